@@ -0,0 +1,40 @@
+"""Add arr_fingerprint to Media
+
+Revision ID: aefda0b25241
+Revises: 9606084facbe
+Create Date: 2026-10-18 09:20:41.532118
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from app_logger import ModuleLogger
+
+# revision identifiers, used by Alembic.
+revision: str = "aefda0b25241"
+down_revision: Union[str, None] = "9606084facbe"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+logging = ModuleLogger("AlembicMigrations")
+
+
+def upgrade() -> None:
+    logging.info("Adding 'arr_fingerprint' to media table")
+    with op.batch_alter_table("media", schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column(
+                "arr_fingerprint",
+                sa.String(),
+                server_default="",
+                nullable=False,
+            )
+        )
+
+
+def downgrade() -> None:
+    logging.info("Removing 'arr_fingerprint' from media table")
+    with op.batch_alter_table("media", schema=None) as batch_op:
+        batch_op.drop_column("arr_fingerprint")
@@ -0,0 +1,40 @@
+"""Add sync_epoch to Media
+
+Revision ID: 3c7d2e9b8f41
+Revises: aefda0b25241
+Create Date: 2026-10-18 10:10:12.284519
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from app_logger import ModuleLogger
+
+# revision identifiers, used by Alembic.
+revision: str = "3c7d2e9b8f41"
+down_revision: Union[str, None] = "aefda0b25241"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+logging = ModuleLogger("AlembicMigrations")
+
+
+def upgrade() -> None:
+    logging.info("Adding 'sync_epoch' to media table")
+    with op.batch_alter_table("media", schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column(
+                "sync_epoch",
+                sa.Integer(),
+                server_default="0",
+                nullable=False,
+            )
+        )
+
+
+def downgrade() -> None:
+    logging.info("Removing 'sync_epoch' from media table")
+    with op.batch_alter_table("media", schema=None) as batch_op:
+        batch_op.drop_column("sync_epoch")
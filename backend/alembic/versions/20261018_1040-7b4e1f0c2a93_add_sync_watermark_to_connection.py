@@ -0,0 +1,44 @@
+"""Add sync watermark to Connection
+
+Revision ID: 7b4e1f0c2a93
+Revises: 3c7d2e9b8f41
+Create Date: 2026-10-18 10:40:27.518306
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from app_logger import ModuleLogger
+
+# revision identifiers, used by Alembic.
+revision: str = "7b4e1f0c2a93"
+down_revision: Union[str, None] = "3c7d2e9b8f41"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+logging = ModuleLogger("AlembicMigrations")
+
+
+def upgrade() -> None:
+    logging.info(
+        "Adding 'last_synced_at' and 'last_full_synced_at' to connection table"
+    )
+    with op.batch_alter_table("connection", schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column("last_synced_at", sa.DateTime(), nullable=True)
+        )
+        batch_op.add_column(
+            sa.Column("last_full_synced_at", sa.DateTime(), nullable=True)
+        )
+
+
+def downgrade() -> None:
+    logging.info(
+        "Removing 'last_synced_at' and 'last_full_synced_at' from connection"
+        " table"
+    )
+    with op.batch_alter_table("connection", schema=None) as batch_op:
+        batch_op.drop_column("last_full_synced_at")
+        batch_op.drop_column("last_synced_at")
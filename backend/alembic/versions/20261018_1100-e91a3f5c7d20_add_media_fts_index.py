@@ -0,0 +1,68 @@
+"""Add full-text search index for Media
+
+Revision ID: e91a3f5c7d20
+Revises: 7b4e1f0c2a93
+Create Date: 2026-10-18 11:00:41.903517
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+from app_logger import ModuleLogger
+
+# revision identifiers, used by Alembic.
+revision: str = "e91a3f5c7d20"
+down_revision: Union[str, None] = "7b4e1f0c2a93"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+logging = ModuleLogger("AlembicMigrations")
+
+# NOTE: Triggers are dropped if the media table is recreated, any later
+# migration that recreates it (batch mode) should recreate the triggers.
+_COLUMNS = "title, clean_title, title_slug, studio, overview"
+_NEW = "new.title, new.clean_title, new.title_slug, new.studio, new.overview"
+_OLD = "old.title, old.clean_title, old.title_slug, old.studio, old.overview"
+_CHANGED = (
+    "old.title IS NOT new.title OR old.clean_title IS NOT new.clean_title"
+    " OR old.title_slug IS NOT new.title_slug OR old.studio IS NOT new.studio"
+    " OR old.overview IS NOT new.overview"
+)
+
+
+def upgrade() -> None:
+    logging.info("Creating 'media_fts' full-text search index for media")
+    op.execute(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS media_fts USING fts5({_COLUMNS},"
+        " content='media', content_rowid='id',"
+        " tokenize='unicode61 remove_diacritics 2')"
+    )
+    op.execute(
+        "CREATE TRIGGER IF NOT EXISTS media_fts_ai AFTER INSERT ON media"
+        f" BEGIN INSERT INTO media_fts(rowid, {_COLUMNS})"
+        f" VALUES (new.id, {_NEW}); END"
+    )
+    op.execute(
+        "CREATE TRIGGER IF NOT EXISTS media_fts_ad AFTER DELETE ON media"
+        f" BEGIN INSERT INTO media_fts(media_fts, rowid, {_COLUMNS})"
+        f" VALUES ('delete', old.id, {_OLD}); END"
+    )
+    op.execute(
+        f"CREATE TRIGGER IF NOT EXISTS media_fts_au AFTER UPDATE OF {_COLUMNS}"
+        f" ON media WHEN {_CHANGED}"
+        f" BEGIN INSERT INTO media_fts(media_fts, rowid, {_COLUMNS})"
+        f" VALUES ('delete', old.id, {_OLD});"
+        f" INSERT INTO media_fts(rowid, {_COLUMNS}) VALUES (new.id, {_NEW});"
+        " END"
+    )
+    logging.info("Indexing existing media for full-text search")
+    op.execute("INSERT INTO media_fts(media_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    logging.info("Removing 'media_fts' full-text search index for media")
+    op.execute("DROP TRIGGER IF EXISTS media_fts_au")
+    op.execute("DROP TRIGGER IF EXISTS media_fts_ad")
+    op.execute("DROP TRIGGER IF EXISTS media_fts_ai")
+    op.execute("DROP TABLE IF EXISTS media_fts")
@@ -0,0 +1,68 @@
+"""Add composite indexes for Media
+
+Revision ID: c4f8a1d6e2b7
+Revises: e91a3f5c7d20
+Create Date: 2026-10-18 11:20:37.615208
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from app_logger import ModuleLogger
+
+# revision identifiers, used by Alembic.
+revision: str = "c4f8a1d6e2b7"
+down_revision: Union[str, None] = "e91a3f5c7d20"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+logging = ModuleLogger("AlembicMigrations")
+
+# NOTE: Indexes are created without batch mode, so that the media table is
+# not recreated and the full-text search triggers are kept.
+_INDEXES: dict[str, tuple[list[str], bool]] = {
+    "ix_media_connection_id_txdb_id": (["connection_id", "txdb_id"], True),
+    "ix_media_connection_id_sync_epoch": (
+        ["connection_id", "sync_epoch"],
+        False,
+    ),
+    "ix_media_is_movie_added_at": (["is_movie", "added_at"], False),
+    "ix_media_monitor_trailer_exists": (["monitor", "trailer_exists"], False),
+    "ix_media_trailer_exists": (["trailer_exists"], False),
+    "ix_media_status_downloaded_at": (["status", "downloaded_at"], False),
+    "ix_media_added_at": (["added_at"], False),
+    "ix_media_updated_at": (["updated_at"], False),
+    "ix_media_downloaded_at": (["downloaded_at"], False),
+}
+# Replaced by the composite indexes starting with the same column
+_REPLACED_INDEXES: dict[str, list[str]] = {
+    "ix_media_connection_id": ["connection_id"],
+    "ix_media_is_movie": ["is_movie"],
+}
+
+
+def upgrade() -> None:
+    logging.info("Removing duplicate media of a connection with same txdb id")
+    result = op.get_bind().execute(
+        sa.text(
+            "DELETE FROM media WHERE id NOT IN"
+            " (SELECT MIN(id) FROM media GROUP BY connection_id, txdb_id)"
+        )
+    )
+    if result.rowcount:
+        logging.info(f"Removed {result.rowcount} duplicate media items")
+    logging.info("Adding composite indexes to media table")
+    for name, (columns, unique) in _INDEXES.items():
+        op.create_index(name, "media", columns, unique=unique)
+    for name in _REPLACED_INDEXES:
+        op.drop_index(name, table_name="media")
+
+
+def downgrade() -> None:
+    logging.info("Removing composite indexes from media table")
+    for name, columns in _REPLACED_INDEXES.items():
+        op.create_index(name, "media", columns, unique=False)
+    for name in _INDEXES:
+        op.drop_index(name, table_name="media")
@@ -0,0 +1,69 @@
+"""Add download queue
+
+Revision ID: 7d2e9b4a1f63
+Revises: c4f8a1d6e2b7
+Create Date: 2026-10-18 11:40:12.408216
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+import sqlmodel.sql.sqltypes
+from app_logger import ModuleLogger
+
+# revision identifiers, used by Alembic.
+revision: str = "7d2e9b4a1f63"
+down_revision: Union[str, None] = "c4f8a1d6e2b7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+logging = ModuleLogger("AlembicMigrations")
+
+
+def upgrade() -> None:
+    logging.info("Creating download queue table")
+    op.create_table(
+        "downloadjob",
+        sa.Column("media_id", sa.Integer(), nullable=False),
+        sa.Column("profile_id", sa.Integer(), nullable=False),
+        sa.Column("priority", sa.Integer(), nullable=False),
+        sa.Column("yt_id", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("retry_count", sa.Integer(), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column(
+            "last_error", sqlmodel.sql.sqltypes.AutoString(), nullable=True
+        ),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("visible_at", sa.DateTime(), nullable=False),
+        sa.Column("claimed_at", sa.DateTime(), nullable=True),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["media_id"],
+            ["media.id"],
+            name="fk_downloadjob_media_id_media",
+            ondelete="CASCADE",
+        ),
+        sa.ForeignKeyConstraint(
+            ["profile_id"],
+            ["trailerprofile.id"],
+            name="fk_downloadjob_profile_id_trailerprofile",
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("id", name="downloadjob_pkc"),
+        sa.UniqueConstraint("media_id", name="uq_downloadjob_media_id"),
+    )
+    op.create_index(
+        "ix_downloadjob_priority_id",
+        "downloadjob",
+        [sa.text("priority DESC"), "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    logging.info("Dropping download queue table")
+    op.drop_index("ix_downloadjob_priority_id", table_name="downloadjob")
+    op.drop_table("downloadjob")
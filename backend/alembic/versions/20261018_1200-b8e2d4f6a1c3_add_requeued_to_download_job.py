@@ -0,0 +1,40 @@
+"""Add requeued to DownloadJob
+
+Revision ID: b8e2d4f6a1c3
+Revises: 7d2e9b4a1f63
+Create Date: 2026-10-18 12:00:41.207815
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from app_logger import ModuleLogger
+
+# revision identifiers, used by Alembic.
+revision: str = "b8e2d4f6a1c3"
+down_revision: Union[str, None] = "7d2e9b4a1f63"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+logging = ModuleLogger("AlembicMigrations")
+
+
+def upgrade() -> None:
+    logging.info("Adding 'requeued' to downloadjob table")
+    with op.batch_alter_table("downloadjob", schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column(
+                "requeued",
+                sa.Boolean(),
+                server_default=sa.false(),
+                nullable=False,
+            )
+        )
+
+
+def downgrade() -> None:
+    logging.info("Removing 'requeued' from downloadjob table")
+    with op.batch_alter_table("downloadjob", schema=None) as batch_op:
+        batch_op.drop_column("requeued")
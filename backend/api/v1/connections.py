@@ -3,7 +3,7 @@ from fastapi import APIRouter, HTTPException, status
 from api.v1.models import ErrorResponse
 from api.v1 import websockets
 from core.base.database.manager.connection import (
-    ConnectionDatabaseManager,
+    AsyncConnectionDatabaseManager,
     validate_connection,
     get_connection_rootfolders,
 )
@@ -19,8 +19,8 @@ connections_router = APIRouter(prefix="/connections", tags=["Connections"])
 
 @connections_router.get("/")
 async def get_connections() -> list[ConnectionRead]:
-    db_handler = ConnectionDatabaseManager()
-    connections = db_handler.read_all()
+    db_handler = AsyncConnectionDatabaseManager()
+    connections = await db_handler.read_all()
     return connections
 
 
@@ -81,7 +81,7 @@ async def get_rootfolders(connection: ConnectionCreate) -> list[str]:
     },
 )
 async def create_connection(connection: ConnectionCreate) -> str:
-    db_handler = ConnectionDatabaseManager()
+    db_handler = AsyncConnectionDatabaseManager()
     try:
         result, connection_id = await db_handler.create(connection)
         await refresh_connection(connection_id)
@@ -103,9 +103,9 @@ async def create_connection(connection: ConnectionCreate) -> str:
     },
 )
 async def get_connection(connection_id: int) -> ConnectionRead:
-    db_handler = ConnectionDatabaseManager()
+    db_handler = AsyncConnectionDatabaseManager()
     try:
-        connection = db_handler.read(connection_id)
+        connection = await db_handler.read(connection_id)
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
     return connection
@@ -125,7 +125,7 @@ async def get_connection(connection_id: int) -> ConnectionRead:
     },
 )
 async def update_connection(connection_id: int, connection: ConnectionUpdate) -> str:
-    db_handler = ConnectionDatabaseManager()
+    db_handler = AsyncConnectionDatabaseManager()
     try:
         # Update the connection in the database
         await db_handler.update(connection_id, connection)
@@ -152,9 +152,9 @@ async def update_connection(connection_id: int, connection: ConnectionUpdate) ->
     },
 )
 async def delete_connection(connection_id: int) -> str:
-    db_handler = ConnectionDatabaseManager()
+    db_handler = AsyncConnectionDatabaseManager()
     try:
-        db_handler.delete(connection_id)
+        await db_handler.delete(connection_id)
     except Exception as e:
         await websockets.ws_manager.broadcast("Failed to delete Connection!", "Error")
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
@@ -170,7 +170,9 @@ async def read_file(file_path: str) -> str:
     status_code=status.HTTP_200_OK,
     description="Get information about the video file.",
 )
-def get_video_info(file_path: str) -> video_analysis.VideoInfo | None:
+async def get_video_info(
+    file_path: str,
+) -> video_analysis.VideoInfo | None:
     """Get information about the video file.\n
     Args:
         file_path (str): Path of the video file. \n
@@ -185,7 +187,7 @@ def get_video_info(file_path: str) -> video_analysis.VideoInfo | None:
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid file path.",
         )
-    return video_analysis.get_media_info(file_path)
+    return await video_analysis.get_media_info(file_path)
 
 
 # @files_router.post(
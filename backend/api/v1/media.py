@@ -1,13 +1,23 @@
+from typing import Iterator
 from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import StreamingResponse
 
 from api.v1 import websockets
-from api.v1.models import BatchUpdate, ErrorResponse, SearchMedia
+from api.v1.models import BatchUpdate, ErrorResponse, MediaPage, SearchMedia
 from app_logger import ModuleLogger
-from core.base.database.manager import trailerprofile
-from core.base.database.manager.base import MediaDatabaseManager
+from core.base.database.manager import customfilter, trailerprofile
+from core.base.database.manager.base import (
+    AsyncMediaDatabaseManager,
+    MediaDatabaseManager,
+)
+from core.base.database.models.customfilter import FilterType
 from core.base.database.models.media import MediaRead
+from core.base.database.models.trailerprofile import TrailerProfileRead
+from core.base.database.utils.engine import run_async_read
+from core.base.utils.filters import compile_profile_matcher
 from core.download import trailer_search
 from core.files_handler import FilesHandler, FolderInfo
+from exceptions import ItemNotFoundError
 from core.tasks.download_trailers import (
     batch_download_trailers,
     download_trailer_by_id,
@@ -46,8 +56,8 @@ async def get_all_media(
     Returns:
         list[MediaRead]: List of media objects. \n
     """
-    db_handler = MediaDatabaseManager()
-    media = db_handler.read_all(
+    db_handler = AsyncMediaDatabaseManager()
+    media = await db_handler.read_all(
         movies_only=movies_only,
         filter_by=filter_by,
         sort_by=sort_by,
@@ -56,6 +66,205 @@ async def get_all_media(
     return media
 
 
+@media_router.get(
+    "/all/page",
+    status_code=status.HTTP_200_OK,
+    responses={
+        status.HTTP_400_BAD_REQUEST: {
+            "model": ErrorResponse,
+            "description": "Invalid cursor",
+        }
+    },
+)
+async def get_all_media_page(
+    limit: int = 100,
+    cursor: str | None = None,
+    movies_only: bool | None = None,
+    filter_by: str | None = "all",
+    sort_by: str | None = None,
+    sort_asc: bool = True,
+) -> MediaPage:
+    """Get a page of all media from the database. \n
+    Pass the `next_cursor` of a page as `cursor` to get the next page, \
+        with the same filters and sorting. \n
+    Args:
+        limit (int, Optional=100): Max number of items in the page, \
+            between 1 and 1000.
+        cursor (str, Optional=None): Cursor of the page to get. \
+            If `None`, it will return the first page. \n
+        movies_only (bool, Optional=None):
+            Flag to get only movies.
+            - If `True`, it will return only `movies`.
+            - If `False`, it will return only `series`.
+            - If `None`, it will return all media items. \n
+        filter_by (str, Optional=`all`):
+            Filter the media items by a column value. Available filters are
+            - `all`
+            - `downloaded`
+            - `monitored`
+            - `missing`
+            - `unmonitored`. \n
+        sort_by (str, Optional=None): Sort the media items by `title`, `year`, \
+            `added_at`, or `updated_at`. \n
+        sort_asc (bool, Optional=True): Flag to sort in ascending order. \n
+    Returns:
+        MediaPage: Media objects of the page and the cursor for the \
+            next page, `null` if this is the last page. \n
+    Raises:
+        HTTPException (400): If the cursor is invalid.
+    """
+    db_handler = AsyncMediaDatabaseManager()
+    try:
+        media, next_cursor = await db_handler.read_page(
+            limit=max(1, min(limit, 1000)),
+            cursor=cursor,
+            movies_only=movies_only,
+            filter_by=filter_by,
+            sort_by=sort_by,
+            sort_asc=sort_asc,
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+        )
+    return MediaPage(items=media, next_cursor=next_cursor)
+
+
+@media_router.get(
+    "/all/stream",
+    response_class=StreamingResponse,
+    responses={
+        status.HTTP_200_OK: {
+            "content": {"application/x-ndjson": {}},
+            "description": "One media object (JSON) per line",
+        }
+    },
+)
+def stream_all_media(
+    movies_only: bool | None = None,
+    filter_by: str | None = "all",
+    sort_by: str | None = None,
+    sort_asc: bool = True,
+) -> StreamingResponse:
+    """Stream all media from the database as newline delimited JSON. \n
+    Media is read from the database and sent in batches, so the response \
+        starts right away and memory use doesn't grow with the library. \n
+    Args:
+        movies_only (bool, Optional=None):
+            Flag to get only movies.
+            - If `True`, it will return only `movies`.
+            - If `False`, it will return only `series`.
+            - If `None`, it will return all media items. \n
+        filter_by (str, Optional=`all`):
+            Filter the media items by a column value. Available filters are
+            - `all`
+            - `downloaded`
+            - `monitored`
+            - `missing`
+            - `unmonitored`. \n
+        sort_by (str, Optional=None): Sort the media items by `title`, `year`, \
+            `added_at`, or `updated_at`. \n
+        sort_asc (bool, Optional=True): Flag to sort in ascending order. \n
+    Returns:
+        StreamingResponse: Media objects, one JSON object per line. \n
+    """
+    db_handler = MediaDatabaseManager()
+    batches = db_handler.read_all_batches(
+        movies_only=movies_only,
+        filter_by=filter_by,
+        sort_by=sort_by,
+        sort_asc=sort_asc,
+    )
+
+    def _ndjson_lines() -> Iterator[str]:
+        # Sync generator, iterated in a thread pool by the response
+        for media_list in batches:
+            yield "".join(
+                f"{media.model_dump_json()}\n" for media in media_list
+            )
+
+    return StreamingResponse(
+        _ndjson_lines(), media_type="application/x-ndjson"
+    )
+
+
+@media_router.get(
+    "/filter/{customfilter_id}",
+    status_code=status.HTTP_200_OK,
+    responses={
+        status.HTTP_400_BAD_REQUEST: {
+            "model": ErrorResponse,
+            "description": "Invalid cursor or filter",
+        },
+        status.HTTP_404_NOT_FOUND: {
+            "model": ErrorResponse,
+            "description": "Custom filter not found",
+        },
+    },
+)
+async def get_filtered_media_page(
+    customfilter_id: int,
+    limit: int = 100,
+    cursor: str | None = None,
+    movies_only: bool | None = None,
+    sort_by: str | None = None,
+    sort_asc: bool = True,
+) -> MediaPage:
+    """Get a page of media matching a custom filter. \n
+    Filters are applied in the database, pages work same as `/all/page`. \n
+    Args:
+        customfilter_id (int): ID of the custom filter to apply.
+        limit (int, Optional=100): Max number of items in the page, \
+            between 1 and 1000.
+        cursor (str, Optional=None): Cursor of the page to get. \
+            If `None`, it will return the first page. \n
+        movies_only (bool, Optional=None):
+            Flag to get only movies.
+            - If `True`, it will return only `movies`.
+            - If `False`, it will return only `series`.
+            - If `None`, it will use the custom filter type, only `movies` \
+                for `MOVIES` filters, only `series` for `SERIES` filters \
+                and all media items otherwise. \n
+        sort_by (str, Optional=None): Sort the media items by `title`, `year`, \
+            `added_at`, or `updated_at`. \n
+        sort_asc (bool, Optional=True): Flag to sort in ascending order. \n
+    Returns:
+        MediaPage: Media objects of the page and the cursor for the \
+            next page, `null` if this is the last page. \n
+    Raises:
+        HTTPException (400): If the cursor or a filter value is invalid.
+        HTTPException (404): If the custom filter is not found.
+    """
+    try:
+        view_filter = await run_async_read(
+            customfilter.get_customfilter, customfilter_id
+        )
+    except ItemNotFoundError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail=str(e)
+        )
+    if movies_only is None:
+        if view_filter.filter_type == FilterType.MOVIES:
+            movies_only = True
+        elif view_filter.filter_type == FilterType.SERIES:
+            movies_only = False
+    db_handler = AsyncMediaDatabaseManager()
+    try:
+        media, next_cursor = await db_handler.read_page(
+            limit=max(1, min(limit, 1000)),
+            cursor=cursor,
+            movies_only=movies_only,
+            sort_by=sort_by,
+            sort_asc=sort_asc,
+            filters=view_filter.filters,
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+        )
+    return MediaPage(items=media, next_cursor=next_cursor)
+
+
 @media_router.get("/")
 async def get_recent_media(
     limit: int = 30, offset: int = 0, movies_only: bool | None = None
@@ -72,8 +281,10 @@ async def get_recent_media(
     Returns:
     - list[MediaRead]: List of media objects.
     """
-    db_handler = MediaDatabaseManager()
-    media = db_handler.read_recent(limit, offset, movies_only=movies_only)
+    db_handler = AsyncMediaDatabaseManager()
+    media = await db_handler.read_recent(
+        limit, offset, movies_only=movies_only
+    )
     return media
 
 
@@ -85,8 +296,8 @@ async def get_updated_after(seconds: int) -> list[MediaRead]:
     Returns:
         list[MediaRead]: List of media objects. \n
     """
-    db_handler = MediaDatabaseManager()
-    media = db_handler.read_updated_after(seconds)
+    db_handler = AsyncMediaDatabaseManager()
+    media = await db_handler.read_updated_after(seconds)
     return media
 
 
@@ -101,8 +312,8 @@ async def get_recently_downloaded(
     Returns:
         list[MediaRead]: List of media objects. \n
     """
-    db_handler = MediaDatabaseManager()
-    media_list = db_handler.read_recently_downloaded(limit, offset)
+    db_handler = AsyncMediaDatabaseManager()
+    media_list = await db_handler.read_recently_downloaded(limit, offset)
     return media_list
 
 
@@ -114,8 +325,8 @@ async def search_media(query: str) -> list[SearchMedia]:
     Returns:
         list[SearchMedia]: List of search media objects. \n
     """
-    db_handler = MediaDatabaseManager()
-    media_list = db_handler.search(query)
+    db_handler = AsyncMediaDatabaseManager()
+    media_list = await db_handler.search(query)
     search_media_list: list[SearchMedia] = []
     for media in media_list:
         media_data = media.model_dump()
@@ -141,9 +352,9 @@ async def get_media_by_id(media_id: int) -> MediaRead:
     Returns:
         MediaRead: Media object. \n
     """
-    db_handler = MediaDatabaseManager()
+    db_handler = AsyncMediaDatabaseManager()
     try:
-        media = db_handler.read(media_id)
+        media = await db_handler.read(media_id)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail=str(e)
@@ -151,6 +362,46 @@ async def get_media_by_id(media_id: int) -> MediaRead:
     return media
 
 
+@media_router.get(
+    "/{media_id}/trailerprofile",
+    status_code=status.HTTP_200_OK,
+    responses={
+        status.HTTP_404_NOT_FOUND: {
+            "model": ErrorResponse,
+            "description": "Media Not Found or no matching profile",
+        }
+    },
+)
+async def get_media_trailerprofile(media_id: int) -> TrailerProfileRead:
+    """Get the trailer profile that would be used to download the trailer \
+        of a media, the enabled profile with the highest priority whose \
+        filters match the media. \n
+    Args:
+        media_id (int): ID of the media item. \n
+    Returns:
+        TrailerProfileRead: Matching trailer profile. \n
+    Raises:
+        HTTPException (404): If the media is not found or no enabled \
+            profile matches it.
+    """
+    db_handler = AsyncMediaDatabaseManager()
+    try:
+        media = await db_handler.read(media_id)
+    except ItemNotFoundError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail=str(e)
+        )
+    profiles = await trailerprofile.get_trailerprofiles_async()
+    profiles = [p for p in profiles if p.enabled]
+    profile = compile_profile_matcher(profiles)(media)
+    if profile is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No enabled trailer profile matches media {media_id}",
+        )
+    return profile
+
+
 @media_router.get(
     "/{media_id}/files",
     status_code=status.HTTP_200_OK,
@@ -168,9 +419,9 @@ async def get_media_files(media_id: int) -> FolderInfo | str:
     Returns:
         FolderInfo|str: Folder information or error message. \n
     """
-    db_handler = MediaDatabaseManager()
+    db_handler = AsyncMediaDatabaseManager()
     try:
-        media = db_handler.read(media_id)
+        media = await db_handler.read(media_id)
         if not media.folder_path:
             raise Exception("Media has no folder path!")
         files_handler = FilesHandler()
@@ -231,9 +482,9 @@ async def monitor_media(media_id: int, monitor: bool = True) -> str:
         str: Monitoring message.
     """
     logger.info(f"Monitoring media with ID: {media_id}")
-    db_handler = MediaDatabaseManager()
+    db_handler = AsyncMediaDatabaseManager()
     try:
-        msg, is_success = db_handler.update_monitoring(media_id, monitor)
+        msg, is_success = await db_handler.update_monitoring(media_id, monitor)
         logger.info(msg)
         await websockets.ws_manager.broadcast(
             msg, "Success" if is_success else "Error"
@@ -288,9 +539,9 @@ async def update_yt_id(media_id: int, yt_id: str) -> str:
             status_code=status.HTTP_406_NOT_ACCEPTABLE,
             detail="Invalid YouTube ID!",
         )
-    db_handler = MediaDatabaseManager()
+    db_handler = AsyncMediaDatabaseManager()
     try:
-        db_handler.update_ytid(media_id, yt_id)
+        await db_handler.update_ytid(media_id, yt_id)
         msg = f"YouTube ID for media with ID: {media_id} has been updated."
         logger.info(msg)
         await websockets.ws_manager.broadcast(msg, "Success")
@@ -320,12 +571,12 @@ async def search_for_trailer(media_id: int, profile_id: int) -> str:
         str: Youtube ID of the trailer if found, else empty string. \n
     """
     logger.info(f"Searching for trailer for media with ID: {media_id}")
-    db_handler = MediaDatabaseManager()
-    media = db_handler.read(media_id)
-    profile = trailerprofile.get_trailerprofile(profile_id)
+    db_handler = AsyncMediaDatabaseManager()
+    media = await db_handler.read(media_id)
+    profile = await trailerprofile.get_trailerprofile_async(profile_id)
 
     if yt_id := trailer_search.search_yt_for_trailer(media, profile):
-        db_handler.update_ytid(media_id, yt_id)
+        await db_handler.update_ytid(media_id, yt_id)
         msg = (
             f"Trailer found for media '{media.title}' [{media.id}] as"
             f" ({yt_id})"
@@ -357,9 +608,9 @@ async def delete_media_trailer(media_id: int) -> str:
         str: Deleting trailer message.
     """
     logger.info(f"Deleting trailer for media with ID: {media_id}")
-    db_handler = MediaDatabaseManager()
+    db_handler = AsyncMediaDatabaseManager()
     try:
-        media = db_handler.read(media_id)
+        media = await db_handler.read(media_id)
         if not media.trailer_exists:
             msg = (
                 f"Media '{media.title}' [{media.id}] has no trailer to delete"
@@ -379,7 +630,7 @@ async def delete_media_trailer(media_id: int) -> str:
             )
             await websockets.ws_manager.broadcast(msg, "Error")
             return msg
-        db_handler.update_trailer_exists(media_id, False)
+        await db_handler.update_trailer_exists(media_id, False)
         msg = (
             f"Trailer for media '{media.title}' [{media.id}] has been deleted."
         )
@@ -418,14 +669,14 @@ async def batch_update_media(update: BatchUpdate) -> None:
         str: Monitoring message.
     """
     logger.info(f"Monitoring media with IDs: {update.media_ids}")
-    db_handler = MediaDatabaseManager()
+    db_handler = AsyncMediaDatabaseManager()
     try:
         msg = ""
         if update.action == "monitor":
-            db_handler.update_monitoring_bulk(update.media_ids, True)
+            await db_handler.update_monitoring_bulk(update.media_ids, True)
             msg = f"{len(update.media_ids)} Media are now monitored"
         elif update.action == "unmonitor":
-            db_handler.update_monitoring_bulk(update.media_ids, False)
+            await db_handler.update_monitoring_bulk(update.media_ids, False)
             msg = f"{len(update.media_ids)} Media are now unmonitored"
         elif update.action == "delete":
             for media_id in update.media_ids:
@@ -1,8 +1,22 @@
 from pydantic import BaseModel
 
+from core.base.database.models.media import MediaRead
+
 # THESE MODELS ARE ONLY FOR API RESPONSES
 
 
+class ArrWebhookMedia(BaseModel):
+    id: int
+    tmdbId: int | None = None
+    tvdbId: int | None = None
+
+
+class ArrWebhook(BaseModel):
+    eventType: str
+    movie: ArrWebhookMedia | None = None
+    series: ArrWebhookMedia | None = None
+
+
 class BatchUpdate(BaseModel):
     media_ids: list[int]
     action: str
@@ -23,6 +37,11 @@ class Log(BaseModel):
     raw_log: str
 
 
+class MediaPage(BaseModel):
+    items: list[MediaRead]
+    next_cursor: str | None = None
+
+
 class SearchMedia(BaseModel):
     id: int
     title: str
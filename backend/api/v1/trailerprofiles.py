@@ -29,7 +29,7 @@ async def get_trailer_profiles() -> list[TrailerProfileRead]:
     Returns:
         list[TrailerProfileRead]: List of trailer profiles.
     """
-    return trailerprofile.get_trailerprofiles()
+    return await trailerprofile.get_trailerprofiles_async()
 
 
 def handle_exceptions(func):
@@ -71,7 +71,9 @@ async def create_trailer_profile(
     Returns:
         TrailerProfileRead: Created trailer profile.
     """
-    return trailerprofile.create_trailerprofile(trailerprofile_create)
+    return await trailerprofile.create_trailerprofile_async(
+        trailerprofile_create
+    )
 
 
 @trailerprofiles_router.get(
@@ -93,7 +95,7 @@ async def get_trailer_profile(
     Returns:
         TrailerProfileRead: Trailer profile.
     """
-    return trailerprofile.get_trailerprofile(trailerprofile_id)
+    return await trailerprofile.get_trailerprofile_async(trailerprofile_id)
 
 
 @trailerprofiles_router.put(
@@ -115,7 +117,7 @@ async def update_trailer_profile(
     Returns:
         TrailerProfileRead: Updated trailer profile.
     """
-    return trailerprofile.update_trailerprofile(
+    return await trailerprofile.update_trailerprofile_async(
         trailerprofile_id, trailerprofile_update
     )
 
@@ -138,7 +140,7 @@ async def update_trailer_profile_setting(
     Returns:
         TrailerProfileRead: Updated trailer profile.
     """
-    return trailerprofile.update_trailerprofile_setting(
+    return await trailerprofile.update_trailerprofile_setting_async(
         trailerprofile_id, update.key, update.value
     )
 
@@ -161,4 +163,4 @@ async def delete_trailer_profile(
         bool: True if the trailer profile was deleted successfully. \
             Raises HTTPException otherwise.
     """
-    return trailerprofile.delete_trailerprofile(trailerprofile_id)
+    return await trailerprofile.delete_trailerprofile_async(trailerprofile_id)
@@ -0,0 +1,96 @@
+from fastapi import APIRouter, BackgroundTasks, HTTPException, status
+
+from api.v1.models import ArrWebhook, ErrorResponse
+from app_logger import ModuleLogger
+from core.base.database.manager.connection import ConnectionDatabaseManager
+from core.base.database.models.connection import ArrType
+from core.tasks.api_refresh import api_delete_media, api_refresh_media
+
+logger = ModuleLogger("Webhooks")
+
+webhooks_router = APIRouter(prefix="/webhooks", tags=["Webhooks"])
+
+# Arr events that change the media data, the media is refreshed from Arr API
+REFRESH_EVENTS = {
+    "Download",
+    "Rename",
+    "MovieAdded",
+    "SeriesAdd",
+    "MovieFileDelete",
+    "EpisodeFileDelete",
+}
+# Arr events that remove the media from Arr, the media is deleted
+DELETE_EVENTS = {"MovieDelete", "SeriesDelete"}
+
+
+@webhooks_router.post(
+    "/{connection_id}",
+    status_code=status.HTTP_200_OK,
+    responses={
+        status.HTTP_200_OK: {
+            "description": "Webhook Received Successfully!",
+        },
+        status.HTTP_400_BAD_REQUEST: {
+            "model": ErrorResponse,
+            "description": "Webhook payload doesn't match the connection",
+        },
+        status.HTTP_404_NOT_FOUND: {
+            "model": ErrorResponse,
+            "description": "Connection Not Found",
+        },
+    },
+)
+async def arr_webhook(
+    connection_id: int, payload: ArrWebhook, background_tasks: BackgroundTasks
+) -> str:
+    """Receive a webhook from Radarr/Sonarr 'Connect' settings. \n
+    Only the media in the payload is refreshed from Arr API (or deleted), \
+        in the background after the response is sent. \n
+    Add a webhook connection in Radarr/Sonarr with the url \
+        `/api/v1/webhooks/{connection_id}?api_key=<trailarr_api_key>` \
+        and method `POST`."""
+    try:
+        connection = ConnectionDatabaseManager().read(connection_id)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail=str(e)
+        )
+    event_type = payload.eventType
+    if event_type == "Test":
+        logger.info(f"Test webhook received for connection: {connection.name}")
+        return "Webhook Test Successful!"
+    if event_type not in REFRESH_EVENTS | DELETE_EVENTS:
+        logger.debug(
+            f"Ignoring webhook event '{event_type}' for connection:"
+            f" {connection.name}"
+        )
+        return f"Event '{event_type}' ignored"
+    # Get the media from the payload based on connection type
+    if connection.arr_type == ArrType.RADARR:
+        media = payload.movie
+        txdb_id = media.tmdbId if media else None
+    else:
+        media = payload.series
+        txdb_id = media.tvdbId if media else None
+    if media is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=(
+                f"Webhook event '{event_type}' has no media for connection:"
+                f" {connection.name}"
+            ),
+        )
+    logger.info(
+        f"Webhook event '{event_type}' received for connection:"
+        f" {connection.name}, media id: {media.id}"
+    )
+    if event_type in DELETE_EVENTS:
+        if txdb_id is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Webhook event '{event_type}' has no txdb id",
+            )
+        background_tasks.add_task(api_delete_media, connection, [str(txdb_id)])
+        return f"Event '{event_type}' received, deleting media"
+    background_tasks.add_task(api_refresh_media, connection, [media.id])
+    return f"Event '{event_type}' received, refreshing media"
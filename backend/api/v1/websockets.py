@@ -38,6 +38,24 @@ class WSConnectionManager:
         for connection in self.active_connections:
             await connection.send_json({"type": type, "message": message})
 
+    async def broadcast_progress(self, progress: dict) -> None:
+        """Send a progress event to all connected clients. \n
+        Progress is sent with type 'Progress' and the event in `progress`, \
+            so that clients don't show it as a message. Progress is best \
+            effort, a client that can't receive it is skipped.
+        Args:
+            progress (dict): The progress event to send.
+        Returns:
+            None
+        """
+        for connection in list(self.active_connections):
+            try:
+                await connection.send_json(
+                    {"type": "Progress", "message": "", "progress": progress}
+                )
+            except Exception:
+                continue
+
 
 def broadcast(message: str, type: str = "Success") -> None:
     """Send a message to all connected clients. Non-Async function.
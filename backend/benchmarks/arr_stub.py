@@ -0,0 +1,180 @@
+"""Helpers shared by the benchmarks: a local stub Arr server and \
+    generators for realistic Radarr/Sonarr API payloads."""
+
+import asyncio
+from contextlib import contextmanager
+import json
+import multiprocessing
+import random
+from typing import Any, Iterator
+from aiohttp import web
+
+_OVERVIEW = (
+    "A retired operative is pulled back into the field when an old enemy"
+    " resurfaces with a plan that threatens everything they swore to protect."
+)
+
+
+def generate_movie(radarr_id: int) -> dict[str, Any]:
+    """Generate a movie, similar to one returned by Radarr API."""
+    title = f"Benchmark Movie {radarr_id}"
+    slug = title.lower().replace(" ", "-")
+    return {
+        "id": radarr_id,
+        "title": title,
+        "originalTitle": title,
+        "originalLanguage": {"id": 1, "name": "English"},
+        "sortTitle": title.lower(),
+        "sizeOnDisk": random.randint(1, 50) * 1024**3,
+        "status": "released",
+        "overview": _OVERVIEW,
+        "inCinemas": "2019-05-01T00:00:00Z",
+        "images": [
+            {
+                "coverType": "poster",
+                "url": f"/MediaCover/{radarr_id}/poster.jpg",
+                "remoteUrl": f"https://image.tmdb.org/t/p/{slug}-poster.jpg",
+            },
+            {
+                "coverType": "fanart",
+                "url": f"/MediaCover/{radarr_id}/fanart.jpg",
+                "remoteUrl": f"https://image.tmdb.org/t/p/{slug}-fanart.jpg",
+            },
+        ],
+        "website": "",
+        "year": 1980 + radarr_id % 45,
+        "youTubeTrailerId": f"yt{radarr_id:09d}",
+        "studio": "Benchmark Studios",
+        "path": f"/movies/{title} ({1980 + radarr_id % 45})",
+        "qualityProfileId": 1,
+        "hasFile": True,
+        "movieFileId": radarr_id,
+        "monitored": radarr_id % 3 != 0,
+        "minimumAvailability": "released",
+        "isAvailable": True,
+        "folderName": f"/movies/{title} ({1980 + radarr_id % 45})",
+        "runtime": 90 + radarr_id % 60,
+        "cleanTitle": slug.replace("-", ""),
+        "imdbId": f"tt{radarr_id:07d}",
+        "tmdbId": 100000 + radarr_id,
+        "titleSlug": f"{100000 + radarr_id}",
+        "genres": ["Action", "Thriller"],
+        "tags": [],
+        "added": "2023-01-01T00:00:00Z",
+        "ratings": {
+            "imdb": {"votes": 1000, "value": 7.1, "type": "user"},
+            "tmdb": {"votes": 500, "value": 6.9, "type": "user"},
+        },
+        "movieFile": {
+            "id": radarr_id,
+            "relativePath": f"{title} ({1980 + radarr_id % 45}).mkv",
+            "size": 4 * 1024**3,
+            "quality": {"quality": {"id": 7, "name": "Bluray-1080p"}},
+            "mediaInfo": {
+                "audioCodec": "DTS",
+                "videoCodec": "x264",
+                "resolution": "1920x1080",
+                "runTime": "1:52:00",
+            },
+        },
+        "statistics": {"movieFileCount": 1, "sizeOnDisk": 4 * 1024**3},
+    }
+
+
+def generate_movies(
+    count: int, changed_percent: float = 0
+) -> list[dict[str, Any]]:
+    """Generate a list of movies, similar to Radarr API response. \n
+    `changed_percent` of the movies get a modified title, to simulate \
+        changes in Arr since the last refresh."""
+    movies = [generate_movie(i) for i in range(1, count + 1)]
+    if changed_percent > 0:
+        step = max(1, int(100 / changed_percent))
+        for movie in movies[::step]:
+            movie["title"] += " (Updated)"
+    return movies
+
+
+class StubArrServer:
+    """Minimal Arr API server that counts opened sockets. \n
+    Serves the given movies at `/api/v3/movie` and `/api/v3/movie/{id}`."""
+
+    def __init__(self, movies: list[dict[str, Any]] | None = None) -> None:
+        self.sockets: set[tuple[str, int]] = set()
+        self.movies = movies or []
+        self._movies_body = json.dumps(self.movies).encode()
+        self.runner: web.AppRunner | None = None
+        self.url = ""
+
+    async def _handle(self, request: web.Request) -> web.StreamResponse:
+        # Client address (ip, port) is unique for every opened socket
+        if request.transport is not None:
+            peername = request.transport.get_extra_info("peername")
+            self.sockets.add(tuple(peername))
+        path = request.path.rstrip("/")
+        if path.endswith("system/status"):
+            return web.json_response({"appName": "Radarr", "version": "5.0"})
+        if path.endswith("rootfolder"):
+            return web.json_response([{"path": "/movies"}])
+        if "/movie/" in path:
+            movie_id = int(path.rsplit("/", 1)[-1])
+            if 0 < movie_id <= len(self.movies):
+                return web.json_response(self.movies[movie_id - 1])
+            return web.json_response({})
+        return web.Response(
+            body=self._movies_body, content_type="application/json"
+        )
+
+    async def start(self) -> None:
+        app = web.Application()
+        app.router.add_route("GET", "/{tail:.*}", self._handle)
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = self.runner.addresses[0][1]
+        self.url = f"http://127.0.0.1:{port}"
+
+    async def stop(self) -> None:
+        if self.runner:
+            await self.runner.cleanup()
+
+
+def _serve_forever(
+    movie_count: int, changed_percent: float, url_queue
+) -> None:
+    """🚨This is a private method🚨 \n
+    Run the stub server in the current process until terminated."""
+
+    async def _serve() -> None:
+        server = StubArrServer(generate_movies(movie_count, changed_percent))
+        await server.start()
+        url_queue.put(server.url)
+        await asyncio.Event().wait()
+
+    asyncio.run(_serve())
+
+
+@contextmanager
+def stub_server_process(
+    movie_count: int, changed_percent: float = 0
+) -> Iterator[str]:
+    """Run a stub Arr server in a separate process, so that its memory \
+        and CPU usage does not affect the measurements. \n
+    Args:
+        movie_count (int): Number of movies to serve.
+        changed_percent (float, Optional=0): Percent of movies to modify. \n
+    Yields:
+        str: URL of the stub server."""
+    url_queue = multiprocessing.Queue()
+    process = multiprocessing.Process(
+        target=_serve_forever,
+        args=(movie_count, changed_percent, url_queue),
+        daemon=True,
+    )
+    process.start()
+    try:
+        yield url_queue.get(timeout=300)
+    finally:
+        process.terminate()
+        process.join()
@@ -0,0 +1,112 @@
+"""Benchmark Arr API requests with a new session per request vs the \
+    shared connection pool.
+
+Starts a local stub Arr server, simulates a connection refresh \
+    (system status, rootfolders and media list calls) and reports request \
+    latency and the number of sockets opened on the server per refresh.
+
+Usage (from `backend` folder):
+    APP_DATA_DIR=/tmp/trailarr python -m benchmarks.bench_arr_client_pool
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Any
+import aiohttp
+
+from benchmarks.arr_stub import StubArrServer, generate_movies
+from core.base.arr_manager import client_pool
+from core.base.arr_manager.request_manager import AsyncRequestManager
+
+API_KEY = "benchmark"
+
+
+class _UnpooledRequestManager(AsyncRequestManager):
+    """Old behaviour, a new client session for every request."""
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        params: dict | None = None,
+        data: list[dict] | dict | None = None,
+    ) -> Any:
+        url = f"{self.host_url}/{path.lstrip('/')}"
+        headers = {"X-Api-Key": self.api_key}
+        async with aiohttp.ClientSession() as session:
+            async with session.request(
+                method, url, headers=headers, params=params, data=data
+            ) as client_response:
+                return await self._process_response(client_response)
+
+
+async def _refresh(manager: AsyncRequestManager, items: int) -> list[float]:
+    """Simulate the calls made during a single connection refresh."""
+    latencies: list[float] = []
+    paths = ["/api/v3/system/status", "/api/v3/rootfolder", "/api/v3/movie"]
+    paths += [f"/api/v3/movie/{i}" for i in range(items)]
+    for path in paths:
+        start = time.perf_counter()
+        await manager._request("GET", path)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+async def _run(
+    name: str,
+    server: StubArrServer,
+    manager: AsyncRequestManager,
+    refreshes: int,
+    items: int,
+) -> None:
+    server.sockets.clear()
+    latencies: list[float] = []
+    start = time.perf_counter()
+    for _ in range(refreshes):
+        latencies += await _refresh(manager, items)
+    total = time.perf_counter() - start
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(
+        f"{name:<10} total={total:7.3f}s"
+        f" mean={statistics.mean(latencies):6.2f}ms p95={p95:6.2f}ms"
+        f" sockets/refresh={len(server.sockets) / refreshes:6.1f}"
+    )
+
+
+async def main(refreshes: int, items: int, media_count: int) -> None:
+    server = StubArrServer(generate_movies(media_count))
+    await server.start()
+    try:
+        print(
+            f"{refreshes} refreshes, {items + 3} requests each,"
+            f" {media_count} media in list"
+        )
+        await _run(
+            "unpooled",
+            server,
+            _UnpooledRequestManager(server.url, API_KEY),
+            refreshes,
+            items,
+        )
+        await _run(
+            "pooled",
+            server,
+            AsyncRequestManager(server.url, API_KEY),
+            refreshes,
+            items,
+        )
+    finally:
+        await client_pool.close_client_sessions()
+        await server.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--refreshes", type=int, default=20)
+    parser.add_argument("--items", type=int, default=50)
+    parser.add_argument("--media-count", type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(main(args.refreshes, args.items, args.media_count))
@@ -0,0 +1,86 @@
+"""Benchmark peak memory of parsing the full Radarr movie list vs \
+    streaming it one item at a time.
+
+Serves a generated large `/api/v3/movie` payload from a local stub Arr \
+    server and parses it into `MediaCreate` chunks of 100, the same way a \
+    connection refresh does. Peak memory is measured with `tracemalloc`.
+
+Usage (from `backend` folder):
+    APP_DATA_DIR=/tmp/trailarr python -m benchmarks.bench_arr_streaming
+"""
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+
+from benchmarks.arr_stub import stub_server_process
+from core.base.arr_manager import client_pool
+from core.base.database.models.media import MediaCreate
+from core.radarr.api_manager import RadarrManager
+from core.radarr.data_parser import parse_movie
+
+CHUNK_SIZE = 100
+
+
+def _process_chunk(chunk: list[MediaCreate]) -> None:
+    """Stand-in for the database sync of a chunk, drops the chunk."""
+    chunk.clear()
+
+
+async def _full_list(manager: RadarrManager) -> int:
+    """Old behaviour, load the whole list then parse it in chunks."""
+    media_data = await manager.get_all_movies()
+    count = 0
+    chunk: list[MediaCreate] = []
+    for media in media_data:
+        chunk.append(parse_movie(1, media))
+        count += 1
+        if len(chunk) == CHUNK_SIZE:
+            _process_chunk(chunk)
+    _process_chunk(chunk)
+    return count
+
+
+async def _streaming(manager: RadarrManager) -> int:
+    """New behaviour, parse items as the response is received."""
+    count = 0
+    chunk: list[MediaCreate] = []
+    async for media in manager.iter_all_movies():
+        chunk.append(parse_movie(1, media))
+        count += 1
+        if len(chunk) == CHUNK_SIZE:
+            _process_chunk(chunk)
+    _process_chunk(chunk)
+    return count
+
+
+async def _measure(name: str, func, manager: RadarrManager) -> None:
+    tracemalloc.start()
+    start = time.perf_counter()
+    count = await func(manager)
+    total = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"{name:<10} items={count} time={total:6.2f}s"
+        f" peak_memory={peak / 1024**2:8.2f} MB"
+    )
+
+
+async def main(url: str, media_count: int) -> None:
+    print(f"{media_count} movies")
+    manager = RadarrManager(url, "benchmark")
+    try:
+        await _measure("full_list", _full_list, manager)
+        await _measure("streaming", _streaming, manager)
+    finally:
+        await client_pool.close_client_sessions()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--media-count", type=int, default=20000)
+    args = parser.parse_args()
+    with stub_server_process(args.media_count) as url:
+        asyncio.run(main(url, args.media_count))
@@ -0,0 +1,148 @@
+"""Benchmark the set-based bulk status updates of `MediaDatabaseManager` \
+    against the previous implementation, that called the single item \
+    method (get, modify, add) for each media item.
+
+Runs each bulk method once over all media, same as a sync or disk scan. \
+    Reports wall time and the number of SQL statements issued.
+
+Usage (from `backend` folder, uses the database in `APP_DATA_DIR`):
+    APP_DATA_DIR=/tmp/trailarr-bench python -m benchmarks.bench_bulk_status
+"""
+
+import argparse
+import time
+from typing import Any, Callable
+from sqlalchemy import event
+
+from benchmarks.db_utils import create_connection, setup_database
+from core.base.database.manager.base import MediaDatabaseManager
+from core.base.database.models.helpers import MediaUpdateDC
+from core.base.database.models.media import (
+    MediaCreate,
+    MediaUpdate,
+    MonitorStatus,
+)
+from core.base.database.utils.engine import engine, manage_write_session
+
+
+class _QueryCounter:
+    """Count the SQL statements executed on the engine."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args, **kwargs) -> None:
+        self.count += 1
+
+
+class _PerItemMediaDatabaseManager(MediaDatabaseManager):
+    """Previous implementation, calls the single item method in a loop."""
+
+    @manage_write_session
+    def update_media_status_bulk(self, media_update_list, *, _session=None):
+        for media_update in media_update_list:
+            self.update_media_status(
+                media_update, _session=_session, _commit=False
+            )
+        _session.commit()
+
+    @manage_write_session
+    def update_trailer_exists_bulk(self, media_updates, *, _session=None):
+        for media_id, trailer_exists in media_updates:
+            self.update_trailer_exists(
+                media_id, trailer_exists, _session=_session, _commit=False
+            )
+        _session.commit()
+
+    @manage_write_session
+    def update_monitoring_bulk(self, media_ids, monitor, *, _session=None):
+        for media_id in media_ids:
+            self.update_monitoring(
+                media_id, monitor, _session=_session, _commit=False
+            )
+        _session.commit()
+
+    @manage_write_session
+    def update_bulk(self, media_updates, *, _session=None):
+        for media_id, media_update in media_updates:
+            self.update(
+                media_id, media_update, _session=_session, _commit=False
+            )
+        _session.commit()
+
+
+def _create_media(connection_id: int, media_count: int) -> list[int]:
+    media_list = MediaDatabaseManager().create_or_update_bulk(
+        [
+            MediaCreate(
+                connection_id=connection_id,
+                arr_id=i,
+                title=f"Movie {i}",
+                txdb_id=str(i),
+                trailer_exists=i % 2 == 0,
+            )
+            for i in range(media_count)
+        ]
+    )
+    return [media_read.id for media_read, _, _ in media_list]
+
+
+def _get_operations(
+    media_ids: list[int],
+) -> list[tuple[str, Callable[[MediaDatabaseManager], Any]]]:
+    status_updates = [
+        MediaUpdateDC(
+            id=media_id,
+            monitor=i % 3 == 0,
+            status=MonitorStatus.MONITORED,
+            trailer_exists=None if i % 2 else i % 4 == 0,
+        )
+        for i, media_id in enumerate(media_ids)
+    ]
+    trailer_updates = [
+        (media_id, i % 5 == 0) for i, media_id in enumerate(media_ids)
+    ]
+    image_updates = [
+        (media_id, MediaUpdate(poster_path=f"/posters/{media_id}.jpg"))
+        for media_id in media_ids
+    ]
+    return [
+        ("media_status", lambda m: m.update_media_status_bulk(status_updates)),
+        (
+            "trailer_exists",
+            lambda m: m.update_trailer_exists_bulk(trailer_updates),
+        ),
+        ("monitor", lambda m: m.update_monitoring_bulk(media_ids, True)),
+        ("unmonitor", lambda m: m.update_monitoring_bulk(media_ids, False)),
+        ("update", lambda m: m.update_bulk(image_updates)),
+    ]
+
+
+def main(media_count: int) -> None:
+    setup_database()
+    counter = _QueryCounter()
+    managers: list[tuple[str, MediaDatabaseManager]] = [
+        ("per_item", _PerItemMediaDatabaseManager()),
+        ("set_based", MediaDatabaseManager()),
+    ]
+    print(f"{media_count} media items")
+    for name, manager in managers:
+        connection = create_connection(f"http://localhost/{name}")
+        media_ids = _create_media(connection.id, media_count)
+        for operation, func in _get_operations(media_ids):
+            counter.count = 0
+            start = time.perf_counter()
+            func(manager)
+            total = time.perf_counter() - start
+            print(
+                f"  {name:<10} {operation:<15} time={total:7.2f}s"
+                f" statements={counter.count}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--media-count", type=int, default=10000)
+    args = parser.parse_args()
+    main(args.media_count)
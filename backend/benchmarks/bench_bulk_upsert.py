@@ -0,0 +1,114 @@
+"""Benchmark `MediaDatabaseManager.create_or_update_bulk` against the \
+    previous per-item lookup implementation.
+
+Syncs generated movies to the database in chunks of 100 (same as a \
+    connection refresh), first into an empty table (inserts) and then again \
+    with every movie modified (updates). Reports wall time and the number \
+    of SQL statements issued.
+
+Usage (from `backend` folder, uses the database in `APP_DATA_DIR`):
+    APP_DATA_DIR=/tmp/trailarr-bench python -m benchmarks.bench_bulk_upsert
+"""
+
+import argparse
+import time
+from sqlalchemy import event
+from sqlmodel import Session
+
+from benchmarks.arr_stub import generate_movies
+from benchmarks.db_utils import create_connection, setup_database
+from core.base.database.manager.base import MediaDatabaseManager
+from core.base.database.models.media import MediaCreate, MediaRead
+from core.base.database.utils.engine import engine, manage_write_session
+from core.radarr.data_parser import parse_movie
+
+CHUNK_SIZE = 100
+
+
+class _QueryCounter:
+    """Count the SQL statements executed on the engine."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args, **kwargs) -> None:
+        self.count += 1
+
+
+class _PerItemMediaDatabaseManager(MediaDatabaseManager):
+    """Previous implementation, one lookup query per media item."""
+
+    @manage_write_session
+    def create_or_update_bulk(
+        self,
+        media_create_list: list[MediaCreate],
+        *,
+        _session: Session = None,  # type: ignore
+    ) -> list[tuple[MediaRead, bool, bool]]:
+        self._check_connection_exists_bulk(media_create_list, session=_session)
+        db_media_list = [
+            self._create_or_update(media_create, _session)
+            for media_create in media_create_list
+        ]
+        _session.commit()
+        return [
+            (MediaRead.model_validate(db_media), created, updated)
+            for db_media, created, updated in db_media_list
+        ]
+
+
+def _sync(
+    manager: MediaDatabaseManager, media_list: list[MediaCreate]
+) -> tuple[int, int]:
+    created_count = updated_count = 0
+    for i in range(0, len(media_list), CHUNK_SIZE):
+        result = manager.create_or_update_bulk(media_list[i : i + CHUNK_SIZE])
+        created_count += sum(1 for _, created, _ in result if created)
+        updated_count += sum(1 for _, _, updated in result if updated)
+    return created_count, updated_count
+
+
+def _run(
+    name: str,
+    manager: MediaDatabaseManager,
+    media_list: list[MediaCreate],
+    counter: _QueryCounter,
+) -> None:
+    counter.count = 0
+    start = time.perf_counter()
+    created_count, updated_count = _sync(manager, media_list)
+    total = time.perf_counter() - start
+    print(
+        f"  {name:<18} time={total:7.2f}s queries={counter.count:7d}"
+        f" created={created_count} updated={updated_count}"
+    )
+
+
+def main(media_counts: list[int]) -> None:
+    counter = _QueryCounter()
+    for media_count in media_counts:
+        movies = generate_movies(media_count)
+        for label, manager in [
+            ("per-item", _PerItemMediaDatabaseManager()),
+            ("bulk", MediaDatabaseManager()),
+        ]:
+            setup_database()
+            connection = create_connection("http://127.0.0.1")
+            new_media = [parse_movie(connection.id, m) for m in movies]
+            changed_media = [
+                parse_movie(connection.id, {**m, "title": m["title"] + "!"})
+                for m in movies
+            ]
+            print(f"{media_count} items, {label}")
+            _run("insert", manager, new_media, counter)
+            _run("update", manager, changed_media, counter)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--media-counts", type=int, nargs="+", default=[10000, 50000]
+    )
+    args = parser.parse_args()
+    main(args.media_counts)
@@ -0,0 +1,157 @@
+"""Stress test concurrent database writes, with a session per write on \
+    each thread vs the single database writer.
+
+Runs at the same time, for a fixed number of rounds:
+    - refresh: syncs all media of a connection in chunks of 100.
+    - downloads: threads updating the status of one media item at a time.
+    - ui edits: threads toggling the monitoring of one media item at a time.
+
+Reports writes/sec, the max and p99 latency of a single write, and the \
+    number of writes that failed with "database is locked".
+
+Usage (from `backend` folder):
+    APP_DATA_DIR=/tmp/trailarr python -m benchmarks.bench_db_writes
+"""
+
+import argparse
+import random
+import threading
+import time
+from typing import Callable
+
+from sqlalchemy.exc import OperationalError
+
+from benchmarks.arr_stub import generate_movies
+from benchmarks.db_utils import create_connection, setup_database
+from core.base.database.manager.base import MediaDatabaseManager
+from core.base.database.models.helpers import MediaUpdateDC
+from core.base.database.models.media import MonitorStatus
+from core.base.database.utils.engine import db_writer, get_session
+from core.radarr.data_parser import extract_movie
+
+CHUNK_SIZE = 100
+
+
+class _Stats:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.latencies: list[float] = []
+        self.locked = 0
+
+    def timed(self, write: Callable[[], object]) -> None:
+        start = time.perf_counter()
+        try:
+            write()
+        except OperationalError as e:
+            if "database is locked" not in str(e):
+                raise
+            with self._lock:
+                self.locked += 1
+            return
+        with self._lock:
+            self.latencies.append(time.perf_counter() - start)
+
+
+def _direct(write: Callable[..., object]) -> Callable[..., object]:
+    """Old behaviour, each write opens its own session and commits it."""
+
+    def _write(*args, **kwargs) -> object:
+        with get_session() as session:
+            return write(*args, **kwargs, _session=session)
+
+    return _write
+
+
+def _run(
+    connection_id: int,
+    media_ids: list[int],
+    movies: list[dict],
+    use_writer: bool,
+    rounds: int,
+    threads: int,
+) -> None:
+    db_manager = MediaDatabaseManager()
+    sync_bulk = db_manager.sync_bulk
+    update_status = db_manager.update_media_status
+    update_monitoring = db_manager.update_monitoring
+    if not use_writer:
+        sync_bulk = _direct(sync_bulk)
+        update_status = _direct(update_status)
+        update_monitoring = _direct(update_monitoring)
+    stats = _Stats()
+
+    def _refresh() -> None:
+        for _ in range(rounds):
+            for i in range(0, len(movies), CHUNK_SIZE):
+                chunk = [
+                    extract_movie(connection_id, m)
+                    for m in movies[i : i + CHUNK_SIZE]
+                ]
+                stats.timed(lambda: sync_bulk(chunk))
+
+    def _downloads(seed: int) -> None:
+        rng = random.Random(seed)
+        for _ in range(rounds * 50):
+            update = MediaUpdateDC(
+                id=rng.choice(media_ids),
+                monitor=True,
+                status=rng.choice(list(MonitorStatus)),
+            )
+            stats.timed(lambda: update_status(update))
+
+    def _ui_edits(seed: int) -> None:
+        rng = random.Random(seed)
+        for _ in range(rounds * 50):
+            media_id = rng.choice(media_ids)
+            monitor = rng.random() < 0.5
+            stats.timed(lambda: update_monitoring(media_id, monitor))
+
+    workers = [threading.Thread(target=_refresh)]
+    for i in range(threads):
+        workers.append(threading.Thread(target=_downloads, args=(i,)))
+        workers.append(threading.Thread(target=_ui_edits, args=(100 + i,)))
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+    latencies = sorted(stats.latencies)
+    p99 = latencies[int(len(latencies) * 0.99) - 1] * 1000
+    name = "writer" if use_writer else "direct"
+    print(
+        f"  {name:<7} writes/sec={len(latencies) / elapsed:8.0f}"
+        f" p99={p99:8.1f}ms max={latencies[-1] * 1000:8.1f}ms"
+        f" locked={stats.locked}"
+    )
+
+
+def main(media_count: int, rounds: int, threads: int) -> None:
+    setup_database()
+    movies = generate_movies(media_count)
+    connection = create_connection("http://localhost/writes")
+    db_manager = MediaDatabaseManager()
+    for i in range(0, media_count, CHUNK_SIZE):
+        db_manager.sync_bulk(
+            [
+                extract_movie(connection.id, m)
+                for m in movies[i : i + CHUNK_SIZE]
+            ]
+        )
+    media_ids = [media.id for media in db_manager.read_all()]
+    print(
+        f"{media_count} movies, {rounds} refreshes, {threads} download and"
+        f" {threads} ui threads"
+    )
+    for use_writer in (False, True):
+        _run(connection.id, media_ids, movies, use_writer, rounds, threads)
+    db_writer.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--media-count", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--threads", type=int, default=4)
+    args = parser.parse_args()
+    main(args.media_count, args.rounds, args.threads)
@@ -0,0 +1,117 @@
+"""Benchmark removing media deleted from Arr at the end of a refresh, \
+    with `NOT IN (<all seen ids>)` vs the sync epoch.
+
+Seeds N media for a connection, marks 90% of them as seen in the current \
+    refresh and deletes the other 10%. The old path loads the stale media \
+    with a `NOT IN` of all seen ids and deletes them one by one. The new \
+    path stamps the seen (unchanged) media with the sync epoch and deletes \
+    stale media with a single statement.
+
+SQLite's limit of variables in a statement is set to the upstream default \
+    (32766), some distributions build SQLite with a higher limit.
+
+Usage (from `backend` folder):
+    APP_DATA_DIR=/tmp/trailarr python -m benchmarks.bench_delete_stale
+"""
+
+import argparse
+import sqlite3
+import time
+
+from sqlalchemy import event
+from sqlalchemy.exc import OperationalError
+from sqlmodel import Session, col, delete, insert, select
+
+from benchmarks.db_utils import create_connection, setup_database
+from core.base.database.manager.base import MediaDatabaseManager
+from core.base.database.models.media import Media
+from core.base.database.utils.engine import engine
+
+KEEP_PERCENT = 90
+
+
+def _seed(connection_id: int, media_count: int) -> list[int]:
+    """Insert media for the connection, returns the ids of media to keep."""
+    with Session(engine) as session:
+        session.exec(delete(Media))  # type: ignore
+        session.execute(
+            insert(Media),
+            [
+                {
+                    "connection_id": connection_id,
+                    "arr_id": i,
+                    "title": f"Movie {i}",
+                    "txdb_id": str(i),
+                    "sync_epoch": 1,
+                }
+                for i in range(media_count)
+            ],
+        )
+        session.commit()
+        ids = session.exec(select(Media.id).order_by(Media.id)).all()
+    return [media_id for media_id in ids if media_id % 100 < KEEP_PERCENT]
+
+
+def _delete_except(connection_id: int, media_ids: list[int]) -> int:
+    """Old behaviour, `NOT IN` all seen ids and delete one by one."""
+    with Session(engine) as session:
+        statement = (
+            select(Media)
+            .where(Media.connection_id == connection_id)
+            .where(~col(Media.id).in_(media_ids))
+        )
+        db_media_list = session.exec(statement).all()
+        for db_media in db_media_list:
+            session.delete(db_media)
+        session.commit()
+        return len(db_media_list)
+
+
+def _delete_stale(connection_id: int, media_ids: list[int]) -> int:
+    """New behaviour, stamp seen media with sync epoch and delete the rest."""
+    db_manager = MediaDatabaseManager()
+    sync_epoch = db_manager.read_next_sync_epoch(connection_id)
+    db_manager.update_sync_epoch(media_ids, sync_epoch)
+    return db_manager.delete_stale(connection_id, sync_epoch)
+
+
+def _run(name: str, func, connection_id: int, media_count: int) -> None:
+    keep_ids = _seed(connection_id, media_count)
+    start = time.perf_counter()
+    try:
+        deleted = func(connection_id, keep_ids)
+    except OperationalError as e:
+        print(f"  {name:<12} failed: {e.orig}")
+        return
+    total = time.perf_counter() - start
+    print(f"  {name:<12} time={total:7.2f}s deleted={deleted}")
+
+
+def _set_variable_limit(limit: int) -> None:
+    """Set the SQLite variable limit on all new database connections."""
+
+    @event.listens_for(engine, "connect")
+    def _set_limit(dbapi_connection, connection_record):
+        dbapi_connection.setlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, limit)
+
+    engine.dispose()
+
+
+def main(media_counts: list[int], variable_limit: int) -> None:
+    _set_variable_limit(variable_limit)
+    setup_database()
+    connection = create_connection("http://localhost")
+    for media_count in media_counts:
+        print(f"{media_count} media, {100 - KEEP_PERCENT}% removed from Arr")
+        _run("not_in", _delete_except, connection.id, media_count)
+        _run("sync_epoch", _delete_stale, connection.id, media_count)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--media-counts", type=int, nargs="+", default=[10000, 30000, 100000]
+    )
+    parser.add_argument("--variable-limit", type=int, default=32766)
+    args = parser.parse_args()
+    main(args.media_counts, args.variable_limit)
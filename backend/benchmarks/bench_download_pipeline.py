@@ -0,0 +1,192 @@
+"""Benchmark downloading and converting trailers one after the other vs \
+    in the `DownloadPipeline`, where a trailer is downloaded while \
+    another is converted.
+
+Fixture videos are generated locally with ffmpeg (test pattern and tone). \
+    Downloads are simulated by copying a fixture at a fixed bandwidth, \
+    conversions run ffmpeg (libx264/aac), the same as a profile converting \
+    to h264.
+
+Without ffmpeg, fixtures are random bytes and conversions are simulated \
+    by waiting for `--convert-seconds`, as ffmpeg runs in its own process.
+
+Reports for each run:
+    - time: time to download and convert all trailers.
+    - per minute: trailers finished per minute.
+
+Usage (from `backend` folder):
+    APP_DATA_DIR=/tmp/trailarr python -m benchmarks.bench_download_pipeline
+"""
+
+import argparse
+import asyncio
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+from typing import Awaitable, Callable
+
+from core.base.utils.cpu_quota import get_cpu_quota
+from core.base.utils.process_runner import run_process
+from core.download.pipeline import DownloadPipeline
+
+_FFMPEG = shutil.which("ffmpeg")
+
+
+def _generate_fixtures(folder: str, count: int, seconds: int) -> list[str]:
+    """Create the fixture videos, returns their paths."""
+    paths: list[str] = []
+    for i in range(count):
+        path = os.path.join(folder, f"fixture_{i}.mkv")
+        if _FFMPEG:
+            subprocess.run(
+                [
+                    _FFMPEG,
+                    "-v",
+                    "error",
+                    "-f",
+                    "lavfi",
+                    "-i",
+                    f"testsrc2=size=1280x720:rate=30:duration={seconds}",
+                    "-f",
+                    "lavfi",
+                    "-i",
+                    f"sine=frequency={440 + i * 20}:duration={seconds}",
+                    "-c:v",
+                    "libx264",
+                    "-preset",
+                    "ultrafast",
+                    "-c:a",
+                    "aac",
+                    "-y",
+                    path,
+                ],
+                check=True,
+            )
+        else:
+            with open(path, "wb") as file:
+                file.write(os.urandom(seconds * 256 * 1024))
+        paths.append(path)
+    return paths
+
+
+def _stages(
+    fixture: str, work_dir: str, bandwidth: float, convert_seconds: float
+) -> tuple[Callable[[], Awaitable[str]], Callable[[str], Awaitable[str]]]:
+    """Download and convert stages for a fixture video."""
+    name = os.path.splitext(os.path.basename(fixture))[0]
+
+    async def _download() -> str:
+        download_file = os.path.join(work_dir, f"temp_{name}.mkv")
+        await asyncio.to_thread(shutil.copyfile, fixture, download_file)
+        await asyncio.sleep(os.path.getsize(fixture) / bandwidth)
+        return download_file
+
+    async def _convert(download_file: str) -> str:
+        output_file = os.path.join(work_dir, f"{name}.mkv")
+        if _FFMPEG:
+            result = await run_process(
+                [
+                    _FFMPEG,
+                    "-v",
+                    "error",
+                    "-i",
+                    download_file,
+                    "-c:v",
+                    "libx264",
+                    "-preset",
+                    "veryfast",
+                    "-crf",
+                    "22",
+                    "-c:a",
+                    "aac",
+                    "-b:a",
+                    "128k",
+                    "-y",
+                    output_file,
+                ]
+            )
+            if result.returncode != 0:
+                raise RuntimeError(result.stderr)
+        else:
+            await asyncio.sleep(convert_seconds)
+            shutil.copyfile(download_file, output_file)
+        os.remove(download_file)
+        return output_file
+
+    return _download, _convert
+
+
+async def _sequential(stages: list, workers: int) -> None:
+    """Old behaviour, download and then convert each trailer."""
+    for download, convert in stages:
+        await convert(await download())
+
+
+async def _pipelined(stages: list, workers: int) -> None:
+    """New behaviour, trailers of the workers go through the pipeline."""
+    queue = list(stages)
+    convert_workers = min(workers, get_cpu_quota())
+    async with DownloadPipeline(workers, convert_workers) as pipeline:
+
+        async def _worker() -> None:
+            while queue:
+                download, convert = queue.pop(0)
+                await pipeline.run(download, convert)
+
+        await asyncio.gather(*(_worker() for _ in range(workers)))
+
+
+def main(
+    count: int,
+    seconds: int,
+    bandwidth_mb: float,
+    convert_seconds: float,
+    workers: int,
+) -> None:
+    with tempfile.TemporaryDirectory() as folder:
+        fixtures = _generate_fixtures(folder, count, seconds)
+        size = sum(os.path.getsize(path) for path in fixtures)
+        print(
+            f"{count} trailers of {seconds}s ({size / 1024**2:.1f}MB),"
+            f" {bandwidth_mb}MB/s download, {get_cpu_quota()} CPUs,"
+            f" conversion: {'ffmpeg' if _FFMPEG else 'simulated'}"
+        )
+        runs = [
+            ("sequential", _sequential, 1),
+            (f"pipeline ({workers} workers)", _pipelined, workers),
+        ]
+        for name, run, run_workers in runs:
+            work_dir = os.path.join(folder, name.split()[0])
+            os.makedirs(work_dir)
+            stages = [
+                _stages(
+                    fixture, work_dir, bandwidth_mb * 1024**2, convert_seconds
+                )
+                for fixture in fixtures
+            ]
+            start = time.perf_counter()
+            asyncio.run(run(stages, run_workers))
+            elapsed = time.perf_counter() - start
+            print(
+                f"  {name:<24} time={elapsed:7.2f}s"
+                f" per minute={count * 60 / elapsed:6.1f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=8)
+    parser.add_argument("--seconds", type=int, default=10)
+    parser.add_argument("--bandwidth-mb", type=float, default=2.0)
+    parser.add_argument("--convert-seconds", type=float, default=1.0)
+    parser.add_argument("--workers", type=int, default=2)
+    args = parser.parse_args()
+    main(
+        args.count,
+        args.seconds,
+        args.bandwidth_mb,
+        args.convert_seconds,
+        args.workers,
+    )
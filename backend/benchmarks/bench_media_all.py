@@ -0,0 +1,127 @@
+"""Benchmark reading the whole library from `/media/all`, against the \
+    NDJSON `/media/all/stream` and the keyset paginated `/media/all/page`.
+
+Reports for each endpoint:
+    - ttfb: time to the first byte of the response body.
+    - total: time to read the full response.
+    - peak: peak memory allocated by python while serving it (tracemalloc).
+And the latency of the first and the last page, with 100 items per page.
+
+Usage (from `backend` folder, uses the database in `APP_DATA_DIR`):
+    APP_DATA_DIR=/tmp/trailarr-bench python -m benchmarks.bench_media_all
+"""
+
+import argparse
+from contextlib import contextmanager
+import logging
+import socket
+import threading
+import time
+import tracemalloc
+from typing import Iterator
+
+from fastapi import FastAPI
+import httpx
+import uvicorn
+
+from api.v1.media import media_router
+from benchmarks.arr_stub import generate_movies
+from benchmarks.db_utils import create_connection, setup_database
+from core.base.database.manager.base import MediaDatabaseManager
+from core.radarr.data_parser import extract_movie
+
+CHUNK_SIZE = 1000
+
+
+def _add_movies(connection_id: int, media_count: int) -> None:
+    db_manager = MediaDatabaseManager()
+    movies = generate_movies(media_count)
+    for i in range(0, media_count, CHUNK_SIZE):
+        chunk = movies[i : i + CHUNK_SIZE]
+        db_manager.sync_bulk(
+            [extract_movie(connection_id, movie) for movie in chunk]
+        )
+
+
+@contextmanager
+def _serve(app: FastAPI) -> Iterator[str]:
+    """Run the app in a thread of this process, so that its memory is \
+        traced. Yields the base URL of the server."""
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    config = uvicorn.Config(app, log_level="warning", access_log=False)
+    server = uvicorn.Server(config)
+    thread = threading.Thread(target=server.run, args=([sock],))
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    try:
+        yield f"http://127.0.0.1:{sock.getsockname()[1]}"
+    finally:
+        server.should_exit = True
+        thread.join()
+
+
+def _read(client: httpx.Client, url: str) -> tuple[float, float, int]:
+    """Read the response, returns (ttfb, total, body size)."""
+    start = time.perf_counter()
+    ttfb = 0.0
+    size = 0
+    with client.stream("GET", url, params={"sort_by": "title"}) as response:
+        for chunk in response.iter_bytes():
+            if not ttfb:
+                ttfb = time.perf_counter() - start
+            size += len(chunk)
+    return ttfb, time.perf_counter() - start, size
+
+
+def _peak_mb(client: httpx.Client, url: str) -> float:
+    tracemalloc.start()
+    _read(client, url)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024**2
+
+
+def _page_ms(client: httpx.Client, cursor: str | None) -> tuple[float, dict]:
+    params: dict = {"sort_by": "title", "limit": 100}
+    if cursor:
+        params["cursor"] = cursor
+    start = time.perf_counter()
+    page = client.get("/media/all/page", params=params).json()
+    return (time.perf_counter() - start) * 1000, page
+
+
+def main(media_count: int) -> None:
+    # Don't log every request of the client
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    setup_database()
+    connection = create_connection("http://localhost/all")
+    _add_movies(connection.id, media_count)
+    app = FastAPI()
+    app.include_router(media_router)
+    print(f"{media_count} movies")
+    with _serve(app) as base_url, httpx.Client(
+        base_url=base_url, timeout=300
+    ) as client:
+        for url in ("/media/all", "/media/all/stream"):
+            ttfb, total, size = _read(client, url)
+            peak = _peak_mb(client, url)
+            print(
+                f"  {url:<18} ttfb={ttfb:7.3f}s total={total:7.3f}s"
+                f" peak={peak:7.1f}MB size={size / 1024**2:6.1f}MB"
+            )
+        first_ms, page = _page_ms(client, None)
+        last_ms = 0.0
+        while page["next_cursor"]:
+            last_ms, page = _page_ms(client, page["next_cursor"])
+    print(
+        f"  /media/all/page    first={first_ms:6.1f}ms last={last_ms:6.1f}ms"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--media-count", type=int, default=50000)
+    args = parser.parse_args()
+    main(args.media_count)
@@ -0,0 +1,92 @@
+"""Benchmark converting Arr media data for the database sync, with pydantic \
+    models vs plain `__slots__` dataclasses.
+
+Reports items/sec for:
+    - parse: Arr data to `MediaCreate` (pydantic) vs `MediaCreateDC`.
+    - sync: parse, create/update in the database in chunks of 100 and \
+        convert the results to read models, for new and then changed media.
+
+Usage (from `backend` folder):
+    APP_DATA_DIR=/tmp/trailarr python -m benchmarks.bench_media_parse
+"""
+
+import argparse
+import time
+from typing import Any
+
+from benchmarks.arr_stub import generate_movies
+from benchmarks.db_utils import create_connection, setup_database
+from core.base.database.manager.base import MediaDatabaseManager
+from core.base.database.models.base import AppSQLModel
+from core.base.database.models.media import MonitorStatus
+from core.radarr.data_parser import extract_movie, parse_movie
+
+CHUNK_SIZE = 100
+
+
+class _MediaReadModel(AppSQLModel):
+    """Old pydantic read model used by the sync."""
+
+    id: int
+    created: bool
+    folder_path: str | None
+    arr_monitored: bool
+    monitor: bool
+    status: MonitorStatus
+    trailer_exists: bool
+
+
+def _sync_pydantic(connection_id: int, movies: list[dict[str, Any]]) -> None:
+    """Old behaviour, pydantic parse, ORM upsert and pydantic read models."""
+    db_manager = MediaDatabaseManager()
+    for i in range(0, len(movies), CHUNK_SIZE):
+        chunk = [
+            parse_movie(connection_id, m) for m in movies[i : i + CHUNK_SIZE]
+        ]
+        for media_read, created, _ in db_manager.create_or_update_bulk(chunk):
+            _MediaReadModel(**media_read.model_dump(), created=created)
+
+
+def _sync_records(connection_id: int, movies: list[dict[str, Any]]) -> None:
+    """New behaviour, extract to dataclasses and upsert with SQL only."""
+    db_manager = MediaDatabaseManager()
+    for i in range(0, len(movies), CHUNK_SIZE):
+        chunk = [
+            extract_movie(connection_id, m) for m in movies[i : i + CHUNK_SIZE]
+        ]
+        db_manager.sync_bulk(chunk)
+
+
+def _rate(count: int, func, *args) -> float:
+    start = time.perf_counter()
+    func(*args)
+    return count / (time.perf_counter() - start)
+
+
+def main(media_count: int) -> None:
+    setup_database()
+    movies = generate_movies(media_count)
+    changed = [{**movie, "title": movie["title"] + "!"} for movie in movies]
+    print(f"{media_count} movies, items/sec")
+
+    def _parse(parse) -> None:
+        for movie in movies:
+            parse(1, movie)
+
+    old = _rate(media_count, _parse, parse_movie)
+    new = _rate(media_count, _parse, extract_movie)
+    print(f"  parse        pydantic={old:9.0f} records={new:9.0f}")
+
+    old_connection = create_connection("http://localhost/pydantic")
+    new_connection = create_connection("http://localhost/records")
+    for name, data in (("sync_new", movies), ("sync_changed", changed)):
+        old = _rate(media_count, _sync_pydantic, old_connection.id, data)
+        new = _rate(media_count, _sync_records, new_connection.id, data)
+        print(f"  {name:<12} pydantic={old:9.0f} records={new:9.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--media-count", type=int, default=10000)
+    args = parser.parse_args()
+    main(args.media_count)
@@ -0,0 +1,88 @@
+"""Benchmark reading all media for the background tasks, full `MediaRead` \
+    objects of `read_all()` vs the column projected records.
+
+Reports for each read, while keeping all items (as the tasks do) or \
+    iterating over them one at a time:
+    - time: time to read all media.
+    - peak: peak memory allocated by python during the read (tracemalloc).
+
+Usage (from `backend` folder, uses the database in `APP_DATA_DIR`):
+    APP_DATA_DIR=/tmp/trailarr-bench python -m benchmarks.bench_media_projection
+"""
+
+import argparse
+import time
+import tracemalloc
+from typing import Callable, Iterable
+
+from benchmarks.arr_stub import generate_movies
+from benchmarks.db_utils import create_connection, setup_database
+from core.base.database.manager.base import MediaDatabaseManager
+from core.base.database.models.helpers import MediaImagesDC, MediaTrailerDC
+from core.radarr.data_parser import extract_movie
+
+CHUNK_SIZE = 1000
+
+
+def _add_movies(connection_id: int, media_count: int) -> None:
+    db_manager = MediaDatabaseManager()
+    movies = generate_movies(media_count)
+    for i in range(0, media_count, CHUNK_SIZE):
+        chunk = movies[i : i + CHUNK_SIZE]
+        db_manager.sync_bulk(
+            [extract_movie(connection_id, movie) for movie in chunk]
+        )
+
+
+def _measure(read: Callable[[], Iterable], keep: bool) -> tuple[float, float]:
+    """Run the read, returns (seconds, peak MB)."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    if keep:
+        items = list(read())
+    else:
+        for items in read():
+            pass
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del items
+    return elapsed, peak / 1024**2
+
+
+def main(media_count: int) -> None:
+    setup_database()
+    connection = create_connection("http://localhost/projection")
+    _add_movies(connection.id, media_count)
+    db_manager = MediaDatabaseManager()
+    reads: list[tuple[str, Callable[[], Iterable], bool]] = [
+        ("read_all()", db_manager.read_all, True),
+        (
+            "read_all_projected(MediaTrailerDC)",
+            lambda: db_manager.read_all_projected(MediaTrailerDC),
+            True,
+        ),
+        (
+            "read_all_projected(MediaImagesDC)",
+            lambda: db_manager.read_all_projected(MediaImagesDC),
+            True,
+        ),
+        (
+            "iter_all_projected(MediaTrailerDC)",
+            lambda: db_manager.iter_all_projected(MediaTrailerDC),
+            False,
+        ),
+    ]
+    print(f"{media_count} movies")
+    for name, read, keep in reads:
+        # Warm up the database cache
+        _measure(read, keep)
+        elapsed, peak = _measure(read, keep)
+        print(f"  {name:<36} time={elapsed:7.3f}s peak={peak:8.1f}MB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--media-count", type=int, default=50000)
+    args = parser.parse_args()
+    main(args.media_count)
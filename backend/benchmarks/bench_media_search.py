@@ -0,0 +1,110 @@
+"""Benchmark `/media/search` queries with the full-text search index \
+    against the previous `ILIKE '%query%'` scan of the media titles.
+
+Grows the library in steps and reports the median latency of each query \
+    at every size. The ILIKE scan grows with the library, while the \
+    full-text search only reads the matching rows of the index.
+
+Usage (from `backend` folder, uses the database in `APP_DATA_DIR`):
+    APP_DATA_DIR=/tmp/trailarr-bench python -m benchmarks.bench_media_search
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from sqlmodel import col, desc, select
+
+from benchmarks.arr_stub import generate_movies
+from benchmarks.db_utils import create_connection, setup_database
+from core.base.database.manager.base import MediaDatabaseManager
+from core.base.database.models.media import Media
+from core.radarr.data_parser import extract_movie
+
+CHUNK_SIZE = 1000
+
+# Words used for the titles, first words are the most common
+_WORDS = [f"word{i}" for i in range(2000)]
+_WEIGHTS = [1 / (i + 1) for i in range(len(_WORDS))]
+
+_QUERIES = {
+    "rare word": "unique",
+    "prefix": "uniq",
+    "two words": "word1 uniq",
+    "common word": "word0",
+}
+
+
+class _ILikeMediaDatabaseManager(MediaDatabaseManager):
+    """Previous implementation, ILIKE on the title ordered by added date."""
+
+    def _get_search_statement(self, query: str, limit=50, offset=0):
+        return (
+            select(Media)
+            .where(col(Media.title).ilike(f"%{query}%"))
+            .offset(offset)
+            .limit(limit)
+            .order_by(desc(Media.added_at))
+        )
+
+
+def _add_movies(connection_id: int, start: int, count: int) -> None:
+    """Add movies with random titles, one in 1000 is 'Unique'."""
+    db_manager = MediaDatabaseManager()
+    movies = generate_movies(count)
+    for i, movie in enumerate(movies, start=start):
+        words = random.choices(_WORDS, _WEIGHTS, k=3)
+        if i % 1000 == 0:
+            words.append("Unique")
+        movie["id"] = i
+        movie["tmdbId"] = i
+        movie["title"] = " ".join(words).title()
+    for i in range(0, count, CHUNK_SIZE):
+        chunk = movies[i : i + CHUNK_SIZE]
+        db_manager.sync_bulk(
+            [extract_movie(connection_id, movie) for movie in chunk]
+        )
+
+
+def _median_ms(db_manager: MediaDatabaseManager, query: str) -> float:
+    timings = []
+    for _ in range(5):
+        start = time.perf_counter()
+        db_manager.search(query)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def main(sizes: list[int]) -> None:
+    random.seed(1)
+    setup_database()
+    connection = create_connection("http://localhost/search")
+    managers = {
+        "ilike": _ILikeMediaDatabaseManager(),
+        "fts": MediaDatabaseManager(),
+    }
+    media_count = 0
+    print("median ms per search")
+    for size in sorted(sizes):
+        _add_movies(connection.id, media_count + 1, size - media_count)
+        media_count = size
+        print(f"{media_count} movies")
+        for name, query in _QUERIES.items():
+            results = {
+                key: _median_ms(db_manager, query)
+                for key, db_manager in managers.items()
+            }
+            print(
+                f"  {name:<12} ilike={results['ilike']:8.2f}"
+                f" fts={results['fts']:8.2f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1000, 10000, 50000, 100000]
+    )
+    args = parser.parse_args()
+    main(args.sizes)
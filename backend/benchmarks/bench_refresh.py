@@ -0,0 +1,69 @@
+"""Benchmark a full connection refresh from a stub Radarr server.
+
+Runs the refresh three times against a library of generated movies:
+    - cold: empty database, every movie is created.
+    - steady: nothing changed in Arr since the last refresh.
+    - changed: a small percent of the movies changed in Arr.
+
+Reports wall time and CPU time of each run.
+
+Usage (from `backend` folder, uses the database in `APP_DATA_DIR`):
+    APP_DATA_DIR=/tmp/trailarr-bench python -m benchmarks.bench_refresh
+"""
+
+import argparse
+import asyncio
+import time
+
+from benchmarks.arr_stub import stub_server_process
+from benchmarks.db_utils import (
+    create_connection,
+    setup_database,
+    update_connection_url,
+)
+from core.base.arr_manager import client_pool
+from core.base.database.models.connection import ConnectionRead
+from core.radarr.connection_manager import RadarrConnectionManager
+
+
+async def _refresh(connection: ConnectionRead) -> RadarrConnectionManager:
+    manager = RadarrConnectionManager(connection)
+    try:
+        await manager.refresh()
+    finally:
+        await client_pool.close_client_sessions()
+    return manager
+
+
+def _run(name: str, connection: ConnectionRead) -> None:
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    manager = asyncio.run(_refresh(connection))
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+    print(
+        f"{name:<8} wall={wall:7.2f}s cpu={cpu:7.2f}s"
+        f" created={manager.created_count}"
+        f" updated={manager.updated_count}"
+        f" unchanged={manager.unchanged_count}"
+    )
+
+
+def main(media_count: int, changed_percent: float) -> None:
+    setup_database()
+    print(f"{media_count} movies, {changed_percent}% changed in last run")
+    with stub_server_process(media_count) as url:
+        connection = create_connection(url)
+        _run("cold", connection)
+        _run("steady", connection)
+    with stub_server_process(media_count, changed_percent) as url:
+        update_connection_url(connection, url)
+        _run("changed", connection)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--media-count", type=int, default=10000)
+    parser.add_argument("--changed-percent", type=float, default=1)
+    args = parser.parse_args()
+    main(args.media_count, args.changed_percent)
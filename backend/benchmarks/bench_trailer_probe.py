@@ -0,0 +1,112 @@
+"""Benchmark checking media folders for existing trailers one by one vs \
+    concurrently in a pool of worker threads.
+
+Generates a directory tree of N media folders, a third with an inline \
+    trailer, a third with a 'Trailers' subfolder and a third without any \
+    trailer. Each folder also has a few other files and an 'Extras' folder.
+
+Network shares (NFS/SMB) are simulated by adding a fixed latency to every \
+    directory listing and `isdir` call, in both code paths.
+
+Usage (from `backend` folder):
+    APP_DATA_DIR=/tmp/trailarr python -m benchmarks.bench_trailer_probe
+"""
+
+import argparse
+import asyncio
+import os
+from pathlib import Path
+import tempfile
+import time
+
+import aiofiles.os
+
+from core.base.database.utils.init_db import init_db
+from core.files_handler import FilesHandler
+
+
+def _generate_tree(root: Path, media_count: int) -> list[str]:
+    """Create the media folders, returns their paths."""
+    paths: list[str] = []
+    for i in range(media_count):
+        folder = root / f"Movie {i} ({2000 + i % 25})"
+        (folder / "Extras").mkdir(parents=True)
+        for name in (".mkv", ".en.srt", ".nfo", "-poster.jpg"):
+            (folder / f"Movie {i}{name}").touch()
+        if i % 3 == 0:
+            (folder / f"Movie {i}-trailer.mkv").touch()
+        elif i % 3 == 1:
+            (folder / "Trailers").mkdir()
+            (folder / "Trailers" / f"Movie {i}-trailer.mp4").touch()
+        paths.append(str(folder))
+    return paths
+
+
+def _add_latency(latency: float) -> None:
+    """Add latency to directory listings, like on a network share."""
+    scandir = os.scandir
+    isdir = os.path.isdir
+
+    def _slow_scandir(path):
+        time.sleep(latency)
+        return scandir(path)
+
+    def _slow_isdir(path):
+        time.sleep(latency)
+        return isdir(path)
+
+    os.scandir = _slow_scandir  # type: ignore
+    aiofiles.os.scandir = aiofiles.os.wrap(_slow_scandir)
+    aiofiles.os.path.isdir = aiofiles.os.wrap(_slow_isdir)
+
+
+async def _sequential(paths: list[str], workers: int) -> int:
+    """Old behaviour, check each folder one by one."""
+    count = 0
+    for path in paths:
+        if await FilesHandler.check_trailer_exists(path, True):
+            count += 1
+    return count
+
+
+async def _concurrent(paths: list[str], workers: int) -> int:
+    """New behaviour, check all folders in a pool of worker threads."""
+    results = await FilesHandler.check_trailers_exist(
+        paths, check_inline_file=True, max_workers=workers
+    )
+    return sum(results.values())
+
+
+async def _run(name: str, func, paths: list[str], workers: int) -> None:
+    start = time.perf_counter()
+    count = await func(paths, workers)
+    total = time.perf_counter() - start
+    print(
+        f"  {name:<14} time={total:7.2f}s"
+        f" folders/s={len(paths) / total:8.0f} trailers={count}"
+    )
+
+
+async def main(media_count: int, latency_ms: float, workers: list[int]):
+    init_db()
+    with tempfile.TemporaryDirectory() as root:
+        paths = _generate_tree(Path(root), media_count)
+        if latency_ms:
+            _add_latency(latency_ms / 1000)
+        print(f"{media_count} media folders, {latency_ms}ms latency")
+        await _run("sequential", _sequential, paths, 1)
+        for worker_count in workers:
+            await _run(
+                f"workers={worker_count}", _concurrent, paths, worker_count
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--media-count", type=int, default=3000)
+    parser.add_argument("--latency-ms", type=float, default=2)
+    parser.add_argument(
+        "--workers", type=int, nargs="+", default=[4, 16, 32, 64]
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.media_count, args.latency_ms, args.workers))
@@ -0,0 +1,64 @@
+"""Database helpers shared by the benchmarks. \n
+Benchmarks write to the database at `APP_DATA_DIR`, always run them with \
+    a throwaway `APP_DATA_DIR`!"""
+
+from sqlmodel import Session, delete
+
+from config.settings import app_settings
+from core.base.database.models.connection import (
+    ArrType,
+    Connection,
+    ConnectionRead,
+    MonitorType,
+)
+from core.base.database.models.media import Media
+from core.base.database.utils.engine import engine
+from core.base.database.utils.init_db import init_db
+
+
+def setup_database() -> None:
+    """Create the database tables and remove any existing media."""
+    if app_settings.app_data_dir == "/config":
+        raise SystemExit(
+            "Refusing to run benchmark on '/config', set APP_DATA_DIR to a"
+            " temporary folder."
+        )
+    init_db()
+    with Session(engine) as session:
+        session.exec(delete(Media))  # type: ignore
+        session.exec(delete(Connection))  # type: ignore
+        session.commit()
+
+
+def create_connection(
+    url: str, monitor: MonitorType = MonitorType.MONITOR_NEW
+) -> ConnectionRead:
+    """Create a Radarr connection in the database without validating it. \n
+    Args:
+        url (str): URL of the (stub) Arr server.
+        monitor (MonitorType, Optional): Monitor type for the connection. \n
+    Returns:
+        ConnectionRead: The created connection."""
+    with Session(engine) as session:
+        db_connection = Connection(
+            name="Benchmark",
+            arr_type=ArrType.RADARR,
+            url=url,
+            api_key="benchmark",
+            monitor=monitor,
+        )
+        session.add(db_connection)
+        session.commit()
+        session.refresh(db_connection)
+        return ConnectionRead.model_validate(db_connection)
+
+
+def update_connection_url(connection: ConnectionRead, url: str) -> None:
+    """Point the connection to a different (stub) Arr server."""
+    connection.url = url
+    with Session(engine) as session:
+        db_connection = session.get(Connection, connection.id)
+        assert db_connection is not None
+        db_connection.url = url
+        session.add(db_connection)
+        session.commit()
@@ -670,6 +670,111 @@ class _Config:
         - If a value is provided, app will start with that url_base as \
             root path."""
 
+    # Arr API connection pool settings
+    arr_request_timeout = int_property(
+        "ARR_REQUEST_TIMEOUT", default=300, min_=10
+    )
+    """Total timeout (in seconds) for a single request to Arr API.
+        - Default is 300 seconds. Minimum is 10.
+        - Valid values are integers."""
+
+    arr_connect_timeout = int_property(
+        "ARR_CONNECT_TIMEOUT", default=15, min_=1
+    )
+    """Timeout (in seconds) for connecting to Arr API.
+        - Default is 15 seconds. Minimum is 1.
+        - Valid values are integers."""
+
+    arr_pool_limit_per_host = int_property(
+        "ARR_POOL_LIMIT_PER_HOST", default=10, min_=1, max_=100
+    )
+    """Maximum number of open connections to a single Arr host.
+        - Default is 10.
+        - Valid values are integers between 1 and 100."""
+
+    arr_keepalive_timeout = int_property(
+        "ARR_KEEPALIVE_TIMEOUT", default=60, min_=1
+    )
+    """Time (in seconds) to keep idle Arr API connections open for reuse.
+        - Default is 60 seconds.
+        - Valid values are integers."""
+
+    arr_dns_cache_ttl = int_property("ARR_DNS_CACHE_TTL", default=300, min_=0)
+    """Time (in seconds) to cache DNS lookups of Arr hosts.
+        - Default is 300 seconds. 0 disables caching.
+        - Valid values are integers."""
+
+    arr_refresh_concurrency = int_property(
+        "ARR_REFRESH_CONCURRENCY", default=3, min_=1, max_=10
+    )
+    """Maximum number of Arr connections to refresh at the same time.
+        - Default is 3.
+        - Valid values are integers between 1 and 10."""
+
+    arr_refresh_timeout = int_property(
+        "ARR_REFRESH_TIMEOUT", default=1800, min_=60
+    )
+    """Timeout (in seconds) for refreshing data of a single Arr connection.
+        - Default is 1800 seconds (30 minutes). Minimum is 60.
+        - Valid values are integers."""
+
+    arr_delta_refresh = bool_property("ARR_DELTA_REFRESH", default=False)
+    """Refresh only the media changed in Arr history since the last refresh, \
+        instead of fetching all media on every refresh. \
+        A full refresh is still done every `arr_full_refresh_interval` hours.
+        - Default is False.
+        - Valid values are True/False."""
+
+    arr_full_refresh_interval = int_property(
+        "ARR_FULL_REFRESH_INTERVAL", default=24, min_=1
+    )
+    """Interval (in hours) for a full refresh of Arr data, when delta \
+        refresh is enabled.
+        - Default is 24 hours. Minimum is 1.
+        - Valid values are integers."""
+
+    trailer_probe_workers = int_property(
+        "TRAILER_PROBE_WORKERS", default=16, min_=1, max_=64
+    )
+    """Maximum number of media folders to check for trailers at the same \
+        time, while syncing new media from Arr.
+        - Default is 16.
+        - Increase for high-latency network shares (NFS/SMB), decrease \
+            for slow local disks.
+        - Valid values are integers between 1 and 64."""
+
+    # Trailer download pool settings
+    trailer_download_workers = int_property(
+        "TRAILER_DOWNLOAD_WORKERS", default=2, min_=1, max_=8
+    )
+    """Maximum number of trailers to download at the same time.
+        - Default is 2.
+        - Valid values are integers between 1 and 8."""
+
+    trailer_downloads_per_hour = int_property(
+        "TRAILER_DOWNLOADS_PER_HOUR", default=30, min_=1, max_=3600
+    )
+    """Maximum number of trailer downloads started per hour, shared by \
+        all download tasks, to avoid getting rate limited by YouTube.
+        - Default is 30, one download every 2 minutes.
+        - Valid values are integers between 1 and 3600."""
+
+    trailer_download_burst = int_property(
+        "TRAILER_DOWNLOAD_BURST", default=3, min_=1, max_=100
+    )
+    """Number of trailer downloads that can start right away, before \
+        `trailer_downloads_per_hour` pacing applies.
+        - Default is 3.
+        - Valid values are integers between 1 and 100."""
+
+    trailer_convert_workers = int_property(
+        "TRAILER_CONVERT_WORKERS", default=0, min_=0, max_=32
+    )
+    """Maximum number of trailers to convert with ffmpeg at the same time, \
+        while other trailers are downloaded.
+        - Default is 0, use the number of CPUs available to the container.
+        - Valid values are integers between 0 and 32."""
+
     def _save_to_env(self, key: str, value: str | int | bool):
         """Save the given key-value pair to the environment variables."""
         os.environ[key.upper()] = str(value)
@@ -1,3 +1,4 @@
+from datetime import datetime, timezone
 from typing import Any
 from exceptions import InvalidResponseError
 from core.base.arr_manager.request_manager import AsyncRequestManager
@@ -128,3 +129,43 @@ class AsyncBaseArrManager(AsyncRequestManager):
                 raise InvalidResponseError("Path not found in response")
             rootfolders.append(f"{rootfolder['path']}")
         return rootfolders
+
+    async def _get_updated_ids(
+        self, since: datetime, id_key: str
+    ) -> list[int]:
+        """Get the ids of the media with history events since the given time
+
+        Args:
+            since (datetime): Time to get events from, naive times are UTC
+            id_key (str): Key of the media id in the history records
+
+        Returns:
+            list[int]: Unique ids of the media, in order of the events
+
+        Raises:
+            ConnectionError: If the connection is refused / response is not 200
+            ConnectionTimeoutError: If the connection times out
+            InvalidResponseError: If the API response is invalid
+        """
+        if since.tzinfo is not None:
+            since = since.astimezone(timezone.utc)
+        response: str | dict[str, Any] | list[dict[str, Any]] = (
+            await self._request(
+                "GET",
+                f"/api/{self.version}/history/since",
+                params={"date": since.strftime("%Y-%m-%dT%H:%M:%SZ")},
+            )
+        )
+        if isinstance(response, str):
+            raise InvalidResponseError(response)
+        if not isinstance(response, list):
+            raise InvalidResponseError(
+                f"Unable to parse response! Response: ({response})"
+            )
+        # Use a dict to keep the order of the ids while removing duplicates
+        media_ids: dict[int, None] = {}
+        for record in response:
+            media_id = record.get(id_key) if isinstance(record, dict) else None
+            if media_id:
+                media_ids[int(media_id)] = None
+        return list(media_ids)
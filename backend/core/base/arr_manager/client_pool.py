@@ -0,0 +1,81 @@
+import asyncio
+from urllib.parse import urlparse
+import weakref
+import aiohttp
+
+from app_logger import ModuleLogger
+from config.settings import app_settings
+
+logger = ModuleLogger("ArrClientPool")
+
+# Sessions are bound to the event loop they are created in. Background tasks
+# run each job in a new event loop, so the pool keeps one session per host
+# for every running loop. Loops are held weakly, so a closed loop does not
+# keep its sessions alive.
+_sessions: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, dict[str, aiohttp.ClientSession]
+] = weakref.WeakKeyDictionary()
+
+
+def _get_host_key(url: str) -> str:
+    """🚨This is a private method🚨 \n
+    Get the pool key (scheme://host:port) for the given URL. \n
+    Args:
+        url (str): URL of the Arr instance. \n
+    Returns:
+        str: Key used to look up the session for the host."""
+    parsed_url = urlparse(url)
+    return f"{parsed_url.scheme}://{parsed_url.netloc}".lower()
+
+
+def _create_session() -> aiohttp.ClientSession:
+    """🚨This is a private method🚨 \n
+    Create a new keep-alive client session with connection limits, \
+        DNS caching and timeouts from app settings. \n
+    Returns:
+        aiohttp.ClientSession: New client session for a single host."""
+    connector = aiohttp.TCPConnector(
+        limit_per_host=app_settings.arr_pool_limit_per_host,
+        ttl_dns_cache=app_settings.arr_dns_cache_ttl,
+        keepalive_timeout=app_settings.arr_keepalive_timeout,
+    )
+    timeout = aiohttp.ClientTimeout(
+        total=app_settings.arr_request_timeout,
+        connect=app_settings.arr_connect_timeout,
+    )
+    return aiohttp.ClientSession(connector=connector, timeout=timeout)
+
+
+def get_client_session(url: str) -> aiohttp.ClientSession:
+    """Get a shared client session for the host of the given URL. \n
+    Sessions are pooled per host and per event loop, so all Radarr/Sonarr \
+        managers talking to the same host reuse the same connections. \n
+    Must be called from within a running event loop. \n
+    Args:
+        url (str): URL of the Arr instance. \n
+    Returns:
+        aiohttp.ClientSession: Shared client session for the host."""
+    loop = asyncio.get_running_loop()
+    loop_sessions = _sessions.setdefault(loop, {})
+    host_key = _get_host_key(url)
+    session = loop_sessions.get(host_key)
+    if session is None or session.closed:
+        logger.debug(f"Creating new HTTP connection pool for '{host_key}'")
+        session = _create_session()
+        loop_sessions[host_key] = session
+    return session
+
+
+async def close_client_sessions() -> None:
+    """Close all pooled client sessions of the running event loop. \n
+    Should be called before the event loop is closed. \n
+    Returns:
+        None"""
+    loop = asyncio.get_running_loop()
+    loop_sessions = _sessions.pop(loop, {})
+    for session in loop_sessions.values():
+        if not session.closed:
+            await session.close()
+    if loop_sessions:
+        logger.debug(f"Closed {len(loop_sessions)} HTTP connection pool(s)")
+    return None
@@ -0,0 +1,127 @@
+import codecs
+import json
+from typing import Any, AsyncGenerator
+import aiohttp
+
+from exceptions import InvalidResponseError
+
+_WHITESPACE = " \t\n\r"
+
+
+class JSONArrayStreamParser:
+    """Incremental parser for a JSON array of items. \n
+    Feed it chunks of the response body as they arrive, and it returns the \
+        items that are complete so far. Only the unparsed remainder of the \
+        body is kept in memory, so memory usage is bounded by the size of a \
+        single item and the chunk size, not the size of the whole array.
+    """
+
+    def __init__(self) -> None:
+        self._buffer = ""
+        self._decoder = json.JSONDecoder()
+        self._started = False
+        # Next token is a "," or "]" after an item, or an item after a ","
+        self._need_separator = False
+        self._need_item = False
+        self.finished = False
+
+    def _skip_whitespace(self, pos: int) -> int:
+        """🚨This is a private method🚨 \n
+        Get the position of next non-whitespace character in the buffer."""
+        buffer = self._buffer
+        while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+            pos += 1
+        return pos
+
+    def feed(self, data: str) -> list[Any]:
+        """Feed a chunk of the JSON text to the parser. \n
+        Args:
+            data (str): Next chunk of the JSON text. \n
+        Returns:
+            list[Any]: Items completed by this chunk, can be empty. \n
+        Raises:
+            InvalidResponseError: If the data is not a JSON array, or items \
+                are not separated by commas."""
+        if self.finished:
+            return []
+        self._buffer += data
+        items: list[Any] = []
+        pos = 0
+        while True:
+            pos = self._skip_whitespace(pos)
+            if pos >= len(self._buffer):
+                break
+            char = self._buffer[pos]
+            if not self._started:
+                if char != "[":
+                    raise InvalidResponseError(
+                        "Invalid response from API, expected a list of items."
+                    )
+                self._started = True
+                pos += 1
+                continue
+            if char == "]" and not self._need_item:
+                self.finished = True
+                pos += 1
+                break
+            if self._need_separator:
+                if char != ",":
+                    raise InvalidResponseError(
+                        "Invalid response from API, expected ',' or ']'"
+                        " after an item."
+                    )
+                self._need_separator = False
+                self._need_item = True
+                pos += 1
+                continue
+            if char in ",]":
+                raise InvalidResponseError(
+                    "Invalid response from API, expected an item."
+                )
+            try:
+                item, end = self._decoder.raw_decode(self._buffer, pos)
+            except json.JSONDecodeError:
+                # Item is not complete yet, wait for more data
+                break
+            # Make sure the item is followed by a separator, otherwise a
+            # number/literal could have been cut off at the end of the chunk
+            if self._skip_whitespace(end) >= len(self._buffer):
+                break
+            items.append(item)
+            self._need_separator = True
+            self._need_item = False
+            pos = end
+        self._buffer = self._buffer[pos:]
+        return items
+
+    def close(self) -> None:
+        """Check that the whole array was parsed. \n
+        Raises:
+            InvalidResponseError: If the JSON array is incomplete/invalid."""
+        if not self.finished or self._buffer.strip():
+            raise InvalidResponseError(
+                "Invalid response from API, incomplete list of items."
+            )
+        return None
+
+
+async def iter_json_array(
+    response: aiohttp.ClientResponse, chunk_size: int = 64 * 1024
+) -> AsyncGenerator[Any, None]:
+    """Parse a JSON array from the response body one item at a time. \n
+    Args:
+        response (aiohttp.ClientResponse): Response with a JSON array body.
+        chunk_size (int, Optional=65536): Bytes to read from the body at \
+            a time. \n
+    Yields:
+        Any: Items of the JSON array, in order. \n
+    Raises:
+        InvalidResponseError: If the response is not a valid JSON array."""
+    parser = JSONArrayStreamParser()
+    decoder = codecs.getincrementaldecoder(response.charset or "utf-8")()
+    async for chunk in response.content.iter_chunked(chunk_size):
+        for item in parser.feed(decoder.decode(chunk)):
+            yield item
+    for item in parser.feed(decoder.decode(b"", final=True)):
+        yield item
+    parser.close()
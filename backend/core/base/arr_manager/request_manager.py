@@ -1,7 +1,10 @@
-from typing import Any
+import asyncio
+from typing import Any, AsyncGenerator
 from urllib.parse import urlparse, urlunparse
 import aiohttp
 
+from core.base.arr_manager.client_pool import get_client_session
+from core.base.arr_manager.json_stream import iter_json_array
 from exceptions import ConnectionTimeoutError, InvalidResponseError
 
 
@@ -18,6 +21,21 @@ class AsyncRequestManager:
         self.host_url = host_url.rstrip("/")
         self.api_key = api_key
 
+    def _build_url(self, path: str) -> str:
+        """🚨This is a private method🚨 \n
+        Build the full URL for the given path of the Arr API
+
+        Args:
+            path (str): Destination for specific call
+
+        Returns:
+            str: Full URL with duplicate and trailing slashes removed
+        """
+        initial_url = f"{self.host_url}/{path}"
+        parsed_url = urlparse(initial_url)
+        fixed_path = parsed_url.path.replace("//", "/").rstrip("/")
+        return urlunparse(parsed_url._replace(path=fixed_path))
+
     async def _request(
         self,
         method: str,
@@ -42,29 +60,86 @@ class AsyncRequestManager:
             ConnectionTimeoutError: If the connection times out
             InvalidResponseError: If the API response is invalid
         """
-        initial_url = f"{self.host_url}/{path}"
-        parsed_url = urlparse(initial_url)
-        fixed_path = parsed_url.path.replace("//", "/").rstrip("/")
-        url = urlunparse(parsed_url._replace(path=fixed_path))
+        url = self._build_url(path)
         headers = {"X-Api-Key": self.api_key}
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.request(
-                    method, url, headers=headers, params=params, data=data
-                ) as client_response:
-                    # client_response.raise_for_status()
-                    response = await self._process_response(client_response)
-                    return response
-            except aiohttp.ServerTimeoutError:
-                raise ConnectionTimeoutError(
-                    "Timeout occurred while connecting to API."
-                )
-            except aiohttp.ClientConnectionError:
-                raise ConnectionError("Connection Refused while connecting to API.")
-            except Exception:
-                raise ConnectionError(
-                    "Unable to connect to API. Check your connection."
-                )
+        session = get_client_session(self.host_url)
+        try:
+            async with session.request(
+                method, url, headers=headers, params=params, data=data
+            ) as client_response:
+                # client_response.raise_for_status()
+                response = await self._process_response(client_response)
+                return response
+        except (aiohttp.ServerTimeoutError, asyncio.TimeoutError):
+            raise ConnectionTimeoutError(
+                "Timeout occurred while connecting to API."
+            )
+        except aiohttp.ClientConnectionError:
+            raise ConnectionError("Connection Refused while connecting to API.")
+        except Exception:
+            raise ConnectionError(
+                "Unable to connect to API. Check your connection."
+            )
+
+    async def _request_stream(
+        self,
+        method: str,
+        path: str,
+        params: dict | None = None,
+    ) -> AsyncGenerator[dict[str, Any], None]:
+        """Send a request of HTTP method type to the Arr API and parse the \
+            JSON list in the response one item at a time, as it is received
+
+        Args:
+            method (str): HTTP method type
+            path (str): Destination for specific call
+            params (dict | None): Parameters to send with the request
+
+        Yields:
+            dict[str, Any]: Items of the list in the API response
+
+        Raises:
+            ConnectionError: If the connection is refused / response is not 200
+            ConnectionTimeoutError: If the connection times out
+            InvalidResponseError: If the API response is not a list of items
+        """
+        url = self._build_url(path)
+        headers = {"X-Api-Key": self.api_key}
+        session = get_client_session(self.host_url)
+        try:
+            async with session.request(
+                method, url, headers=headers, params=params
+            ) as client_response:
+                if client_response.status != 200:
+                    # Raises the relevant error for the status code
+                    await self._process_response(client_response)
+                content_type = client_response.headers.get("content-type")
+                if content_type and "text/html" in content_type:
+                    raise InvalidResponseError(
+                        "Invalid Response from server! Check if"
+                        f" {self.host_url} is a valid API endpoint."
+                    )
+                async for item in iter_json_array(client_response):
+                    if not isinstance(item, dict):
+                        raise InvalidResponseError(
+                            "Invalid response from API, expected a list of"
+                            " objects."
+                        )
+                    yield item
+        except (InvalidResponseError, ConnectionError):
+            raise
+        except (aiohttp.ServerTimeoutError, asyncio.TimeoutError):
+            raise ConnectionTimeoutError(
+                "Timeout occurred while connecting to API."
+            )
+        except aiohttp.ClientConnectionError:
+            raise ConnectionError(
+                "Connection Refused while connecting to API."
+            )
+        except Exception:
+            raise ConnectionError(
+                "Unable to connect to API. Check your connection."
+            )
 
     async def _process_response(
         self, response: aiohttp.ClientResponse
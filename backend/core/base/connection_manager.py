@@ -1,16 +1,30 @@
 from abc import ABC
+import asyncio
+from datetime import datetime, timedelta, timezone
 from functools import cache
-from typing import Any, AsyncGenerator, Callable, Protocol
+import threading
+from typing import Any, AsyncGenerator, Callable, Protocol, TypeVar
 
 from app_logger import ModuleLogger
 from core.base.database.manager.base import MediaDatabaseManager
-from core.base.database.models.helpers import MediaReadDC, MediaUpdateDC
+from core.base.database.manager.connection import ConnectionDatabaseManager
+from core.base.database.models.helpers import (
+    MediaCreateDC,
+    MediaReadDC,
+    MediaUpdateDC,
+)
 from core.files_handler import FilesHandler
 from core.base.database.models.connection import ConnectionRead, MonitorType
-from core.base.database.models.media import MediaCreate, MonitorStatus
+from core.base.database.models.media import MonitorStatus
 
 logger = ModuleLogger("ConnectionManager")
 
+T = TypeVar("T")
+
+# Connections can be refreshed concurrently (and from different event loops
+# for manual refreshes), so database work is serialized with a thread lock
+_db_lock = threading.Lock()
+
 
 class ArrManagerProtocol(Protocol):
     """Abstract class for getting data from the Arr APIs."""
@@ -33,42 +47,112 @@ class ArrManagerProtocol(Protocol):
             list[dict[str, Any]]: The media from the Arr application."""
         raise NotImplementedError("Subclasses must implement this method")
 
+    def iter_all_media(self) -> AsyncGenerator[dict[str, Any], None]:
+        """Stream all media from the Arr application, one item at a time. \n
+        Yields:
+            dict[str, Any]: The media from the Arr application."""
+        raise NotImplementedError("Subclasses must implement this method")
+
+    async def get_media(self, arr_id: int) -> dict[str, Any]:
+        """Get a single media item from the Arr application. \n
+        Args:
+            arr_id (int): The id of the media in the Arr application. \n
+        Returns:
+            dict[str, Any]: The media from the Arr application."""
+        raise NotImplementedError("Subclasses must implement this method")
+
+    async def get_updated_media_ids(self, since: datetime) -> list[int]:
+        """Get the ids of media changed since the given time, from the \
+            Arr application history. \n
+        Args:
+            since (datetime): Time to get changes from. \n
+        Returns:
+            list[int]: The ids of the changed media."""
+        raise NotImplementedError("Subclasses must implement this method")
+
 
 class BaseConnectionManager(ABC):
     """Connection manager for working with the Arr applications.
     Abstract class that provides the base functionality for working with the Arr applications.
     """
 
+    CHUNK_SIZE = 100
+    # Delta refreshes read Arr history from a bit before the last refresh,
+    # to allow for clock differences between Trailarr and the Arr host
+    HISTORY_OVERLAP = timedelta(minutes=5)
     arr_manager: ArrManagerProtocol
     connection_id: int
     # inline_trailer: bool
     is_movie: bool
     monitor: MonitorType
-    parse_media: Callable[[int, dict[str, Any]], MediaCreate]
+    parse_media: Callable[[int, dict[str, Any]], MediaCreateDC]
+    fingerprint_media: Callable[[dict[str, Any], str], tuple[str, str]] | None
 
     def __init__(
         self,
         connection: ConnectionRead,
         arr_manager: ArrManagerProtocol,
-        parse_media: Callable[[int, dict[str, Any]], MediaCreate],
+        parse_media: Callable[[int, dict[str, Any]], MediaCreateDC],
         # inline_trailer: bool,
         is_movie: bool = True,
+        fingerprint_media: (
+            Callable[[dict[str, Any], str], tuple[str, str]] | None
+        ) = None,
     ):
         """Initialize the ArrConnectionManager. \n
         Args:
-            connection (ConnectionRead): The connection data."""
+            connection (ConnectionRead): The connection data.
+            arr_manager (ArrManagerProtocol): The Arr API manager.
+            parse_media (Callable): Function to parse Arr media data.
+            is_movie (bool, Optional=True): Flag for movies/series.
+            fingerprint_media (Callable, Optional=None): Function to get \
+                the txdb id and fingerprint of Arr media data. If given, \
+                media with unchanged fingerprints is skipped on refresh."""
         self.connection_id = connection.id
+        self.connection_name = connection.name
         self.path_mappings = [
             pm for pm in connection.path_mappings if pm.path_from != pm.path_to
         ]
         self.monitor = connection.monitor
+        self.last_synced_at = connection.last_synced_at
         self.arr_manager = arr_manager
         self.parse_media = parse_media
+        self.fingerprint_media = fingerprint_media
+        # Connection settings that change the parsed media, so that all
+        # media is re-processed if any of these are changed
+        self.fingerprint_salt = "|".join(
+            [str(self.monitor)]
+            + [f"{pm.path_from}>{pm.path_to}" for pm in self.path_mappings]
+        )
         # self.inline_trailer = inline_trailer
         self.is_movie = is_movie
         self.created_count = 0
         self.updated_count = 0
-        self.media_ids = []
+        self.unchanged_count = 0
+        self.total_count = 0
+        self.unchanged_ids: list[int] = []
+        self.sync_epoch = 0
+        # Trailer exists results of the media folders checked on disk
+        # during this refresh, keyed by folder path
+        self.trailer_exists_map: dict[str, bool] = {}
+        self.fetch_failed = False
+
+    async def _run_db(self, func: Callable[..., T], *args: Any) -> T:
+        """🚨This is a private method🚨 \n
+        Run a blocking database function in a worker thread, so that other \
+            connections can keep fetching data from their Arr APIs. \n
+        Only one database function runs at a time across all connections.\n
+        Args:
+            func (Callable): The database function to run.
+            *args (Any): Arguments to pass to the function. \n
+        Returns:
+            T: The return value of the function."""
+
+        def _locked_call() -> T:
+            with _db_lock:
+                return func(*args)
+
+        return await asyncio.to_thread(_locked_call)
 
     async def get_system_status(self):
         """Get the system status from the Arr application. \n
@@ -150,45 +234,108 @@ class BaseConnectionManager(ABC):
             logger.error("Failed to get media data from Arr application.")
             return []
 
-    async def _parse_data(self) -> AsyncGenerator[list[MediaCreate], None]:
+    async def _parse_data(self) -> AsyncGenerator[list[MediaCreateDC], None]:
         """Parse media received from the Arr API to objects that can be added to database.\n
+        Media is streamed from the Arr API and parsed as it is received, \
+            so only one chunk of media is held in memory at a time.\n
+        Media with unchanged fingerprint is not parsed, only it's sync \
+            epoch is updated in the database.\n
+        Sets `fetch_failed` if the media could not be retrieved completely.\n
         Yields:
-            list[_MediaCreate]: list of parsed media objects in chunks of 100.
+            list[MediaCreateDC]: list of parsed media objects in chunks of 100.
         """
-        media_data = await self.get_media_data()
-        logger.debug(f"Media data received: {len(media_data)} items")
-        if not media_data:
-            yield []
-            return
-        # Parse the media data to MediaCreate objects in chunks of 100
         chunk_count = 0
-        total_chunks = (len(media_data) + 99) // 100
-        count = 0
-        parsed_media: list[MediaCreate] = []
-        for media in media_data:
-            parsed_media.append(self.parse_media(self.connection_id, media))
-            count += 1
-            if count == 100:
-                chunk_count += 1
-                logger.debug(f"Chunk {chunk_count}/{total_chunks} parsed")
-                yield parsed_media
-                count = 0
-                parsed_media = []
-        if parsed_media:
-            # If there are remaining media items in the last chunk, yield them
+        parsed_media: list[MediaCreateDC] = []
+        existing_media: dict[str, tuple[int, str]] = {}
+        if self.fingerprint_media:
+            existing_media = await self._run_db(
+                MediaDatabaseManager().read_fingerprints, self.connection_id
+            )
+        try:
+            async for media in self.arr_manager.iter_all_media():
+                self.total_count += 1
+                fingerprint = ""
+                if self.fingerprint_media:
+                    txdb_id, fingerprint = self.fingerprint_media(
+                        media, self.fingerprint_salt
+                    )
+                    existing = existing_media.get(txdb_id)
+                    if existing and existing[1] == fingerprint:
+                        # Unchanged since last refresh, skip it
+                        self.unchanged_ids.append(existing[0])
+                        self.unchanged_count += 1
+                        if len(self.unchanged_ids) >= self.CHUNK_SIZE * 10:
+                            await self._update_unchanged_media()
+                        continue
+                parsed_media.append(self._parse_media(media, fingerprint))
+                if len(parsed_media) == self.CHUNK_SIZE:
+                    chunk_count += 1
+                    logger.debug(
+                        f"Chunk {chunk_count} parsed"
+                        f" ({self.total_count} items)"
+                    )
+                    yield parsed_media
+                    parsed_media = []
+        except Exception as e:
+            self.fetch_failed = True
+            logger.error(
+                f"Failed to get media data from Arr application. Error: {e}"
+            )
+        await self._update_unchanged_media()
+        logger.debug(f"Media data received: {self.total_count} items")
+        if parsed_media or (self.total_count == 0 and not self.fetch_failed):
+            # Yield the remaining media items in the last chunk, if any
             chunk_count += 1
-            logger.debug(f"Chunk {chunk_count}/{total_chunks} parsed")
+            logger.debug(
+                f"Chunk {chunk_count} parsed ({self.total_count} items)"
+            )
             yield parsed_media
-            parsed_media = []
+
+    def _parse_media(
+        self, media: dict[str, Any], fingerprint: str | None = None
+    ) -> MediaCreateDC:
+        """🚨This is a private method🚨 \n
+        Parse a media item received from the Arr API, and set it's \
+            fingerprint and sync epoch.\n
+        Args:
+            media (dict[str, Any]): The media data from the Arr API.
+            fingerprint (str, Optional=None): Fingerprint of the media data, \
+                calculated if not given.\n
+        Returns:
+            MediaCreateDC: The parsed media object."""
+        if fingerprint is None:
+            fingerprint = ""
+            if self.fingerprint_media:
+                _, fingerprint = self.fingerprint_media(
+                    media, self.fingerprint_salt
+                )
+        media_create = self.parse_media(self.connection_id, media)
+        media_create.arr_fingerprint = fingerprint
+        media_create.sync_epoch = self.sync_epoch
+        return media_create
+
+    async def _update_unchanged_media(self) -> None:
+        """🚨This is a private method🚨 \n
+        Set the current sync epoch for the unchanged media collected so far, \
+            so that they are not deleted at the end of the refresh."""
+        if not self.unchanged_ids:
+            return
+        await self._run_db(
+            MediaDatabaseManager().update_sync_epoch,
+            self.unchanged_ids,
+            self.sync_epoch,
+        )
+        self.unchanged_ids = []
+        return
 
     def _apply_path_mappings(
-        self, media_list: list[MediaCreate]
-    ) -> list[MediaCreate]:
+        self, media_list: list[MediaCreateDC]
+    ) -> list[MediaCreateDC]:
         """Update the paths of the media based on the path mappings.\n
         Args:
-            media_list (list[MediaCreate]): The list of media objects.\n
+            media_list (list[MediaCreateDC]): The list of media objects.\n
         Returns:
-            list[MediaCreate]: The updated list of media objects."""
+            list[MediaCreateDC]: The updated list of media objects."""
         # If no path mappings exist, return the media list as is
         if len(self.path_mappings) == 0:
             return media_list
@@ -204,18 +351,29 @@ class BaseConnectionManager(ABC):
             )
         return media_list
 
-    async def _check_trailer(self, folder_path: str) -> bool:
-        """Check if a trailer exists for the media in the folder path.\n
+    async def _check_trailers(self, folder_paths: list[str]) -> None:
+        """Check if trailers exist for the media in the folder paths.\n
+        Folders are checked concurrently, results are saved in \
+            `trailer_exists_map`. Folders already checked during this \
+            refresh are not checked again.\n
         Args:
-            folder_path (str): The folder path to check for the trailer.\n
-        Returns:
-            bool: True if the trailer exists, False otherwise."""
-        # Check if there ia a trailer either inline or in a 'Trailers' subfolder
-        trailer_exists = await FilesHandler.check_trailer_exists(
-            path=folder_path,
-            check_inline_file=True,
+            folder_paths (list[str]): The folder paths to check for trailers.
+        """
+        folder_paths = [
+            path
+            for path in folder_paths
+            if path not in self.trailer_exists_map
+        ]
+        if not folder_paths:
+            return
+        logger.debug(f"Checking {len(folder_paths)} folders for trailers")
+        # Check if there is a trailer either inline or in a 'Trailers' subfolder
+        self.trailer_exists_map.update(
+            await FilesHandler.check_trailers_exist(
+                folder_paths, check_inline_file=True
+            )
         )
-        return trailer_exists
+        return
 
     @cache
     def _check_monitoring(
@@ -272,52 +430,37 @@ class BaseConnectionManager(ABC):
         return MonitorStatus.MISSING
 
     def create_or_update_bulk(
-        self, media_data: list[MediaCreate]
+        self, media_data: list[MediaCreateDC]
     ) -> list[MediaReadDC]:
         """Create or update media in the database and return MediaRead objects.\n
         Args:
-            media_data (list[MovieCreate]): The movie data to create or update.\n
+            media_data (list[MediaCreateDC]): The media data to create or update.\n
         Returns:
             list[MediaReadDC]: A list of MediaRead objects."""
         logger.debug(f"Syncing {len(media_data)} media items to database")
-        media_read_list = MediaDatabaseManager().create_or_update_bulk(
-            media_data
-        )
-        # return [
-        #     MediaReadDC(
-        #         id=movie_read.id,
-        #         created=created,
-        #         folder_path=movie_read.folder_path,
-        #         arr_monitored=movie_read.arr_monitored,
-        #         monitor=movie_read.monitor,
-        #         status=movie_read.status,
-        #     )
-        #     for movie_read, created, updated in movie_read_list
-        # ]
+        media_read_list = MediaDatabaseManager().sync_bulk(media_data)
         media_read_dc_list = []
-        for media_read, created, updated in media_read_list:
-            self.media_ids.append(media_read.id)
-            if created:
+        for media_read, updated in media_read_list:
+            if media_read.created:
                 self.created_count += 1
             if updated:
                 self.updated_count += 1
-            media_read_dc = MediaReadDC(
-                **media_read.model_dump(), created=created
-            )
-            media_read_dc_list.append(media_read_dc)
+            media_read_dc_list.append(media_read)
         logger.debug(
             f"Created: {self.created_count}, Updated: {self.updated_count}"
         )
         return media_read_dc_list
 
     def remove_deleted_media(self) -> None:
-        """Remove the media from the database that are not present in the Arr application."""
-        if len(self.media_ids) == 0:
+        """Remove the media from the database that are not present in the Arr application.\n
+        Media not seen in the current sync epoch is deleted."""
+        if self.total_count == 0:
             return
         logger.debug("Removing media not present in Arr application")
-        MediaDatabaseManager().delete_except(
-            self.connection_id, self.media_ids
+        deleted_count = MediaDatabaseManager().delete_stale(
+            self.connection_id, self.sync_epoch
         )
+        logger.debug(f"Removed {deleted_count} media items")
         return
 
     def update_media_status_bulk(self, media_update_list: list[MediaUpdateDC]):
@@ -328,17 +471,27 @@ class BaseConnectionManager(ABC):
         MediaDatabaseManager().update_media_status_bulk(media_update_list)
         return
 
-    async def _process_media_list(self, parsed_media: list[MediaCreate]):
+    async def _process_media_list(self, parsed_media: list[MediaCreateDC]):
         """Process the media list and update the database with the new data.\n
         Args:
-            parsed_media (list[MediaCreate]): The parsed media data."""
+            parsed_media (list[MediaCreateDC]): The parsed media data."""
         if len(parsed_media) == 0:
             logger.warning("No media found in the Arr application")
             return
         # Apply path mappings to the media folder paths
         self._apply_path_mappings(parsed_media)
         # Create or update the media in the database
-        media_res = self.create_or_update_bulk(parsed_media)
+        media_res = await self._run_db(
+            self.create_or_update_bulk, parsed_media
+        )
+        # Check if trailers exist on disk for new media only
+        await self._check_trailers(
+            [
+                media_read.folder_path
+                for media_read in media_res
+                if media_read.created and media_read.folder_path
+            ]
+        )
         # Check if media has trailer and should be monitored
         update_list: list[MediaUpdateDC] = []
         for media_read in media_res:
@@ -347,10 +500,10 @@ class BaseConnectionManager(ABC):
             if media_read.folder_path is None:
                 trailer_exists = False
             else:
-                # Check if trailer exists on disk for new media only
+                # Use the trailer exists result from disk for new media only
                 if media_read.created:
-                    trailer_exists = await self._check_trailer(
-                        media_read.folder_path
+                    trailer_exists = self.trailer_exists_map.get(
+                        media_read.folder_path, False
                     )
                 else:
                     trailer_exists = media_read.trailer_exists
@@ -378,11 +531,16 @@ class BaseConnectionManager(ABC):
                 )
             )
         # Update the database with trailer and monitoring status
-        self.update_media_status_bulk(update_list)
+        await self._run_db(self.update_media_status_bulk, update_list)
         return
 
     async def refresh(self):
         """Gets new data from Arr API and saves it to the database."""
+        sync_started = datetime.now(timezone.utc)
+        # Media seen in this refresh is stamped with a new sync epoch
+        self.sync_epoch = await self._run_db(
+            MediaDatabaseManager().read_next_sync_epoch, self.connection_id
+        )
         # Get the parsed data from the Arr API
         # parsed_media = await self._parse_data()
         async for parsed_media in self._parse_data():
@@ -390,9 +548,131 @@ class BaseConnectionManager(ABC):
             await self._process_media_list(parsed_media)
         media_type = "Movies" if self.is_movie else "Series"
         logger.info(
-            f"{media_type}: {self.created_count} created,"
-            f" {self.updated_count} updated."
+            f"{self.connection_name} - {media_type}:"
+            f" {self.created_count} created,"
+            f" {self.updated_count} updated,"
+            f" {self.unchanged_count} unchanged."
         )
         # Delete any media that is not present in the Arr application
-        self.remove_deleted_media()
+        # Skip if media list is incomplete, to avoid deleting existing media
+        if self.fetch_failed:
+            logger.warning(
+                "Media data from Arr application is incomplete,"
+                " skipping removal of deleted media."
+            )
+            return
+        await self._run_db(self.remove_deleted_media)
+        await self._update_synced_at(sync_started, full_sync=True)
+        return
+
+    async def refresh_delta(self):
+        """Gets new data from Arr API for the media changed since the last \
+            refresh and saves it to the database.\n
+        Changed media is found from the Arr history. Media removed from the \
+            Arr application is not removed, a full `refresh` does that.\n
+        Does a full refresh if the connection was never refreshed before."""
+        if self.last_synced_at is None:
+            await self.refresh()
+            return
+        sync_started = datetime.now(timezone.utc)
+        since = self.last_synced_at - self.HISTORY_OVERLAP
+        try:
+            arr_ids = await self.arr_manager.get_updated_media_ids(since)
+        except Exception as e:
+            self.fetch_failed = True
+            logger.error(
+                f"Failed to get history from Arr application. Error: {e}"
+            )
+            return
+        if arr_ids:
+            failed_ids = await self.refresh_media(arr_ids)
+        else:
+            failed_ids = []
+            logger.info(
+                f"{self.connection_name} - No changes since last refresh."
+            )
+        if failed_ids:
+            # Keep the watermark, so that the failed media is in the history
+            # of the next delta refresh, instead of staying stale until the
+            # next full refresh
+            self.fetch_failed = True
+            logger.warning(
+                f"{self.connection_name} - Failed to get {len(failed_ids)}"
+                " changed media, they will be retried on the next refresh."
+            )
+            return
+        await self._update_synced_at(sync_started, full_sync=False)
+        return
+
+    async def _update_synced_at(
+        self, synced_at: datetime, full_sync: bool
+    ) -> None:
+        """🚨This is a private method🚨 \n
+        Save the start time of a successful refresh as the sync watermark \
+            of the connection.\n
+        Args:
+            synced_at (datetime): Start time of the refresh.
+            full_sync (bool): True if all media was refreshed."""
+        await self._run_db(
+            ConnectionDatabaseManager().update_synced_at,
+            self.connection_id,
+            synced_at,
+            full_sync,
+        )
+        self.last_synced_at = synced_at
+        return
+
+    async def refresh_media(self, arr_ids: list[int]) -> list[int]:
+        """Gets new data for the given media from Arr API and saves it to \
+            the database.\n
+        Other media of the connection is not changed or deleted. Media that \
+            can't be fetched is skipped.\n
+        Args:
+            arr_ids (list[int]): The ids of the media in the Arr application.
+        Returns:
+            list[int]: The ids of the media that couldn't be fetched.
+        """
+        # Stamp with a new sync epoch, so that the media is not deleted by
+        # a full refresh of the connection that is already in progress
+        self.sync_epoch = await self._run_db(
+            MediaDatabaseManager().read_next_sync_epoch, self.connection_id
+        )
+        parsed_media: list[MediaCreateDC] = []
+        failed_ids: list[int] = []
+        for arr_id in arr_ids:
+            try:
+                media = await self.arr_manager.get_media(arr_id)
+            except Exception as e:
+                logger.error(
+                    f"Failed to get media with id {arr_id} from Arr"
+                    f" application. Error: {e}"
+                )
+                failed_ids.append(arr_id)
+                continue
+            parsed_media.append(self._parse_media(media))
+            if len(parsed_media) == self.CHUNK_SIZE:
+                await self._process_media_list(parsed_media)
+                parsed_media = []
+        if parsed_media:
+            await self._process_media_list(parsed_media)
+        media_type = "Movies" if self.is_movie else "Series"
+        logger.info(
+            f"{self.connection_name} - {media_type}:"
+            f" {self.created_count} created,"
+            f" {self.updated_count} updated."
+        )
+        return failed_ids
+
+    async def delete_media(self, txdb_ids: list[str]) -> None:
+        """Delete the given media of the connection from the database.\n
+        Args:
+            txdb_ids (list[str]): The txdb ids of the media to delete."""
+        deleted_count = await self._run_db(
+            MediaDatabaseManager().delete_by_txdb_ids,
+            self.connection_id,
+            txdb_ids,
+        )
+        logger.info(
+            f"{self.connection_name} - Removed {deleted_count} media items"
+        )
         return
@@ -1,21 +1,91 @@
+import base64
+from dataclasses import fields
 from datetime import datetime, timedelta, timezone
+import json
 import re
-from typing import Protocol, Sequence
-from sqlmodel import Session, col, desc, or_, select
-from sqlmodel.sql.expression import SelectOfScalar
+from typing import Any, Iterator, Protocol, Sequence, TypeVar
+from sqlalchemy import (
+    Table,
+    bindparam,
+    case,
+    column,
+    literal,
+    literal_column,
+    table,
+    tuple_,
+)
+from sqlmodel import (
+    Session,
+    col,
+    delete,
+    desc,
+    false,
+    func,
+    insert,
+    or_,
+    select,
+    update,
+)
+from sqlmodel.sql.expression import Select, SelectOfScalar
 
 from core.base.database.manager.connection import ConnectionDatabaseManager
+from core.base.database.manager.general import invalidate_stats
+from core.base.database.models.filter import FilterRead
+from core.base.database.models.helpers import MediaCreateDC, MediaReadDC
 from core.base.database.models.media import (
+    MEDIA_FTS_TABLE,
+    MEDIA_FTS_WEIGHTS,
     Media,
     MediaCreate,
     MediaRead,
     MediaUpdate,
     MonitorStatus,
 )
-from core.base.database.utils.engine import manage_session
+from core.base.database.utils.engine import (
+    get_read_session,
+    manage_session,
+    manage_write_session,
+    run_async_read,
+    run_async_write,
+)
+from core.base.utils.filters import compile_filters
 from exceptions import ItemNotFoundError
 from app_logger import logger
 
+# Fields of MediaCreateDC that are updated for existing media on sync
+_SYNC_UPDATE_FIELDS = tuple(
+    field.name
+    for field in fields(MediaCreateDC)
+    if field.name not in (
+        "connection_id",
+        "txdb_id",
+        "youtube_trailer_id",
+        "arr_fingerprint",
+        "sync_epoch",
+    )
+)
+
+# Fields of MediaCreate that are not synced from Arr (monitor, status etc.),
+# set by `create_or_update_bulk` after syncing the rest
+_LOCAL_FIELDS = set(MediaCreate.model_fields) - {
+    field.name for field in fields(MediaCreateDC)
+}
+
+# Core table of Media, for set-based UPDATE statements run with executemany
+_MEDIA_TABLE: Table = Media.__table__  # type: ignore
+# Full-text search index of Media, rowid is the media id
+_MEDIA_FTS = table(MEDIA_FTS_TABLE, column("rowid"))
+
+# Columns that media can be sorted by in pages, all are NOT NULL
+_SORT_COLUMNS = ("title", "year", "added_at", "updated_at")
+
+_RecordT = TypeVar("_RecordT")
+
+
+def _status_literal(status: MonitorStatus):
+    """Get a SQL literal of the status, to use in CASE expressions."""
+    return literal(status, _MEDIA_TABLE.c.status.type)
+
 
 class MediaUpdateProtocol(Protocol):
     @property
@@ -39,7 +109,7 @@ class MediaDatabaseManager:
 
     __model_name = "Media"
 
-    @manage_session
+    @manage_write_session
     def create_or_update_bulk(
         self,
         media_create_list: list[MediaCreate],
@@ -48,6 +118,8 @@ class MediaDatabaseManager:
     ) -> list[tuple[MediaRead, bool, bool]]:
         """Create or update multiple media objects in the database at once. \n
         If media already exists, it will be updated, otherwise it will be created.\n
+        Arr data is synced the same way as `sync_bulk`, then the other fields \
+            (monitor, status, trailer_exists etc.) are set if given.\n
         Args:
             media_create_list (list[MediaCreate]): List of media objects to create or update.\n
             _session (Session, Optional): A session to use for the database connection.\n
@@ -61,27 +133,67 @@ class MediaDatabaseManager:
             ItemNotFoundError: If any of the connections with provided connection_id's are invalid.
             ValidationError: If any of the media items are invalid.
         """
-        self._check_connection_exists_bulk(media_create_list, session=_session)
+        sync_list = self._sync_bulk(
+            [
+                self._get_sync_media(media_create)
+                for media_create in media_create_list
+            ],
+            _session,
+        )
+        db_media_by_id = self._read_bulk(
+            [media.id for media, _ in sync_list], _session
+        )
+        now = datetime.now(timezone.utc)
         db_media_list: list[tuple[Media, bool, bool]] = []
-        new_count: int = 0
-        updated_count: int = 0
-        for media_create in media_create_list:
-            db_media, created, updated = self._create_or_update(
-                media_create, _session
+        for media_create, (media, updated) in zip(
+            media_create_list, sync_list
+        ):
+            db_media = db_media_by_id[media.id]
+            db_media.sqlmodel_update(
+                media_create.model_dump(
+                    include=_LOCAL_FIELDS,
+                    exclude_unset=True,
+                    exclude_none=True,
+                )
             )
-            db_media_list.append((db_media, created, updated))
-            if created:
-                new_count += 1
-            if updated:
-                updated_count += 1
-        _session.commit()
-        # logger.info(
-        #     f"{self.__model_name}: {new_count} Created, {updated_count} Updated."
-        # )
-        return [
+            if not media.created and _session.is_modified(db_media):
+                db_media.updated_at = now
+                updated = True
+            db_media_list.append((db_media, media.created, updated))
+        # Convert to MediaRead before commit, as commit expires the objects
+        # and reloads them one by one
+        _session.flush()
+        media_read_list = [
             (MediaRead.model_validate(db_media), created, updated)
             for db_media, created, updated in db_media_list
         ]
+        _session.commit()
+        return media_read_list
+
+    @manage_write_session
+    def sync_bulk(
+        self,
+        media_list: list[MediaCreateDC],
+        *,
+        _session: Session = None,  # type: ignore
+    ) -> list[tuple[MediaReadDC, bool]]:
+        """Create or update multiple media objects from Arr data at once. \n
+        Works with plain dataclasses and SQL statements instead of \
+            pydantic/ORM objects, for syncing large amounts of media from \
+            Arr applications.\n
+        Args:
+            media_list (list[MediaCreateDC]): List of media to create or update.
+            _session (Session, Optional): A session to use for the database connection.\n
+                Default is None, in which case a new session will be created.\n
+        Returns:
+            list[tuple[MediaReadDC, bool]]: List of tuples with MediaReadDC \
+                object and updated flag, in the same order as media_list.\n
+        Raises:
+            ItemNotFoundError: If any of the connections with provided connection_id's are invalid.
+        """
+        media_read_list = self._sync_bulk(media_list, _session)
+        _session.commit()
+        return media_read_list
 
     @manage_session
     def read(
@@ -146,6 +258,182 @@ class MediaDatabaseManager:
         db_media_list = _session.exec(statement).all()
         return self._convert_to_read_list(db_media_list)
 
+    @manage_session
+    def read_page(
+        self,
+        limit: int = 100,
+        cursor: str | None = None,
+        movies_only: bool | None = None,
+        filter_by: str | None = "all",
+        sort_by: str | None = None,
+        sort_asc: bool = True,
+        filters: list[FilterRead] | None = None,
+        *,
+        _session: Session = None,  # type: ignore
+    ) -> tuple[list[MediaRead], str | None]:
+        """Get a page of media objects from the database. \n
+        Pages are read with keyset pagination on the sort column and id, \
+            so each page costs the same regardless of its position, and \
+            media added or removed between pages don't shift the pages.\n
+        Args:
+            limit (int, Optional): Max number of items in the page. Default is 100.
+            cursor (str, Optional): Cursor returned with the previous page. \
+                Default is None, in which case the first page is returned.
+            movies_only (bool, Optional): Flag to get only movies. Default is None.\
+                If `True`, it will return only movies. \
+                If `False`, it will return only series. \
+                If `None`, it will return both movies and series.
+            filter_by (str, Optional): Filter the media items by a column value. \
+                Can be `all`, `downloaded`, `monitored`, `missing`, or `unmonitored`. \
+                Default is `all`.
+            sort_by (str, Optional): Sort the media items by `title`, `year`, `added_at`, \
+                or `updated_at`. Default is None, sorted by id.
+            sort_asc (bool, Optional): Flag to sort in ascending order. Default is True.
+            filters (list[FilterRead], Optional): Filters of a custom filter \
+                that the media items should match. Default is None.
+            _session (Session, Optional): A session to use for the database connection.\
+                Default is None, in which case a new session will be created.\n
+        Returns:
+            tuple[list[MediaRead], str | None]: List of MediaRead objects, and \
+                the cursor for the next page, None if this is the last page.\n
+        Raises:
+            ValueError: If the cursor is invalid or for a different sort column.
+        """
+        sort_key = sort_by if sort_by in _SORT_COLUMNS else "id"
+        statement = self._get_sorted_statement(
+            movies_only, filter_by, sort_key, sort_asc, filters
+        )
+        if cursor:
+            sort_value, media_id = self._decode_cursor(cursor, sort_key)
+            sort_column = col(getattr(Media, sort_key))
+            key = tuple_(sort_column, col(Media.id))
+            cursor_key = tuple_(
+                literal(sort_value, sort_column.type), literal(media_id)
+            )
+            statement = statement.where(
+                key > cursor_key if sort_asc else key < cursor_key
+            )
+        # Read one more to know if there is a next page
+        db_media_list = _session.exec(statement.limit(limit + 1)).all()
+        next_cursor: str | None = None
+        if len(db_media_list) > limit:
+            db_media_list = db_media_list[:limit]
+            next_cursor = self._encode_cursor(db_media_list[-1], sort_key)
+        return self._convert_to_read_list(db_media_list), next_cursor
+
+    def read_all_batches(
+        self,
+        movies_only: bool | None = None,
+        filter_by: str | None = "all",
+        sort_by: str | None = None,
+        sort_asc: bool = True,
+        filters: list[FilterRead] | None = None,
+        any_filters: list[list[FilterRead]] | None = None,
+        batch_size: int = 500,
+    ) -> Iterator[list[MediaRead]]:
+        """Get all media objects from the database, in batches. \n
+        Rows are fetched from the database `batch_size` at a time, so only \
+            one batch is held in memory while the batches are consumed. \
+            The session stays open until the generator is exhausted or closed.\n
+        Args:
+            movies_only (bool, Optional): Flag to get only movies. Default is None.\
+                If `True`, it will return only movies. \
+                If `False`, it will return only series. \
+                If `None`, it will return both movies and series.
+            filter_by (str, Optional): Filter the media items by a column value. \
+                Can be `all`, `downloaded`, `monitored`, `missing`, or `unmonitored`. \
+                Default is `all`.
+            sort_by (str, Optional): Sort the media items by `title`, `year`, `added_at`, \
+                or `updated_at`. Default is None, sorted by id.
+            sort_asc (bool, Optional): Flag to sort in ascending order. Default is True.
+            filters (list[FilterRead], Optional): Filters of a custom filter \
+                that the media items should match. Default is None.
+            any_filters (list[list[FilterRead]], Optional): Filters of custom \
+                filters, the media items should match at least one of them. \
+                Default is None.
+            batch_size (int, Optional): Number of rows to fetch at a time. Default is 500.\n
+        Yields:
+            list[MediaRead]: Batch of MediaRead objects.
+        """
+        sort_key = sort_by if sort_by in _SORT_COLUMNS else "id"
+        statement = self._get_sorted_statement(
+            movies_only, filter_by, sort_key, sort_asc, filters
+        )
+        if any_filters is not None:
+            statement = statement.where(
+                or_(false(), *[compile_filters(f) for f in any_filters])
+            )
+        statement = statement.execution_options(yield_per=batch_size)
+        with get_read_session() as session:
+            for db_media_list in session.exec(statement).partitions():
+                # Identity map holds weak references, ORM objects of a
+                # batch are freed once it's converted
+                yield self._convert_to_read_list(db_media_list)
+
+    @manage_session
+    def read_all_projected(
+        self,
+        record_type: type[_RecordT],
+        movies_only: bool | None = None,
+        filter_by: str | None = "all",
+        *,
+        _session: Session = None,  # type: ignore
+    ) -> list[_RecordT]:
+        """Get only the needed columns of all media items from the database, \
+            as lightweight records instead of full `MediaRead` objects. \n
+        Args:
+            record_type (type[_RecordT]): Dataclass (with slots) to create \
+                for each media item, see `models.helpers.MediaTrailerDC`. \
+                Only the columns named by its fields are read, in order.
+            movies_only (bool, Optional): Flag to get only movies. Default is None.\
+                If `True`, it will return only movies. \
+                If `False`, it will return only series. \
+                If `None`, it will return both movies and series.
+            filter_by (str, Optional): Filter the media items by a column value. \
+                Can be `all`, `downloaded`, `monitored`, `missing`, or `unmonitored`. \
+                Default is `all`.
+            _session (Session, Optional): A session to use for the database connection.\n
+                Default is None, in which case a new session will be created.\n
+        Returns:
+            list[_RecordT]: List of records, sorted by id.
+        """
+        statement = self._get_projected_statement(
+            record_type, movies_only, filter_by
+        )
+        return [record_type(*row) for row in _session.exec(statement)]
+
+    def iter_all_projected(
+        self,
+        record_type: type[_RecordT],
+        movies_only: bool | None = None,
+        filter_by: str | None = "all",
+        batch_size: int = 500,
+    ) -> Iterator[_RecordT]:
+        """Get only the needed columns of all media items from the database, \
+            one record at a time. \n
+        Same as `read_all_projected`, but rows are fetched from the database \
+            `batch_size` at a time, so the records are not all held in \
+            memory. The session stays open until the generator is exhausted \
+            or closed.\n
+        Args:
+            record_type (type[_RecordT]): Dataclass (with slots) to create \
+                for each media item, see `models.helpers.MediaTrailerDC`. \
+                Only the columns named by its fields are read, in order.
+            movies_only (bool, Optional): Flag to get only movies. Default is None.
+            filter_by (str, Optional): Filter the media items by a column value. \
+                Can be `all`, `downloaded`, `monitored`, `missing`, or `unmonitored`. \
+                Default is `all`.
+            batch_size (int, Optional): Number of rows to fetch at a time. Default is 500.\n
+        Yields:
+            _RecordT: Record of a media item, sorted by id.
+        """
+        statement = self._get_projected_statement(
+            record_type, movies_only, filter_by
+        ).execution_options(yield_per=batch_size)
+        with get_read_session() as session:
+            for row in session.exec(statement):
+                yield record_type(*row)
+
     @manage_session
     def read_all_by_connection(
         self,
@@ -173,6 +461,50 @@ class MediaDatabaseManager:
         db_media_list = _session.exec(statement).all()
         return self._convert_to_read_list(db_media_list)
 
+    @manage_session
+    def read_fingerprints(
+        self,
+        connection_id: int,
+        *,
+        _session: Session = None,  # type: ignore
+    ) -> dict[str, tuple[int, str]]:
+        """Get the id and Arr data fingerprint of all media items for a \
+            given connection, keyed by txdb id.\n
+        Args:
+            connection_id (int): The id of the connection to get media items for.
+            _session (Session, Optional): A session to use for the database connection.\n
+                Default is None, in which case a new session will be created.\n
+        Returns:
+            dict[str, tuple[int, str]]: Dictionary of txdb id to (id, fingerprint).
+        """
+        statement = select(
+            Media.txdb_id, Media.id, Media.arr_fingerprint
+        ).where(Media.connection_id == connection_id)
+        return {
+            txdb_id: (media_id, fingerprint)
+            for txdb_id, media_id, fingerprint in _session.exec(statement)
+        }
+
+    @manage_session
+    def read_next_sync_epoch(
+        self,
+        connection_id: int,
+        *,
+        _session: Session = None,  # type: ignore
+    ) -> int:
+        """Get the sync epoch to use for the next refresh of a connection.\n
+        Args:
+            connection_id (int): The id of the connection.
+            _session (Session, Optional): A session to use for the database connection.\n
+                Default is None, in which case a new session will be created.\n
+        Returns:
+            int: One more than the highest sync epoch of the connection's media.
+        """
+        statement = select(func.max(Media.sync_epoch)).where(
+            Media.connection_id == connection_id
+        )
+        return (_session.exec(statement).one() or 0) + 1
+
     @manage_session
     def read_recent(
         self,
@@ -254,11 +586,13 @@ class MediaDatabaseManager:
         seconds = max(1, seconds + 1)  # Add 1 second to avoid missing items
         seconds = min(seconds, 86400)  # Max 1 day
         updated_at = datetime.now(timezone.utc) - timedelta(seconds=seconds)
+        # Few media change in a day, hint the query planner so that it
+        # reads each condition from its index instead of scanning the table
         statement = select(Media).where(
             or_(
-                Media.updated_at > updated_at,
-                Media.added_at > updated_at,
-                Media.downloaded_at > updated_at,  # type: ignore
+                func.unlikely(col(Media.updated_at) > updated_at),
+                func.unlikely(col(Media.added_at) > updated_at),
+                func.unlikely(col(Media.downloaded_at) > updated_at),
             )
         )
         db_media_list = _session.exec(statement).all()
@@ -277,7 +611,7 @@ class MediaDatabaseManager:
         If an exact match is found for `imdb id` or `txdb id`, it will return only that item.\n
         If a 4 digit number is found in the query, \
             it will only return list of media from that year [1900-2100].\n
-        Otherwise, it will return a list of [max 50 recently added] Media matching the query.\n
+        Otherwise, it will return a list of [max 50 best matching] Media matching the query.\n
         Args:
             query (str): The search query to search for in the media items.
             offset (int, Optional): The offset to start from. Default is 0.
@@ -295,7 +629,7 @@ class MediaDatabaseManager:
         # logger.info(f"Found {len(db_media_list)} media items.")
         return self._convert_to_read_list(db_media_list)
 
-    @manage_session
+    @manage_write_session
     def update(
         self,
         media_id: int,
@@ -316,6 +650,7 @@ class MediaDatabaseManager:
         Raises:
             ItemNotFoundError: If the media item with provided id doesn't exist.
         """
+        invalidate_stats(_session)
         db_media = self._get_db_item(media_id, _session)
         media_update_data = media_update.model_dump(
             exclude_unset=True,
@@ -331,7 +666,7 @@ class MediaDatabaseManager:
             _session.commit()
         return
 
-    @manage_session
+    @manage_write_session
     def update_bulk(
         self,
         media_updates: list[tuple[int, MediaUpdate]],
@@ -339,6 +674,8 @@ class MediaDatabaseManager:
         _session: Session = None,  # type: ignore
     ) -> None:
         """Update multiple media items in the database at once.\n
+        Updates with the same fields are run as a single executemany \
+            statement, `updated_at` is set only if any value changed.\n
         Args:
             media_updates (list[tuple[int, MediaUpdate]]): List of tuples with media id \
                 and update data.\n
@@ -349,14 +686,55 @@ class MediaDatabaseManager:
         Raises:
             ItemNotFoundError: If any of the media items with provided id's don't exist.
         """
+        invalidate_stats(_session)
+        # Group the updates by the fields being updated, so that each group
+        # is a single UPDATE statement run with executemany
+        update_groups: dict[tuple[str, ...], list[dict[str, Any]]] = {}
         for media_id, media_update in media_updates:
-            self.update(
-                media_id, media_update, _session=_session, _commit=False
+            media_update_data = media_update.model_dump(
+                exclude_unset=True,
+                exclude_none=True,
+                exclude={"youtube_trailer_id", "downloaded_at", "updated_at"},
+            )
+            params = {f"_{key}": v for key, v in media_update_data.items()}
+            params["_id"] = media_id
+            keys = tuple(sorted(media_update_data))
+            update_groups.setdefault(keys, []).append(params)
+        columns = _MEDIA_TABLE.c
+        now = literal(datetime.now(timezone.utc), columns.updated_at.type)
+        updated_count = 0
+        for keys, params_list in update_groups.items():
+            if not keys:
+                # Nothing to update, checked for existence below
+                continue
+            values = {
+                key: bindparam(f"_{key}", type_=columns[key].type)
+                for key in keys
+            }
+            # Set updated_at only if any of the values changed
+            is_modified = or_(
+                *(columns[key].is_not(values[key]) for key in keys)
+            )
+            statement = (
+                update(_MEDIA_TABLE)
+                .where(columns.id == bindparam("_id"))
+                .values(
+                    **values,
+                    updated_at=case(
+                        (is_modified, now), else_=columns.updated_at
+                    ),
+                )
+            )
+            result = _session.execute(statement, params_list)
+            updated_count += result.rowcount
+        if updated_count != len(media_updates):
+            self._check_ids_exist(
+                [media_id for media_id, _ in media_updates], _session
             )
         _session.commit()
         return
 
-    @manage_session
+    @manage_write_session
     def update_media_status(
         self,
         media_update: MediaUpdateProtocol,
@@ -375,6 +753,7 @@ class MediaDatabaseManager:
         Raises:
             ItemNotFoundError: If the media item with provided id doesn't exist.
         """
+        invalidate_stats(_session)
         db_media = self._get_db_item(media_update.id, _session)
         if media_update.trailer_exists is not None:
             db_media.trailer_exists = media_update.trailer_exists
@@ -408,7 +787,7 @@ class MediaDatabaseManager:
             _session.commit()
         return
 
-    @manage_session
+    @manage_write_session
     def update_media_status_bulk(
         self,
         media_update_list: Sequence[MediaUpdateProtocol],
@@ -416,6 +795,8 @@ class MediaDatabaseManager:
         _session: Session = None,  # type: ignore
     ) -> None:
         """Update the monitoring status of multiple media items in the database at once.\n
+        Same as `update_media_status` for each item, run as a single \
+            executemany statement with the status computed in SQL.\n
         Args:
             media_update_list (Sequence[MediaUpdateProtocol]): Sequence of media update objects.\n
             _session (Session, Optional): A session to use for the database connection.\n
@@ -425,14 +806,84 @@ class MediaDatabaseManager:
         Raises:
             ItemNotFoundError: If any of the media items with provided id's don't exist.
         """
+        invalidate_stats(_session)
+        if not media_update_list:
+            return
+        # Compute the status for both the cases of trailer existing or not,
+        # the database picks one based on the trailer_exists value
+        now = datetime.now(timezone.utc)
+        params: list[dict[str, Any]] = []
         for media_update in media_update_list:
-            self.update_media_status(
-                media_update, _session=_session, _commit=False
+            if media_update.status in (
+                MonitorStatus.DOWNLOADING,
+                MonitorStatus.MISSING,
+            ):
+                status_trailer = status_no_trailer = media_update.status
+            else:
+                status_trailer = MonitorStatus.DOWNLOADED
+                status_no_trailer = (
+                    MonitorStatus.MONITORED
+                    if media_update.monitor
+                    else MonitorStatus.MISSING
+                )
+            params.append(
+                {
+                    "_id": media_update.id,
+                    "_trailer_exists": media_update.trailer_exists,
+                    "_monitor": media_update.monitor,
+                    "_status_trailer": status_trailer,
+                    "_status_no_trailer": status_no_trailer,
+                    "_downloaded_at": media_update.downloaded_at or None,
+                    "_yt_id": media_update.yt_id or None,
+                }
+            )
+        columns = _MEDIA_TABLE.c
+        status_type = columns.status.type
+        # Keep the existing trailer_exists value if not given in the update
+        trailer_exists = func.coalesce(
+            bindparam("_trailer_exists", type_=columns.trailer_exists.type),
+            columns.trailer_exists,
+        )
+        statement = (
+            update(_MEDIA_TABLE)
+            .where(columns.id == bindparam("_id"))
+            .values(
+                trailer_exists=trailer_exists,
+                # If trailer exists, disable monitoring
+                monitor=case(
+                    (trailer_exists, literal(False)),
+                    else_=bindparam("_monitor", type_=columns.monitor.type),
+                ),
+                status=case(
+                    (
+                        trailer_exists,
+                        bindparam("_status_trailer", type_=status_type),
+                    ),
+                    else_=bindparam("_status_no_trailer", type_=status_type),
+                ),
+                downloaded_at=func.coalesce(
+                    bindparam(
+                        "_downloaded_at", type_=columns.downloaded_at.type
+                    ),
+                    columns.downloaded_at,
+                ),
+                youtube_trailer_id=func.coalesce(
+                    bindparam("_yt_id", type_=columns.youtube_trailer_id.type),
+                    columns.youtube_trailer_id,
+                ),
+                updated_at=literal(now, columns.updated_at.type),
+            )
+        )
+        result = _session.execute(statement, params)
+        if result.rowcount != len(params):
+            self._check_ids_exist(
+                [media_update.id for media_update in media_update_list],
+                _session,
             )
         _session.commit()
         return
 
-    @manage_session
+    @manage_write_session
     def update_monitoring(
         self,
         media_id: int,
@@ -455,6 +906,7 @@ class MediaDatabaseManager:
         Raises:
             ItemNotFoundError: If the media item with provided id doesn't exist.
         """
+        invalidate_stats(_session)
         db_media = self._get_db_item(media_id, _session)
         # Check if the monitor status is already set to the same value
         if db_media.monitor == monitor:
@@ -495,7 +947,7 @@ class MediaDatabaseManager:
             _session.commit()
         return msg, True
 
-    @manage_session
+    @manage_write_session
     def update_monitoring_bulk(
         self,
         media_ids: list,
@@ -504,6 +956,8 @@ class MediaDatabaseManager:
         _session: Session = None,  # type: ignore
     ) -> None:
         """Update the monitoring status of multiple media items in the database at once.\n
+        Same as `update_monitoring` for each item, run as set-based \
+            updates in batches of 500.\n
         Args:
             media_ids (list[int]): List of media id's to update.
             monitor (bool): The monitoring status to set.
@@ -514,14 +968,66 @@ class MediaDatabaseManager:
         Raises:
             ItemNotFoundError: If any of the media items with provided id's don't exist.
         """
-        for media_id in media_ids:
-            self.update_monitoring(
-                media_id, monitor, _session=_session, _commit=False
+        invalidate_stats(_session)
+        media_ids = list(dict.fromkeys(media_ids))
+        self._check_ids_exist(media_ids, _session)
+        if monitor:
+            # Monitor only media without a trailer, that are not monitored
+            conditions = [
+                col(Media.monitor).is_(False),
+                col(Media.trailer_exists).is_(False),
+            ]
+            status: Any = MonitorStatus.MONITORED
+        else:
+            # If trailer exists, set status to downloaded, else to missing
+            conditions = [col(Media.monitor).is_(True)]
+            status = case(
+                (
+                    col(Media.trailer_exists),
+                    _status_literal(MonitorStatus.DOWNLOADED),
+                ),
+                else_=_status_literal(MonitorStatus.MISSING),
             )
+        now = datetime.now(timezone.utc)
+        for i in range(0, len(media_ids), 500):
+            statement = (
+                update(Media)
+                .where(col(Media.id).in_(media_ids[i : i + 500]), *conditions)
+                .values(monitor=monitor, status=status, updated_at=now)
+            )
+            _session.exec(statement)  # type: ignore
         _session.commit()
         return
 
-    @manage_session
+    @manage_write_session
+    def update_sync_epoch(
+        self,
+        media_ids: list[int],
+        sync_epoch: int,
+        *,
+        _session: Session = None,  # type: ignore
+    ) -> None:
+        """Set the sync epoch of multiple media items, in batches of 500.\n
+        Does not change the `updated_at` timestamp of the media.\n
+        Args:
+            media_ids (list[int]): List of media id's to update.
+            sync_epoch (int): The sync epoch to set.
+            _session (Session, Optional): A session to use for the database connection.\n
+                Default is None, in which case a new session will be created.\n
+        Returns:
+            None
+        """
+        for i in range(0, len(media_ids), 500):
+            statement = (
+                update(Media)
+                .where(col(Media.id).in_(media_ids[i : i + 500]))
+                .values(sync_epoch=sync_epoch)
+            )
+            _session.exec(statement)  # type: ignore
+        _session.commit()
+        return
+
+    @manage_write_session
     def update_trailer_exists(
         self,
         media_id: int,
@@ -542,6 +1048,7 @@ class MediaDatabaseManager:
         Raises:
             ItemNotFoundError: If the media item with provided id doesn't exist.
         """
+        invalidate_stats(_session)
         db_media = self._get_db_item(media_id, _session)
         db_media.trailer_exists = trailer_exists
         db_media.updated_at = datetime.now(timezone.utc)
@@ -559,7 +1066,7 @@ class MediaDatabaseManager:
             _session.commit()
         return None
 
-    @manage_session
+    @manage_write_session
     def update_trailer_exists_bulk(
         self,
         media_updates: list[tuple[int, bool]],
@@ -567,6 +1074,8 @@ class MediaDatabaseManager:
         _session: Session = None,  # type: ignore
     ) -> None:
         """Update the trailer_exists status of multiple media items in the database at once.\n
+        Same as `update_trailer_exists` for each item, run as set-based \
+            updates in batches of 500.\n
         Args:
             media_updates (list[tuple[int, bool]]): List of tuples with media id and \
                 trailer_exists status.\n
@@ -577,14 +1086,48 @@ class MediaDatabaseManager:
         Raises:
             ItemNotFoundError: If any of the media items with provided id's don't exist.
         """
-        for media_id, trailer_exists in media_updates:
-            self.update_trailer_exists(
-                media_id, trailer_exists, _session=_session, _commit=False
-            )
+        invalidate_stats(_session)
+        # Last update wins for duplicate ids, same as updating one by one
+        trailer_exists_map = dict(media_updates)
+        now = datetime.now(timezone.utc)
+        updated_count = 0
+        for trailer_exists in (True, False):
+            media_ids = [
+                media_id
+                for media_id, exists in trailer_exists_map.items()
+                if bool(exists) is trailer_exists
+            ]
+            if trailer_exists:
+                # If trailer exists, disable monitoring
+                values: dict[str, Any] = {
+                    "monitor": False,
+                    "status": MonitorStatus.DOWNLOADED,
+                }
+            else:
+                values = {
+                    "status": case(
+                        (
+                            col(Media.monitor),
+                            _status_literal(MonitorStatus.MONITORED),
+                        ),
+                        else_=_status_literal(MonitorStatus.MISSING),
+                    )
+                }
+            for i in range(0, len(media_ids), 500):
+                statement = (
+                    update(Media)
+                    .where(col(Media.id).in_(media_ids[i : i + 500]))
+                    .values(
+                        trailer_exists=trailer_exists, updated_at=now, **values
+                    )
+                )
+                updated_count += _session.exec(statement).rowcount  # type: ignore
+        if updated_count != len(trailer_exists_map):
+            self._check_ids_exist(list(trailer_exists_map), _session)
         _session.commit()
         return
 
-    @manage_session
+    @manage_write_session
     def update_ytid(
         self,
         media_id: int,
@@ -613,7 +1156,7 @@ class MediaDatabaseManager:
             _session.commit()
         return
 
-    @manage_session
+    @manage_write_session
     def delete(
         self,
         media_id: int,
@@ -630,12 +1173,13 @@ class MediaDatabaseManager:
         Raises:
             ItemNotFoundError: If the media item with provided id doesn't exist.
         """
+        invalidate_stats(_session)
         db_media = self._get_db_item(media_id, _session)
         _session.delete(db_media)
         _session.commit()
         return
 
-    @manage_session
+    @manage_write_session
     def delete_bulk(
         self,
         media_ids: list[int],
@@ -652,6 +1196,7 @@ class MediaDatabaseManager:
         Raises:
             ItemNotFoundError: If any of the media items with provided id's don't exist.
         """
+        invalidate_stats(_session)
         for media_id in media_ids:
             try:
                 media_db = self._get_db_item(media_id, _session)
@@ -664,35 +1209,63 @@ class MediaDatabaseManager:
         _session.commit()
         return
 
-    @manage_session
-    def delete_except(
+    @manage_write_session
+    def delete_stale(
         self,
         connection_id: int,
-        media_ids: list[int],
+        sync_epoch: int,
         *,
         _session: Session = None,  # type: ignore
-    ) -> None:
-        """Delete all media items from the database except the ones provided.\n
+    ) -> int:
+        """Delete all media items of a connection that were not seen in the \
+            given sync epoch, with a single statement.\n
         Args:
             connection_id (int): The id of the connection to delete media items for.
-            media_ids (list[int]): List of media id's to keep.
+            sync_epoch (int): The current sync epoch of the connection. \
+                Media with an older sync epoch is deleted.
             _session (Session, Optional): A session to use for the database connection.\
                 Default is None, in which case a new session will be created.\n
         Returns:
-            None
-        Raises:
-            ItemNotFoundError: If any of the media items with provided id's don't exist.
+            int: Number of media items deleted.
         """
+        invalidate_stats(_session)
         statement = (
-            select(Media)
-            .where(Media.connection_id == connection_id)
-            .where(~col(Media.id).in_(media_ids))
+            delete(Media)
+            .where(col(Media.connection_id) == connection_id)
+            .where(col(Media.sync_epoch) < sync_epoch)
         )
-        db_media_list = _session.exec(statement).all()
-        for db_media in db_media_list:
-            _session.delete(db_media)
+        result = _session.exec(statement)  # type: ignore
         _session.commit()
-        return
+        return result.rowcount
+
+    @manage_write_session
+    def delete_by_txdb_ids(
+        self,
+        connection_id: int,
+        txdb_ids: list[str],
+        *,
+        _session: Session = None,  # type: ignore
+    ) -> int:
+        """Delete media items of a connection by their txdb ids.\n
+        Args:
+            connection_id (int): The id of the connection to delete media items for.
+            txdb_ids (list[str]): List of txdb id's of the media to delete.
+            _session (Session, Optional): A session to use for the database connection.\
+                Default is None, in which case a new session will be created.\n
+        Returns:
+            int: Number of media items deleted.
+        """
+        invalidate_stats(_session)
+        if not txdb_ids:
+            return 0
+        statement = (
+            delete(Media)
+            .where(col(Media.connection_id) == connection_id)
+            .where(col(Media.txdb_id).in_(txdb_ids))
+        )
+        result = _session.exec(statement)  # type: ignore
+        _session.commit()
+        return result.rowcount
 
     def _apply_filter(
         self, statement: SelectOfScalar[Media], filter_by: str
@@ -723,6 +1296,82 @@ class MediaDatabaseManager:
         # return the statement as is
         return statement
 
+    def _get_sorted_statement(
+        self,
+        movies_only: bool | None,
+        filter_by: str | None,
+        sort_key: str,
+        sort_asc: bool,
+        filters: list[FilterRead] | None = None,
+    ) -> SelectOfScalar[Media]:
+        """🚨This is a private method🚨 \n
+        Get a statement for all media, filtered and sorted by the sort \
+            column, with the id as a tie-breaker for a stable order.\n"""
+        statement = select(Media)
+        if movies_only is not None:
+            statement = statement.where(col(Media.is_movie).is_(movies_only))
+        if filter_by:
+            statement = self._apply_filter(statement, filter_by)
+        if filters:
+            statement = statement.where(compile_filters(filters))
+        order_by = [col(getattr(Media, sort_key))]
+        if sort_key != "id":
+            order_by.append(col(Media.id))
+        if not sort_asc:
+            order_by = [desc(column) for column in order_by]
+        return statement.order_by(*order_by)
+
+    def _get_projected_statement(
+        self,
+        record_type: type,
+        movies_only: bool | None,
+        filter_by: str | None,
+    ) -> Select:
+        """🚨This is a private method🚨 \n
+        Get a statement for the columns named by the fields of the record \
+            type, of all media filtered and sorted by id.\n"""
+        statement = select(
+            *[col(getattr(Media, field.name)) for field in fields(record_type)]
+        )
+        if movies_only is not None:
+            statement = statement.where(col(Media.is_movie).is_(movies_only))
+        if filter_by:
+            statement = self._apply_filter(
+                statement, filter_by  # type: ignore
+            )
+        return statement.order_by(col(Media.id))
+
+    def _encode_cursor(self, db_media: Media, sort_key: str) -> str:
+        """🚨This is a private method🚨 \n
+        Get the cursor for the page after the given media item.\n"""
+        sort_value = getattr(db_media, sort_key)
+        if isinstance(sort_value, datetime):
+            sort_value = sort_value.isoformat()
+        data = json.dumps([sort_key, sort_value, db_media.id])
+        return base64.urlsafe_b64encode(data.encode()).decode()
+
+    def _decode_cursor(self, cursor: str, sort_key: str) -> tuple[Any, int]:
+        """🚨This is a private method🚨 \n
+        Get the sort value and id of the last item of the previous page.\n
+        Raises:
+            ValueError: If the cursor is invalid or for a different sort column.
+        """
+        try:
+            cursor_sort_key, sort_value, media_id = json.loads(
+                base64.urlsafe_b64decode(cursor.encode())
+            )
+            if sort_key in ("added_at", "updated_at"):
+                sort_value = datetime.fromisoformat(sort_value)
+            media_id = int(media_id)
+        except (ValueError, TypeError) as e:
+            raise ValueError(f"Invalid cursor: {cursor}") from e
+        if cursor_sort_key != sort_key:
+            raise ValueError(
+                f"Cursor is for sorting by '{cursor_sort_key}', not"
+                f" '{sort_key}'"
+            )
+        return sort_value, media_id
+
     def _create_or_update(
         self, media_create: MediaCreate, session: Session
     ) -> tuple[Media, bool, bool]:
@@ -830,6 +1479,16 @@ class MediaDatabaseManager:
         last_match = matches[-1] if matches else None
         return last_match
 
+    def _get_fts_query(self, query: str) -> str | None:
+        """🚨This is a private method🚨 \n
+        Get a full-text search query that matches all words in the query, \
+            as prefixes of words in the media titles, studio or overview.\n
+        Returns None if the query has no words."""
+        words = re.findall(r"\w+", query)
+        if not words:
+            return None
+        return " ".join(f'"{word}"*' for word in words)
+
     def _get_txdb_statement(self, txdb_id: str) -> SelectOfScalar[Media]:
         """🚨This is a private method🚨 \n
         Get a statement for the database query with txdb id.\n"""
@@ -852,7 +1511,9 @@ class MediaDatabaseManager:
         self, query: str, limit: int = 50, offset: int = 0
     ) -> SelectOfScalar[Media] | None:
         """🚨This is a private method🚨 \n
-        Get a search statement for the database query.\n"""
+        Get a search statement for the database query.\n
+        Words are matched as prefixes with the full-text search index, \
+            results are ranked with BM25.\n"""
         # logger.info(f"Searching for: {query}")
         if not query:
             # logger.info("Empty query. Returning empty list.")
@@ -873,18 +1534,23 @@ class MediaDatabaseManager:
             statement = self._get_year_statement(year)
             # logger.info(f"Found year: {year}")
 
-        statement = (
-            statement.where(
-                col(Media.title).ilike(f"%{query}%"),
-                # or_(
-                #     col(Media.title).ilike(f"%{query}%"),
-                #     col(Media.overview).ilike(f"%{query}%"),
-                # )
+        fts_query = self._get_fts_query(query)
+        if fts_query:
+            # Full-text search, best matches first
+            fts_rank = func.bm25(
+                literal_column(MEDIA_FTS_TABLE), *MEDIA_FTS_WEIGHTS
             )
-            .offset(offset)
-            .limit(limit)
-            .order_by(desc(Media.added_at))
-        )
+            statement = (
+                statement.join(_MEDIA_FTS, _MEDIA_FTS.c.rowid == Media.id)
+                .where(literal_column(MEDIA_FTS_TABLE).op("MATCH")(fts_query))
+                .order_by(fts_rank, desc(Media.added_at))
+            )
+        else:
+            # No words to search for (year only or symbols)
+            statement = statement.where(
+                col(Media.title).ilike(f"%{query}%")
+            ).order_by(desc(Media.added_at))
+        statement = statement.offset(offset).limit(limit)
         # logger.info(f"Final statement: {statement}")
         return statement
 
@@ -904,6 +1570,245 @@ class MediaDatabaseManager:
             raise ItemNotFoundError(self.__model_name, media_id)
         return db_media
 
+    def _sync_bulk(
+        self, media_list: list[MediaCreateDC], session: Session
+    ) -> list[tuple[MediaReadDC, bool]]:
+        """🚨This is a private method🚨 \n
+        Create or update multiple media objects from Arr data at once.\n
+        Does not commit the changes to database.\n
+        Args:
+            media_list (list[MediaCreateDC]): List of media to create or update.
+            session (Session): A session to use for the database connection.\n
+        Returns:
+            list[tuple[MediaReadDC, bool]]: List of tuples with MediaReadDC \
+                object and updated flag, in the same order as media_list.\n
+        Raises:
+            ItemNotFoundError: If any of the connections with provided connection_id's are invalid.
+        """
+        invalidate_stats(session)
+        self._check_connection_exists_bulk(media_list, session=session)
+        now = datetime.now(timezone.utc)
+        existing_rows = self._read_sync_rows_bulk(media_list, session)
+        new_rows: dict[tuple[int, str], dict[str, Any]] = {}
+        updated_rows: dict[tuple[int, str], dict[str, Any]] = {}
+        result_list: list[tuple[dict[str, Any], bool, bool]] = []
+        for media in media_list:
+            key = (media.connection_id, media.txdb_id)
+            if key in existing_rows:
+                row = existing_rows[key]
+                created = False
+                updated = self._update_sync_row(row, media)
+                if updated:
+                    row["updated_at"] = now
+                # Fingerprint/sync epoch change alone doesn't count as an update
+                row["arr_fingerprint"] = media.arr_fingerprint
+                row["sync_epoch"] = media.sync_epoch
+                updated_rows[key] = row
+            elif key in new_rows:
+                # Duplicate of a new media in the list, update it
+                row = new_rows[key]
+                self._update_sync_row(row, media)
+                created, updated = False, True
+            else:
+                row = self._get_sync_insert_row(media, now)
+                new_rows[key] = row
+                created, updated = True, False
+            result_list.append((row, created, updated))
+        if updated_rows:
+            # ORM bulk update by primary key, runs as a single executemany
+            session.execute(
+                update(Media),
+                [
+                    {
+                        "id": row["id"],
+                        "updated_at": row["updated_at"],
+                        "arr_fingerprint": row["arr_fingerprint"],
+                        "sync_epoch": row["sync_epoch"],
+                        **{name: row[name] for name in _SYNC_UPDATE_FIELDS},
+                    }
+                    for row in updated_rows.values()
+                ],
+            )
+        if new_rows:
+            session.execute(insert(Media), list(new_rows.values()))
+            media_ids = self._read_ids_bulk(list(new_rows), session)
+            for key, row in new_rows.items():
+                row["id"] = media_ids[key]
+        media_read_list = [
+            (
+                MediaReadDC(
+                    id=row["id"],
+                    created=created,
+                    folder_path=row["folder_path"],
+                    arr_monitored=row["arr_monitored"],
+                    monitor=row["monitor"],
+                    status=row["status"],
+                    trailer_exists=row["trailer_exists"],
+                ),
+                updated,
+            )
+            for row, created, updated in result_list
+        ]
+        return media_read_list
+
+    def _get_sync_media(self, media_create: MediaCreate) -> MediaCreateDC:
+        """🚨This is a private method🚨 \n
+        Get the Arr data to sync from MediaCreate as MediaCreateDC.\n"""
+        return MediaCreateDC(
+            **media_create.model_dump(
+                include={field.name for field in fields(MediaCreateDC)}
+            )
+        )
+
+    def _get_sync_insert_row(
+        self, media: MediaCreateDC, now: datetime
+    ) -> dict[str, Any]:
+        """🚨This is a private method🚨 \n
+        Get the values to insert a new media from MediaCreateDC, with \
+            defaults from the Media model for all other fields.\n"""
+        row: dict[str, Any] = {}
+        for name, field_info in Media.model_fields.items():
+            if name == "id":
+                continue
+            if field_info.default_factory is not None:
+                row[name] = field_info.default_factory()  # type: ignore
+            else:
+                row[name] = field_info.default
+        row["added_at"] = row["updated_at"] = now
+        for field in fields(media):
+            row[field.name] = getattr(media, field.name)
+        return row
+
+    def _update_sync_row(self, row: dict[str, Any], media: MediaCreateDC):
+        """🚨This is a private method🚨 \n
+        Update the row values with the non-None values from MediaCreateDC.\n
+        Returns:
+            bool: True if any of the values changed, False otherwise."""
+        updated = False
+        for name in _SYNC_UPDATE_FIELDS:
+            value = getattr(media, name)
+            if value is not None and row[name] != value:
+                row[name] = value
+                updated = True
+        return updated
+
+    def _check_ids_exist(self, media_ids: list[int], session: Session):
+        """🚨This is a private method🚨 \n
+        Check that media items exist for all the given ids, in batches of \
+            500.\n
+        Args:
+            media_ids (list[int]): List of media id's to check.
+            session (Session): A session to use for the database connection.\n
+        Raises:
+            ItemNotFoundError: If any of the media items don't exist.
+        """
+        existing_ids: set[int] = set()
+        for i in range(0, len(media_ids), 500):
+            statement = select(Media.id).where(
+                col(Media.id).in_(media_ids[i : i + 500])
+            )
+            existing_ids.update(session.exec(statement))  # type: ignore
+        for media_id in media_ids:
+            if media_id not in existing_ids:
+                raise ItemNotFoundError(self.__model_name, media_id)
+        return
+
+    def _read_bulk(
+        self, media_ids: list[int], session: Session
+    ) -> dict[int, Media]:
+        """🚨This is a private method🚨 \n
+        Get media items by ids, in batches of 500.\n
+        Args:
+            media_ids (list[int]): List of media id's to get.
+            session (Session): A session to use for the database connection.\n
+        Returns:
+            dict[int, Media]: Dictionary of media objects keyed by id.
+        """
+        unique_ids = list(set(media_ids))
+        db_media_by_id: dict[int, Media] = {}
+        for i in range(0, len(unique_ids), 500):
+            statement = select(Media).where(
+                col(Media.id).in_(unique_ids[i : i + 500])
+            )
+            for db_media in session.exec(statement):
+                db_media_by_id[db_media.id] = db_media  # type: ignore
+        return db_media_by_id
+
+    def _read_ids_bulk(
+        self, keys: list[tuple[int, str]], session: Session
+    ) -> dict[tuple[int, str], int]:
+        """🚨This is a private method🚨 \n
+        Get the ids of media items by (connection_id, txdb_id), with one \
+            query per connection (and per 500 items).\n
+        Args:
+            keys (list[tuple[int, str]]): List of (connection_id, txdb_id).
+            session (Session): A session to use for the database connection.\n
+        Returns:
+            dict[tuple[int, str], int]: Dictionary of media ids keyed by \
+                (connection_id, txdb_id).
+        """
+        txdb_ids_by_connection: dict[int, list[str]] = {}
+        for connection_id, txdb_id in keys:
+            txdb_ids_by_connection.setdefault(connection_id, []).append(
+                txdb_id
+            )
+        media_ids: dict[tuple[int, str], int] = {}
+        for connection_id, txdb_ids in txdb_ids_by_connection.items():
+            for i in range(0, len(txdb_ids), 500):
+                statement = (
+                    select(Media.txdb_id, Media.id)
+                    .where(Media.connection_id == connection_id)
+                    .where(col(Media.txdb_id).in_(txdb_ids[i : i + 500]))
+                )
+                for txdb_id, media_id in session.exec(statement):
+                    media_ids[(connection_id, txdb_id)] = media_id
+        return media_ids
+
+    def _read_sync_rows_bulk(
+        self, media_items: list[MediaCreateDC], session: Session
+    ) -> dict[tuple[int, str], dict[str, Any]]:
+        """🚨This is a private method🚨 \n
+        Get the values of existing media items needed for syncing, as \
+            dictionaries, with one query per connection (and per 500 items).\n
+        Args:
+            media_items (list[MediaCreateDC]): List of media items to check.
+            session (Session): A session to use for the database connection.\n
+        Returns:
+            dict[tuple[int, str], dict[str, Any]]: Dictionary of existing \
+                media values keyed by (connection_id, txdb_id).
+        """
+        txdb_ids_by_connection: dict[int, set[str]] = {}
+        for media in media_items:
+            txdb_ids_by_connection.setdefault(media.connection_id, set()).add(
+                media.txdb_id
+            )
+        columns = [
+            col(Media.id),
+            col(Media.connection_id),
+            col(Media.txdb_id),
+            col(Media.updated_at),
+            col(Media.monitor),
+            col(Media.status),
+            col(Media.trailer_exists),
+            *(getattr(Media, name) for name in _SYNC_UPDATE_FIELDS),
+        ]
+        existing_rows: dict[tuple[int, str], dict[str, Any]] = {}
+        for connection_id, txdb_id_set in txdb_ids_by_connection.items():
+            txdb_ids = list(txdb_id_set)
+            # Limit the number of parameters in a single query
+            for i in range(0, len(txdb_ids), 500):
+                statement = (
+                    select(*columns)
+                    .where(Media.connection_id == connection_id)
+                    .where(col(Media.txdb_id).in_(txdb_ids[i : i + 500]))
+                    .order_by(Media.id)
+                )
+                for row in session.execute(statement).mappings():
+                    key = (row["connection_id"], row["txdb_id"])
+                    # Keep the first match, same as `_read_if_exists`
+                    existing_rows.setdefault(key, dict(row))
+        return existing_rows
+
     def _read_if_exists(
         self,
         connection_id: int,
@@ -926,3 +1831,121 @@ class MediaDatabaseManager:
         )
         db_media = session.exec(statement).first()
         return db_media
+
+
+class AsyncMediaDatabaseManager:
+    """Async counterpart of `MediaDatabaseManager` for the API routes. \n
+    Reads run in worker threads and writes are awaited from the \
+        database writer, so a slow query doesn't block the event loop \
+        (and every other request and websocket) while it runs. \n
+    See the methods of `MediaDatabaseManager` for the details."""
+
+    def __init__(self) -> None:
+        self._manager = MediaDatabaseManager()
+
+    async def read(self, id: int) -> MediaRead:
+        """Read a media item by id. See `MediaDatabaseManager.read`."""
+        return await run_async_read(self._manager.read, id)
+
+    async def read_all(
+        self,
+        movies_only: bool | None = None,
+        filter_by: str | None = "all",
+        sort_by: str | None = None,
+        sort_asc: bool = True,
+    ) -> list[MediaRead]:
+        """Read all media items. See `MediaDatabaseManager.read_all`."""
+        return await run_async_read(
+            self._manager.read_all,
+            movies_only=movies_only,
+            filter_by=filter_by,
+            sort_by=sort_by,
+            sort_asc=sort_asc,
+        )
+
+    async def read_page(
+        self,
+        limit: int = 100,
+        cursor: str | None = None,
+        movies_only: bool | None = None,
+        filter_by: str | None = "all",
+        sort_by: str | None = None,
+        sort_asc: bool = True,
+        filters: list[FilterRead] | None = None,
+    ) -> tuple[list[MediaRead], str | None]:
+        """Read a page of media items. \
+            See `MediaDatabaseManager.read_page`."""
+        return await run_async_read(
+            self._manager.read_page,
+            limit=limit,
+            cursor=cursor,
+            movies_only=movies_only,
+            filter_by=filter_by,
+            sort_by=sort_by,
+            sort_asc=sort_asc,
+            filters=filters,
+        )
+
+    async def read_recent(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+        movies_only: bool | None = None,
+    ) -> list[MediaRead]:
+        """Read the recently added media items. \
+            See `MediaDatabaseManager.read_recent`."""
+        return await run_async_read(
+            self._manager.read_recent, limit, offset, movies_only=movies_only
+        )
+
+    async def read_recently_downloaded(
+        self, limit: int = 100, offset: int = 0
+    ) -> list[MediaRead]:
+        """Read the recently downloaded media items. \
+            See `MediaDatabaseManager.read_recently_downloaded`."""
+        return await run_async_read(
+            self._manager.read_recently_downloaded, limit, offset
+        )
+
+    async def read_updated_after(self, seconds: int) -> list[MediaRead]:
+        """Read the media items updated in the last `seconds`. \
+            See `MediaDatabaseManager.read_updated_after`."""
+        return await run_async_read(self._manager.read_updated_after, seconds)
+
+    async def search(self, query: str, offset: int = 0) -> list[MediaRead]:
+        """Search media items. See `MediaDatabaseManager.search`."""
+        return await run_async_read(self._manager.search, query, offset=offset)
+
+    async def update_monitoring(
+        self, media_id: int, monitor: bool
+    ) -> tuple[str, bool]:
+        """Update the monitoring of a media item. \
+            See `MediaDatabaseManager.update_monitoring`."""
+        return await run_async_write(
+            self._manager.update_monitoring, media_id, monitor
+        )
+
+    async def update_monitoring_bulk(
+        self, media_ids: list[int], monitor: bool
+    ) -> None:
+        """Update the monitoring of media items. \
+            See `MediaDatabaseManager.update_monitoring_bulk`."""
+        return await run_async_write(
+            self._manager.update_monitoring_bulk, media_ids, monitor
+        )
+
+    async def update_trailer_exists(
+        self, media_id: int, trailer_exists: bool
+    ) -> None:
+        """Update the trailer exists flag of a media item. \
+            See `MediaDatabaseManager.update_trailer_exists`."""
+        return await run_async_write(
+            self._manager.update_trailer_exists, media_id, trailer_exists
+        )
+
+    async def update_ytid(self, media_id: int, yt_id: str) -> None:
+        """Update the YouTube id of a media item. \
+            See `MediaDatabaseManager.update_ytid`."""
+        return await run_async_write(
+            self._manager.update_ytid, media_id, yt_id
+        )
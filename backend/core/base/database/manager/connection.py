@@ -1,4 +1,6 @@
+from datetime import datetime
 from sqlmodel import Session, select
+from core.base.database.manager.general import invalidate_stats
 from core.base.database.models.connection import (
     ArrType,
     Connection,
@@ -9,7 +11,12 @@ from core.base.database.models.connection import (
     PathMapping,
 )
 
-from core.base.database.utils.engine import manage_session
+from core.base.database.utils.engine import (
+    manage_session,
+    manage_write_session,
+    run_async_read,
+    run_async_write,
+)
 from exceptions import ItemNotFoundError
 from core.radarr.api_manager import RadarrManager
 from core.sonarr.api_manager import SonarrManager
@@ -18,18 +25,13 @@ from core.sonarr.api_manager import SonarrManager
 class ConnectionDatabaseManager:
     """CRUD operations for the Connection database table"""
 
-    @manage_session
     async def create(
         self,
         connection: ConnectionCreate,
-        *,
-        _session: Session = None,  # type: ignore
     ) -> tuple[str, int]:
         """Create a new connection in the database \n
         Args:
-            connection (Connection): The connection to create
-            _session (optional): A session to use for the database connection. \
-                Defaults to None, in which case a new session is created. \n
+            connection (Connection): The connection to create \n
         Returns:
             tuple(str, int): The status message of the connection with version if created. \
                 and the id of the created connection. \n
@@ -40,7 +42,22 @@ class ConnectionDatabaseManager:
             ValidationError: If the connection is invalid
         """
         # Validate the connection details, will raise an error if invalid
+        # Validated before writing, so the write isn't held up by the API
         status = await validate_connection(connection)
+        connection_id = self._create(connection)
+        return status, connection_id
+
+    @manage_write_session
+    def _create(
+        self,
+        connection: ConnectionCreate,
+        *,
+        _session: Session = None,  # type: ignore
+    ) -> int:
+        """🚨This is a private method🚨 \n
+        Create a new connection in the database, without validating it. \n
+        Returns:
+            int: The id of the created connection."""
         # Convert path mappings to database objects
         # Calling Connection.model_validate(connection) will raise an error \
         # with the current implementation of PathMappingCRU
@@ -57,7 +74,7 @@ class ConnectionDatabaseManager:
         _session.add(db_connection)
         _session.commit()
         assert db_connection.id is not None
-        return status, db_connection.id
+        return db_connection.id
 
     @manage_session
     def check_if_exists(
@@ -246,20 +263,15 @@ class ConnectionDatabaseManager:
         connection_read = ConnectionRead.model_validate(connection)
         return connection_read
 
-    @manage_session
     async def update(
         self,
         connection_id: int,
         connection_update: ConnectionUpdate,
-        *,
-        _session: Session = None,  # type: ignore
     ) -> ConnectionRead:
         """Update an existing connection in the database\n
         Args:
             connection_id (int): The id of the connection to update
-            connection (Connection): The connection to update
-            _session (optional): A session to use for the database connection. \
-                Defaults to None, in which case a new session is created. \n
+            connection (Connection): The connection to update \n
         Returns:
             ConnectionRead: The updated read-only connection object. \n
         Raises:
@@ -268,6 +280,27 @@ class ConnectionDatabaseManager:
             InvalidResponseError: If API response is invalid
             ItemNotFoundError: If a connection with provided id does not exist
         """
+        # Validate the updated connection details, before writing them
+        db_connection = self.read(connection_id)
+        connection_update_data = connection_update.model_dump(
+            exclude_unset=True, exclude={"path_mappings"}
+        )
+        await validate_connection(
+            db_connection.model_copy(update=connection_update_data)
+        )
+        return self._update(connection_id, connection_update)
+
+    @manage_write_session
+    def _update(
+        self,
+        connection_id: int,
+        connection_update: ConnectionUpdate,
+        *,
+        _session: Session = None,  # type: ignore
+    ) -> ConnectionRead:
+        """🚨This is a private method🚨 \n
+        Update an existing connection in the database, without validating it.
+        """
         # Get the connection from the database
         db_connection = self._get_db_item(connection_id, _session=_session)
         # Update the connection details from input
@@ -279,14 +312,43 @@ class ConnectionDatabaseManager:
         self._update_path_mappings(
             db_connection, connection_update, _session=_session
         )
-        # Validate the connection details
-        await validate_connection(db_connection)
         # Commit the changes to the database
         _session.add(db_connection)
         _session.commit()
         return ConnectionRead.model_validate(db_connection)
 
-    @manage_session
+    @manage_write_session
+    def update_synced_at(
+        self,
+        connection_id: int,
+        synced_at: datetime,
+        full_sync: bool,
+        *,
+        _session: Session = None,  # type: ignore
+    ) -> None:
+        """Update the sync watermark of a connection after a successful \
+            refresh from Arr API \n
+        Args:
+            connection_id (int): The id of the connection to update
+            synced_at (datetime): Start time of the refresh
+            full_sync (bool): True if all media was refreshed, also updates \
+                the last full sync time
+            _session (optional): A session to use for the database connection. \
+                Defaults to None, in which case a new session is created. \n
+        Returns:
+            None \n
+        Raises:
+            ItemNotFoundError: If a connection with provided id does not exist
+        """
+        db_connection = self._get_db_item(connection_id, _session=_session)
+        db_connection.last_synced_at = synced_at
+        if full_sync:
+            db_connection.last_full_synced_at = synced_at
+        _session.add(db_connection)
+        _session.commit()
+        return
+
+    @manage_write_session
     def delete(
         self,
         connection_id: int,
@@ -303,6 +365,8 @@ class ConnectionDatabaseManager:
         Raises:
             ItemNotFoundError: If a connection with provided id does not exist
         """
+        # Media of the connection is deleted on cascade
+        invalidate_stats(_session)
         connection = self._get_db_item(connection_id, _session=_session)
         _session.delete(connection)
         # # Delete all path mappings associated with the connection
@@ -317,6 +381,56 @@ class ConnectionDatabaseManager:
         return True
 
 
+class AsyncConnectionDatabaseManager:
+    """Async counterpart of `ConnectionDatabaseManager` for the API routes. \n
+    Reads run in worker threads and writes are awaited from the \
+        database writer, so the event loop is not blocked by the database. \n
+    See the methods of `ConnectionDatabaseManager` for the details."""
+
+    def __init__(self) -> None:
+        self._manager = ConnectionDatabaseManager()
+
+    async def create(self, connection: ConnectionCreate) -> tuple[str, int]:
+        """Validate and create a new connection. \
+            See `ConnectionDatabaseManager.create`."""
+        status = await validate_connection(connection)
+        connection_id = await run_async_write(
+            self._manager._create, connection
+        )
+        return status, connection_id
+
+    async def read_all(self) -> list[ConnectionRead]:
+        """Read all connections. See `ConnectionDatabaseManager.read_all`."""
+        return await run_async_read(self._manager.read_all)
+
+    async def read(self, connection_id: int) -> ConnectionRead:
+        """Read a connection by id. See `ConnectionDatabaseManager.read`."""
+        return await run_async_read(self._manager.read, connection_id)
+
+    async def update(
+        self,
+        connection_id: int,
+        connection_update: ConnectionUpdate,
+    ) -> ConnectionRead:
+        """Validate and update an existing connection. \
+            See `ConnectionDatabaseManager.update`."""
+        db_connection = await self.read(connection_id)
+        connection_update_data = connection_update.model_dump(
+            exclude_unset=True, exclude={"path_mappings"}
+        )
+        await validate_connection(
+            db_connection.model_copy(update=connection_update_data)
+        )
+        return await run_async_write(
+            self._manager._update, connection_id, connection_update
+        )
+
+    async def delete(self, connection_id: int) -> bool:
+        """Delete a connection by id. \
+            See `ConnectionDatabaseManager.delete`."""
+        return await run_async_write(self._manager.delete, connection_id)
+
+
 async def validate_connection(connection: ConnectionBase) -> str:
     """Validate the connection details and test the connection to the server \n
     Args:
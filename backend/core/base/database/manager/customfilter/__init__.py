@@ -4,6 +4,7 @@ from core.base.database.manager.customfilter.create import (
 from core.base.database.manager.customfilter.delete import delete_customfilter
 from core.base.database.manager.customfilter.read import (
     get_all_customfilters,
+    get_customfilter,
     get_home_customfilters,
     get_movie_customfilters,
     get_series_customfilters,
@@ -14,6 +15,7 @@ __ALL__ = [
     create_customfilter,
     delete_customfilter,
     get_all_customfilters,
+    get_customfilter,
     get_home_customfilters,
     get_movie_customfilters,
     get_series_customfilters,
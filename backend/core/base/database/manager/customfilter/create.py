@@ -6,10 +6,10 @@ from core.base.database.models.customfilter import (
     CustomFilterRead,
 )
 from core.base.database.models.filter import Filter
-from core.base.database.utils.engine import manage_session
+from core.base.database.utils.engine import manage_write_session
 
 
-@manage_session
+@manage_write_session
 def create_customfilter(
     filter_create: CustomFilterCreate,
     *,
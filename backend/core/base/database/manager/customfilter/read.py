@@ -1,11 +1,38 @@
 from sqlmodel import Session, select
-from core.base.database.manager.customfilter.base import convert_to_read_list
+from core.base.database.manager.customfilter.base import (
+    convert_to_read_item,
+    convert_to_read_list,
+)
 from core.base.database.models.customfilter import (
     CustomFilter,
     CustomFilterRead,
     FilterType,
 )
 from core.base.database.utils.engine import manage_session
+from exceptions import ItemNotFoundError
+
+
+@manage_session
+def get_customfilter(
+    customfilter_id: int,
+    *,
+    _session: Session = None,  # type: ignore
+) -> CustomFilterRead:
+    """
+    Get a custom filter by ID.
+    Args:
+        customfilter_id (int): The ID of the custom filter to retrieve.
+        _session (Session, optional=None): A session to use for the \
+            database connection. A new session is created if not provided.
+    Returns:
+        CustomFilterRead: The custom filter (read-only).
+    Raises:
+        ItemNotFoundError: If the custom filter with the given ID is not found.
+    """
+    db_customfilter = _session.get(CustomFilter, customfilter_id)
+    if db_customfilter is None:
+        raise ItemNotFoundError(model_name="CustomFilter", id=customfilter_id)
+    return convert_to_read_item(db_customfilter)
 
 
 @manage_session
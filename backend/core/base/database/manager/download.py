@@ -0,0 +1,402 @@
+from datetime import datetime, timedelta, timezone
+from typing import Sequence
+
+from sqlalchemy import and_, case, func, literal, or_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlmodel import Session, col, delete, desc, select, update
+
+from core.base.database.models.download import (
+    DownloadJob,
+    DownloadJobRead,
+    DownloadPriority,
+    get_current_time,
+)
+from core.base.database.models.media import Media
+from core.base.database.utils.engine import (
+    manage_session,
+    manage_write_session,
+)
+
+# Jobs are dropped after failing (or being interrupted) this many times
+MAX_ATTEMPTS = 3
+# Seconds a claimed job is hidden from other workers, unless extended
+VISIBILITY_TIMEOUT = 15 * 60
+# Seconds to wait before retrying a failed job, times the attempts
+RETRY_DELAY = 5 * 60
+_CHUNK_SIZE = 500
+
+
+class DownloadQueueManager:
+    """Persistent queue of trailer downloads, one job per media. \n
+    Jobs are claimed by workers in the order of priority and then of \
+        queueing. A claimed job is hidden for a visibility timeout, after \
+        which it's claimed again if the worker didn't complete it, so jobs \
+        of a crashed worker are not lost.
+    """
+
+    @manage_write_session
+    def enqueue(
+        self,
+        media_ids: Sequence[int],
+        profile_id: int,
+        priority: DownloadPriority,
+        yt_id: str | None = None,
+        retry_count: int = 2,
+        *,
+        _session: Session = None,  # type: ignore
+    ) -> int:
+        """Queue trailer downloads for the media with given ids. \n
+        Media already in the queue is not queued again, its job keeps the \
+            highest of both priorities, and the profile, youtube id and \
+            retry count of the request with that priority. A job waiting \
+            to be retried is made available again. A claimed job that is \
+            requested with another profile or youtube id is marked as \
+            requeued, and downloaded again once the worker completes it. \n
+        Media ids that don't exist in the database are ignored.\n
+        Args:
+            media_ids (Sequence[int]): Ids of the media to download \
+                trailers for.
+            profile_id (int): Id of the trailer profile to use.
+            priority (DownloadPriority): Priority of the downloads.
+            yt_id (str, Optional): YouTube id of the trailer to download. \
+                Default is None, in which case the trailer is searched.
+            retry_count (int, Optional): Number of retries if download \
+                fails. Default is 2.
+            _session (Session, Optional): A session to use for the database connection.\
+                Default is None, in which case a new session will be created.\n
+        Returns:
+            int: Number of jobs created or updated.
+        """
+        now = get_current_time()
+        queued = 0
+        for i in range(0, len(media_ids), _CHUNK_SIZE):
+            chunk = media_ids[i : i + _CHUNK_SIZE]
+            statement = sqlite_insert(DownloadJob).from_select(
+                [
+                    "media_id",
+                    "profile_id",
+                    "priority",
+                    "yt_id",
+                    "retry_count",
+                    "attempts",
+                    "created_at",
+                    "visible_at",
+                ],
+                select(
+                    col(Media.id),
+                    literal(profile_id),
+                    literal(int(priority)),
+                    literal(yt_id),
+                    literal(retry_count),
+                    literal(0),
+                    literal(now),
+                    literal(now),
+                ).where(col(Media.id).in_(chunk)),
+            )
+            excluded = statement.excluded
+            is_replaced = excluded.priority >= DownloadJob.priority
+            is_waiting = col(DownloadJob.claimed_at).is_(None)
+            # Worker of a claimed job already loaded the old request
+            is_requeued = and_(
+                is_replaced,
+                col(DownloadJob.claimed_at).is_not(None),
+                or_(
+                    excluded.profile_id != DownloadJob.profile_id,
+                    excluded.yt_id.is_distinct_from(DownloadJob.yt_id),
+                ),
+            )
+            statement = statement.on_conflict_do_update(
+                index_elements=["media_id"],
+                set_={
+                    "priority": func.max(
+                        DownloadJob.priority, excluded.priority
+                    ),
+                    "profile_id": case(
+                        (is_replaced, excluded.profile_id),
+                        else_=DownloadJob.profile_id,
+                    ),
+                    "yt_id": case(
+                        (is_replaced, excluded.yt_id),
+                        else_=DownloadJob.yt_id,
+                    ),
+                    "retry_count": case(
+                        (is_replaced, excluded.retry_count),
+                        else_=DownloadJob.retry_count,
+                    ),
+                    "attempts": case(
+                        (or_(is_waiting, is_requeued), 0),
+                        else_=DownloadJob.attempts,
+                    ),
+                    "visible_at": case(
+                        (is_waiting, excluded.visible_at),
+                        else_=DownloadJob.visible_at,
+                    ),
+                    "requeued": case(
+                        (is_requeued, True), else_=DownloadJob.requeued
+                    ),
+                },
+            )
+            result = _session.exec(statement)  # type: ignore
+            queued += result.rowcount
+        _session.commit()
+        return queued
+
+    @manage_write_session
+    def claim(
+        self,
+        visibility_timeout: int = VISIBILITY_TIMEOUT,
+        *,
+        _session: Session = None,  # type: ignore
+    ) -> DownloadJobRead | None:
+        """Claim the next available job in the queue, with a single \
+            statement, so that a job is never claimed by two workers. \n
+        The job is hidden from other workers until the visibility timeout \
+            passes, extend it with `extend` for long downloads. Jobs claimed \
+            `MAX_ATTEMPTS` times whose timeout passed are removed, so a \
+            download that crashes the worker is not retried forever.\n
+        Args:
+            visibility_timeout (int, Optional): Seconds to hide the job for. \
+                Default is `VISIBILITY_TIMEOUT`.
+            _session (Session, Optional): A session to use for the database connection.\
+                Default is None, in which case a new session will be created.\n
+        Returns:
+            DownloadJobRead | None: The claimed job, None if no job is \
+                available.
+        """
+        now = get_current_time()
+        is_available = col(DownloadJob.visible_at) <= now
+        has_attempts_left = col(DownloadJob.attempts) < MAX_ATTEMPTS
+        _session.exec(
+            delete(DownloadJob).where(
+                and_(is_available, ~has_attempts_left)
+            )  # type: ignore
+        )
+        next_job_id = (
+            select(DownloadJob.id)
+            .where(is_available, has_attempts_left)
+            .order_by(desc(DownloadJob.priority), col(DownloadJob.id))
+            .limit(1)
+            .scalar_subquery()
+        )
+        statement = (
+            update(DownloadJob)
+            .where(col(DownloadJob.id) == next_job_id)
+            .values(
+                attempts=DownloadJob.attempts + 1,
+                claimed_at=now,
+                visible_at=now + timedelta(seconds=visibility_timeout),
+                requeued=False,
+            )
+            .returning(DownloadJob)
+        )
+        db_job = _session.exec(statement).scalars().first()  # type: ignore
+        job = DownloadJobRead.model_validate(db_job) if db_job else None
+        _session.commit()
+        return job
+
+    @manage_write_session
+    def extend(
+        self,
+        job_id: int,
+        visibility_timeout: int = VISIBILITY_TIMEOUT,
+        *,
+        _session: Session = None,  # type: ignore
+    ) -> None:
+        """Keep a claimed job hidden for the visibility timeout from now.\n
+        Args:
+            job_id (int): Id of the claimed job.
+            visibility_timeout (int, Optional): Seconds to hide the job for. \
+                Default is `VISIBILITY_TIMEOUT`.
+            _session (Session, Optional): A session to use for the database connection.\
+                Default is None, in which case a new session will be created.\n
+        Returns:
+            None
+        """
+        visible_at = get_current_time() + timedelta(seconds=visibility_timeout)
+        statement = (
+            update(DownloadJob)
+            .where(col(DownloadJob.id) == job_id)
+            .where(col(DownloadJob.claimed_at).is_not(None))
+            .values(visible_at=visible_at)
+        )
+        _session.exec(statement)  # type: ignore
+        _session.commit()
+        return
+
+    @manage_write_session
+    def complete(
+        self,
+        job_id: int,
+        *,
+        _session: Session = None,  # type: ignore
+    ) -> None:
+        """Remove a finished job from the queue. A job requeued while it \
+            was claimed is kept, and made available again.\n
+        Args:
+            job_id (int): Id of the job.
+            _session (Session, Optional): A session to use for the database connection.\
+                Default is None, in which case a new session will be created.\n
+        Returns:
+            None
+        """
+        db_job = _session.get(DownloadJob, job_id)
+        if db_job is None:
+            return
+        if db_job.requeued:
+            self._release_requeued(db_job, _session)
+            return
+        _session.delete(db_job)
+        _session.commit()
+        return
+
+    @manage_write_session
+    def fail(
+        self,
+        job_id: int,
+        error: str,
+        retry_delay: int = RETRY_DELAY,
+        *,
+        _session: Session = None,  # type: ignore
+    ) -> bool:
+        """Release a failed job, to be retried after a delay that grows \
+            with the attempts. Jobs that failed `MAX_ATTEMPTS` times are \
+            removed from the queue.\n
+        Args:
+            job_id (int): Id of the job.
+            error (str): The error of the failed attempt.
+            retry_delay (int, Optional): Seconds to wait before the first \
+                retry. Default is `RETRY_DELAY`.
+            _session (Session, Optional): A session to use for the database connection.\
+                Default is None, in which case a new session will be created.\n
+        Returns:
+            bool: True if the job will be retried, False if it was removed.
+        """
+        db_job = _session.get(DownloadJob, job_id)
+        if db_job is None:
+            return False
+        if db_job.requeued:
+            # Failed download was of the previous request
+            self._release_requeued(db_job, _session)
+            return True
+        if db_job.attempts >= MAX_ATTEMPTS:
+            _session.delete(db_job)
+            _session.commit()
+            return False
+        db_job.claimed_at = None
+        db_job.last_error = error
+        db_job.visible_at = get_current_time() + timedelta(
+            seconds=retry_delay * db_job.attempts
+        )
+        _session.add(db_job)
+        _session.commit()
+        return True
+
+    def _release_requeued(self, db_job: DownloadJob, session: Session) -> None:
+        """🚨This is a private method🚨 \n
+        Make a job requeued while it was claimed available again, as a \
+            new request."""
+        db_job.requeued = False
+        db_job.claimed_at = None
+        db_job.attempts = 0
+        db_job.last_error = None
+        db_job.visible_at = get_current_time()
+        session.add(db_job)
+        session.commit()
+        return
+
+    @manage_write_session
+    def recover(
+        self,
+        *,
+        _session: Session = None,  # type: ignore
+    ) -> int:
+        """Make the jobs claimed before a restart available again, without \
+            waiting for their visibility timeout. \n
+        🚨 Call this only on startup, before any worker is started. 🚨 \n
+        Jobs that were interrupted `MAX_ATTEMPTS` times are removed, so a \
+            download that crashes the app is not retried forever.\n
+        Args:
+            _session (Session, Optional): A session to use for the database connection.\
+                Default is None, in which case a new session will be created.\n
+        Returns:
+            int: Number of jobs made available again.
+        """
+        is_claimed = col(DownloadJob.claimed_at).is_not(None)
+        _session.exec(
+            delete(DownloadJob).where(
+                and_(is_claimed, col(DownloadJob.attempts) >= MAX_ATTEMPTS)
+            )  # type: ignore
+        )
+        result = _session.exec(
+            update(DownloadJob)
+            .where(is_claimed)
+            .values(claimed_at=None, visible_at=get_current_time())
+        )  # type: ignore
+        _session.commit()
+        return result.rowcount
+
+    @manage_session
+    def count(
+        self,
+        ready_only: bool = False,
+        *,
+        _session: Session = None,  # type: ignore
+    ) -> int:
+        """Count the jobs in the queue.\n
+        Args:
+            ready_only (bool, Optional): Count only the jobs that can be \
+                claimed now. Default is False.
+            _session (Session, Optional): A session to use for the database connection.\
+                Default is None, in which case a new session will be created.\n
+        Returns:
+            int: Number of jobs.
+        """
+        statement = select(func.count()).select_from(DownloadJob)
+        if ready_only:
+            statement = statement.where(
+                col(DownloadJob.visible_at) <= get_current_time()
+            )
+        return _session.exec(statement).one()
+
+    @manage_session
+    def next_visible_at(
+        self,
+        *,
+        _session: Session = None,  # type: ignore
+    ) -> datetime | None:
+        """Get the time when the next job of the queue can be claimed, \
+            for jobs waiting to be retried or claimed by a worker.\n
+        Args:
+            _session (Session, Optional): A session to use for the database connection.\
+                Default is None, in which case a new session will be created.\n
+        Returns:
+            datetime | None: Time in UTC, can be in the past if a job is \
+                available now. None if the queue is empty.
+        """
+        statement = select(func.min(DownloadJob.visible_at)).where(
+            col(DownloadJob.attempts) < MAX_ATTEMPTS
+        )
+        visible_at = _session.exec(statement).one()
+        if visible_at is None:
+            return None
+        # SQLite doesn't keep the timezone
+        return visible_at.replace(tzinfo=timezone.utc)
+
+    @manage_session
+    def read_all(
+        self,
+        *,
+        _session: Session = None,  # type: ignore
+    ) -> list[DownloadJobRead]:
+        """Read all jobs in the queue, in the order they are claimed.\n
+        Args:
+            _session (Session, Optional): A session to use for the database connection.\
+                Default is None, in which case a new session will be created.\n
+        Returns:
+            list[DownloadJobRead]: List of jobs.
+        """
+        statement = select(DownloadJob).order_by(
+            desc(DownloadJob.priority), col(DownloadJob.id)
+        )
+        db_jobs = _session.exec(statement).all()
+        return [DownloadJobRead.model_validate(job) for job in db_jobs]
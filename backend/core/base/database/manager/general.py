@@ -1,8 +1,11 @@
+import threading
+from typing import Any, Callable
 from pydantic import BaseModel
-from sqlmodel import Session, col, select
+from sqlalchemy import event
+from sqlmodel import Session, and_, case, col, func, select
 
 from core.base.database.models.media import Media
-from core.base.database.utils.engine import manage_session
+from core.base.database.utils.engine import engine, manage_session
 
 
 class ServerStats(BaseModel):
@@ -14,37 +17,127 @@ class ServerStats(BaseModel):
     series_monitored: int
 
 
+class _StatsSnapshot:
+    """Last stats read from the database, valid until media is changed. \n
+    Writes that change the counted media (or delete a connection, as media \
+        is deleted on cascade) invalidate the snapshot with \
+        `invalidate_stats`."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._version = 0
+        self._stats: ServerStats | None = None
+        self._stats_version = -1
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._version += 1
+
+    def get(self, read_stats: Callable[[], ServerStats]) -> ServerStats:
+        """Get the stats from the snapshot, reading them from the database \
+            with `read_stats` if media changed since the snapshot was taken.
+        """
+        with self._lock:
+            if self._stats and self._stats_version == self._version:
+                return self._stats.model_copy()
+            version = self._version
+        stats = read_stats()
+        with self._lock:
+            # Media changed while reading, keep it for the version it was
+            # read in, so that it's read again on next call
+            if version > self._stats_version:
+                self._stats = stats
+                self._stats_version = version
+        return stats.model_copy()
+
+
+_stats_snapshot = _StatsSnapshot()
+
+
+def invalidate_stats(session: Session) -> None:
+    """Invalidate the stats snapshot, for a write that changes media. \n
+    Call it from the write, with its session. The snapshot is invalidated \
+        again when the transaction is committed, so that stats read while \
+        the write was in progress are not kept. \n
+    Args:
+        session (Session): Session of the write."""
+    session.connection().info["media_changed"] = True
+    _stats_snapshot.invalidate()
+
+
+@event.listens_for(engine, "commit")
+def _track_media_commit(conn) -> None:
+    """Keep the mark of the connection set by `invalidate_stats` until \
+        it's checked in to the pool, as this event is called just before \
+        the commit."""
+    if conn.info.pop("media_changed", False):
+        conn.info["media_committed"] = True
+        _stats_snapshot.invalidate()
+
+
+@event.listens_for(engine, "rollback")
+def _track_media_rollback(conn) -> None:
+    conn.info.pop("media_changed", None)
+
+
+@event.listens_for(engine, "checkin")
+def _invalidate_stats(dbapi_connection: Any, connection_record: Any) -> None:
+    """Invalidate the stats snapshot after media changes are committed."""
+    if connection_record.info.pop("media_committed", False):
+        _stats_snapshot.invalidate()
+
+
 class GeneralDatabaseManager:
 
-    @manage_session
     def get_stats(
         self,
         *,
         _session: Session = None,  # type: ignore
     ) -> ServerStats:
-        # Downloaded trailers count
-        statement = select(Media.id).where(col(Media.downloaded_at).is_not(None))
-        _downloaded = len(_session.exec(statement).all())
-
-        # Detected trailers count
-        statement = select(Media.id).where(col(Media.trailer_exists).is_(True))
-        _detected = len(_session.exec(statement).all())
-
-        # Movies Total
-        movies_statement = select(Media.id).where(col(Media.is_movie).is_(True))
-        _movies_count = len(_session.exec(movies_statement).all())
+        """Get the media and trailer counts. \n
+        Stats are read from the database only if media changed since the \
+            last call, otherwise the previous stats are returned. \n
+        Args:
+            _session (Session, Optional): A session to use for the database connection. \
+                Default is None, in which case a new session will be created. \n
+        Returns:
+            ServerStats: The media and trailer counts."""
+        return _stats_snapshot.get(lambda: self._read_stats(_session=_session))
 
-        # Movies Monitored
-        statement = movies_statement.where(col(Media.monitor).is_(True))
-        _movies_monitored_count = len(_session.exec(statement).all())
+    @manage_session
+    def _read_stats(
+        self,
+        *,
+        _session: Session = None,  # type: ignore
+    ) -> ServerStats:
+        """🚨This is a private method🚨 \n
+        Read the media and trailer counts with a single aggregate query."""
 
-        # Series Total
-        series_statement = select(Media.id).where(col(Media.is_movie).is_(False))
-        _series_count = len(_session.exec(series_statement).all())
+        def _count_if(*conditions) -> Any:
+            return func.coalesce(
+                func.sum(case((and_(*conditions), 1), else_=0)), 0
+            )
 
-        # Series Monitored
-        statement = series_statement.where(col(Media.monitor).is_(True))
-        _series_monitored_count = len(_session.exec(statement).all())
+        is_movie = col(Media.is_movie).is_(True)
+        is_series = col(Media.is_movie).is_(False)
+        is_monitored = col(Media.monitor).is_(True)
+        statement = select(
+            # COUNT of a column skips NULLs
+            func.count(col(Media.downloaded_at)),
+            _count_if(col(Media.trailer_exists).is_(True)),
+            _count_if(is_movie),
+            _count_if(is_movie, is_monitored),
+            _count_if(is_series),
+            _count_if(is_series, is_monitored),
+        )
+        (
+            _downloaded,
+            _detected,
+            _movies_count,
+            _movies_monitored_count,
+            _series_count,
+            _series_monitored_count,
+        ) = _session.exec(statement).one()
 
         return ServerStats(
             trailers_downloaded=_downloaded,
@@ -5,7 +5,7 @@ from core.base.database.manager.media import logger
 from core.base.database.manager.media.base import BaseMediaManager
 from core.base.database.models.helpers import MediaUpdateDC
 from core.base.database.models.media import Media, MediaCreate, MediaRead, MediaUpdate
-from core.base.database.utils.engine import manage_session
+from core.base.database.utils.engine import manage_write_session
 
 _base = BaseMediaManager()
 
@@ -56,7 +56,7 @@ class MediaCreateUpdateManager:
             session.add(db_media)
             return db_media, True, False
 
-    @manage_session
+    @manage_write_session
     def create_or_update_bulk(
         self,
         media_create_list: list[MediaCreate],
@@ -98,7 +98,7 @@ class MediaCreateUpdateManager:
         ]
 
     # DELETE LATER - NOT USING ANYWHERE
-    @manage_session
+    @manage_write_session
     def update(
         self,
         media_id: int,
@@ -132,7 +132,7 @@ class MediaCreateUpdateManager:
             _session.commit()
         return
 
-    @manage_session
+    @manage_write_session
     def update_bulk(
         self,
         media_updates: list[tuple[int, MediaUpdate]],
@@ -155,7 +155,7 @@ class MediaCreateUpdateManager:
         _session.commit()
         return
 
-    @manage_session
+    @manage_write_session
     def update_media_status(
         self,
         media_update: MediaUpdateDC,
@@ -186,7 +186,7 @@ class MediaCreateUpdateManager:
             _session.commit()
         return
 
-    @manage_session
+    @manage_write_session
     def update_media_status_bulk(
         self,
         media_update_list: Sequence[MediaUpdateDC],
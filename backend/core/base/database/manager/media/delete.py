@@ -3,7 +3,7 @@ from sqlmodel import col, select, Session
 from core.base.database.manager.media import logger
 from core.base.database.manager.media.base import BaseMediaManager
 from core.base.database.models.media import Media
-from core.base.database.utils.engine import manage_session
+from core.base.database.utils.engine import manage_write_session
 from exceptions import ItemNotFoundError
 
 _base = BaseMediaManager()
@@ -13,7 +13,7 @@ class DeleteMediaManager:
 
     __model_name = "Media"
 
-    @manage_session
+    @manage_write_session
     def delete(
         self,
         media_id: int,
@@ -35,7 +35,7 @@ class DeleteMediaManager:
         _session.commit()
         return
 
-    @manage_session
+    @manage_write_session
     def delete_bulk(
         self,
         media_ids: list[int],
@@ -64,7 +64,7 @@ class DeleteMediaManager:
         _session.commit()
         return
 
-    @manage_session
+    @manage_write_session
     def delete_except(
         self,
         connection_id: int,
@@ -1,25 +1,37 @@
 from core.base.database.manager.trailerprofile.create import (
     create_trailerprofile,
+    create_trailerprofile_async,
 )
 from core.base.database.manager.trailerprofile.delete import (
     delete_trailerprofile,
+    delete_trailerprofile_async,
 )
 from core.base.database.manager.trailerprofile.read import (
     get_trailer_folders,
     get_trailerprofile,
+    get_trailerprofile_async,
     get_trailerprofiles,
+    get_trailerprofiles_async,
 )
 from core.base.database.manager.trailerprofile.update import (
     update_trailerprofile,
+    update_trailerprofile_async,
     update_trailerprofile_setting,
+    update_trailerprofile_setting_async,
 )
 
 __ALL__ = [
     create_trailerprofile,
+    create_trailerprofile_async,
     delete_trailerprofile,
+    delete_trailerprofile_async,
     get_trailerprofile,
+    get_trailerprofile_async,
     get_trailerprofiles,
+    get_trailerprofiles_async,
     get_trailer_folders,
     update_trailerprofile,
+    update_trailerprofile_async,
     update_trailerprofile_setting,
+    update_trailerprofile_setting_async,
 ]
@@ -10,12 +10,15 @@ from core.base.database.models.trailerprofile import (
     TrailerProfileCreate,
     TrailerProfileRead,
 )
-from core.base.database.utils.engine import manage_session
+from core.base.database.utils.engine import (
+    manage_write_session,
+    run_async_write,
+)
 
 logger = ModuleLogger("TrailerProfileManager")
 
 
-@manage_session
+@manage_write_session
 def create_trailerprofile(
     trailerprofile_create: TrailerProfileCreate,
     *,
@@ -43,3 +46,19 @@ def create_trailerprofile(
         f" {db_trailerprofile.customfilter.filter_name}"
     )
     return convert_to_read_item(db_trailerprofile)
+
+
+async def create_trailerprofile_async(
+    trailerprofile_create: TrailerProfileCreate,
+) -> TrailerProfileRead:
+    """
+    Async counterpart of `create_trailerprofile`, awaits the write \
+        without blocking the event loop.
+    Args:
+        trailerprofile_create (TrailerProfileCreate): TrailerProfileCreate model
+    Returns:
+        TrailerProfileRead: TrailerProfileRead object
+    Raises:
+        ValidationError: If the input data is not valid.
+    """
+    return await run_async_write(create_trailerprofile, trailerprofile_create)
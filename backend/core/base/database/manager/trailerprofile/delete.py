@@ -2,13 +2,16 @@ from sqlmodel import Session
 
 from app_logger import ModuleLogger
 from core.base.database.models.trailerprofile import TrailerProfile
-from core.base.database.utils.engine import manage_session
+from core.base.database.utils.engine import (
+    manage_write_session,
+    run_async_write,
+)
 from exceptions import ItemNotFoundError
 
 logger = ModuleLogger("TrailerProfileManager")
 
 
-@manage_session
+@manage_write_session
 def delete_trailerprofile(
     id: int, *, _session: Session = None  # type: ignore
 ) -> bool:
@@ -44,3 +47,17 @@ def delete_trailerprofile(
         f" {db_trailerprofile.customfilter.filter_name}"
     )
     return True
+
+
+async def delete_trailerprofile_async(id: int) -> bool:
+    """
+    Async counterpart of `delete_trailerprofile`, awaits the write \
+        without blocking the event loop.
+    Args:
+        id (int): The id of the trailer profile to delete.
+    Returns:
+        bool: True if the trailer profile was deleted successfully.
+    Raises:
+        ItemNotFoundError: If the trailer profile with the given id does not exist.
+    """
+    return await run_async_write(delete_trailerprofile, id)
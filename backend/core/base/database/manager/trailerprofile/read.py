@@ -7,7 +7,7 @@ from core.base.database.models.trailerprofile import (
     TrailerProfile,
     TrailerProfileRead,
 )
-from core.base.database.utils.engine import manage_session
+from core.base.database.utils.engine import manage_session, run_async_read
 from exceptions import ItemNotFoundError
 
 
@@ -70,3 +70,29 @@ def get_trailer_folders(
     statement = select(TrailerProfile.folder_name).distinct()
     db_trailerprofiles = _session.exec(statement).all()
     return {folder.strip() for folder in db_trailerprofiles if folder.strip()}
+
+
+async def get_trailerprofile_async(
+    trailerprofile_id: int,
+) -> TrailerProfileRead:
+    """
+    Async counterpart of `get_trailerprofile`, reads the trailer profile \
+        without blocking the event loop.
+    Args:
+        trailerprofile_id (int): The ID of the trailer profile to retrieve.
+    Returns:
+        TrailerProfileRead: The trailer profile (read-only).
+    Raises:
+        ItemNotFoundError: If the trailer profile with the given ID is not found.
+    """
+    return await run_async_read(get_trailerprofile, trailerprofile_id)
+
+
+async def get_trailerprofiles_async() -> list[TrailerProfileRead]:
+    """
+    Async counterpart of `get_trailerprofiles`, reads the trailer \
+        profiles without blocking the event loop.
+    Returns:
+        list[TrailerProfileRead]: List of trailer profiles (read-only).
+    """
+    return await run_async_read(get_trailerprofiles)
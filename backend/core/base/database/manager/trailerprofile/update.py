@@ -10,13 +10,16 @@ from core.base.database.models.trailerprofile import (
     TrailerProfileCreate,
     TrailerProfileRead,
 )
-from core.base.database.utils.engine import manage_session
+from core.base.database.utils.engine import (
+    manage_write_session,
+    run_async_write,
+)
 from exceptions import ItemNotFoundError
 
 logger = ModuleLogger("TrailerProfileManager")
 
 
-@manage_session
+@manage_write_session
 def update_trailerprofile(
     trailerprofile_id: int,
     trailerprofile_create: TrailerProfileCreate,
@@ -66,7 +69,7 @@ def update_trailerprofile(
     return convert_to_read_item(trailerprofile_db)
 
 
-@manage_session
+@manage_write_session
 def update_trailerprofile_setting(
     id: int,
     setting: str,
@@ -115,3 +118,47 @@ def update_trailerprofile_setting(
         f" {trailerprofile_db.customfilter.filter_name} - {setting}: {value}"
     )
     return convert_to_read_item(trailerprofile_db)
+
+
+async def update_trailerprofile_async(
+    trailerprofile_id: int,
+    trailerprofile_create: TrailerProfileCreate,
+) -> TrailerProfileRead:
+    """
+    Async counterpart of `update_trailerprofile`, awaits the write \
+        without blocking the event loop.
+    Args:
+        trailerprofile_id (int): The ID of the trailer profile to update.
+        trailerprofile_create (TrailerProfileCreate): The new data for the trailer profile.
+    Returns:
+        TrailerProfileRead: The updated trailer profile.
+    Raises:
+        ItemNotFoundError: If the trailer profile with the given ID is not found.
+        ValueError: If the trailer profile is invalid.
+    """
+    return await run_async_write(
+        update_trailerprofile, trailerprofile_id, trailerprofile_create
+    )
+
+
+async def update_trailerprofile_setting_async(
+    id: int,
+    setting: str,
+    value: str | int | bool,
+) -> TrailerProfileRead:
+    """
+    Async counterpart of `update_trailerprofile_setting`, awaits the \
+        write without blocking the event loop.
+    Args:
+        id (int): The ID of the trailer profile to update.
+        setting (str): The name of the setting to update.
+        value (str | int | bool): The new value for the setting.
+    Returns:
+        TrailerProfileRead: The updated trailer profile.
+    Raises:
+        ItemNotFoundError: If the trailer profile with the given ID is not found.
+        ValueError: If the trailer profile is invalid.
+    """
+    return await run_async_write(
+        update_trailerprofile_setting, id, setting, value
+    )
@@ -73,6 +73,11 @@ class Connection(ConnectionBase, table=True):
 
     id: int | None = Field(default=None, primary_key=True)
     added_at: datetime = Field(default_factory=get_current_time)
+    # Start time (UTC) of the last successful refresh from Arr API,
+    # used as the watermark for delta refreshes from Arr history
+    last_synced_at: datetime | None = Field(default=None)
+    # Start time (UTC) of the last successful full refresh from Arr API
+    last_full_synced_at: datetime | None = Field(default=None)
     path_mappings: list[PathMapping] = Relationship(cascade_delete=True)
 
 
@@ -87,6 +92,8 @@ class ConnectionRead(ConnectionBase):
 
     id: int
     added_at: datetime
+    last_synced_at: datetime | None = None
+    last_full_synced_at: datetime | None = None
     path_mappings: list[PathMappingCRU]
 
 
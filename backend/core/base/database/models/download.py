@@ -0,0 +1,73 @@
+from datetime import datetime, timezone
+from enum import IntEnum
+
+from sqlalchemy import Index, desc
+from sqlmodel import Field
+
+from core.base.database.models.base import AppSQLModel
+
+
+def get_current_time():
+    return datetime.now(timezone.utc)
+
+
+class DownloadPriority(IntEnum):
+    """Priority of a queued trailer download, higher is downloaded first."""
+
+    BACKLOG = 0
+    NEW = 1
+    MANUAL = 2
+
+
+class _DownloadJobBase(AppSQLModel):
+    """Base class for the DownloadJob model. \n
+    Note: \n
+        🚨**DO NOT USE THIS CLASS DIRECTLY.**🚨 \n
+    Use DownloadJobRead instead.
+    """
+
+    media_id: int = Field(
+        foreign_key="media.id", ondelete="CASCADE", unique=True
+    )
+    profile_id: int = Field(
+        foreign_key="trailerprofile.id", ondelete="CASCADE"
+    )
+    priority: int = DownloadPriority.BACKLOG
+    yt_id: str | None = None
+    retry_count: int = 2
+    attempts: int = 0
+    last_error: str | None = None
+    created_at: datetime = Field(default_factory=get_current_time)
+    visible_at: datetime = Field(default_factory=get_current_time)
+    claimed_at: datetime | None = None
+    requeued: bool = False
+
+
+class DownloadJob(_DownloadJobBase, table=True):
+    """Database model for a queued trailer download, one per media. \n
+    A job is available to workers once `visible_at` is passed. Claiming a \
+        job hides it for the visibility timeout, so that a job of a worker \
+        that stopped without finishing it is claimed again. \n
+    `requeued` is set when the media is requested again with a different \
+        profile or youtube id while the job is claimed, so that the job is \
+        kept in the queue when the worker completes it. \n
+    Note: \n
+        🚨DO NOT USE THIS CLASS OUTSIDE OF DATABASE MANAGER.🚨 \n
+    👉Use :class:`DownloadJobRead` to read the data.👈
+    """
+
+    __table_args__ = (
+        Index(
+            "ix_downloadjob_priority_id",
+            desc("priority"),
+            "id",
+        ),
+    )
+
+    id: int | None = Field(default=None, primary_key=True)
+
+
+class DownloadJobRead(_DownloadJobBase):
+    """Model for reading a queued trailer download."""
+
+    id: int
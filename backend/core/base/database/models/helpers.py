@@ -1,7 +1,6 @@
 from dataclasses import dataclass
 from datetime import datetime
 
-from core.base.database.models.base import AppSQLModel
 from core.base.database.models.media import MonitorStatus
 
 
@@ -33,8 +32,39 @@ class MediaImage:
 #         return asdict(self)
 
 
-# @dataclass(eq=False, frozen=True, repr=False, slots=True)
-class MediaReadDC(AppSQLModel):
+@dataclass(eq=False, repr=False, slots=True)
+class MediaCreateDC:
+    """Media parsed from Arr data, for syncing to the database. \n
+    Lightweight version of `MediaCreate` without validation, used in the \
+        connection refresh. See `core.base.utils.extractor`."""
+
+    connection_id: int
+    arr_id: int
+    is_movie: bool
+    title: str
+    clean_title: str
+    year: int
+    language: str
+    overview: str | None
+    runtime: int
+    youtube_trailer_id: str | None
+    studio: str
+    media_exists: bool
+    media_filename: str
+    season_count: int
+    folder_path: str | None
+    imdb_id: str | None
+    txdb_id: str
+    title_slug: str
+    poster_url: str | None = None
+    fanart_url: str | None = None
+    arr_monitored: bool = False
+    arr_fingerprint: str = ""
+    sync_epoch: int = 0
+
+
+@dataclass(eq=False, frozen=True, repr=False, slots=True)
+class MediaReadDC:
     id: int
     created: bool
     folder_path: str | None
@@ -44,6 +74,29 @@ class MediaReadDC(AppSQLModel):
     trailer_exists: bool
 
 
+@dataclass(eq=False, frozen=True, repr=False, slots=True)
+class MediaTrailerDC:
+    """Columns of a media item needed to check its trailer on disk. \n
+    See `MediaDatabaseManager.read_all_projected`."""
+
+    id: int
+    title: str
+    folder_path: str | None
+    trailer_exists: bool
+
+
+@dataclass(eq=False, frozen=True, repr=False, slots=True)
+class MediaImagesDC:
+    """Columns of a media item needed to refresh its images. \n
+    See `MediaDatabaseManager.read_all_projected`."""
+
+    id: int
+    poster_url: str | None
+    poster_path: str | None
+    fanart_url: str | None
+    fanart_path: str | None
+
+
 @dataclass(eq=False, frozen=True, repr=False, slots=True)
 class MediaUpdateDC:
     id: int
@@ -1,6 +1,7 @@
 from datetime import datetime, timezone
 from enum import Enum
-from sqlalchemy import Boolean, Column, String, text, Enum as sa_Enum
+from sqlalchemy import DDL, Boolean, Column, Index, String, event, text
+from sqlalchemy import Enum as sa_Enum
 from sqlmodel import Field, Integer
 
 from core.base.database.models.base import AppSQLModel
@@ -96,15 +97,103 @@ class Media(MediaBase, table=True):
     Use MediaCreate, MediaRead, MediaUpdate models instead.
     """
 
-    id: int | None = Field(default=None, primary_key=True)
-    connection_id: int = Field(
-        foreign_key="connection.id", index=True, ondelete="CASCADE"
+    # Composite indexes, created by alembic migration 'c4f8a1d6e2b7'.
+    # Indexes on (connection_id, ...) and (is_movie, ...) also serve the
+    # queries on connection_id / is_movie alone.
+    __table_args__ = (
+        # Media is identified by its txdb id in each connection
+        Index(
+            "ix_media_connection_id_txdb_id",
+            "connection_id",
+            "txdb_id",
+            unique=True,
+        ),
+        Index(
+            "ix_media_connection_id_sync_epoch", "connection_id", "sync_epoch"
+        ),
+        Index("ix_media_is_movie_added_at", "is_movie", "added_at"),
+        Index("ix_media_monitor_trailer_exists", "monitor", "trailer_exists"),
+        Index("ix_media_trailer_exists", "trailer_exists"),
+        Index("ix_media_status_downloaded_at", "status", "downloaded_at"),
+        Index("ix_media_added_at", "added_at"),
+        Index("ix_media_updated_at", "updated_at"),
+        Index("ix_media_downloaded_at", "downloaded_at"),
     )
-    is_movie: bool = Field(default=True, index=True)
+
+    id: int | None = Field(default=None, primary_key=True)
+    connection_id: int = Field(foreign_key="connection.id", ondelete="CASCADE")
+    is_movie: bool = Field(default=True)
 
     added_at: datetime = Field(default_factory=get_current_time)
     updated_at: datetime = Field(default_factory=get_current_time)
     downloaded_at: datetime | None = Field(default=None)
+    # Sync bookkeeping, not part of the API models
+    # Fingerprint of the Arr data, used to skip unchanged media on refresh
+    arr_fingerprint: str = Field(
+        default="",
+        sa_column=Column(String, server_default=text("('')"), nullable=False),
+    )
+    # Sync generation in which the media was last seen in the Arr data,
+    # media from older generations is deleted at the end of a refresh
+    sync_epoch: int = Field(
+        default=0,
+        sa_column=Column(Integer, server_default=text("0"), nullable=False),
+    )
+
+
+# Full-text search index for media, an external content FTS5 table that is
+# kept in sync with the media table by triggers.
+# Created by alembic migration 'e91a3f5c7d20' for the app, and with the DDL
+# below when tables are created with `create_all` (tests).
+MEDIA_FTS_TABLE = "media_fts"
+MEDIA_FTS_COLUMNS = (
+    "title",
+    "clean_title",
+    "title_slug",
+    "studio",
+    "overview",
+)
+# Relative weights of the columns for BM25 ranking of search results
+MEDIA_FTS_WEIGHTS = (10.0, 5.0, 5.0, 2.0, 1.0)
+
+_fts_columns = ", ".join(MEDIA_FTS_COLUMNS)
+_fts_new = ", ".join(f"new.{column}" for column in MEDIA_FTS_COLUMNS)
+_fts_old = ", ".join(f"old.{column}" for column in MEDIA_FTS_COLUMNS)
+_fts_changed = " OR ".join(
+    f"old.{column} IS NOT new.{column}" for column in MEDIA_FTS_COLUMNS
+)
+MEDIA_FTS_DDL = (
+    (
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {MEDIA_FTS_TABLE} USING fts5("
+        f"{_fts_columns}, content='media', content_rowid='id',"
+        " tokenize='unicode61 remove_diacritics 2')"
+    ),
+    (
+        f"CREATE TRIGGER IF NOT EXISTS {MEDIA_FTS_TABLE}_ai AFTER INSERT ON"
+        f" media BEGIN INSERT INTO {MEDIA_FTS_TABLE}(rowid, {_fts_columns})"
+        f" VALUES (new.id, {_fts_new}); END"
+    ),
+    (
+        f"CREATE TRIGGER IF NOT EXISTS {MEDIA_FTS_TABLE}_ad AFTER DELETE ON"
+        f" media BEGIN INSERT INTO {MEDIA_FTS_TABLE}({MEDIA_FTS_TABLE}, rowid,"
+        f" {_fts_columns}) VALUES ('delete', old.id, {_fts_old}); END"
+    ),
+    (
+        f"CREATE TRIGGER IF NOT EXISTS {MEDIA_FTS_TABLE}_au AFTER UPDATE OF"
+        f" {_fts_columns} ON media WHEN {_fts_changed}"
+        f" BEGIN INSERT INTO {MEDIA_FTS_TABLE}({MEDIA_FTS_TABLE}, rowid,"
+        f" {_fts_columns}) VALUES ('delete', old.id, {_fts_old});"
+        f" INSERT INTO {MEDIA_FTS_TABLE}(rowid, {_fts_columns})"
+        f" VALUES (new.id, {_fts_new}); END"
+    ),
+)
+for _statement in MEDIA_FTS_DDL:
+    event.listen(Media.__table__, "after_create", DDL(_statement))
+event.listen(
+    Media.__table__,
+    "before_drop",
+    DDL(f"DROP TABLE IF EXISTS {MEDIA_FTS_TABLE}"),
+)
 
 
 class MediaCreate(MediaBase):
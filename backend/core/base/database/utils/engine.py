@@ -1,12 +1,14 @@
+import asyncio
 from contextlib import contextmanager
 from functools import wraps
-from sqlite3 import OperationalError
-import time
-from typing import Any, Generator
+from typing import Any, Callable, Generator, TypeVar
 from sqlalchemy import Engine, event, StaticPool, text as sa_text
 from sqlmodel import SQLModel, Session, create_engine
 
 from config.settings import app_settings
+from core.base.database.utils.writer import DatabaseWriter
+
+T = TypeVar("T")
 
 # sqlite_file_name = "database.db"
 sqlite_url = app_settings.database_url
@@ -20,7 +22,8 @@ if app_settings.testing:
         },
         poolclass=StaticPool,
     )
-    SQLModel.metadata.create_all(engine)
+    # In-memory database can't be shared between connections
+    read_engine = engine
 else:
     engine = create_engine(
         sqlite_url,
@@ -29,6 +32,26 @@ else:
         },  # Allow multi-threaded access
         echo=False,
     )  # pragma: no cover
+    # Readers use their own read-only connections, reading the last
+    # committed data while the writer is writing (WAL)
+    read_engine = create_engine(
+        sqlite_url,
+        connect_args={"check_same_thread": False},
+        echo=False,
+    )  # pragma: no cover
+
+    @event.listens_for(read_engine, "connect")
+    def set_read_only(dbapi_connection, connection_record):
+        """Make the connections of the read engine read-only."""
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA query_only=ON")
+        cursor.close()
+
+
+# All writes of the app go through this writer, see `manage_write_session`
+db_writer = DatabaseWriter(engine)
+if app_settings.testing:
+    SQLModel.metadata.create_all(engine)
 # * Not needed, Alembic will create the database tables
 # SQLModel.metadata.create_all(engine)
 
@@ -57,7 +80,10 @@ def flush_records_to_db():
 
 @contextmanager
 def get_session() -> Generator[Session, None, None]:
-    """Provide a SQLModel session to the context manager
+    """Provide a SQLModel session to the context manager \n
+    Note: \n
+        Use `manage_write_session` for writes in the app, so that they \
+            are serialized by the database writer.
 
     Yields:
         Session: A SQLModel session
@@ -76,11 +102,38 @@ def get_session() -> Generator[Session, None, None]:
         session.close()
 
 
+@contextmanager
+def get_read_session() -> Generator[Session, None, None]:
+    """Provide a read-only SQLModel session to the context manager. \n
+    When called from a write running on the database writer thread, the \
+        session is on the write connection, so that changes of the write \
+        are visible to it.
+
+    Yields:
+        Session: A SQLModel session
+
+    Example::
+
+        with get_read_session() as session:
+            movies = session.exec(select(Movie)).all()
+    """
+    if db_writer.connection is not None:
+        with db_writer.session() as session:
+            yield session
+        return
+    session = Session(read_engine)
+    try:
+        yield session
+    finally:
+        session.close()
+
+
 def manage_session(func):
-    """Decorator to manage the session for a function. \n
+    """Decorator to manage the session for a function that reads from \
+        the database. \n
     Add '_session' to the function's keyword arguments, \n
-    decorator will supply a new session if one is not provided. \n
-    Also handles database lock errors by retrying the function (5 times). \n
+    decorator will supply a new read-only session if one is not provided. \n
+    Use `manage_write_session` for functions that write to the database. \n
     Args:
         func: The function to decorate
 
@@ -99,38 +152,123 @@ def manage_session(func):
                 _session: Session = None,  # type: ignore
             ) -> MovieRead:
                 movie = _session.get(Movie, movie_id)
-                # do something else with _session or commit the changes
+                # do something else with _session
                 return movie
 
         Outside a class method
         @manage_session
         def read(movie_id: int, *, _session: Session = None) -> MovieRead:
             movie = _session.get(Movie, movie_id)
-            # do something else with _session or commit the changes
+            # do something else with _session
             return movie
     """
 
     @wraps(func)
     def wrapper(*args: Any, **kwargs: Any) -> Any:
-        retries = 5
-        delay = 0.1
-        for i in range(retries):
-            try:
-                # Check if a '_session' keyword argument was provided
-                if kwargs.get("_session") is None:
-                    # If not, create a new session and add it to kwargs
-                    with get_session() as _session:
-                        kwargs["_session"] = _session
-                        return func(*args, **kwargs)
-                else:
-                    # If a session was provided, just call the function
-                    return func(*args, **kwargs)
-            except OperationalError as e:
-                if "database is locked" in str(e):
-                    time.sleep(delay)
-                    delay *= 2  # Double the delay for each retry
-                else:
-                    raise
-        raise Exception("Database is locked, retries exhausted.")
+        # Check if a '_session' keyword argument was provided
+        if kwargs.get("_session") is None:
+            # If not, create a new session and add it to kwargs
+            with get_read_session() as _session:
+                kwargs["_session"] = _session
+                return func(*args, **kwargs)
+        # If a session was provided, just call the function
+        return func(*args, **kwargs)
+
+    return wrapper
+
+
+def manage_write_session(func):
+    """Decorator to manage the session for a function that writes to \
+        the database. \n
+    Add '_session' to the function's keyword arguments, \n
+    if a session is not provided, the function is run on the database \
+        writer thread with a new session, and the call returns once the \
+        changes are committed. \n
+    Writes from all threads are serialized by the writer, so they don't \
+        wait for (or fail on) the database lock held by another write. \n
+    Args:
+        func: The function to decorate
+
+    Returns:
+        The decorated function with a session keyword argument
+
+    Example::
+
+        Within a class method
+        class MovieDatabaseHandler:
+            @manage_write_session
+            def update(
+                self,
+                movie_id: int,
+                title: str,
+                *,
+                _session: Session = None,  # type: ignore
+            ) -> None:
+                movie = _session.get(Movie, movie_id)
+                movie.title = title
+                _session.commit()
+    """
+
+    @wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        # If a session was provided, just call the function
+        if kwargs.get("_session") is not None:
+            return func(*args, **kwargs)
+
+        def _write(_session: Session) -> Any:
+            return func(*args, **{**kwargs, "_session": _session})
+
+        return db_writer.run(_write)
 
     return wrapper
+
+
+async def run_async_read(
+    func: Callable[..., T], *args: Any, **kwargs: Any
+) -> T:
+    """Run a function that reads from the database, decorated with \
+        `manage_session`, from async code without blocking the event loop. \n
+    The function is run in a worker thread with a session of the read \
+        engine, so both the queries and the conversion of the rows to the \
+        read models are done off the event loop. \n
+    Args:
+        func: The read function to run
+        *args: Positional arguments for the function
+        **kwargs: Keyword arguments for the function
+
+    Returns:
+        The result of the function
+
+    Example::
+
+        movie = await run_async_read(db_handler.read, movie_id)
+    """
+    return await asyncio.to_thread(func, *args, **kwargs)
+
+
+async def run_async_write(
+    func: Callable[..., T], *args: Any, **kwargs: Any
+) -> T:
+    """Run a function that writes to the database, decorated with \
+        `manage_write_session`, from async code without blocking the \
+        event loop. \n
+    The write is queued to the database writer, and awaited until the \
+        changes are committed, so writes from async code are serialized \
+        with all other writes of the app. \n
+    Args:
+        func: The write function to run
+        *args: Positional arguments for the function
+        **kwargs: Keyword arguments for the function
+
+    Returns:
+        The result of the function
+
+    Example::
+
+        await run_async_write(db_handler.update_monitoring, movie_id, True)
+    """
+
+    def _write(_session: Session) -> T:
+        return func(*args, **kwargs, _session=_session)
+
+    return await asyncio.wrap_future(db_writer.submit(_write))
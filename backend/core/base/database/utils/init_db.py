@@ -9,6 +9,7 @@ from core.base.database.models.media import Media
 from core.base.database.models.filter import Filter
 from core.base.database.models.customfilter import CustomFilter
 from core.base.database.models.trailerprofile import TrailerProfile
+from core.base.database.models.download import DownloadJob
 
 from core.base.database.utils.engine import engine
 
@@ -16,7 +17,14 @@ from core.base.database.utils.engine import engine
 # initializing DB. Otherwise, SQLModel might fail to initialize \
 # relationships properly
 
-__ALL__ = [Connection, Media, Filter, CustomFilter, TrailerProfile]
+__ALL__ = [
+    Connection,
+    Media,
+    Filter,
+    CustomFilter,
+    TrailerProfile,
+    DownloadJob,
+]
 
 
 def init_db():
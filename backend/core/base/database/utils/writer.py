@@ -0,0 +1,224 @@
+import queue
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Generator, TypeVar
+
+from sqlalchemy import Connection, Engine, event
+from sqlmodel import Session
+
+from app_logger import ModuleLogger
+
+logger = ModuleLogger("DatabaseWriter")
+
+T = TypeVar("T")
+
+
+def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+    """Let SQLAlchemy begin the transactions instead of the sqlite3 \
+        driver, which doesn't begin them before SAVEPOINT statements."""
+    dbapi_connection.isolation_level = None
+
+
+def _begin_transaction(conn: Connection) -> None:
+    """Begin the transaction, with the `sqlite_begin` execution option \
+        of the connection as the transaction type, if set."""
+    begin = conn.get_execution_options().get("sqlite_begin")
+    conn.exec_driver_sql(f"BEGIN {begin}" if begin else "BEGIN")
+
+
+@dataclass(slots=True)
+class _WriteJob:
+    func: Callable[[Session], Any]
+    future: Future = field(default_factory=Future)
+
+
+class DatabaseWriter:
+    """Single writer for the database, serializes all write transactions \
+        on a dedicated thread. \n
+    Writes are queued, and the writes waiting in the queue are run in a \
+        single transaction and committed together (group commit). Each \
+        write runs in its own savepoint, so a failed write is rolled back \
+        without affecting the others in the group. \n
+    As SQLite allows only one writer at a time, writing from a single \
+        connection removes the lock contention between threads. Readers \
+        use their own connections, and read the last committed data (WAL).
+    """
+
+    def __init__(self, engine: Engine, max_batch_size: int = 64) -> None:
+        """Create a writer for the database. \n
+        Transactions of the engine are begun by SQLAlchemy instead of the \
+            sqlite3 driver, so that savepoints work. Should be created \
+            before the engine opens any connections. \n
+        Args:
+            engine (Engine): Engine to get the write connection from.
+            max_batch_size (int, Optional=64): Max number of writes to \
+                commit together."""
+        event.listen(engine, "connect", _disable_pysqlite_transactions)
+        event.listen(engine, "begin", _begin_transaction)
+        self._engine = engine
+        self._max_batch_size = max_batch_size
+        # None in the queue stops the writer thread
+        self._queue: queue.SimpleQueue[_WriteJob | None]
+        self._queue = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._local = threading.local()
+
+    @property
+    def connection(self) -> Connection | None:
+        """Connection of the write transaction, if called from a write \
+            running on the writer thread, otherwise None."""
+        return getattr(self._local, "connection", None)
+
+    @contextmanager
+    def session(self) -> Generator[Session, None, None]:
+        """Provide a session for a write running on the writer thread. \n
+        Session joins the group transaction in a savepoint, committing \
+            the session releases the savepoint, and the changes are saved \
+            when the group is committed. \n
+        Raises:
+            RuntimeError: If not called from the writer thread."""
+        connection = self.connection
+        if connection is None:
+            raise RuntimeError("Not in a database write transaction")
+        session = Session(
+            bind=connection, join_transaction_mode="create_savepoint"
+        )
+        try:
+            yield session
+        finally:
+            # Rolls back to the savepoint, if not committed
+            session.close()
+
+    def submit(self, func: Callable[[Session], T]) -> "Future[T]":
+        """Queue a write to run on the writer thread. \n
+        Args:
+            func (Callable[[Session], T]): Function to run with a session \
+                for the write. Changes should be committed with the session. \n
+        Returns:
+            Future[T]: Result of the function, set once the changes are \
+                committed to the database."""
+        job = _WriteJob(func)
+        self._start()
+        self._queue.put(job)
+        return job.future
+
+    def run(self, func: Callable[[Session], T]) -> T:
+        """Run a write on the writer thread and wait for it to be committed. \n
+        If called from a write on the writer thread, it's run in the same \
+            transaction instead of being queued. \n
+        Args:
+            func (Callable[[Session], T]): Function to run with a session \
+                for the write. Changes should be committed with the session. \n
+        Returns:
+            T: Result of the function.
+        Raises:
+            Exception: Any exception raised by the function, or while \
+                committing the changes."""
+        if self.connection is not None:
+            with self.session() as session:
+                return func(session)
+        return self.submit(func).result()
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Stop the writer thread, after the queued writes are committed. \n
+        Writes submitted after this start the writer thread again."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+            if thread is None:
+                return
+            self._queue.put(None)
+        thread.join(timeout)
+
+    def _start(self) -> None:
+        """🚨This is a private method🚨 \n
+        Start the writer thread if it's not running."""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="DatabaseWriter", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self) -> None:
+        """🚨This is a private method🚨 \n
+        Write the queued jobs in groups, until stopped."""
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            jobs = [job]
+            stop = False
+            # Writes queued while the last group was committed
+            while len(jobs) < self._max_batch_size:
+                try:
+                    job = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if job is None:
+                    stop = True
+                    break
+                jobs.append(job)
+            self._write_group(jobs)
+            if stop:
+                return
+
+    def _write_group(self, jobs: list[_WriteJob]) -> None:
+        """🚨This is a private method🚨 \n
+        Run the jobs in a single transaction, and set their results once \
+            committed. If the commit fails, the jobs are run again one by \
+            one, so that only the jobs that can't be saved fail."""
+        jobs = [
+            job for job in jobs if job.future.set_running_or_notify_cancel()
+        ]
+        if not jobs:
+            return
+        try:
+            outcomes = self._write(jobs)
+        except Exception as e:
+            if len(jobs) == 1:
+                jobs[0].future.set_exception(e)
+                return
+            logger.warning(
+                f"Group commit of {len(jobs)} writes failed, writing them"
+                f" one by one. Error: {e}"
+            )
+            outcomes = []
+            for job in jobs:
+                try:
+                    outcomes += self._write([job])
+                except Exception as e:
+                    outcomes.append((None, e))
+        for job, (result, error) in zip(jobs, outcomes):
+            if error is None:
+                job.future.set_result(result)
+            else:
+                job.future.set_exception(error)
+
+    def _write(
+        self, jobs: list[_WriteJob]
+    ) -> list[tuple[Any, Exception | None]]:
+        """🚨This is a private method🚨 \n
+        Run the jobs in a single transaction and commit it. \n
+        Returns:
+            list[tuple[Any, Exception | None]]: Result or error of each job.
+        """
+        outcomes: list[tuple[Any, Exception | None]] = []
+        with self._engine.connect() as connection:
+            # Take the write lock at the start of the transaction
+            connection.execution_options(sqlite_begin="IMMEDIATE")
+            with connection.begin():
+                self._local.connection = connection
+                try:
+                    for job in jobs:
+                        try:
+                            with self.session() as session:
+                                outcomes.append((job.func(session), None))
+                        except Exception as e:
+                            outcomes.append((None, e))
+                finally:
+                    self._local.connection = None
+        return outcomes
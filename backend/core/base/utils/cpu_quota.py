@@ -0,0 +1,54 @@
+import math
+import os
+
+_CGROUP_ROOT = "/sys/fs/cgroup"
+
+
+def _read_quota(cgroup_root: str) -> float | None:
+    """🚨This is a private method🚨 \n
+    Read the CPU quota of the container from cgroup v2 or v1 files. \n
+    Returns:
+        float | None: Number of CPUs allowed, None if not limited."""
+    try:
+        # cgroup v2: "<quota> <period>" or "max <period>"
+        with open(os.path.join(cgroup_root, "cpu.max")) as file:
+            quota, period = file.read().split()
+        if quota == "max":
+            return None
+        return int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+    try:
+        # cgroup v1: quota is -1 if not limited
+        cpu_dir = os.path.join(cgroup_root, "cpu")
+        with open(os.path.join(cpu_dir, "cpu.cfs_quota_us")) as file:
+            quota = int(file.read())
+        with open(os.path.join(cpu_dir, "cpu.cfs_period_us")) as file:
+            period = int(file.read())
+        if quota <= 0 or period <= 0:
+            return None
+        return quota / period
+    except (OSError, ValueError):
+        return None
+
+
+def get_cpu_quota(cgroup_root: str = _CGROUP_ROOT) -> int:
+    """Get the number of CPUs the app can use, from the CPU quota of the \
+        container (cgroup) and the CPUs the process can run on. \n
+    A fractional quota is rounded up, as a process using a part of a CPU \
+        still needs one to run on. \n
+    Args:
+        cgroup_root (str, Optional): Path of the cgroup filesystem. \
+            Default is '/sys/fs/cgroup'.
+    Returns:
+        int: Number of CPUs, at least 1.
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        # Not available on some platforms
+        cpus = os.cpu_count() or 1
+    quota = _read_quota(cgroup_root)
+    if quota is not None:
+        cpus = min(cpus, math.ceil(quota))
+    return max(1, cpus)
@@ -0,0 +1,116 @@
+from dataclasses import fields
+from typing import Any, Callable, TypeVar
+
+from pydantic import AliasPath, BaseModel
+from pydantic_core import PydanticUndefined
+
+T = TypeVar("T")
+
+
+def _get_path(name: str, field_info: Any) -> tuple[str, ...]:
+    """🚨This is a private method🚨 \n
+    Get the path to the Arr API field for a data parser field."""
+    alias = field_info.validation_alias
+    if isinstance(alias, AliasPath):
+        return tuple(str(key) for key in alias.path)
+    if isinstance(alias, str):
+        return (alias,)
+    return (name,)
+
+
+def _get_expression(path: tuple[str, ...], default: str | None) -> str:
+    """🚨This is a private method🚨 \n
+    Get the python expression to read the value at path from `data`, \
+        using the default if any of the keys don't exist."""
+    if default is None:
+        # Required field, raise KeyError if missing
+        return "data" + "".join(f"[{key!r}]" for key in path)
+    expression = "data"
+    for key in path[:-1]:
+        expression = f"({expression}.get({key!r}) or _EMPTY)"
+    return f"{expression}.get({path[-1]!r}, {default})"
+
+
+def compile_extractor(
+    parser: type[BaseModel],
+    record_type: type[T],
+    converters: dict[str, Callable[[Any], Any]] | None = None,
+) -> Callable[[int, dict[str, Any]], T]:
+    """Compile a function that extracts the fields of a data parser model \
+        from Arr API data, without running pydantic validation. \n
+    The field aliases and defaults are read from the parser model, and \
+        the generated function reads them directly from the data dict. \
+        Values are not validated, other than the converters given. \n
+    Args:
+        parser (type[BaseModel]): Data parser model with validation aliases \
+            for the Arr API fields.
+        record_type (type[T]): Dataclass to create, should have all fields \
+            of the parser model.
+        converters (dict[str, Callable], Optional=None): Functions to \
+            convert the raw value of a field, same as the `before` field \
+            validators of the parser model. Not applied to defaults. \n
+    Returns:
+        Callable[[int, dict[str, Any]], T]: Function that takes the \
+            connection id and Arr API data, and returns the record. \n
+    Raises:
+        ValueError: If the record type is missing any of the parser fields.
+    """
+    converters = converters or {}
+    record_fields = fields(record_type)  # type: ignore
+    missing = set(parser.model_fields) - {f.name for f in record_fields}
+    if missing:
+        raise ValueError(
+            f"{record_type.__name__} is missing fields: {sorted(missing)}"
+        )
+    namespace: dict[str, Any] = {"_record_type": record_type, "_EMPTY": {}}
+    arguments = ["connection_id=connection_id"]
+    for name, field_info in parser.model_fields.items():
+        if name == "connection_id":
+            continue
+        default: str | None = None
+        if field_info.default_factory is not None:
+            default = f"_default_{name}()"
+            namespace[f"_default_{name}"] = field_info.default_factory
+        elif field_info.default is not PydanticUndefined:
+            default = f"_default_{name}"
+            namespace[f"_default_{name}"] = field_info.default
+        expression = _get_expression(_get_path(name, field_info), default)
+        if name in converters:
+            expression = f"_convert_{name}({expression})"
+            namespace[f"_convert_{name}"] = converters[name]
+        arguments.append(f"{name}={expression}")
+    lines = ["def extract(connection_id, data):", "    return _record_type("]
+    lines += [f"        {argument}," for argument in arguments]
+    lines.append("    )")
+    source = "\n".join(lines) + "\n"
+    exec(source, namespace)
+    extract = namespace["extract"]
+    extract.__qualname__ = f"extract_{parser.__name__}"
+    return extract
+
+
+def get_image_urls(
+    images: list[dict[str, Any]],
+) -> tuple[str | None, str | None]:
+    """Get the poster and fanart urls from the Arr API media images. \n
+    Args:
+        images (list[dict[str, Any]]): Images of the media from Arr API. \n
+    Returns:
+        tuple[str | None, str | None]: The first poster and fanart urls, \
+            None if the media has no poster/fanart."""
+    poster_url: str | None = None
+    fanart_url: str | None = None
+    for image in images:
+        # Check if the image is a poster or fanart
+        if image["coverType"] == "poster":
+            # Set first poster as the poster_url, if not already set
+            if not poster_url:
+                poster_url = str(image.get("remoteUrl", "")).strip()
+        elif image["coverType"] == "fanart":
+            # Set first fanart as the fanart_url, if not already set
+            if not fanart_url:
+                fanart_url = str(image.get("remoteUrl", "")).strip()
+        # Break if both poster and fanart are set
+        if poster_url and fanart_url:
+            break
+    return poster_url, fanart_url
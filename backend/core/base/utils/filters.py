@@ -1,6 +1,35 @@
-from datetime import datetime
+from datetime import date, datetime, timedelta
+from enum import Enum
+import operator
+from typing import Any, Callable
+from sqlalchemy import (
+    Boolean,
+    Column,
+    ColumnElement,
+    DateTime,
+    Integer,
+    Numeric,
+    String,
+    TypeDecorator,
+    case,
+    type_coerce,
+)
+from sqlalchemy import Enum as sa_Enum
+from sqlmodel import and_, false, func, or_, true
+
 from core.base.database.models.filter import FilterCondition, FilterRead
-from core.base.database.models.media import MediaRead
+from core.base.database.models.media import Media, MediaRead
+from core.base.database.models.trailerprofile import TrailerProfileRead
+
+# Characters removed by `str.strip()`, to check for empty strings in SQL
+_WHITESPACE = (
+    "\t\n\x0b\x0c\r\x1c\x1d\x1e\x1f \x85\xa0\u1680\u2000\u2001\u2002"
+    "\u2003\u2004\u2005\u2006\u2007\u2008\u2009\u200a\u2028\u2029\u202f"
+    "\u205f\u3000"
+)
+
+MediaPredicate = Callable[[MediaRead], bool]
+"""Function that checks if a media item matches compiled filters."""
 
 
 def _matches_boolean(media_value: bool, filter: FilterRead) -> bool:
@@ -36,7 +65,8 @@ def _matches_datetime(media_value: datetime, filter: FilterRead) -> bool:
         FilterCondition.IN_THE_LAST,
         FilterCondition.NOT_IN_THE_LAST,
     }:
-        _delta = media_value.date() - datetime.now().date()
+        # Days since the media date, negative for dates in the future
+        _delta = datetime.now().date() - media_value.date()
         if filter.filter_condition == FilterCondition.IN_THE_LAST:
             return _delta.days <= int(filter.filter_value)
         elif filter.filter_condition == FilterCondition.NOT_IN_THE_LAST:
@@ -104,6 +134,8 @@ def _matches_filter(media_value, filter: FilterRead) -> bool:
         return _matches_datetime(media_value, filter)
     elif isinstance(media_value, str):
         return _matches_string(media_value, filter)
+    elif isinstance(media_value, Enum):
+        return _matches_string(media_value.value, filter)
     else:
         return _matches_generic(media_value, filter)
 
@@ -121,3 +153,369 @@ def matches_filters(media: MediaRead, filters: list[FilterRead]) -> bool:
         if not _matches_filter(media_value, filter):
             return False
     return True
+
+
+def _compile_boolean(column: Any, filter: FilterRead) -> ColumnElement[bool]:
+    """Compile boolean comparisons, same as `_matches_boolean`."""
+    filter_value = filter.filter_value.lower() == "true"
+    if filter.filter_condition == FilterCondition.EQUALS:
+        return column == filter_value
+    elif filter.filter_condition == FilterCondition.NOT_EQUALS:
+        return column != filter_value
+    return false()
+
+
+def _compile_number(column: Any, filter: FilterRead) -> ColumnElement[bool]:
+    """Compile numeric comparisons, same as `_matches_number`."""
+    filter_value = float(filter.filter_value)
+    if filter.filter_condition == FilterCondition.EQUALS:
+        return column == filter_value
+    elif filter.filter_condition == FilterCondition.NOT_EQUALS:
+        return column != filter_value
+    elif filter.filter_condition == FilterCondition.GREATER_THAN:
+        return column > filter_value
+    elif filter.filter_condition == FilterCondition.GREATER_THAN_EQUAL:
+        return column >= filter_value
+    elif filter.filter_condition == FilterCondition.LESS_THAN:
+        return column < filter_value
+    elif filter.filter_condition == FilterCondition.LESS_THAN_EQUAL:
+        return column <= filter_value
+    return false()
+
+
+def _compile_datetime(column: Any, filter: FilterRead) -> ColumnElement[bool]:
+    """Compile datetime comparisons, same as `_matches_datetime`. \n
+    Dates are compared as `YYYY-MM-DD` strings of the stored datetimes."""
+    media_date = func.date(column)
+    if filter.filter_condition in {
+        FilterCondition.IN_THE_LAST,
+        FilterCondition.NOT_IN_THE_LAST,
+    }:
+        days = int(filter.filter_value)
+        try:
+            cutoff = datetime.now().date() - timedelta(days=days)
+        except OverflowError:
+            cutoff = date.min if days > 0 else date.max
+        if filter.filter_condition == FilterCondition.IN_THE_LAST:
+            return media_date >= cutoff.isoformat()
+        return media_date < cutoff.isoformat()
+    try:
+        filter_date = datetime.strptime(filter.filter_value, "%Y-%m-%d")
+    except ValueError:
+        return false()  # Invalid date format in filter_value
+    filter_value = filter_date.date().isoformat()
+    if filter.filter_condition == FilterCondition.EQUALS:
+        return media_date == filter_value
+    elif filter.filter_condition == FilterCondition.NOT_EQUALS:
+        return media_date != filter_value
+    elif filter.filter_condition == FilterCondition.IS_AFTER:
+        return media_date > filter_value
+    elif filter.filter_condition == FilterCondition.IS_BEFORE:
+        return media_date < filter_value
+    return false()
+
+
+def _compile_string(column: Any, filter: FilterRead) -> ColumnElement[bool]:
+    """Compile string comparisons, same as `_matches_string`. \n
+    Uses `instr` and `substr` instead of `LIKE`, which is case-insensitive \
+        and treats `%` and `_` as wildcards."""
+    filter_value = filter.filter_value
+    length = len(filter_value)
+    if filter.filter_condition == FilterCondition.EQUALS:
+        return column == filter_value
+    elif filter.filter_condition == FilterCondition.NOT_EQUALS:
+        return column != filter_value
+    elif filter.filter_condition in {
+        FilterCondition.CONTAINS,
+        FilterCondition.STARTS_WITH,
+        FilterCondition.ENDS_WITH,
+    }:
+        if not filter_value:
+            return true()  # Every string contains an empty string
+    elif filter.filter_condition in {
+        FilterCondition.NOT_CONTAINS,
+        FilterCondition.NOT_STARTS_WITH,
+        FilterCondition.NOT_ENDS_WITH,
+    }:
+        if not filter_value:
+            return false()
+    if filter.filter_condition == FilterCondition.CONTAINS:
+        return func.instr(column, filter_value) > 0
+    elif filter.filter_condition == FilterCondition.NOT_CONTAINS:
+        return func.instr(column, filter_value) == 0
+    elif filter.filter_condition == FilterCondition.STARTS_WITH:
+        return func.substr(column, 1, length) == filter_value
+    elif filter.filter_condition == FilterCondition.NOT_STARTS_WITH:
+        return func.substr(column, 1, length) != filter_value
+    elif filter.filter_condition == FilterCondition.ENDS_WITH:
+        return func.substr(column, -length) == filter_value
+    elif filter.filter_condition == FilterCondition.NOT_ENDS_WITH:
+        return func.substr(column, -length) != filter_value
+    elif filter.filter_condition == FilterCondition.IS_EMPTY:
+        return func.trim(column, _WHITESPACE) == ""
+    elif filter.filter_condition == FilterCondition.IS_NOT_EMPTY:
+        return func.trim(column, _WHITESPACE) != ""
+    return false()
+
+
+def _compile_generic(filter: FilterRead) -> ColumnElement[bool]:
+    """Compile comparisons of a `None` value, same as `_matches_generic`."""
+    if filter.filter_condition == FilterCondition.IS_EMPTY:
+        return true()
+    return false()
+
+
+def _get_column(filter_by: str) -> tuple[Column | None, str]:
+    """Get the media column to filter by and the kind of its values, \
+        one of `bool`, `number`, `datetime`, `str` or `enum`. \n
+    Column is None if it's not a media column, values are always None."""
+    column: Column | None = Media.__table__.c.get(filter_by)  # type: ignore
+    if column is None:
+        return None, "none"
+    column_type = column.type
+    if isinstance(column_type, TypeDecorator):
+        # Like `AutoString`, compare as the underlying type
+        column_type = column_type.impl_instance
+    if isinstance(column_type, Boolean):
+        return column, "bool"
+    if isinstance(column_type, (Integer, Numeric)):
+        return column, "number"
+    if isinstance(column_type, DateTime):
+        return column, "datetime"
+    if isinstance(column_type, sa_Enum) and column_type.enum_class:
+        return column, "enum"
+    if isinstance(column_type, String):
+        return column, "str"
+    return column, "none"
+
+
+def _compile_filter(filter: FilterRead) -> ColumnElement[bool]:
+    """Compile a single filter to a SQL expression on the media table."""
+    column, kind = _get_column(filter.filter_by)
+    if column is None:
+        return _compile_generic(filter)
+    if kind == "bool":
+        expression = _compile_boolean(column, filter)
+    elif kind == "number":
+        expression = _compile_number(column, filter)
+    elif kind == "datetime":
+        expression = _compile_datetime(column, filter)
+    elif kind == "enum":
+        # Enums are stored by name, compare their values instead
+        enum_class = column.type.enum_class  # type: ignore
+        enum_values = {member.name: member.value for member in enum_class}
+        value = case(enum_values, value=type_coerce(column, String))
+        expression = _compile_string(value, filter)
+    elif kind == "str":
+        expression = _compile_string(column, filter)
+    else:
+        expression = _compile_generic(filter)
+    if not column.nullable:
+        return expression
+    # Missing values are only matched by IS_EMPTY, like `_matches_generic`
+    if filter.filter_condition == FilterCondition.IS_EMPTY:
+        return or_(column.is_(None), expression)
+    return and_(column.is_not(None), expression)
+
+
+def compile_filters(filters: list[FilterRead]) -> ColumnElement[bool]:
+    """Compile the filters to a SQL expression, to select the media \
+        matching all of them in the database. \n
+    Matches the same media as `matches_filters`, and never evaluates to \
+        NULL, so the expression can also be negated.
+    Args:
+        filters (list[FilterRead]): The list of filters to compile.
+    Returns:
+        ColumnElement[bool]: Expression to use in a WHERE clause on the \
+            media table. Always true if there are no filters.
+    Raises:
+        ValueError: If the value of a number or `IN_THE_LAST` filter is \
+            not a number, same as `matches_filters`.
+    """
+    return and_(true(), *[_compile_filter(filter) for filter in filters])
+
+
+def _never(value: Any) -> bool:
+    return False
+
+
+_NUMBER_OPERATORS: dict[FilterCondition, Callable[[Any, Any], bool]] = {
+    FilterCondition.EQUALS: operator.eq,
+    FilterCondition.NOT_EQUALS: operator.ne,
+    FilterCondition.GREATER_THAN: operator.gt,
+    FilterCondition.GREATER_THAN_EQUAL: operator.ge,
+    FilterCondition.LESS_THAN: operator.lt,
+    FilterCondition.LESS_THAN_EQUAL: operator.le,
+}
+
+_DATE_OPERATORS: dict[FilterCondition, Callable[[Any, Any], bool]] = {
+    FilterCondition.EQUALS: operator.eq,
+    FilterCondition.NOT_EQUALS: operator.ne,
+    FilterCondition.IS_AFTER: operator.gt,
+    FilterCondition.IS_BEFORE: operator.lt,
+}
+
+
+def _boolean_predicate(filter: FilterRead) -> Callable[[Any], bool]:
+    """Precompiled `_matches_boolean`."""
+    filter_value = filter.filter_value.lower() == "true"
+    if filter.filter_condition == FilterCondition.EQUALS:
+        return lambda value: value == filter_value
+    elif filter.filter_condition == FilterCondition.NOT_EQUALS:
+        return lambda value: value != filter_value
+    return _never
+
+
+def _number_predicate(filter: FilterRead) -> Callable[[Any], bool]:
+    """Precompiled `_matches_number`."""
+    filter_value = float(filter.filter_value)
+    compare = _NUMBER_OPERATORS.get(filter.filter_condition)
+    if compare is None:
+        return _never
+    return lambda value: compare(value, filter_value)
+
+
+def _datetime_predicate(filter: FilterRead) -> Callable[[Any], bool]:
+    """Precompiled `_matches_datetime`, dates are compared with the date \
+        of today when the filter is compiled."""
+    if filter.filter_condition in {
+        FilterCondition.IN_THE_LAST,
+        FilterCondition.NOT_IN_THE_LAST,
+    }:
+        days = int(filter.filter_value)
+        try:
+            cutoff = datetime.now().date() - timedelta(days=days)
+        except OverflowError:
+            cutoff = date.min if days > 0 else date.max
+        if filter.filter_condition == FilterCondition.IN_THE_LAST:
+            return lambda value: value.date() >= cutoff
+        return lambda value: value.date() < cutoff
+    try:
+        filter_date = datetime.strptime(filter.filter_value, "%Y-%m-%d")
+    except ValueError:
+        return _never  # Invalid date format in filter_value
+    compare = _DATE_OPERATORS.get(filter.filter_condition)
+    if compare is None:
+        return _never
+    filter_value = filter_date.date()
+    return lambda value: compare(value.date(), filter_value)
+
+
+def _string_predicate(filter: FilterRead) -> Callable[[Any], bool]:
+    """Precompiled `_matches_string`."""
+    filter_value = filter.filter_value
+    condition = filter.filter_condition
+    if condition == FilterCondition.EQUALS:
+        return lambda value: value == filter_value
+    elif condition == FilterCondition.NOT_EQUALS:
+        return lambda value: value != filter_value
+    elif condition == FilterCondition.CONTAINS:
+        return lambda value: filter_value in value
+    elif condition == FilterCondition.NOT_CONTAINS:
+        return lambda value: filter_value not in value
+    elif condition == FilterCondition.STARTS_WITH:
+        return lambda value: value.startswith(filter_value)
+    elif condition == FilterCondition.NOT_STARTS_WITH:
+        return lambda value: not value.startswith(filter_value)
+    elif condition == FilterCondition.ENDS_WITH:
+        return lambda value: value.endswith(filter_value)
+    elif condition == FilterCondition.NOT_ENDS_WITH:
+        return lambda value: not value.endswith(filter_value)
+    elif condition == FilterCondition.IS_EMPTY:
+        return lambda value: not value.strip()
+    elif condition == FilterCondition.IS_NOT_EMPTY:
+        return lambda value: bool(value.strip())
+    return _never
+
+
+def _compile_predicate(filter: FilterRead) -> MediaPredicate:
+    """Compile a single filter to a predicate on media items."""
+    filter_by = filter.filter_by
+    # `_matches_generic` result, for missing values
+    if_missing = filter.filter_condition == FilterCondition.IS_EMPTY
+    _, kind = _get_column(filter_by)
+    if kind == "bool":
+        check = _boolean_predicate(filter)
+    elif kind == "number":
+        check = _number_predicate(filter)
+    elif kind == "datetime":
+        check = _datetime_predicate(filter)
+    elif kind == "enum":
+        string_check = _string_predicate(filter)
+
+        def check(value: Any) -> bool:
+            return string_check(value.value)
+
+    elif kind == "str":
+        check = _string_predicate(filter)
+    else:
+        return lambda media: if_missing
+
+    def _predicate(media: MediaRead) -> bool:
+        value = getattr(media, filter_by, None)
+        if value is None:
+            return if_missing
+        return check(value)
+
+    return _predicate
+
+
+def compile_predicate(filters: list[FilterRead]) -> MediaPredicate:
+    """Compile the filters to a function that checks if a media item \
+        matches all of them. \n
+    Same as `matches_filters`, but the filter values are parsed and the \
+        comparisons are chosen once, instead of for every media item.
+    Args:
+        filters (list[FilterRead]): The list of filters to compile.
+    Returns:
+        MediaPredicate: Function that takes a media item and returns \
+            True if it matches all filters.
+    Raises:
+        ValueError: If the value of a number or `IN_THE_LAST` filter is \
+            not a number.
+    """
+    predicates = tuple(_compile_predicate(filter) for filter in filters)
+    if not predicates:
+        return lambda media: True
+    if len(predicates) == 1:
+        return predicates[0]
+
+    def _matches_all(media: MediaRead) -> bool:
+        for predicate in predicates:
+            if not predicate(media):
+                return False
+        return True
+
+    return _matches_all
+
+
+def compile_profile_matcher(
+    trailer_profiles: list[TrailerProfileRead],
+) -> Callable[[MediaRead], TrailerProfileRead | None]:
+    """Compile the filters of trailer profiles into a function that finds \
+        the highest priority profile matching a media item. \n
+    Profiles are sorted and compiled once, so the matcher can be reused \
+        for any number of media items.
+    Args:
+        trailer_profiles (list[TrailerProfileRead]): Profiles to match.
+    Returns:
+        Callable[[MediaRead], TrailerProfileRead | None]: Function that \
+            takes a media item and returns the highest priority profile \
+            it matches, None if it doesn't match any.
+    Raises:
+        ValueError: If a filter value is invalid for its column.
+    """
+    # Sort profiles by priority, higher priority first
+    profiles = sorted(trailer_profiles, key=lambda p: p.priority, reverse=True)
+    compiled = tuple(
+        (compile_predicate(profile.customfilter.filters), profile)
+        for profile in profiles
+    )
+
+    def _match_profile(media: MediaRead) -> TrailerProfileRead | None:
+        for predicate, profile in compiled:
+            if predicate(media):
+                return profile
+        return None
+
+    return _match_profile
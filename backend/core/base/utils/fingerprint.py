@@ -0,0 +1,71 @@
+import hashlib
+import json
+from typing import Any
+from pydantic import AliasPath, BaseModel
+
+# Bump this when the parsing logic changes, so that all media gets
+# re-parsed and updated in the database on the next refresh
+FINGERPRINT_VERSION = "1"
+
+_MISSING = object()
+
+
+def get_alias_paths(parser: type[BaseModel]) -> tuple[tuple[str, ...], ...]:
+    """Get the paths of all Arr API fields used by a data parser. \n
+    Args:
+        parser (type[BaseModel]): Data parser model with validation aliases \
+            for the Arr API fields. \n
+    Returns:
+        tuple[tuple[str, ...], ...]: Paths to the Arr API fields. \
+            Ex: `(("id",), ("statistics", "movieFileCount"))`"""
+    paths: list[tuple[str, ...]] = []
+    for name, field in parser.model_fields.items():
+        alias = field.validation_alias
+        if isinstance(alias, AliasPath):
+            paths.append(tuple(str(key) for key in alias.path))
+        elif isinstance(alias, str):
+            paths.append((alias,))
+        else:
+            paths.append((name,))
+    return tuple(sorted(set(paths)))
+
+
+def _get_path_value(data: dict[str, Any], path: tuple[str, ...]) -> Any:
+    """🚨This is a private method🚨 \n
+    Get the value at the given path in data, None if it doesn't exist."""
+    value: Any = data
+    for key in path:
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key, _MISSING)
+        if value is _MISSING:
+            return None
+    return value
+
+
+def compute_fingerprint(
+    data: dict[str, Any],
+    paths: tuple[tuple[str, ...], ...],
+    images: list[tuple[Any, Any]],
+    salt: str = "",
+) -> str:
+    """Compute a compact fingerprint of the relevant fields of Arr media. \n
+    The fingerprint changes only when any of the fields at the given paths, \
+        the images or the salt changes. \n
+    Args:
+        data (dict[str, Any]): Media data from the Arr API.
+        paths (tuple[tuple[str, ...], ...]): Paths to the relevant fields.
+        images (list[tuple[Any, Any]]): List of (coverType, remoteUrl) of \
+            the media images.
+        salt (str, Optional): Extra data to include in the fingerprint, \
+            like connection settings that affect the parsed media. \n
+    Returns:
+        str: Fingerprint of the media as a 32 character hex string."""
+    values = [_get_path_value(data, path) for path in paths]
+    payload = json.dumps(
+        [FINGERPRINT_VERSION, salt, values, images],
+        separators=(",", ":"),
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
@@ -0,0 +1,160 @@
+import asyncio
+from collections import deque
+from dataclasses import dataclass, field
+import os
+import re
+import signal
+from typing import Callable
+
+from app_logger import ModuleLogger
+
+logger = ModuleLogger("ProcessRunner")
+
+# Lines are split on '\r' too, progress is updated in place with it
+_LINE_END = re.compile(rb"\r\n|\r|\n")
+_READ_SIZE = 64 * 1024
+# A longer line is handled in parts, so the buffer is bounded
+_MAX_LINE_LENGTH = 64 * 1024
+# Seconds to wait for the process to exit after SIGTERM, before SIGKILL
+_KILL_GRACE_PERIOD = 5
+
+LineHandler = Callable[[str, str], None]
+
+
+@dataclass(slots=True)
+class ProcessResult:
+    """Result of a process run with `run_process`. \n
+    Only the last `max_lines` lines of each output are kept."""
+
+    returncode: int
+    stdout_lines: deque[str] = field(default_factory=deque)
+    stderr_lines: deque[str] = field(default_factory=deque)
+
+    @property
+    def stdout(self) -> str:
+        return "\n".join(self.stdout_lines)
+
+    @property
+    def stderr(self) -> str:
+        return "\n".join(self.stderr_lines)
+
+
+async def _read_lines(
+    stream: asyncio.StreamReader,
+    name: str,
+    lines: deque[str],
+    on_line: LineHandler | None,
+) -> None:
+    """🚨This is a private method🚨 \n
+    Read the output of the process as it's written, line by line."""
+    buffer = b""
+
+    def _handle_part(data: bytes) -> None:
+        line = data.decode("utf-8", errors="replace").rstrip()
+        if not line:
+            return
+        lines.append(line)
+        if on_line is None:
+            return
+        try:
+            on_line(name, line)
+        except Exception as e:
+            # Output must be read to the end, or the process blocks
+            logger.error(f"Error handling process output line: {e}")
+
+    def _handle(data: bytes) -> None:
+        for i in range(0, len(data), _MAX_LINE_LENGTH):
+            _handle_part(data[i : i + _MAX_LINE_LENGTH])
+
+    while chunk := await stream.read(_READ_SIZE):
+        buffer += chunk
+        *complete, buffer = _LINE_END.split(buffer)
+        for data in complete:
+            _handle(data)
+        if len(buffer) >= _MAX_LINE_LENGTH:
+            # Keep only the last part of the line, not yet complete
+            split_at = len(buffer) - len(buffer) % _MAX_LINE_LENGTH
+            _handle(buffer[:split_at])
+            buffer = buffer[split_at:]
+    _handle(buffer)
+
+
+def _signal_process(process: asyncio.subprocess.Process, sig: int) -> None:
+    """🚨This is a private method🚨 \n
+    Send a signal to the process and its children (process group)."""
+    try:
+        os.killpg(process.pid, sig)
+    except ProcessLookupError:
+        pass
+
+
+async def _stop_process(process: asyncio.subprocess.Process) -> None:
+    """🚨This is a private method🚨 \n
+    Terminate the process, and kill it if it doesn't exit in time."""
+    if process.returncode is not None:
+        return
+    _signal_process(process, signal.SIGTERM)
+    try:
+        await asyncio.wait_for(process.wait(), _KILL_GRACE_PERIOD)
+    except asyncio.TimeoutError:
+        _signal_process(process, signal.SIGKILL)
+        await process.wait()
+
+
+async def run_process(
+    cmd: list[str],
+    timeout: float | None = None,
+    on_line: LineHandler | None = None,
+    max_lines: int = 200,
+) -> ProcessResult:
+    """Run a command without blocking the event loop, reading its output \
+        line by line as it's written. \n
+    The process is started in its own process group, so its children \
+        (ex: ffmpeg started by yt-dlp) are stopped with it. If the call \
+        times out or is cancelled, the processes are terminated and then \
+        killed if they don't exit in time. \n
+    Args:
+        cmd (list[str]): Command and its arguments.
+        timeout (float, Optional=None): Seconds to wait for the process \
+            to finish. Default is None, no timeout.
+        on_line (LineHandler, Optional=None): Called with the stream name \
+            ('stdout' or 'stderr') and each line of output. Lines ending \
+            with '\\r' (progress) are handled as separate lines.
+        max_lines (int, Optional=200): Number of last lines of each output \
+            kept in the result.
+    Returns:
+        ProcessResult: Return code and the last lines of the output.
+    Raises:
+        FileNotFoundError: If the command is not found.
+        asyncio.TimeoutError: If the process didn't finish in time.
+        asyncio.CancelledError: If the call was cancelled.
+    """
+    process = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdin=asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        start_new_session=True,
+    )
+    result = ProcessResult(
+        returncode=-1,
+        stdout_lines=deque(maxlen=max_lines),
+        stderr_lines=deque(maxlen=max_lines),
+    )
+    stdout, stderr = process.stdout, process.stderr
+    assert stdout is not None and stderr is not None
+    readers = asyncio.gather(
+        _read_lines(stdout, "stdout", result.stdout_lines, on_line),
+        _read_lines(stderr, "stderr", result.stderr_lines, on_line),
+    )
+    try:
+        await asyncio.wait_for(asyncio.shield(readers), timeout)
+        result.returncode = await process.wait()
+    except (asyncio.TimeoutError, asyncio.CancelledError):
+        logger.debug(f"Stopping process '{cmd[0]}' [{process.pid}]")
+        # Don't leave the processes running, even if cancelled again
+        await asyncio.shield(_stop_process(process))
+        readers.cancel()
+        await asyncio.gather(readers, return_exceptions=True)
+        raise
+    return result
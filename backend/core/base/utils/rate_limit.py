@@ -0,0 +1,68 @@
+import asyncio
+import threading
+import time
+
+
+class TokenBucket:
+    """Token bucket rate limiter, safe to share between threads and \
+        event loops. \n
+    Tokens are added at `rate` per second, up to `capacity` (the burst), \
+        and each `acquire` takes one, waiting for it if the bucket is empty. \
+        Waiting callers reserve their tokens in the order of their calls, \
+        so the rate is kept no matter how many callers are waiting.
+    """
+
+    def __init__(self, rate: float, capacity: int) -> None:
+        """Create a token bucket, starting full. \n
+        Args:
+            rate (float): Tokens added per second.
+            capacity (int): Max number of tokens in the bucket."""
+        self._lock = threading.Lock()
+        self._rate = rate
+        self._capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+
+    def configure(self, rate: float, capacity: int) -> None:
+        """Change the rate and capacity of the bucket. Tokens already \
+            reserved are not changed."""
+        with self._lock:
+            self._refill()
+            self._rate = rate
+            self._capacity = capacity
+            self._tokens = min(self._tokens, capacity)
+
+    def reserve(self) -> float:
+        """Take a token from the bucket. \n
+        Returns:
+            float: Seconds to wait before the token is available, \
+                0 if available now."""
+        with self._lock:
+            self._refill()
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self._rate
+
+    async def acquire(self) -> None:
+        """Take a token from the bucket, waiting until it's available."""
+        delay = self.reserve()
+        if delay <= 0:
+            return
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            # Give back the unused token
+            with self._lock:
+                self._tokens += 1
+            raise
+
+    def _refill(self) -> None:
+        """🚨This is a private method🚨 \n
+        Add the tokens for the time since the last refill. \n
+        Must be called with the lock held."""
+        now = time.monotonic()
+        self._tokens = min(
+            self._capacity, self._tokens + (now - self._updated) * self._rate
+        )
+        self._updated = now
@@ -0,0 +1,186 @@
+import asyncio
+from dataclasses import dataclass
+from typing import Awaitable, Callable, TypeVar
+
+from app_logger import ModuleLogger
+from config.settings import app_settings
+from core.base.utils.cpu_quota import get_cpu_quota
+
+logger = ModuleLogger("TrailersDownloader")
+
+T = TypeVar("T")
+
+
+@dataclass(eq=False, slots=True)
+class _PipelineItem:
+    """A video going through the pipeline."""
+
+    download: Callable[[], Awaitable[str]]
+    convert: Callable[[str], Awaitable[str]]
+    future: asyncio.Future[str]
+
+    async def run_stage(self, stage: Awaitable[T]) -> T:
+        """Run a stage of the item, cancelled if the caller is cancelled, \
+            so that its processes are stopped."""
+        task = asyncio.ensure_future(stage)
+
+        def _cancel_stage(future: asyncio.Future) -> None:
+            if future.cancelled():
+                task.cancel()
+
+        self.future.add_done_callback(_cancel_stage)
+        try:
+            return await task
+        finally:
+            self.future.remove_done_callback(_cancel_stage)
+
+
+def get_convert_workers() -> int:
+    """Get the number of conversions to run at the same time, from the \
+        `trailer_convert_workers` setting, or the CPU quota if not set."""
+    return app_settings.trailer_convert_workers or get_cpu_quota()
+
+
+class DownloadPipeline:
+    """Pipeline with a download stage and a conversion stage, so that a \
+        video is downloaded while another is converted. \n
+    Downloads are network bound, up to `download_workers` run at once. \
+        Conversions are CPU bound (ffmpeg processes), up to \
+        `convert_workers` run at once, sized to the CPUs of the container. \
+        Stages run as async tasks, a stage of a cancelled caller is \
+        cancelled. \n
+    Stages are connected by bounded queues, a downloaded video waits for \
+        a free slot in the conversion queue before the next download of \
+        that worker starts, so downloads don't run ahead of conversions. \n
+    Use as an async context manager, in the event loop of the callers::
+
+        async with DownloadPipeline(download_workers=2) as pipeline:
+            output_file = await pipeline.run(download, convert)
+    """
+
+    def __init__(
+        self,
+        download_workers: int = 1,
+        convert_workers: int | None = None,
+        queue_size: int = 1,
+    ) -> None:
+        """Create a pipeline, started when entering the context. \n
+        Args:
+            download_workers (int, Optional=1): Number of downloads to run \
+                at the same time.
+            convert_workers (int, Optional=None): Number of conversions to \
+                run at the same time. Default is None, in which case \
+                `get_convert_workers` is used.
+            queue_size (int, Optional=1): Number of items that can wait \
+                for each stage."""
+        if convert_workers is None:
+            convert_workers = get_convert_workers()
+        self.download_workers = max(1, download_workers)
+        self.convert_workers = max(1, convert_workers)
+        self._queue_size = max(1, queue_size)
+        self._download_queue: asyncio.Queue[_PipelineItem]
+        self._convert_queue: asyncio.Queue[tuple[_PipelineItem, str]]
+        self._tasks: list[asyncio.Task] = []
+
+    async def __aenter__(self) -> "DownloadPipeline":
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    def start(self) -> None:
+        """Start the workers of both stages in the running event loop."""
+        self._download_queue = asyncio.Queue(self._queue_size)
+        self._convert_queue = asyncio.Queue(self._queue_size)
+        self._tasks = [
+            asyncio.create_task(self._download_worker())
+            for _ in range(self.download_workers)
+        ]
+        self._tasks += [
+            asyncio.create_task(self._convert_worker())
+            for _ in range(self.convert_workers)
+        ]
+        logger.debug(
+            f"Download pipeline started with {self.download_workers}"
+            f" download and {self.convert_workers} conversion workers"
+        )
+
+    async def close(self) -> None:
+        """Stop the workers, videos not finished yet are cancelled."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        while not self._download_queue.empty():
+            self._download_queue.get_nowait().future.cancel()
+        while not self._convert_queue.empty():
+            self._convert_queue.get_nowait()[0].future.cancel()
+
+    async def run(
+        self,
+        download: Callable[[], Awaitable[str]],
+        convert: Callable[[str], Awaitable[str]],
+    ) -> str:
+        """Run a video through the pipeline. \n
+        Args:
+            download (Callable[[], Awaitable[str]]): Downloads the video, \
+                returns the downloaded file path.
+            convert (Callable[[str], Awaitable[str]]): Converts the \
+                downloaded file, returns the output file path.
+        Returns:
+            str: The output file path returned by `convert`.
+        Raises:
+            Exception: Any exception raised by `download` or `convert`.
+        """
+        if not self._tasks:
+            raise RuntimeError("Download pipeline is not started")
+        future = asyncio.get_running_loop().create_future()
+        await self._download_queue.put(
+            _PipelineItem(download=download, convert=convert, future=future)
+        )
+        return await future
+
+    async def _download_worker(self) -> None:
+        """🚨This is a private method🚨 \n
+        Download the queued videos and queue them for conversion."""
+        while True:
+            item = await self._download_queue.get()
+            if item.future.done():
+                # Caller was cancelled while waiting
+                continue
+            try:
+                download_file = await item.run_stage(item.download())
+            except asyncio.CancelledError:
+                if item.future.cancelled():
+                    continue
+                # Pipeline is closed
+                item.future.cancel()
+                raise
+            except Exception as e:
+                if not item.future.done():
+                    item.future.set_exception(e)
+                continue
+            await self._convert_queue.put((item, download_file))
+
+    async def _convert_worker(self) -> None:
+        """🚨This is a private method🚨 \n
+        Convert the downloaded videos and return the results to callers."""
+        while True:
+            item, download_file = await self._convert_queue.get()
+            if item.future.done():
+                continue
+            try:
+                output_file = await item.run_stage(item.convert(download_file))
+            except asyncio.CancelledError:
+                if item.future.cancelled():
+                    continue
+                # Pipeline is closed
+                item.future.cancel()
+                raise
+            except Exception as e:
+                if not item.future.done():
+                    item.future.set_exception(e)
+                continue
+            if not item.future.done():
+                item.future.set_result(output_file)
@@ -0,0 +1,205 @@
+import asyncio
+from dataclasses import asdict, dataclass
+import re
+import time
+
+from api.v1 import websockets
+from core.base.utils.process_runner import LineHandler
+
+# Seconds between progress events of a media, at most 2 events per second
+PUBLISH_INTERVAL = 0.5
+
+# [download]  45.3% of ~  12.34MiB at    1.23MiB/s ETA 00:10 (frag 3/20)
+_YTDLP_PERCENT = re.compile(r"^\[download\]\s+(?P<percent>\d+(?:\.\d+)?)%")
+_YTDLP_SPEED = re.compile(r"\sat\s+(?P<speed>\d+(?:\.\d+)?\s*\w+/s)")
+_YTDLP_ETA = re.compile(r"\sETA\s+(?P<eta>\d+(?::\d+)*)")
+# Duration of the input, written to stderr before the conversion starts
+_FFMPEG_DURATION = re.compile(r"^\s*Duration:\s*(?P<duration>[\d:.]+)")
+
+
+@dataclass(slots=True)
+class DownloadProgress:
+    """Progress of a stage of a trailer download, sent to the clients. \n
+    `stage` is 'download' (yt-dlp) or 'convert' (ffmpeg), `speed` is as \
+        reported by the tool (ex: '1.23MiB/s' or '2.5x') and `eta` is in \
+        seconds. Values not known yet are None."""
+
+    media_id: int
+    stage: str
+    percent: float | None = None
+    speed: str | None = None
+    eta: int | None = None
+
+
+def _parse_time(value: str) -> float | None:
+    """🚨This is a private method🚨 \n
+    Convert a '[HH:]MM:SS[.ms]' time to seconds, None if not valid."""
+    seconds = 0.0
+    try:
+        for part in value.split(":"):
+            seconds = seconds * 60 + float(part)
+    except ValueError:
+        return None
+    return seconds
+
+
+def parse_ytdlp_progress(media_id: int, line: str) -> DownloadProgress | None:
+    """Parse a yt-dlp progress line. \n
+    Args:
+        media_id (int): ID of the media being downloaded.
+        line (str): Line of the yt-dlp output.
+    Returns:
+        DownloadProgress | None: The progress, None if the line is not a \
+            progress line.
+    """
+    match = _YTDLP_PERCENT.match(line)
+    if not match:
+        return None
+    progress = DownloadProgress(
+        media_id=media_id,
+        stage="download",
+        percent=float(match.group("percent")),
+    )
+    if speed := _YTDLP_SPEED.search(line):
+        progress.speed = speed.group("speed").replace(" ", "")
+    if eta := _YTDLP_ETA.search(line):
+        eta_seconds = _parse_time(eta.group("eta"))
+        if eta_seconds is not None:
+            progress.eta = int(eta_seconds)
+    if progress.percent == 100:
+        progress.eta = 0
+    return progress
+
+
+class FFmpegProgressParser:
+    """Parser for the output of ffmpeg run with `-progress pipe:1`. \n
+    ffmpeg writes a block of 'key=value' lines to stdout for each update, \
+        ending with a 'progress=continue' or 'progress=end' line. Percent \
+        and ETA are computed from the input duration, read from stderr."""
+
+    def __init__(self, media_id: int) -> None:
+        self.media_id = media_id
+        self.duration: float | None = None
+        self._values: dict[str, str] = {}
+
+    def parse_line(self, stream: str, line: str) -> DownloadProgress | None:
+        """Parse a line of the ffmpeg output. \n
+        Args:
+            stream (str): Output stream of the line, 'stdout' or 'stderr'.
+            line (str): Line of the ffmpeg output.
+        Returns:
+            DownloadProgress | None: The progress, when a progress block \
+                is complete. None otherwise.
+        """
+        if stream == "stderr":
+            match = _FFMPEG_DURATION.match(line)
+            if match and self.duration is None:
+                self.duration = _parse_time(match.group("duration"))
+            return None
+        key, sep, value = line.partition("=")
+        if not sep:
+            return None
+        key, value = key.strip(), value.strip()
+        if key != "progress":
+            self._values[key] = value
+            return None
+        progress = self._get_progress(finished=value == "end")
+        self._values.clear()
+        return progress
+
+    def _get_progress(self, finished: bool) -> DownloadProgress:
+        """🚨This is a private method🚨 \n
+        Get the progress from the values of the last block."""
+        progress = DownloadProgress(media_id=self.media_id, stage="convert")
+        speed = self._values.get("speed", "N/A")
+        if speed != "N/A":
+            progress.speed = speed
+        if finished:
+            progress.percent, progress.eta = 100.0, 0
+            return progress
+        # 'out_time_ms' is in microseconds too, used by older versions
+        out_time_us = self._values.get(
+            "out_time_us", self._values.get("out_time_ms", "N/A")
+        )
+        if not self.duration or not out_time_us.isdigit():
+            return progress
+        out_time = int(out_time_us) / 1_000_000
+        progress.percent = round(min(100.0, out_time / self.duration * 100), 1)
+        try:
+            speed_factor = float(speed.rstrip("x"))
+        except ValueError:
+            return progress
+        if speed_factor > 0:
+            remaining = max(0.0, self.duration - out_time)
+            progress.eta = int(remaining / speed_factor)
+        return progress
+
+
+class ProgressPublisher:
+    """Publish the download progress of a media to the websocket clients, \
+        as the output of yt-dlp and ffmpeg is read. \n
+    Events are throttled to one per `interval` seconds, an event coming \
+        sooner replaces the pending one, which is sent with the next event \
+        or by `flush` when the stage ends. Must be used in a running event \
+        loop, events are sent in the background."""
+
+    def __init__(self, media_id: int, interval: float = PUBLISH_INTERVAL):
+        """Create a publisher for a media. \n
+        Args:
+            media_id (int): ID of the media being downloaded.
+            interval (float, Optional=PUBLISH_INTERVAL): Min seconds \
+                between events."""
+        self.media_id = media_id
+        self.interval = interval
+        self._pending: DownloadProgress | None = None
+        self._last_sent = float("-inf")
+        self._tasks: set[asyncio.Task] = set()
+
+    def update(self, progress: DownloadProgress) -> None:
+        """Publish the progress, or keep it as pending if the last event \
+            was sent less than `interval` seconds ago."""
+        if time.monotonic() - self._last_sent < self.interval:
+            self._pending = progress
+            return
+        self._send(progress)
+
+    def flush(self) -> None:
+        """Publish the pending progress, if any."""
+        if self._pending is not None:
+            self._send(self._pending)
+
+    def ytdlp_handler(self) -> LineHandler:
+        """Get an output handler for yt-dlp, publishing its progress."""
+
+        def _on_line(stream: str, line: str) -> None:
+            progress = parse_ytdlp_progress(self.media_id, line)
+            if progress is not None:
+                self.update(progress)
+
+        return _on_line
+
+    def ffmpeg_handler(self) -> LineHandler:
+        """Get an output handler for ffmpeg run with `-progress pipe:1`, \
+            publishing its progress."""
+        parser = FFmpegProgressParser(self.media_id)
+
+        def _on_line(stream: str, line: str) -> None:
+            progress = parser.parse_line(stream, line)
+            if progress is not None:
+                self.update(progress)
+
+        return _on_line
+
+    def _send(self, progress: DownloadProgress) -> None:
+        """🚨This is a private method🚨 \n
+        Send the progress to the clients in a background task."""
+        self._pending = None
+        self._last_sent = time.monotonic()
+        if not websockets.ws_manager.active_connections:
+            return
+        task = asyncio.get_running_loop().create_task(
+            websockets.ws_manager.broadcast_progress(asdict(progress))
+        )
+        # Keep a reference, so the task is not garbage collected
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
@@ -6,13 +6,18 @@ from core.base.database.manager.base import MediaDatabaseManager
 from core.base.database.models.helpers import MediaUpdateDC
 from core.base.database.models.media import MediaRead, MonitorStatus
 from core.base.database.models.trailerprofile import TrailerProfileRead
-from core.download.video_v2 import download_video
-from core.download import trailer_file, trailer_search, video_analysis
+from core.download import (
+    trailer_file,
+    trailer_search,
+    video_analysis,
+    video_v2,
+)
+from core.download.pipeline import DownloadPipeline
+from core.download.progress import ProgressPublisher
 from core.plex_extras import get_plex
 from exceptions import DownloadFailedError
 import os
 
-
 logger = ModuleLogger("TrailersDownloader")
 
 
@@ -55,22 +60,47 @@ def __update_media_status(media: MediaRead, type: MonitorStatus):
     return None
 
 
-def __download_and_verify_trailer(
-    media: MediaRead, video_id: str, profile: TrailerProfileRead
+async def __download_and_verify_trailer(
+    media: MediaRead,
+    video_id: str,
+    profile: TrailerProfileRead,
+    pipeline: DownloadPipeline | None = None,
 ) -> str:
-    """Download the trailer and verify it."""
+    """Download the trailer and verify it. \n
+    The download runs in the download stage of the pipeline, conversion, \
+        verification and silence removal in the conversion stage."""
     trailer_url = f"https://www.youtube.com/watch?v={video_id}"
     logger.info(
-        f"Downloading trailer for {media.title} [{media.id}] from" f" {trailer_url}"
+        f"Downloading trailer for {media.title} [{media.id}] from"
+        f" {trailer_url}"
     )
     tmp_output_file = f"/app/tmp/{media.id}-trailer.%(ext)s"
-    output_file = download_video(trailer_url, tmp_output_file, profile)
-    tmp_output_file = tmp_output_file.replace("%(ext)s", profile.file_format)
-    if not trailer_file.verify_download(tmp_output_file, output_file, media.title):
-        raise DownloadFailedError("Trailer verification failed")
-    if profile.remove_silence:
-        output_file = video_analysis.remove_silence_at_end(output_file)
-    return output_file
+    progress = ProgressPublisher(media.id)
+
+    async def _download() -> str:
+        return await video_v2.download_source(
+            trailer_url, tmp_output_file, profile, progress
+        )
+
+    async def _convert(download_file: str) -> str:
+        output_file = await video_v2.convert_source(
+            download_file, tmp_output_file, profile, progress
+        )
+        tmp_file = tmp_output_file.replace("%(ext)s", profile.file_format)
+        if not await trailer_file.verify_download(
+            tmp_file, output_file, media.title
+        ):
+            raise DownloadFailedError("Trailer verification failed")
+        if profile.remove_silence:
+            output_file = await video_analysis.remove_silence_at_end(
+                output_file
+            )
+        return output_file
+
+    if pipeline is not None:
+        return await pipeline.run(_download, _convert)
+    async with DownloadPipeline(convert_workers=1) as pipeline:
+        return await pipeline.run(_download, _convert)
 
 
 async def download_trailer(
@@ -78,6 +108,7 @@ async def download_trailer(
     profile: TrailerProfileRead,
     retry_count: int = 2,
     exclude: list[str] | None = None,
+    pipeline: DownloadPipeline | None = None,
 ) -> bool:
     """Download trailer for a media object with given profile.
     Args:
@@ -85,6 +116,8 @@ async def download_trailer(
         profile (TrailerProfileRead): The trailer profile to use.
         retry_count (int, optional): Number of retries if download fails. Defaults to 2.
         exclude (list[str], optional): List of video IDs to exclude from search. Defaults to None.
+        pipeline (DownloadPipeline, optional): Pipeline to download and convert \
+            the trailer in, shared with other downloads. Defaults to None.
     Returns:
         bool: True if trailer download was successful, False otherwise.
     Raises:
@@ -96,7 +129,8 @@ async def download_trailer(
     # --- Plex-Pass guard ---
     if plex and plex.has_trailer(media.txdb_id, media.is_movie):
         logger.info(
-            "Skipped trailer download for %s - Plex Pass already provides trailer.",
+            "Skipped trailer download for %s - Plex Pass already provides"
+            " trailer.",
             media.title,
         )
         return True
@@ -121,7 +155,9 @@ async def download_trailer(
     try:
         __update_media_status(media, MonitorStatus.DOWNLOADING)
         # Download the trailer and verify
-        output_file = __download_and_verify_trailer(media, video_id, profile)
+        output_file = await __download_and_verify_trailer(
+            media, video_id, profile, pipeline
+        )
         # Move the trailer to the media folder (create subfolder if needed)
         trailer_file.move_trailer_to_folder(output_file, media, profile)
         __update_media_status(media, MonitorStatus.DOWNLOADED)
@@ -136,9 +172,15 @@ async def download_trailer(
         logger.error(f"Failed to download trailer: {e}")
         __update_media_status(media, MonitorStatus.MISSING)
         if retry_count > 0:
-            logger.info(f"Retrying download for {media.title}... ({3 - retry_count}/3)")
+            logger.info(
+                f"Retrying download for {media.title}... ({3 - retry_count}/3)"
+            )
             media.youtube_trailer_id = None
             if video_id:
                 exclude.append(video_id)
-            return await download_trailer(media, profile, retry_count - 1, exclude)
-        raise DownloadFailedError(f"Failed to download trailer for {media.title}")
+            return await download_trailer(
+                media, profile, retry_count - 1, exclude, pipeline
+            )
+        raise DownloadFailedError(
+            f"Failed to download trailer for {media.title}"
+        )
@@ -231,7 +231,7 @@ def move_trailer_to_folder(
     return True
 
 
-def verify_download(
+async def verify_download(
     tmp_output_file: str, output_file: str, title: str
 ) -> bool:
     """Verify if the trailer is downloaded successfully. \n
@@ -250,7 +250,9 @@ def verify_download(
         trailer_downloaded = False
     else:
         # Verify the trailer has audio and video streams
-        trailer_downloaded = video_analysis.verify_trailer_streams(output_file)
+        trailer_downloaded = await video_analysis.verify_trailer_streams(
+            output_file
+        )
         if not trailer_downloaded:
             logger.debug(
                 f"Trailer has either no audio or video streams: {title}"
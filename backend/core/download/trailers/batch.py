@@ -1,68 +1,247 @@
 import asyncio
-from random import randint
+from dataclasses import dataclass
+import math
+import threading
+import time
+
 from app_logger import ModuleLogger
+from config.settings import app_settings
+from core.base.database.manager import trailerprofile
+from core.base.database.manager.base import MediaDatabaseManager
+from core.base.database.manager.download import (
+    VISIBILITY_TIMEOUT,
+    DownloadQueueManager,
+)
+from core.base.database.models.download import (
+    DownloadJobRead,
+    DownloadPriority,
+    get_current_time,
+)
 from core.base.database.models.media import MediaRead
 from core.base.database.models.trailerprofile import TrailerProfileRead
+from core.base.database.utils.engine import run_async_read, run_async_write
+from core.base.utils.rate_limit import TokenBucket
+from core.download.pipeline import DownloadPipeline, get_convert_workers
 from core.download.trailer import download_trailer
-from exceptions import DownloadFailedError
+from exceptions import DownloadFailedError, ItemNotFoundError
 
 logger = ModuleLogger("TrailerDownloadTasks")
 
+# Paces all downloads, tasks run in their own event loops
+_download_bucket = TokenBucket(
+    rate=app_settings.trailer_downloads_per_hour / 3600,
+    capacity=app_settings.trailer_download_burst,
+)
+# Held while the queue is processed, tasks run in their own threads
+_queue_lock = threading.Lock()
+
+
+@dataclass(slots=True)
+class DownloadPoolStats:
+    """Progress of the downloads of the queue."""
+
+    total: int
+    downloaded: int = 0
+    failed: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def done(self) -> int:
+        return self.downloaded + self.failed
+
+    @property
+    def per_hour(self) -> float:
+        """Downloads finished per hour, since the downloads started."""
+        if self.elapsed <= 0:
+            return 0.0
+        return self.done * 3600 / self.elapsed
+
+
+def _get_download_bucket() -> TokenBucket:
+    """🚨This is a private method🚨 \n
+    Get the shared download bucket, with the rate from current settings."""
+    _download_bucket.configure(
+        rate=app_settings.trailer_downloads_per_hour / 3600,
+        capacity=app_settings.trailer_download_burst,
+    )
+    return _download_bucket
+
+
+async def _keep_claimed(
+    queue: DownloadQueueManager, job: DownloadJobRead
+) -> None:
+    """🚨This is a private method🚨 \n
+    Extend the visibility timeout of a job while it's downloading."""
+    while True:
+        await asyncio.sleep(VISIBILITY_TIMEOUT / 3)
+        await run_async_write(queue.extend, job.id)
+
 
-async def batch_download_task(
-    media_list: list[MediaRead],
-    profile: TrailerProfileRead,
-    downloading_count: int | None = None,
-    download_count: int | None = None,
+def _load_job_items(
+    job: DownloadJobRead,
+) -> tuple[MediaRead, TrailerProfileRead] | None:
+    """🚨This is a private method🚨 \n
+    Read the media and profile of a job, None if either was removed or the \
+        trailer was downloaded since the job was queued."""
+    try:
+        media = MediaDatabaseManager().read(job.media_id)
+        profile = trailerprofile.get_trailerprofile(job.profile_id)
+    except ItemNotFoundError:
+        return None
+    # Manual requests can replace an existing trailer
+    if media.trailer_exists and job.priority < DownloadPriority.MANUAL:
+        return None
+    if job.yt_id:
+        media.youtube_trailer_id = job.yt_id
+    return media, profile
+
+
+async def _run_download_workers(
+    workers: int, stats: DownloadPoolStats
 ) -> None:
-    """Download trailers for a list of media IDs with given profile. \n
+    """🚨This is a private method🚨 \n
+    Claim and download the jobs in the queue with concurrent workers, \
+        until no job is available. Database calls are run off the event \
+        loop, so that they don't hold up the output readers of the \
+        running downloads and conversions."""
+    queue = DownloadQueueManager()
+    bucket = _get_download_bucket()
+    started_at = time.monotonic() - stats.elapsed
+    # Trailers are downloaded by up to `workers` at once, while others
+    # are converted
+    pipeline = DownloadPipeline(
+        download_workers=workers,
+        convert_workers=min(workers, get_convert_workers()),
+    )
+
+    async def _worker() -> None:
+        while True:
+            job = await run_async_write(queue.claim)
+            if job is None:
+                return
+            items = await asyncio.to_thread(_load_job_items, job)
+            if items is None:
+                logger.debug(
+                    f"Skipping queued download for media [{job.media_id}],"
+                    " media or profile removed or trailer already exists"
+                )
+                await run_async_write(queue.complete, job.id)
+                continue
+            media, profile = items
+            stats.total += 1
+            keep_claimed = asyncio.create_task(_keep_claimed(queue, job))
+            try:
+                await bucket.acquire()
+                ready_count = await run_async_read(
+                    queue.count, ready_only=True
+                )
+                logger.info(
+                    f"Downloading trailer for '{media.title}' [{media.id}]"
+                    f" (attempt {job.attempts}), {ready_count} in queue"
+                )
+                if await download_trailer(
+                    media, profile, job.retry_count, pipeline=pipeline
+                ):
+                    stats.downloaded += 1
+                else:
+                    stats.failed += 1
+                await run_async_write(queue.complete, job.id)
+            except DownloadFailedError as e:
+                # Already retried by the download, not queued again
+                stats.failed += 1
+                logger.error(e)
+                await run_async_write(queue.complete, job.id)
+            except Exception as e:
+                stats.failed += 1
+                logger.error(
+                    "Unexpected error downloading trailer for media"
+                    f" '{media.title}' [{media.id}]: {e}"
+                )
+                if await run_async_write(queue.fail, job.id, str(e)):
+                    logger.info(
+                        f"Download for '{media.title}' [{media.id}] will be"
+                        " retried later"
+                    )
+            finally:
+                keep_claimed.cancel()
+            stats.elapsed = time.monotonic() - started_at
+            queued_count = await run_async_read(queue.count)
+            logger.info(
+                f"Trailer downloads: {stats.done} done"
+                f" ({stats.failed} failed), {stats.per_hour:.1f}/hour,"
+                f" {queued_count} in queue"
+            )
+
+    # A worker waits for the conversion of its trailer, more workers than
+    # downloads keep the downloads going while trailers are converted
+    worker_count = pipeline.download_workers + pipeline.convert_workers
+    async with pipeline:
+        await asyncio.gather(*(_worker() for _ in range(worker_count)))
+    stats.elapsed = time.monotonic() - started_at
+
+
+async def _schedule_retries(queue: DownloadQueueManager) -> None:
+    """🚨This is a private method🚨 \n
+    Schedule the processing of the queue for when the next job waiting \
+        to be retried is available, if any."""
+    # Imported here, the download tasks import this module
+    from core.tasks.download_trailers import schedule_download_queue
+
+    next_visible_at = await run_async_read(queue.next_visible_at)
+    if next_visible_at is None:
+        return
+    delay = (next_visible_at - get_current_time()).total_seconds()
+    delay = max(1, math.ceil(delay))
+    logger.debug(f"Processing the download queue again in {delay} seconds")
+    schedule_download_queue(delay=delay)
+
+
+async def process_download_queue(
+    workers: int | None = None,
+) -> DownloadPoolStats:
+    """Download the trailers queued in the download queue, using a pool \
+        of concurrent workers, until no queued download is available. \n
+    Workers read the media and profile of each job when they claim it. \
+        Trailers are downloaded and converted in a `DownloadPipeline`, so \
+        a trailer is downloaded while another is converted. \
+        Downloads are started at the rate of `trailer_downloads_per_hour`, \
+        with up to `trailer_download_burst` started right away. \n
+    Only one call processes the queue at a time, others return right away \
+        as their jobs are picked up by the running one. Jobs left waiting \
+        to be retried are processed again when they are available, with \
+        `schedule_download_queue`. \n
     🚨 This function needs to be called from a background task. 🚨
     Args:
-        media_list (list[MediaRead]): List of media objects to download trailers for.
-        profile (TrailerProfileRead): The trailer profile to use for download.
-        downloading_count (int, optional=None): The current downloading count.
-        download_count (int, optional=None): The total download count.
+        workers (int, optional=None): Number of concurrent downloads. \
+            Defaults to `trailer_download_workers` setting.
     Returns:
-        None
+        DownloadPoolStats: Number of trailers downloaded and failed, \
+            and the time taken.
     """
-    if downloading_count is None:
-        downloading_count = 1
-    if download_count is None:
-        download_count = len(media_list)
-    for media in media_list:
-        logger.info(
-            f"Downloading trailer {downloading_count}/{download_count}"
-        )
+    stats = DownloadPoolStats(total=0)
+    if workers is None:
+        workers = app_settings.trailer_download_workers
+    workers = max(1, workers)
+    queue = DownloadQueueManager()
+    while ready_count := await run_async_read(queue.count, ready_only=True):
+        if not _queue_lock.acquire(blocking=False):
+            logger.debug("Download queue is already being processed")
+            return stats
         try:
-            await download_trailer(media, profile)
-        except DownloadFailedError as e:
-            logger.error(e)
-        except Exception as e:
-            logger.error(
-                "Unexpected error downloading trailer for media"
-                f" '{media.title}' [{media.id}]: {e}"
+            logger.info(
+                f"Downloading {ready_count} queued trailers"
+                f" with {workers} workers, at most"
+                f" {app_settings.trailer_downloads_per_hour} per hour"
             )
+            await _run_download_workers(workers, stats)
         finally:
-            downloading_count += 1
-        # Sleep for a random time if more downloads are pending
-        if downloading_count >= download_count:
-            return
-        _sleep_for = randint(0, 60)  # Random sleep between 0 and 60 seconds
-        # Increase the sleep time as more trailers are being downloaded
-        if downloading_count < 10:
-            _sleep_for += 120
-        elif downloading_count < 50:
-            _sleep_for += 240
-        elif downloading_count < 100:
-            _sleep_for += 360
-        elif downloading_count < 200:
-            _sleep_for += 420
-        elif downloading_count < 500:
-            _sleep_for += 540
-        elif downloading_count < 1000:
-            _sleep_for += 600
+            _queue_lock.release()
+        # Check again for jobs queued after the workers finished
+    await _schedule_retries(queue)
+    if stats.total:
         logger.info(
-            f"Sleeping for {_sleep_for} seconds before next download..."
+            f"Downloaded {stats.downloaded}/{stats.total} trailers in"
+            f" {stats.elapsed:.0f} seconds ({stats.per_hour:.1f}/hour),"
+            f" {stats.failed} failed"
         )
-        await asyncio.sleep(_sleep_for)
-    return None
+    return stats
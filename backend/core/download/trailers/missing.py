@@ -1,28 +1,23 @@
+from datetime import datetime, timedelta, timezone
+
 from app_logger import ModuleLogger
 from config.settings import app_settings
 from core.base.database.manager import trailerprofile
 from core.base.database.manager.base import MediaDatabaseManager
+from core.base.database.manager.download import DownloadQueueManager
+from core.base.database.models.download import DownloadPriority
 from core.base.database.models.media import MediaRead
 from core.base.database.models.trailerprofile import TrailerProfileRead
-from core.base.utils.filters import matches_filters
-from core.download.trailers.batch import batch_download_task
+from core.base.utils.filters import compile_profile_matcher
+from core.download.trailers.batch import process_download_queue
 from core.files_handler import FilesHandler
 import os
 from core.plex_extras import get_plex
 
 logger = ModuleLogger("TrailerDownloadTasks")
 
-
-def _find_matching_profile_id(
-    db_media: MediaRead, trailer_profiles: list[TrailerProfileRead]
-) -> int | None:
-    """Find a matching profile for a media item and return it's ID."""
-    # Sort profiles by priority, higher priority first
-    trailer_profiles.sort(key=lambda p: p.priority, reverse=True)
-    for profile in trailer_profiles:
-        if matches_filters(db_media, profile.customfilter.filters):
-            return profile.id
-    return None
+# Media added within this time is downloaded before the backlog
+NEW_MEDIA_AGE = timedelta(days=1)
 
 
 def _is_valid_media(db_media: MediaRead, skipped_titles: dict[str, list[str]]) -> bool:
@@ -57,85 +52,106 @@ def _is_valid_media(db_media: MediaRead, skipped_titles: dict[str, list[str]]) -
 
 
 def _process_media_items(
-    db_media_list: list[MediaRead],
     trailer_profiles: list[TrailerProfileRead],
     skipped_titles: dict[str, list[str]],
     profile_to_media_map: dict[int, list[MediaRead]],
-) -> int:
-    """Process media items and group them by matching profiles."""
+) -> tuple[int, int]:
+    """Find monitored media matching the profiles and group them by the \
+        highest priority profile they match. \n
+    Media not matching any profile is filtered out in the database, the \
+        profiles compiled once are used to pick the profile of each item.\n
+    Returns:
+        tuple[int, int]: Number of media items checked and number of \
+            media items that need a download."""
+    db_manager = MediaDatabaseManager()
+    plex = get_plex()
+    match_profile = compile_profile_matcher(trailer_profiles)
+    _checked_count = 0
     _download_count = 0
-    for db_media in db_media_list:
-        if not db_media.monitor:
-            skipped_titles["not_monitored"].append(db_media.title)
-            continue
-
-        plex = get_plex()
-        # --- Plex-Pass guard ---
-        if plex and plex.has_trailer(db_media.txdb_id, db_media.is_movie):
-            logger.info(
-                "Skipped trailer download for %s - Plex Pass already provides trailer.",
-                db_media.title,
-            )
-            continue
-        # -----------------------
-
-        profile_id = _find_matching_profile_id(db_media, trailer_profiles)
-        if not profile_id:
-            skipped_titles["no_matching_profile"].append(db_media.title)
-            continue
-
-        if not _is_valid_media(db_media, skipped_titles):
-            continue
-
-        # if _check_file_already_downloaded(
-        #     db_media, trailer_profiles[profile_id]
-        # ):
-        #     skipped_titles["already_downloaded"].append(db_media.title)
-        #     continue
-
-        _download_count += 1
-        profile_to_media_map[profile_id].append(db_media)
-    return _download_count
+    for db_media_list in db_manager.read_all_batches(
+        filter_by="monitored",
+        any_filters=[p.customfilter.filters for p in trailer_profiles],
+    ):
+        _checked_count += len(db_media_list)
+        for db_media in db_media_list:
+            profile = match_profile(db_media)
+            if profile is None:
+                continue
+
+            # --- Plex-Pass guard ---
+            if plex and plex.has_trailer(db_media.txdb_id, db_media.is_movie):
+                logger.info(
+                    "Skipped trailer download for %s - Plex Pass already"
+                    " provides trailer.",
+                    db_media.title,
+                )
+                continue
+            # -----------------------
+
+            if not _is_valid_media(db_media, skipped_titles):
+                continue
+
+            # if _check_file_already_downloaded(
+            #     db_media, trailer_profiles[profile_id]
+            # ):
+            #     skipped_titles["already_downloaded"].append(db_media.title)
+            #     continue
+
+            _download_count += 1
+            profile_to_media_map[profile.id].append(db_media)
+    return _checked_count, _download_count
 
 
 def _log_skipped_titles(
     skipped_titles: dict[str, list[str]],
-    total_media_count: int,
+    checked_count: int,
     download_count: int,
 ) -> None:
     """Log skipped media titles and summary."""
     for skip_reason, skip_titles in skipped_titles.items():
         skip_reason = skip_reason.replace("_", " ")
         logger.debug(f"Skipped {len(skip_titles)} titles - {skip_reason}")
-    _skip_count = sum(len(titles) for titles in skipped_titles.values())
+    _skip_count = checked_count - download_count
     logger.info(
-        f"Total {total_media_count} media items checked. "
+        f"Total {checked_count} media items checked. "
         f"Skipped: {_skip_count}, Download needed: {download_count}"
     )
 
 
+def _get_priority(media: MediaRead, new_after: datetime) -> DownloadPriority:
+    """Get the download priority of a media, recently added media is \
+        downloaded before the backlog."""
+    # Datetimes read from the database are naive, in UTC
+    if media.added_at.replace(tzinfo=None) >= new_after:
+        return DownloadPriority.NEW
+    return DownloadPriority.BACKLOG
+
+
 async def _download_trailers(
     profile_map: dict[int, TrailerProfileRead],
     profile_to_media_map: dict[int, list[MediaRead]],
-    download_count: int,
 ) -> None:
-    """Download trailers for each profile with its media list."""
-    _downloading_count = 1
+    """Queue the trailer downloads for the media of all profiles, and \
+        download the queued trailers."""
+    queue = DownloadQueueManager()
+    new_after = datetime.now(timezone.utc).replace(tzinfo=None) - NEW_MEDIA_AGE
     for profile_id, media_list in profile_to_media_map.items():
-        profile = profile_map[profile_id]
         if not media_list:
             continue
         logger.info(
-            f"Downloading trailers for {len(media_list)} media items using"
-            f" profile: {profile.customfilter.filter_name}"
-        )
-        await batch_download_task(
-            media_list,
-            profile,
-            downloading_count=_downloading_count,
-            download_count=download_count,
+            f"Queueing trailer downloads for {len(media_list)} media items"
+            " using profile:"
+            f" {profile_map[profile_id].customfilter.filter_name}"
         )
-        _downloading_count += len(media_list)
+        for priority in (DownloadPriority.NEW, DownloadPriority.BACKLOG):
+            media_ids = [
+                media.id
+                for media in media_list
+                if _get_priority(media, new_after) == priority
+            ]
+            if media_ids:
+                queue.enqueue(media_ids, profile_id, priority)
+    await process_download_queue()
 
 
 async def download_missing_trailers() -> None:
@@ -145,8 +161,6 @@ async def download_missing_trailers() -> None:
         logger.warning("Monitoring is disabled, skipping trailers download")
         return
 
-    db_manager = MediaDatabaseManager()
-    db_media_list = db_manager.read_all()
     trailer_profiles = trailerprofile.get_trailerprofiles()
 
     if not trailer_profiles:
@@ -165,13 +179,9 @@ async def download_missing_trailers() -> None:
     if not enabled_profiles:
         logger.warning("No enabled TrailerProfiles found, skipping download")
         return
-    # Sort Profiles to the highest priority first
-    enabled_profiles.sort(key=lambda p: p.priority, reverse=True)
-
     # Initialize the dictionary to track skipped titles.
+    # Media not monitored or not matching any profile is not read at all.
     skipped_titles: dict[str, list[str]] = {
-        "no_matching_profile": [],
-        "not_monitored": [],
         "missing_folder_path": [],
         "media_not_found": [],
         # "already_downloaded": [],
@@ -183,12 +193,12 @@ async def download_missing_trailers() -> None:
         profile.id: [] for profile in enabled_profiles
     }
 
-    _download_count = _process_media_items(
-        db_media_list, enabled_profiles, skipped_titles, profile_to_media_map
+    _checked_count, _download_count = _process_media_items(
+        enabled_profiles, skipped_titles, profile_to_media_map
     )
 
-    _log_skipped_titles(skipped_titles, len(db_media_list), _download_count)
+    _log_skipped_titles(skipped_titles, _checked_count, _download_count)
 
-    await _download_trailers(profile_map, profile_to_media_map, _download_count)
+    await _download_trailers(profile_map, profile_to_media_map)
 
     logger.info("Finished downloading missing trailers.")
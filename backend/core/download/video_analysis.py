@@ -1,16 +1,20 @@
+import asyncio
 from datetime import datetime
 import os
 import re
-import subprocess
 import json
 
 from pydantic import BaseModel
 
 from config.settings import app_settings
 from app_logger import ModuleLogger
+from core.base.utils.process_runner import run_process
 
 logger = ModuleLogger("VideoAnalysis")
 
+ANALYSIS_TIMEOUT = 120  # 2 minutes timeout for ffprobe / silence detection
+TRIM_TIMEOUT = 300  # 5 minutes timeout for trimming a video
+
 
 class StreamInfo(BaseModel):
 
@@ -58,7 +62,7 @@ def convert_bitrate(bit_rate: str) -> str:
     return f"{value} bps"
 
 
-def get_media_info(file_path: str) -> VideoInfo | None:
+async def get_media_info(file_path: str) -> VideoInfo | None:
     """
     Get media information using ffprobe. \n
     Args:
@@ -83,12 +87,9 @@ def get_media_info(file_path: str) -> VideoInfo | None:
     ]
     try:
         logger.debug(f"Running media analysis for: {file_path}")
-        # Run ffprobe command to get media info
-        result = subprocess.run(
-            ffprobe_cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
+        # Run ffprobe command to get media info, keep all of the json output
+        result = await run_process(
+            ffprobe_cmd, timeout=ANALYSIS_TIMEOUT, max_lines=100_000
         )
         # Return None if command failed
         if result.returncode != 0:
@@ -131,12 +132,14 @@ def get_media_info(file_path: str) -> VideoInfo | None:
             )
             video_info.streams.append(stream_info)
         return video_info
+    except asyncio.TimeoutError:
+        logger.error(f"Media analysis timed out for: {file_path}")
     except Exception as e:
         logger.error(f"Error extracting video info: {str(e)}")
     return None
 
 
-def verify_trailer_streams(trailer_path: str):
+async def verify_trailer_streams(trailer_path: str):
     """
     Check if the trailer has audio and video streams. \n
     Args:
@@ -149,7 +152,7 @@ def verify_trailer_streams(trailer_path: str):
     if not trailer_path:
         return False
     # Get media analysis for the trailer
-    media_info = get_media_info(trailer_path)
+    media_info = await get_media_info(trailer_path)
     if media_info is None:
         logger.debug(f"No media info found for the trailer: {trailer_path}")
         return False
@@ -188,7 +191,7 @@ def verify_trailer_streams(trailer_path: str):
     return True
 
 
-def get_silence_timestamps(
+async def get_silence_timestamps(
     file_path: str,
 ) -> tuple[float | None, float | None]:
     """
@@ -204,7 +207,14 @@ def get_silence_timestamps(
     try:
         # Get silence timestamps using ffmpeg silencedetect filter
         logger.debug(f"Running ffmpeg silencedetect for: {file_path}")
-        result = subprocess.run(
+        # Keep only the silencedetect lines, not all of the ffmpeg output
+        silence_lines: list[str] = []
+
+        def _on_line(stream: str, line: str) -> None:
+            if "silence_" in line:
+                silence_lines.append(line)
+
+        await run_process(
             [
                 "/usr/local/bin/ffmpeg",
                 "-i",
@@ -215,16 +225,16 @@ def get_silence_timestamps(
                 "null",
                 "-",
             ],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
+            timeout=ANALYSIS_TIMEOUT,
+            on_line=_on_line,
+            max_lines=20,
         )
         silence_start = None
         silence_end = None
         logger.debug(
             f"Silence detection completed for: {file_path}, parsing results..."
         )
-        for line in result.stderr.split("\n"):
+        for line in silence_lines:
             if "silence_start" in line:
                 silence_start = float(
                     re.search(r"silence_start: (\d+\.\d+)", line).group(1)  # type: ignore
@@ -244,6 +254,8 @@ def get_silence_timestamps(
             silence_start + 2.0 if silence_start is not None else None
         )
         return silence_start, silence_end
+    except asyncio.TimeoutError:
+        logger.error(f"Silence detection timed out for: {file_path}")
     except Exception as e:
         logger.error(f"Exception while detecting silence in video: {str(e)}")
     # timeTook = datetime.now() - time
@@ -251,7 +263,7 @@ def get_silence_timestamps(
     return None, None
 
 
-def trim_video_at_end(
+async def trim_video_at_end(
     file_path: str, output_file: str, end_timestamp: int | float | str
 ) -> bool:
     """Trim the video at the end using ffmpeg. \n
@@ -283,12 +295,7 @@ def trim_video_at_end(
             "copy",
             output_file,
         ]
-        remove_result = subprocess.run(
-            remove_cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-        )
+        remove_result = await run_process(remove_cmd, timeout=TRIM_TIMEOUT)
         if remove_result.returncode == 0:
             # print("STDERR:")
             # print(remove_result.stderr)
@@ -308,7 +315,7 @@ def trim_video_at_end(
     return False
 
 
-def remove_silence_at_end(file_path: str) -> str:
+async def remove_silence_at_end(file_path: str) -> str:
     """
     Remove silence from the end of the video. \n
     Args:
@@ -318,7 +325,7 @@ def remove_silence_at_end(file_path: str) -> str:
     """
     logger.info(f"Detecting silence at end of video: {file_path}")
     # Get silence timestamps
-    silence_start, silence_end = get_silence_timestamps(file_path)
+    silence_start, silence_end = await get_silence_timestamps(file_path)
     if silence_start is None or silence_end is None:
         logger.info("No silence detected at end of video")
         return file_path
@@ -331,7 +338,7 @@ def remove_silence_at_end(file_path: str) -> str:
             "Silence detected at end of video. Trimming video at"
             f" {silence_start}"
         )
-        trim_video_at_end(file_path, output_file, silence_start)
+        await trim_video_at_end(file_path, output_file, silence_start)
     except Exception as e:
         logger.error(f"Exception while removing silence from video: {str(e)}")
         return file_path
@@ -266,7 +266,7 @@ def _get_subtitle_options(
 #     return ffmpeg_cmd
 
 
-def get_ffmpeg_cmd(
+async def get_ffmpeg_cmd(
     profile: TrailerProfileRead,
     input_file: str,
     output_file: str,
@@ -293,7 +293,7 @@ def get_ffmpeg_cmd(
     _audio_stream: StreamInfo | None = None
     _subtitle_stream: StreamInfo | None = None
     # Get the media streams information
-    media_info = get_media_info(input_file)
+    media_info = await get_media_info(input_file)
     if media_info is not None:
         for stream in media_info.streams:
             if stream.codec_type == "video":
@@ -307,6 +307,10 @@ def get_ffmpeg_cmd(
         "-hide_banner",
         # "-loglevel",
         # "repeat+level+warning",
+        # Write progress as 'key=value' lines to stdout, instead of stats
+        "-nostats",
+        "-progress",
+        "pipe:1",
     ]
     # Set video specific options
     ffmpeg_cmd.extend(
@@ -1,11 +1,13 @@
+import asyncio
 import os
 import shlex
-import subprocess
 import time
 from app_logger import ModuleLogger
 
 from config.settings import app_settings
 from core.base.database.models.trailerprofile import TrailerProfileRead
+from core.base.utils.process_runner import LineHandler, run_process
+from core.download.progress import ProgressPublisher
 from core.download.video_conversion import get_ffmpeg_cmd
 from exceptions import ConversionFailedError, DownloadFailedError
 
@@ -134,14 +136,18 @@ def _get_ytdl_options(profile: TrailerProfileRead) -> list[str]:
     return _options
 
 
-def _download_with_ytdlp(
-    url: str, file_path: str, profile: TrailerProfileRead
+async def _download_with_ytdlp(
+    url: str,
+    file_path: str,
+    profile: TrailerProfileRead,
+    progress: ProgressPublisher | None = None,
 ) -> str:
     """Download the video using yt-dlp from the given URL
     Args:
         url (str): URL of the video
         file_path (str): Output file path
         profile (TrailerProfileRead): Trailer profile used for downloading
+        progress (ProgressPublisher, Optional=None): Publishes the progress
     Raises:
         DownloadFailedError: Error while downloading video
     Returns:
@@ -153,46 +159,16 @@ def _download_with_ytdlp(
     # Download the video
     logger.debug(f"Downloading video with options: {ytdlp_cmd}")
 
+    on_line = _log_output_line("YT-DLP")
+    if progress is not None:
+        on_line = _chain_handlers(on_line, progress.ytdlp_handler())
     try:
-        result = subprocess.run(
+        result = await run_process(
             ytdlp_cmd,
-            capture_output=True,
-            text=True,
             timeout=SUBPROCESS_TIMEOUT,  # 15 minutes timeout
-            encoding="utf-8",
-            errors="replace",
+            on_line=on_line,
         )
-
-        # Log all output in a single call and check for sign-in errors
-        combined_output = ""
-        if result.stdout:
-            combined_output += f"STDOUT:\n{result.stdout}\n"
-        if result.stderr:
-            combined_output += f"STDERR:\n{result.stderr}"
-
-        if combined_output:
-            logger.debug(f"YT-DLP output::\n{combined_output}")
-
-        # Check for sign-in errors in stderr
-        if result.stderr:
-            stderr_lower = result.stderr.lower()
-            if "sign in" in stderr_lower:
-                msg = "Sign in required to download video"
-                if "age restricted" in stderr_lower:
-                    msg = "Video is age restricted, sign in to download"
-                elif "not a bot" in stderr_lower:
-                    msg = (
-                        "Youtube bot detection kicked in, sign in to download"
-                    )
-                logger.error(msg)
-                raise DownloadFailedError(msg)
-
-        if result.returncode != 0:
-            msg = f"yt-dlp command failed with exit code {result.returncode}"
-            logger.error(msg)
-            raise DownloadFailedError(f"Error downloading video. {msg}")
-
-    except subprocess.TimeoutExpired:
+    except asyncio.TimeoutError:
         msg = "yt-dlp download timed out after 15 minutes"
         logger.error(msg)
         raise DownloadFailedError(msg)
@@ -200,14 +176,37 @@ def _download_with_ytdlp(
         msg = f"Error running yt-dlp process: {str(e)}"
         logger.error(msg)
         raise DownloadFailedError(msg)
+    finally:
+        if progress is not None:
+            progress.flush()
+
+    # Check for sign-in errors in stderr
+    stderr_lower = result.stderr.lower()
+    if "sign in" in stderr_lower:
+        msg = "Sign in required to download video"
+        if "age restricted" in stderr_lower:
+            msg = "Video is age restricted, sign in to download"
+        elif "not a bot" in stderr_lower:
+            msg = "Youtube bot detection kicked in, sign in to download"
+        logger.error(msg)
+        raise DownloadFailedError(msg)
+
+    if result.returncode != 0:
+        msg = f"yt-dlp command failed with exit code {result.returncode}"
+        logger.error(msg)
+        raise DownloadFailedError(f"Error downloading video. {msg}")
 
     logger.info("Video downloaded successfully")
     return file_path.replace("%(ext)s", profile.file_format)
     # return "Video downloaded successfully"
 
 
-def _convert_video(
-    profile: TrailerProfileRead, input_file: str, output_file: str, retry=True
+async def _convert_video(
+    profile: TrailerProfileRead,
+    input_file: str,
+    output_file: str,
+    retry=True,
+    progress: ProgressPublisher | None = None,
 ) -> str:
     """Convert the video to the desired format
     Args:
@@ -216,56 +215,30 @@ def _convert_video(
         output_file (str): Output video file path
         retry (bool, Optional=True): Retry the conversion without hardware acceleration. \
             If conversion fails, retry without hardware acceleration once
+        progress (ProgressPublisher, Optional=None): Publishes the progress
     Raises:
         ConversionFailedError: Error while converting video
     Returns:
         str: Success message if the video is converted successfully
     """
     # Get the ffmpeg command for conversion
-    ffmpeg_cmd = get_ffmpeg_cmd(
+    ffmpeg_cmd = await get_ffmpeg_cmd(
         profile, input_file, output_file, fallback=not retry
     )
     # Convert the video
     logger.debug(f"Converting video with options: {ffmpeg_cmd}")
 
+    # Progress is written to stdout, only log the messages in stderr
+    on_line = _log_output_line("FFmpeg", streams=("stderr",))
+    if progress is not None:
+        on_line = _chain_handlers(on_line, progress.ffmpeg_handler())
     try:
-        result = subprocess.run(
+        result = await run_process(
             ffmpeg_cmd,
-            capture_output=True,
-            text=True,
             timeout=SUBPROCESS_TIMEOUT,  # 15 minutes timeout
-            encoding="utf-8",
-            errors="replace",
+            on_line=on_line,
         )
-
-        # Log all output in a single call
-        combined_output = ""
-        if result.stdout:
-            combined_output += f"STDOUT:\n{result.stdout}\n"
-        if result.stderr:
-            combined_output += f"STDERR:\n{result.stderr}"
-
-        if combined_output:
-            logger.debug(f"FFmpeg output::\n{combined_output}")
-
-        if result.returncode != 0:
-            # If the conversion fails, retry without hardware acceleration
-            if retry:
-                logger.warning(
-                    "FFmpeg conversion failed with exit code"
-                    f" {result.returncode}, retrying without hardware"
-                    " acceleration (if enabled)"
-                )
-                # Retry the conversion with fallback
-                return _convert_video(
-                    profile, input_file, output_file, retry=False
-                )
-            # If the conversion fails again, log the error and raise an exception
-            msg = f"FFmpeg command failed with exit code {result.returncode}"
-            logger.error(msg)
-            raise ConversionFailedError(f"Error converting video. {msg}")
-
-    except subprocess.TimeoutExpired:
+    except asyncio.TimeoutError:
         msg = "FFmpeg conversion timed out after 15 minutes"
         logger.error(msg)
         raise ConversionFailedError(msg)
@@ -273,37 +246,92 @@ def _convert_video(
         msg = f"Error running FFmpeg process: {str(e)}"
         logger.error(msg)
         raise ConversionFailedError(msg)
+    finally:
+        if progress is not None:
+            progress.flush()
+
+    if result.returncode != 0:
+        # If the conversion fails, retry without hardware acceleration
+        if retry:
+            logger.warning(
+                "FFmpeg conversion failed with exit code"
+                f" {result.returncode}, retrying without hardware"
+                " acceleration (if enabled)"
+            )
+            # Retry the conversion with fallback
+            return await _convert_video(
+                profile, input_file, output_file, False, progress
+            )
+        # If the conversion fails again, log the error and raise an exception
+        msg = f"FFmpeg command failed with exit code {result.returncode}"
+        logger.error(f"{msg}, last output:\n{result.stderr}")
+        raise ConversionFailedError(f"Error converting video. {msg}")
 
     logger.info("Video converted successfully")
     return "Video converted successfully"
 
 
+def _log_output_line(
+    name: str, streams: tuple[str, ...] = ("stdout", "stderr")
+) -> LineHandler:
+    """Get a handler logging the output lines of a process as they are \
+        written, instead of all of the output after it exits. \
+        Only the lines of the given `streams` are logged."""
+
+    def _log_line(stream: str, line: str) -> None:
+        if stream in streams:
+            logger.debug(f"{name} {stream}: {line}")
+
+    return _log_line
+
+
+def _chain_handlers(*handlers: LineHandler) -> LineHandler:
+    """Get a handler passing each output line to all of the `handlers`."""
+
+    def _on_line(stream: str, line: str) -> None:
+        for handler in handlers:
+            handler(stream, line)
+
+    return _on_line
+
+
 def _cleanup_files(file_path: str):
-    """Cleanup the temporary files created during the download and conversion"""
-    # Check if a file already exists at the given path, delete it
+    """Cleanup the temporary files left by a previous download and \
+        conversion to the given path. \n
+    Only the files of this path are deleted (ex: '7-trailer.mkv', \
+        'temp_7-trailer.webm.part' and 'trimmed_7-trailer.mkv' for \
+        '7-trailer.%(ext)s'), files of other downloads running at the \
+        same time are kept."""
     dir_name = os.path.dirname(file_path)
-    if os.path.exists(dir_name):
-        for file in os.listdir(dir_name):
-            file_name_wo_ext, file_ext = os.path.splitext(file)
-            if file_name_wo_ext in file:
-                os.remove(os.path.join(dir_name, file))
+    if not os.path.exists(dir_name):
+        return
+    file_name = os.path.basename(file_path).replace("%(ext)s", "")
+    prefixes = tuple(
+        f"{prefix}{file_name}" for prefix in ("", "temp_", "trimmed_")
+    )
+    for file in os.listdir(dir_name):
+        if file.startswith(prefixes):
+            os.remove(os.path.join(dir_name, file))
 
 
-def download_video(
-    url: str, file_path: str, profile: TrailerProfileRead
+async def download_source(
+    url: str,
+    file_path: str,
+    profile: TrailerProfileRead,
+    progress: ProgressPublisher | None = None,
 ) -> str:
-    """Download the video from the given URL
+    """Download the video from the given URL, without converting it. \n
+    This is the network bound stage of `download_video`.
     Args:
         url (str): URL of the video
         file_path (str): Output file path template with %(ext)s
         profile (TrailerProfileRead): Trailer profile used for downloading
+        progress (ProgressPublisher, Optional=None): Publishes the progress
     Raises:
         DownloadFailedError: Error while downloading video
-        ConversionFailedError: Error while converting video
     Returns:
-        str: Success message if the video is downloaded successfully
+        str: Path of the downloaded (temporary) file
     """
-    # try:
     # Get the file name from the file path
     file_name = os.path.basename(file_path)
     temp_file_path = file_path.replace(file_name, f"temp_{file_name}")
@@ -312,20 +340,74 @@ def download_video(
 
     # Download the video using yt-dlp
     start_time = time.perf_counter()  # Download start time
-    download_file_path = _download_with_ytdlp(url, temp_file_path, profile)
-    end_time = time.perf_counter()  # Download end time / Conversion start time
-    logger.debug(f"Trailer downloaded in {end_time - start_time:.2f}s")
+    download_file_path = await _download_with_ytdlp(
+        url, temp_file_path, profile, progress
+    )
+    logger.debug(
+        f"Trailer downloaded in {time.perf_counter() - start_time:.2f}s"
+    )
+    return download_file_path
 
+
+async def convert_source(
+    download_file_path: str,
+    file_path: str,
+    profile: TrailerProfileRead,
+    progress: ProgressPublisher | None = None,
+) -> str:
+    """Convert a video downloaded with `download_source` to the desired \
+        format, and delete the downloaded file. \n
+    This is the CPU bound stage of `download_video`.
+    Args:
+        download_file_path (str): Path of the downloaded file
+        file_path (str): Output file path template with %(ext)s
+        profile (TrailerProfileRead): Trailer profile used for conversion
+        progress (ProgressPublisher, Optional=None): Publishes the progress
+    Raises:
+        ConversionFailedError: Error while converting video
+    Returns:
+        str: Path of the converted file
+    """
     # Add the file extension from download file to the output file
     converted_file_path = file_path.replace(
         "%(ext)s", download_file_path.split(".")[-1]
     )
     # Convert the video to the desired format
-    _convert_video(profile, download_file_path, converted_file_path)
-    logger.debug(f"Trailer converted in {time.perf_counter() - end_time:.2f}s")
+    start_time = time.perf_counter()  # Conversion start time
+    await _convert_video(
+        profile, download_file_path, converted_file_path, progress=progress
+    )
+    logger.debug(
+        f"Trailer converted in {time.perf_counter() - start_time:.2f}s"
+    )
     os.remove(download_file_path)
-    # except Exception as e:
-    #     logger.error(f"Error downloading video: {e}")
-    #     return ""
+    return converted_file_path
+
+
+async def download_video(
+    url: str,
+    file_path: str,
+    profile: TrailerProfileRead,
+    progress: ProgressPublisher | None = None,
+) -> str:
+    """Download the video from the given URL and convert it. \n
+    Use `DownloadPipeline` to download a video while others are converted.
+    Args:
+        url (str): URL of the video
+        file_path (str): Output file path template with %(ext)s
+        profile (TrailerProfileRead): Trailer profile used for downloading
+        progress (ProgressPublisher, Optional=None): Publishes the progress
+    Raises:
+        DownloadFailedError: Error while downloading video
+        ConversionFailedError: Error while converting video
+    Returns:
+        str: Success message if the video is downloaded successfully
+    """
+    download_file_path = await download_source(
+        url, file_path, profile, progress
+    )
+    converted_file_path = await convert_source(
+        download_file_path, file_path, profile, progress
+    )
     logger.info("Video download and conversion completed successfully")
     return converted_file_path
@@ -1,4 +1,5 @@
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime as dt
 import hashlib
 import os
@@ -10,6 +11,7 @@ from pydantic import BaseModel, Field
 import unicodedata
 
 from app_logger import ModuleLogger
+from config.settings import app_settings
 from core.base.database.manager import trailerprofile
 
 logger = ModuleLogger("FilesHandler")
@@ -361,6 +363,88 @@ class FilesHandler:
                 return True
         return False
 
+    @staticmethod
+    def _probe_trailer(
+        path: str, trailer_folders: set[str], check_inline_file: bool
+    ) -> bool:
+        """🚨This is a private method🚨 \n
+        Blocking version of `check_trailer_exists`, run in a worker thread.\n
+        Lists the folder only once, and trailer folders only if found, to \
+            keep the number of round trips low on network shares.\n
+        Args:
+            path (str): The path to the folder to check for a trailer.
+            trailer_folders (set[str]): Lowercase trailer folder names.
+            check_inline_file (bool): If True, also check for a trailer \
+                file in the given folder.\n
+        Returns:
+            bool: True if a trailer exists in the folder, False otherwise."""
+        try:
+            with os.scandir(path) as entries:
+                folders: list[str] = []
+                for entry in entries:
+                    if entry.is_dir():
+                        if entry.name.lower().strip() in trailer_folders:
+                            folders.append(entry.path)
+                    elif check_inline_file and entry.is_file():
+                        if FilesHandler.is_trailer_file(entry.name):
+                            return True
+            for folder in folders:
+                with os.scandir(folder) as entries:
+                    for entry in entries:
+                        if not entry.is_file():
+                            continue
+                        if FilesHandler.is_trailer_file(entry.name):
+                            return True
+        except OSError:
+            # Folder doesn't exist or can't be read
+            return False
+        return False
+
+    @staticmethod
+    async def check_trailers_exist(
+        paths: list[str],
+        check_inline_file: bool = False,
+        max_workers: int | None = None,
+    ) -> dict[str, bool]:
+        """Check if trailers exist in multiple folders concurrently.\n
+        Folders are checked in a dedicated pool of worker threads, as \
+            probes are mostly waiting on the disk/network. Use a higher \
+            number of workers for high-latency network shares (NFS/SMB).\n
+        Args:
+            paths (list[str]): The paths to the folders to check.
+            check_inline_file (bool): If True, check for a trailer file in \
+                the given folders and in a 'trailers' folder. If False \
+                (default), only checks for a 'trailers' folder.
+            max_workers (int, Optional=None): Maximum number of folders to \
+                check at the same time. Default is `trailer_probe_workers` \
+                from app settings.\n
+        Returns:
+            dict[str, bool]: Mapping of folder path to trailer exists flag."""
+        unique_paths = list(dict.fromkeys(paths))
+        if not unique_paths:
+            return {}
+        if max_workers is None:
+            max_workers = app_settings.trailer_probe_workers
+        max_workers = max(1, min(max_workers, len(unique_paths)))
+        trailer_folders = FilesHandler.get_trailer_folders()
+        loop = asyncio.get_running_loop()
+        with ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="trailer_probe"
+        ) as executor:
+            results = await asyncio.gather(
+                *(
+                    loop.run_in_executor(
+                        executor,
+                        FilesHandler._probe_trailer,
+                        path,
+                        trailer_folders,
+                        check_inline_file,
+                    )
+                    for path in unique_paths
+                )
+            )
+        return dict(zip(unique_paths, results))
+
     @staticmethod
     def check_file_exists(folder_path: str, file_name: str) -> bool:
         """Check if a file exists in the specified folder.\n
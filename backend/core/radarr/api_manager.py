@@ -1,4 +1,5 @@
-from typing import Any
+from datetime import datetime
+from typing import Any, AsyncGenerator
 from exceptions import InvalidResponseError
 from core.base.arr_manager.base import AsyncBaseArrManager
 
@@ -56,6 +57,25 @@ class RadarrManager(AsyncBaseArrManager):
             return movies
         raise InvalidResponseError("Invalid response from Radarr API")
 
+    async def iter_all_movies(self) -> AsyncGenerator[dict[str, Any], None]:
+        """Stream all movies from the Radarr API, one item at a time
+
+        Items are parsed as the response is received, so the full list \
+            is never held in memory.
+
+        Yields:
+            dict[str, Any]: Movie from the Radarr API
+
+        Raises:
+            ConnectionError: If the connection is refused / response is not 200
+            ConnectionTimeoutError: If the connection times out
+            InvalidResponseError: If the API response is invalid
+        """
+        async for item in self._request_stream(
+            "GET", f"/api/{self.version}/movie"
+        ):
+            yield item
+
     async def get_movie(self, radarr_id: int) -> dict[str, Any]:
         """Get a movie from the Arr API
 
@@ -75,6 +95,25 @@ class RadarrManager(AsyncBaseArrManager):
             return movie
         raise InvalidResponseError("Invalid response from Radarr API")
 
+    async def get_updated_movie_ids(self, since: datetime) -> list[int]:
+        """Get the ids of the movie changed since the given time, from \
+            the Radarr history
+
+        Args:
+            since (datetime): Time to get changes from, naive times are UTC
+
+        Returns:
+            list[int]: Unique ids of the movie with history events
+
+        Raises:
+            ConnectionError: If the connection is refused / response is not 200
+            ConnectionTimeoutError: If the connection times out
+            InvalidResponseError: If the API response is invalid
+        """
+        return await self._get_updated_ids(since, "movieId")
+
     # Define Alias methods here!
     get_all_media = get_all_movies
     get_media = get_movie
+    get_updated_media_ids = get_updated_movie_ids
+    iter_all_media = iter_all_movies
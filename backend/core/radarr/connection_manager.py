@@ -1,5 +1,5 @@
 from core.base.connection_manager import BaseConnectionManager
-from core.radarr.data_parser import parse_movie
+from core.radarr.data_parser import extract_movie, fingerprint_movie
 from core.base.database.models.connection import ConnectionRead
 from core.radarr.api_manager import RadarrManager
 
@@ -18,7 +18,8 @@ class RadarrConnectionManager(BaseConnectionManager):
         super().__init__(
             connection,
             radarr_manager,
-            parse_movie,
+            extract_movie,
+            fingerprint_media=fingerprint_movie,
             # inline_trailer=True,
             is_movie=True,
         )
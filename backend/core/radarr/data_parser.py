@@ -2,7 +2,10 @@ from typing import Any
 
 from pydantic import AliasPath, BaseModel, Field, field_validator
 
+from core.base.database.models.helpers import MediaCreateDC
 from core.base.database.models.media import MediaCreate
+from core.base.utils.extractor import compile_extractor, get_image_urls
+from core.base.utils.fingerprint import compute_fingerprint, get_alias_paths
 
 
 class RadarrDataParser(BaseModel):
@@ -52,6 +55,30 @@ class RadarrDataParser(BaseModel):
         return bool(v)
 
 
+_FINGERPRINT_PATHS = get_alias_paths(RadarrDataParser)
+
+
+def fingerprint_movie(
+    movie_data: dict[str, Any], salt: str = ""
+) -> tuple[str, str]:
+    """Get the txdb id and fingerprint of the movie data from Radarr.\n
+    Fingerprint only changes if any of the fields used by `parse_movie` \
+        are changed, and can be used to skip parsing unchanged movies.\n
+    Args:
+        movie_data (dict[str, Any]): The movie data from Radarr.
+        salt (str, Optional): Extra data to include in the fingerprint.\n
+    Returns:
+        tuple[str, str]: The txdb id and fingerprint of the movie."""
+    images = [
+        (image.get("coverType"), image.get("remoteUrl"))
+        for image in movie_data.get("images", [])
+    ]
+    fingerprint = compute_fingerprint(
+        movie_data, _FINGERPRINT_PATHS, images, salt
+    )
+    return str(movie_data.get("tmdbId", "")), fingerprint
+
+
 def parse_movie(connection_id: int, movie_data: dict[str, Any]) -> MediaCreate:
     """Parse the movie data from Radarr to a MovieCreate object.\n
     Args:
@@ -65,18 +92,33 @@ def parse_movie(connection_id: int, movie_data: dict[str, Any]) -> MediaCreate:
     # print(movie_parsed.model_dump())
 
     new_movie = MediaCreate.model_validate(movie_parsed.model_dump())
-    for image in movie_data["images"]:
-        # Check if the image is a poster or fanart
-        if image["coverType"] == "poster":
-            # Set first poster as the poster_url, if not already set
-            if not new_movie.poster_url:
-                new_movie.poster_url = str(image.get("remoteUrl", "")).strip()
-        elif image["coverType"] == "fanart":
-            # Set first fanart as the fanart_url, if not already set
-            if not new_movie.fanart_url:
-                new_movie.fanart_url = str(image.get("remoteUrl", "")).strip()
-        # Break if both poster and fanart are set
-        if new_movie.poster_url and new_movie.fanart_url:
-            break
+    new_movie.poster_url, new_movie.fanart_url = get_image_urls(
+        movie_data["images"]
+    )
+
+    return new_movie
+
+
+_extract_movie = compile_extractor(
+    RadarrDataParser,
+    MediaCreateDC,
+    converters={"txdb_id": str, "media_exists": bool},
+)
 
+
+def extract_movie(
+    connection_id: int, movie_data: dict[str, Any]
+) -> MediaCreateDC:
+    """Extract the movie data from Radarr to a MediaCreateDC object.\n
+    Same result as `parse_movie`, without pydantic validation. Used for \
+        syncing movies from Radarr to the database.\n
+    Args:
+        connection_id (int): The connection id.
+        movie_data (dict[str, Any]): The movie data from Radarr.\n
+    Returns:
+        MediaCreateDC: The movie data as a MediaCreateDC object."""
+    new_movie = _extract_movie(connection_id, movie_data)
+    new_movie.poster_url, new_movie.fanart_url = get_image_urls(
+        movie_data["images"]
+    )
     return new_movie
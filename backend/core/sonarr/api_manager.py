@@ -1,4 +1,5 @@
-from typing import Any
+from datetime import datetime
+from typing import Any, AsyncGenerator
 from exceptions import InvalidResponseError
 from core.base.arr_manager.base import AsyncBaseArrManager
 
@@ -51,6 +52,25 @@ class SonarrManager(AsyncBaseArrManager):
             return series
         raise InvalidResponseError("Invalid response from Sonarr API")
 
+    async def iter_all_series(self) -> AsyncGenerator[dict[str, Any], None]:
+        """Stream all series from the Sonarr API, one item at a time
+
+        Items are parsed as the response is received, so the full list \
+            is never held in memory.
+
+        Yields:
+            dict[str, Any]: Series from the Sonarr API
+
+        Raises:
+            ConnectionError: If the connection is refused / response is not 200
+            ConnectionTimeoutError: If the connection times out
+            InvalidResponseError: If the API response is invalid
+        """
+        async for item in self._request_stream(
+            "GET", f"/api/{self.version}/series"
+        ):
+            yield item
+
     async def get_series(self, sonarr_id: int) -> dict[str, Any]:
         """Get a series from the Sonarr API
 
@@ -70,6 +90,25 @@ class SonarrManager(AsyncBaseArrManager):
             return series
         raise InvalidResponseError("Invalid response from Sonarr API")
 
+    async def get_updated_series_ids(self, since: datetime) -> list[int]:
+        """Get the ids of the series changed since the given time, from \
+            the Sonarr history
+
+        Args:
+            since (datetime): Time to get changes from, naive times are UTC
+
+        Returns:
+            list[int]: Unique ids of the series with history events
+
+        Raises:
+            ConnectionError: If the connection is refused / response is not 200
+            ConnectionTimeoutError: If the connection times out
+            InvalidResponseError: If the API response is invalid
+        """
+        return await self._get_updated_ids(since, "seriesId")
+
     # Define Alias methods here!
     get_all_media = get_all_series
     get_media = get_series
+    get_updated_media_ids = get_updated_series_ids
+    iter_all_media = iter_all_series
@@ -1,5 +1,5 @@
 from core.base.connection_manager import BaseConnectionManager
-from core.sonarr.data_parser import parse_series
+from core.sonarr.data_parser import extract_series, fingerprint_series
 from core.base.database.models.connection import ConnectionRead
 from core.sonarr.api_manager import SonarrManager
 
@@ -18,7 +18,8 @@ class SonarrConnectionManager(BaseConnectionManager):
         super().__init__(
             connection,
             sonarr_manager,
-            parse_series,
+            extract_series,
+            fingerprint_media=fingerprint_series,
             # inline_trailer=False,
             is_movie=False,
         )
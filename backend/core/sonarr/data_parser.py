@@ -2,7 +2,10 @@ from typing import Any
 
 from pydantic import AliasPath, BaseModel, Field, field_validator
 
+from core.base.database.models.helpers import MediaCreateDC
 from core.base.database.models.media import MediaCreate
+from core.base.utils.extractor import compile_extractor, get_image_urls
+from core.base.utils.fingerprint import compute_fingerprint, get_alias_paths
 
 
 class SonarrDataParser(BaseModel):
@@ -53,6 +56,30 @@ class SonarrDataParser(BaseModel):
         return bool(v)
 
 
+_FINGERPRINT_PATHS = get_alias_paths(SonarrDataParser)
+
+
+def fingerprint_series(
+    series_data: dict[str, Any], salt: str = ""
+) -> tuple[str, str]:
+    """Get the txdb id and fingerprint of the series data from Sonarr.\n
+    Fingerprint only changes if any of the fields used by `parse_series` \
+        are changed, and can be used to skip parsing unchanged series.\n
+    Args:
+        series_data (dict[str, Any]): The series data from Sonarr.
+        salt (str, Optional): Extra data to include in the fingerprint.\n
+    Returns:
+        tuple[str, str]: The txdb id and fingerprint of the series."""
+    images = [
+        (image.get("coverType"), image.get("remoteUrl"))
+        for image in series_data.get("images", [])
+    ]
+    fingerprint = compute_fingerprint(
+        series_data, _FINGERPRINT_PATHS, images, salt
+    )
+    return str(series_data.get("tvdbId", "")), fingerprint
+
+
 def parse_series(
     connection_id: int, series_data: dict[str, Any]
 ) -> MediaCreate:
@@ -68,20 +95,35 @@ def parse_series(
     # print(series_parsed.model_dump())
 
     new_series = MediaCreate.model_validate(series_parsed.model_dump())
-    for image in series_data["images"]:
-        # Check if the image is a poster or fanart
-        if image["coverType"] == "poster":
-            # Set first poster as the poster_url, if not already set
-            if not new_series.poster_url:
-                new_series.poster_url = str(image.get("remoteUrl", "")).strip()
-        elif image["coverType"] == "fanart":
-            # Set first fanart as the fanart_url, if not already set
-            if not new_series.fanart_url:
-                new_series.fanart_url = str(image.get("remoteUrl", "")).strip()
-        # Break if both poster and fanart are set
-        if new_series.poster_url and new_series.fanart_url:
-            break
+    new_series.poster_url, new_series.fanart_url = get_image_urls(
+        series_data["images"]
+    )
+
+    return new_series
+
+
+_extract_series = compile_extractor(
+    SonarrDataParser,
+    MediaCreateDC,
+    converters={"txdb_id": str, "media_exists": bool},
+)
 
+
+def extract_series(
+    connection_id: int, series_data: dict[str, Any]
+) -> MediaCreateDC:
+    """Extract the series data from Sonarr to a MediaCreateDC object.\n
+    Same result as `parse_series`, without pydantic validation. Used for \
+        syncing series from Sonarr to the database.\n
+    Args:
+        connection_id (int): The connection id.
+        series_data (dict[str, Any]): The series data from Sonarr.\n
+    Returns:
+        MediaCreateDC: The series data as a MediaCreateDC object."""
+    new_series = _extract_series(connection_id, series_data)
+    new_series.poster_url, new_series.fanart_url = get_image_urls(
+        series_data["images"]
+    )
     return new_series
 
 
@@ -1,16 +1,83 @@
 import asyncio
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+import time
+from core.base.arr_manager.client_pool import close_client_sessions
 from core.base.database.manager.connection import ConnectionDatabaseManager
 from core.base.database.models.connection import ArrType, ConnectionRead
 from core.radarr.connection_manager import RadarrConnectionManager
 from core.sonarr.connection_manager import SonarrConnectionManager
 from app_logger import ModuleLogger
+from config.settings import app_settings
 from core.tasks.image_refresh import refresh_images
 from core.tasks import scheduler
 
 logger = ModuleLogger("APIRefreshTasks")
 
 
+def _is_delta_refresh(connection: ConnectionRead) -> bool:
+    """🚨This is a private method🚨 \n
+    Check if the scheduled refresh of a connection can be a delta refresh. \n
+    Args:
+        connection (ConnectionRead): The connection to refresh. \n
+    Returns:
+        bool: True if delta refresh is enabled and a full refresh is not due.
+    """
+    if not app_settings.arr_delta_refresh:
+        return False
+    if not connection.last_synced_at or not connection.last_full_synced_at:
+        return False
+    # Database times are naive UTC
+    full_refresh_due = connection.last_full_synced_at + timedelta(
+        hours=app_settings.arr_full_refresh_interval
+    )
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    return now < full_refresh_due
+
+
+async def _refresh_connection(
+    connection: ConnectionRead,
+    semaphore: asyncio.Semaphore,
+    timeout: float | None = None,
+) -> tuple[str, float]:
+    """🚨This is a private method🚨 \n
+    Refresh data from API for a connection, with a timeout. \n
+    Args:
+        connection (ConnectionRead): The connection to refresh.
+        semaphore (asyncio.Semaphore): Limits the concurrent refreshes.
+        timeout (float, Optional=None): Seconds to wait for the refresh. \
+            Default is None, in which case `arr_refresh_timeout` is used. \n
+    Returns:
+        tuple[str, float]: Status of the refresh and time taken in seconds.
+    """
+    if timeout is None:
+        timeout = app_settings.arr_refresh_timeout
+    async with semaphore:
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(
+                api_refresh_by_id(
+                    connection,
+                    image_refresh=False,
+                    delta=_is_delta_refresh(connection),
+                ),
+                timeout=timeout,
+            )
+            status = "Success"
+        except asyncio.TimeoutError:
+            status = "Timed out"
+            logger.error(
+                f"Refreshing data for connection: {connection.name} timed"
+                f" out after {timeout} seconds"
+            )
+        except Exception as e:
+            status = "Failed"
+            logger.error(
+                f"Failed to refresh data for connection: {connection.name}."
+                f" Error: {e}"
+            )
+        return status, time.perf_counter() - start
+
+
 async def api_refresh() -> None:
     logger.info("Refreshing data from APIs")
     # Get all connections from database
@@ -19,30 +86,65 @@ async def api_refresh() -> None:
         logger.warning("No connections found in the database")
         return
 
-    # Refresh data from API for each connection
-    for connection in connnections:
-        await api_refresh_by_id(connection, image_refresh=False)
+    # Refresh data from API for all connections concurrently
+    start = time.perf_counter()
+    semaphore = asyncio.Semaphore(app_settings.arr_refresh_concurrency)
+    results = await asyncio.gather(
+        *(
+            _refresh_connection(connection, semaphore)
+            for connection in connnections
+        )
+    )
+    for connection, (status, duration) in zip(connnections, results):
+        logger.info(
+            f"Connection: {connection.name} - {status} in {duration:.2f}s"
+        )
+    logger.info(
+        f"Refreshed {len(connnections)} connections in"
+        f" {time.perf_counter() - start:.2f}s"
+    )
 
     # Refresh images after API refresh to download/update images for new media
     await refresh_images(recent_only=True)
     logger.info("API Refresh completed!")
 
 
-async def api_refresh_by_id(connection: ConnectionRead, image_refresh=True) -> None:
+def _get_connection_manager(
+    connection: ConnectionRead,
+) -> SonarrConnectionManager | RadarrConnectionManager | None:
+    """🚨This is a private method🚨 \n
+    Get the connection manager based on the connection type. \n
+    Args:
+        connection (ConnectionRead): The connection to get the manager for. \n
+    Returns:
+        SonarrConnectionManager | RadarrConnectionManager | None: The \
+            connection manager, None if the connection type is invalid.
+    """
+    if connection.arr_type == ArrType.SONARR:
+        return SonarrConnectionManager(connection)
+    if connection.arr_type == ArrType.RADARR:
+        return RadarrConnectionManager(connection)
+    logger.warning(
+        f"Invalid connection type: {connection.arr_type} for connection:"
+        f" {connection}"
+    )
+    return None
+
+
+async def api_refresh_by_id(
+    connection: ConnectionRead, image_refresh=True, delta=False
+) -> None:
     logger.info(f"Refreshing data from API for connection: {connection.name}")
     # Get connection manager based on connection type
-    if connection.arr_type == ArrType.SONARR:
-        connection_db_manager = SonarrConnectionManager(connection)
-    elif connection.arr_type == ArrType.RADARR:
-        connection_db_manager = RadarrConnectionManager(connection)
-    else:
-        logger.warning(
-            f"Invalid connection type: {connection.arr_type} for connection: {connection}"
-        )
+    connection_db_manager = _get_connection_manager(connection)
+    if not connection_db_manager:
         return
 
-    # Refresh data from API
-    await connection_db_manager.refresh()
+    # Refresh data from API, only media changed in Arr history for delta
+    if delta:
+        await connection_db_manager.refresh_delta()
+    else:
+        await connection_db_manager.refresh()
     logger.info(f"Data refreshed for connection: {connection.name}")
 
     # Refresh images after API refresh to download/update images for new media
@@ -52,13 +154,61 @@ async def api_refresh_by_id(connection: ConnectionRead, image_refresh=True) -> N
         logger.info("API Refresh completed!")
 
 
+async def api_refresh_media(
+    connection: ConnectionRead, arr_ids: list[int]
+) -> None:
+    """Refresh data from API for the given media of a connection only, \
+        used by webhooks from the Arr applications. \n
+    Args:
+        connection (ConnectionRead): The connection of the media.
+        arr_ids (list[int]): The ids of the media in the Arr application.
+    """
+    logger.info(
+        f"Refreshing data from API for {len(arr_ids)} media of connection:"
+        f" {connection.name}"
+    )
+    connection_db_manager = _get_connection_manager(connection)
+    if not connection_db_manager:
+        return
+    try:
+        await connection_db_manager.refresh_media(arr_ids)
+    except Exception as e:
+        logger.error(
+            f"Failed to refresh media for connection: {connection.name}."
+            f" Error: {e}"
+        )
+        return
+    # Download/update images for new media
+    await refresh_images(recent_only=True)
+    return
+
+
+async def api_delete_media(
+    connection: ConnectionRead, txdb_ids: list[str]
+) -> None:
+    """Delete the given media of a connection from the database, used by \
+        webhooks from the Arr applications. \n
+    Args:
+        connection (ConnectionRead): The connection of the media.
+        txdb_ids (list[str]): The txdb ids of the media to delete.
+    """
+    connection_db_manager = _get_connection_manager(connection)
+    if not connection_db_manager:
+        return
+    await connection_db_manager.delete_media(txdb_ids)
+    return
+
+
 def api_refresh_by_id_job(connection_id: int):
     def run_async(conn: ConnectionRead) -> None:
         """Run the async task in a separate event loop."""
         new_loop = asyncio.new_event_loop()
         asyncio.set_event_loop(new_loop)
-        new_loop.run_until_complete(api_refresh_by_id(conn))
-        new_loop.close()
+        try:
+            new_loop.run_until_complete(api_refresh_by_id(conn))
+        finally:
+            new_loop.run_until_complete(close_client_sessions())
+            new_loop.close()
         return
 
     logger.info(f"Refreshing data from API for connection ID: {connection_id}")
@@ -1,7 +1,7 @@
 from app_logger import ModuleLogger
 from config.logs import manager as logs_manager
 from core.base.database.manager.base import MediaDatabaseManager
-from core.base.database.models.helpers import MediaUpdateDC
+from core.base.database.models.helpers import MediaTrailerDC, MediaUpdateDC
 from core.base.database.models.media import MonitorStatus
 from core.download import video_analysis
 from core.files_handler import FilesHandler
@@ -57,12 +57,11 @@ async def trailer_cleanup():
     Also cleanup any residual files left in '/tmp' directory.
     """
     logger.info("Running trailer cleanup task...")
-    # Get all media from the database and filter out the ones that have no trailers
+    # Get the media that have trailers, only the columns needed here
     db_manager = MediaDatabaseManager()
-    db_media_list = db_manager.read_all()
-    media_with_trailers = [
-        media for media in db_media_list if media.trailer_exists is True
-    ]
+    media_with_trailers = db_manager.read_all_projected(
+        MediaTrailerDC, filter_by="downloaded"
+    )
     logger.info(
         f"Analyzing {len(media_with_trailers)} media items with trailers."
     )
@@ -80,7 +79,7 @@ async def trailer_cleanup():
 
         # Verify the trailer has audio and video streams
         # if not, delete the trailer file and set monitor to True
-        if not video_analysis.verify_trailer_streams(trailer_path):
+        if not await video_analysis.verify_trailer_streams(trailer_path):
             logger.info(
                 f"Deleting trailer with missing audio/video for {media.title}"
             )
@@ -3,12 +3,13 @@ from datetime import datetime, timedelta
 
 from app_logger import ModuleLogger
 from config.settings import app_settings
+from core.base.arr_manager.client_pool import close_client_sessions
 from core.base.database.manager import trailerprofile
 from core.base.database.manager.base import MediaDatabaseManager
+from core.base.database.manager.download import DownloadQueueManager
+from core.base.database.models.download import DownloadPriority
 from core.base.database.models.media import MediaRead
-from core.base.database.models.trailerprofile import TrailerProfileRead
-from core.download.trailer import download_trailer
-from core.download.trailers.batch import batch_download_task
+from core.download.trailers.batch import process_download_queue
 from core.files_handler import FilesHandler
 from core.tasks import scheduler
 from exceptions import (
@@ -22,19 +23,36 @@ from core.plex_extras import get_plex
 logger = ModuleLogger("TrailerDownloadTasks")
 
 
-def _download_trailer(
-    media: MediaRead,
-    profile: TrailerProfileRead,
-    retry_count: int,
-) -> None:
+def _process_download_queue() -> None:
     """Run the async task in a separate event loop."""
     new_loop = asyncio.new_event_loop()
     asyncio.set_event_loop(new_loop)
-    new_loop.run_until_complete(download_trailer(media, profile, retry_count))
-    new_loop.close()
+    try:
+        new_loop.run_until_complete(process_download_queue())
+    finally:
+        # Close pooled HTTP sessions bound to this loop before closing it
+        new_loop.run_until_complete(close_client_sessions())
+        new_loop.close()
     return
 
 
+def schedule_download_queue(delay: int = 1) -> None:
+    """Schedule a background job to download the queued trailers. \n
+    If the job is already scheduled, it's moved to the new run time. \n
+    Args:
+        delay (int, optional): Seconds to wait before starting. Defaults to 1.
+    """
+    scheduler.add_job(
+        func=_process_download_queue,
+        trigger="date",
+        run_date=datetime.now() + timedelta(seconds=delay),
+        id="download_queue",
+        name="Download Queued Trailers",
+        max_instances=1,
+        replace_existing=True,
+    )
+
+
 def download_trailer_by_id(media_id: int, profile_id: int, yt_id: str = "") -> str:
     """Download trailer for a media by ID with given profile.
     Schedules a background job to download it. \n
@@ -56,7 +74,7 @@ def download_trailer_by_id(media_id: int, profile_id: int, yt_id: str = "") -> s
     media = db_manager.read(media_id)
     _type = "Movie" if media.is_movie else "Series"
     # Check if trailer profile with the given ID exists
-    profile = trailerprofile.get_trailerprofile(profile_id)
+    trailerprofile.get_trailerprofile(profile_id)
 
     logger.info(f"Downloading trailer for {media.title} [{media_id}]")
 
@@ -81,21 +99,16 @@ def download_trailer_by_id(media_id: int, profile_id: int, yt_id: str = "") -> s
         # If yt_id is provided, always use it,
         # disable retries as retries will download a different trailer
         retry_count = 0
-        media.youtube_trailer_id = yt_id
-    elif profile.always_search:
-        # If always search is enabled, do not use the id from the database
-        media.youtube_trailer_id = None
 
-    # Add Job to scheduler to download trailer
-    scheduler.add_job(
-        func=_download_trailer,
-        args=(media, profile, retry_count),
-        trigger="date",
-        run_date=datetime.now() + timedelta(seconds=1),
-        id=f"download_trailer_by_id_{media_id}",
-        name=f"Download Trailer for {media.title}",
-        max_instances=1,
+    # Queue the download ahead of others, media is read again by the worker
+    DownloadQueueManager().enqueue(
+        [media_id],
+        profile_id,
+        DownloadPriority.MANUAL,
+        yt_id=yt_id or None,
+        retry_count=retry_count,
     )
+    schedule_download_queue()
     msg = "Trailer download started in background for "
     msg += f"{_type}: '{media.title}' [{media_id}]"
     if yt_id:
@@ -105,21 +118,9 @@ def download_trailer_by_id(media_id: int, profile_id: int, yt_id: str = "") -> s
     return msg
 
 
-def _batch_download_task(
-    media_list: list[MediaRead],
-    profile: TrailerProfileRead,
-) -> None:
-    """Run the async task in a separate event loop."""
-    new_loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(new_loop)
-    new_loop.run_until_complete(batch_download_task(media_list, profile))
-    new_loop.close()
-    return
-
-
 def batch_download_trailers(profile_id: int, media_ids: list[int]) -> None:
     """Download trailers for a list of media IDs. \n
-    Schedules a background job to download them. \n
+    Queues the downloads and schedules a background job to download them. \n
     Args:
         profile_id (int): The ID of the trailer profile to use for download.
         media_ids (list[int]): List of media IDs to download trailers for.
@@ -182,13 +183,10 @@ def batch_download_trailers(profile_id: int, media_ids: list[int]) -> None:
     if not media_trailer_list:
         logger.info("No missing trailers to download")
         return
-    # Add Job to scheduler to download trailers
-    scheduler.add_job(
-        func=_batch_download_task,
-        args=(media_trailer_list, profile),
-        trigger="date",
-        run_date=datetime.now() + timedelta(seconds=1),
-        id="batch_download_trailers",
-        name="Batch Download Trailers",
-        max_instances=1,
+    # Queue the downloads ahead of others, media is read again by workers
+    DownloadQueueManager().enqueue(
+        [media.id for media in media_trailer_list],
+        profile.id,
+        DownloadPriority.MANUAL,
     )
+    schedule_download_queue()
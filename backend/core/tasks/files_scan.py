@@ -2,6 +2,7 @@ from app_logger import ModuleLogger
 from core.base.database.manager.base import MediaDatabaseManager
 from core.base.database.manager.connection import ConnectionDatabaseManager
 from core.base.database.models.connection import ArrType
+from core.base.database.models.helpers import MediaTrailerDC
 from core.files_handler import FilesHandler
 from core.radarr.connection_manager import RadarrConnectionManager
 from core.sonarr.connection_manager import SonarrConnectionManager
@@ -15,9 +16,7 @@ async def scan_disk_for_trailers() -> None:
         None
     """
     logger.info("Scanning disk for trailers.")
-    # # Get all media from the database
     db_handler = MediaDatabaseManager()
-    all_media = db_handler.read_all()
 
     # # Get all root folders from the media folders
     # root_folders: set[str] = set()
@@ -49,8 +48,9 @@ async def scan_disk_for_trailers() -> None:
         )
 
     # Match the trailer folders to the media in the database
+    # Only the needed columns, one batch of media in memory at a time
     updated_media: list[tuple[int, bool]] = []
-    for media in all_media:
+    for media in db_handler.iter_all_projected(MediaTrailerDC):
         if not media.folder_path:
             continue
         # Check if trailer was found
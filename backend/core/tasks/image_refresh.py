@@ -1,6 +1,6 @@
 from core.base.database.manager.base import MediaDatabaseManager
-from core.base.database.models.helpers import MediaImage
-from core.base.database.models.media import MediaUpdate
+from core.base.database.models.helpers import MediaImage, MediaImagesDC
+from core.base.database.models.media import MediaRead, MediaUpdate
 from core.download.image import refresh_media_images
 from app_logger import ModuleLogger
 
@@ -32,13 +32,16 @@ async def refresh_and_save_media_images(
     is_movie: bool, recent_only: bool = False
 ):
     db_manager = MediaDatabaseManager()
+    db_media_list: list[MediaRead] | list[MediaImagesDC]
     if recent_only:
         # Get all media from the database that have been added/updated \
         # in the last 24 hours
         db_media_list = db_manager.read_recent(movies_only=is_movie)
     else:
-        # Get all media from the database
-        db_media_list = db_manager.read_all(movies_only=is_movie)
+        # Get all media from the database, only the image columns
+        db_media_list = db_manager.read_all_projected(
+            MediaImagesDC, movies_only=is_movie
+        )
     media_image_list: list[MediaImage] = []
     logger.debug(
         "Refreshing images for"
@@ -3,10 +3,13 @@ from datetime import datetime, timedelta
 
 from app_logger import ModuleLogger
 from config.settings import app_settings
+from core.base.arr_manager.client_pool import close_client_sessions
+from core.base.database.manager.download import DownloadQueueManager
 from core.download.trailers.missing import download_missing_trailers
 from core.tasks import scheduler
 from core.tasks.api_refresh import api_refresh
 from core.tasks.cleanup import delete_old_logs, trailer_cleanup
+from core.tasks.download_trailers import schedule_download_queue
 from core.tasks.files_scan import scan_disk_for_trailers
 from core.tasks.image_refresh import refresh_images
 from core.updates.docker_check import check_for_update
@@ -20,8 +23,12 @@ def run_async(task) -> None:
     """Run the async task in a separate event loop."""
     new_loop = asyncio.new_event_loop()
     asyncio.set_event_loop(new_loop)
-    new_loop.run_until_complete(task())
-    new_loop.close()
+    try:
+        new_loop.run_until_complete(task())
+    finally:
+        # Close pooled HTTP sessions bound to this loop before closing it
+        new_loop.run_until_complete(close_client_sessions())
+        new_loop.close()
     return
 
 
@@ -177,6 +184,25 @@ def download_missing_trailers_job():
     return
 
 
+def download_queue_job():
+    """Makes the trailer downloads interrupted by a restart available \
+        again, and schedules a background job to resume the queued \
+        downloads. \n
+        Runs once, in 2 minutes, if any downloads are queued. \n
+    Returns:
+        None
+    """
+    queue = DownloadQueueManager()
+    recovered = queue.recover()
+    if recovered:
+        logger.info(f"Recovered {recovered} interrupted trailer downloads")
+    if not queue.count():
+        return
+    schedule_download_queue(delay=120)
+    logger.info("Download Queue job scheduled!")
+    return
+
+
 def schedule_all_tasks():
     """Schedules all tasks for the application. \n
     Returns:
@@ -196,6 +222,9 @@ def schedule_all_tasks():
     # Schedule trailer download task to run every hour, start in 15 minutes from now
     download_missing_trailers_job()
 
+    # Resume the queued trailer downloads, start in 2 minutes from now
+    download_queue_job()
+
     # Schedule Image Refresh to run every 6 hours, start in 10 minutes from now
     image_refresh_job()
 
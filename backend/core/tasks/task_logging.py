@@ -1,6 +1,5 @@
-from contextlib import contextmanager
 from datetime import datetime, timezone
-from typing import Generator, Sequence
+from typing import Sequence, TypeVar
 
 from api.v1 import websockets
 from apscheduler import events
@@ -8,6 +7,11 @@ from apscheduler.schedulers.base import BaseScheduler
 from apscheduler.job import Job
 from sqlalchemy import StaticPool
 from sqlmodel import Field, SQLModel, Session, col, create_engine, select
+from sqlmodel.sql.expression import SelectOfScalar
+
+from core.base.database.utils.writer import DatabaseWriter
+
+T = TypeVar("T")
 
 
 def get_current_time():
@@ -54,25 +58,24 @@ engine = create_engine(
     },
     poolclass=StaticPool,
 )
+# Reads and writes are serialized on a single writer thread, as all sessions
+# share the one connection of the in-memory database
+db_writer = DatabaseWriter(engine)
 SQLModel.metadata.create_all(engine)
 
 
-@contextmanager
-def _get_session() -> Generator[Session, None, None]:
-    """Provide a SQLModel session for tasks in memory database \n
-    Yields:
-        Session: A SQLModel session \n
+def _read_all(statement: SelectOfScalar[T]) -> Sequence[T]:
+    """Read from the tasks in memory database with `db_writer.run`, so \
+        that the read doesn't use the shared connection while a write \
+        transaction is in progress. \n
+    Args:
+        statement (SelectOfScalar[T]): Select statement to run. \n
+    Returns:
+        Sequence[T]: Rows returned by the statement. \n
     Example:: \n
-        with _get_session() as session:
-            movie_1 = Movie(title=..., year=..., ...)
-            session.add(movie_1)
-            session.commit()
+        tasks = _read_all(select(TaskInfoDB))
     """
-    session = Session(engine)
-    try:
-        yield session
-    finally:
-        session.close()
+    return db_writer.run(lambda session: session.exec(statement).all())
 
 
 def _get_task(task_id: str) -> TaskInfoDB | None:
@@ -82,12 +85,12 @@ def _get_task(task_id: str) -> TaskInfoDB | None:
     Returns:
         TaskInfoDB: Task with the given ID. \n
     """
-    with _get_session() as session:
-        _task_db = session.exec(
-            select(TaskInfoDB).where(TaskInfoDB.task_id == task_id)
-        ).first()
-    if not _task_db:
+    _tasks = _read_all(
+        select(TaskInfoDB).where(TaskInfoDB.task_id == task_id).limit(1)
+    )
+    if not _tasks:
         return None
+    _task_db = _tasks[0]
     # if _task_db.last_run_start:
     #     _task_db.last_run_start = _task_db.last_run_start.replace(tzinfo=timezone.utc)
     return _task_db
@@ -100,10 +103,12 @@ def save_task(task: TaskInfo) -> None:
     Returns:
         None \n
     """
-    with _get_session() as session:
-        task_db = TaskInfoDB.model_validate(task)
-        session.add(task_db)
+
+    def _save(session: Session) -> None:
+        session.add(TaskInfoDB.model_validate(task))
         session.commit()
+
+    db_writer.run(_save)
     return None
 
 
@@ -114,22 +119,26 @@ def update_task(task: TaskInfo) -> None:
     Returns:
         None \n
     """
-    _task_db = _get_task(task.task_id)
-    if not _task_db:
-        save_task(task)
-        return
-
-    # Update the task info with new values
-    _task_db.interval = task.interval
-    _task_db.last_run_duration = task.last_run_duration
-    _task_db.last_run_start = task.last_run_start
-    _task_db.last_run_status = task.last_run_status
-    _task_db.next_run = task.next_run
 
-    # Save to the database
-    with _get_session() as session:
+    def _update(session: Session) -> None:
+        _task_db = session.exec(
+            select(TaskInfoDB).where(TaskInfoDB.task_id == task.task_id)
+        ).first()
+        if not _task_db:
+            session.add(TaskInfoDB.model_validate(task))
+            session.commit()
+            return
+
+        # Update the task info with new values
+        _task_db.interval = task.interval
+        _task_db.last_run_duration = task.last_run_duration
+        _task_db.last_run_start = task.last_run_start
+        _task_db.last_run_status = task.last_run_status
+        _task_db.next_run = task.next_run
         session.add(_task_db)
         session.commit()
+
+    db_writer.run(_update)
     return None
 
 
@@ -140,13 +149,12 @@ def _get_queue(queue_id: str) -> QueueInfoDB | None:
     Returns:
         TaskInfoDB: Task with the given ID. \n
     """
-    with _get_session() as session:
-        _queue_db = session.exec(
-            select(QueueInfoDB).where(QueueInfoDB.queue_id == queue_id)
-        ).first()
-    if not _queue_db:
+    _queues = _read_all(
+        select(QueueInfoDB).where(QueueInfoDB.queue_id == queue_id).limit(1)
+    )
+    if not _queues:
         return None
-    return _queue_db
+    return _queues[0]
 
 
 def save_queue(queue: QueueInfo) -> None:
@@ -156,10 +164,12 @@ def save_queue(queue: QueueInfo) -> None:
     Returns:
         None \n
     """
-    with _get_session() as session:
-        queue_db = QueueInfoDB.model_validate(queue)
-        session.add(queue_db)
+
+    def _save(session: Session) -> None:
+        session.add(QueueInfoDB.model_validate(queue))
         session.commit()
+
+    db_writer.run(_save)
     return None
 
 
@@ -170,21 +180,25 @@ def update_queue(queue: QueueInfo) -> None:
     Returns:
         None \n
     """
-    _queue_db = _get_queue(queue.queue_id)
-    if not _queue_db:
-        save_queue(queue)
-        return
 
-    # Update the task info with new values
-    _queue_db.duration = queue.duration
-    _queue_db.finished = queue.finished
-    _queue_db.started = queue.started
-    _queue_db.status = queue.status
+    def _update(session: Session) -> None:
+        _queue_db = session.exec(
+            select(QueueInfoDB).where(QueueInfoDB.queue_id == queue.queue_id)
+        ).first()
+        if not _queue_db:
+            session.add(QueueInfoDB.model_validate(queue))
+            session.commit()
+            return
 
-    # Save to the database
-    with _get_session() as session:
+        # Update the task info with new values
+        _queue_db.duration = queue.duration
+        _queue_db.finished = queue.finished
+        _queue_db.started = queue.started
+        _queue_db.status = queue.status
         session.add(_queue_db)
         session.commit()
+
+    db_writer.run(_update)
     return None
 
 
@@ -195,7 +209,8 @@ def cleanup_queue() -> None:
         None \n
     """
     _now = get_current_time()
-    with _get_session() as session:
+
+    def _cleanup(session: Session) -> None:
         _queue_list = session.exec(select(QueueInfoDB)).all()
         for _queue in _queue_list:
             if _queue.status == "Running":
@@ -205,9 +220,16 @@ def cleanup_queue() -> None:
             if _seconds_ago > 3630:  # 1 hour with 30 seconds grace period
                 session.delete(_queue)
                 # Also delete the task if it exists and not scheduled task
-                _task = _get_task(_queue.queue_id)
+                _task = session.exec(
+                    select(TaskInfoDB).where(
+                        TaskInfoDB.task_id == _queue.queue_id
+                    )
+                ).first()
                 if _task and not _task.scheduled:
                     session.delete(_task)
+        session.commit()
+
+    db_writer.run(_cleanup)
     return None
 
 
@@ -240,9 +262,8 @@ def get_all_tasks() -> list[TaskInfo]:
     Returns:
         sequence: List of all tasks scheduled in the scheduler.
     """
-    with _get_session() as session:
-        statement = select(TaskInfoDB).where(col(TaskInfoDB.scheduled).is_(True))
-        _jobs_list = session.exec(statement).all()
+    statement = select(TaskInfoDB).where(col(TaskInfoDB.scheduled).is_(True))
+    _jobs_list = _read_all(statement)
     return _to_read_task_list(_jobs_list)
 
 
@@ -251,8 +272,7 @@ def get_all_queue() -> list[QueueInfo]:
     Returns:
         sequence: List of all jobs scheduled in the scheduler.
     """
-    with _get_session() as session:
-        _queue_list = session.exec(select(QueueInfoDB)).all()
+    _queue_list = _read_all(select(QueueInfoDB))
     return _to_read_queue_list(_queue_list)
 
 
@@ -22,7 +22,8 @@ from app_logger import ModuleLogger
 from api.v1.routes import api_v1_router
 from api.v1.websockets import ws_manager
 from config.settings import app_settings
-from core.base.database.utils.engine import flush_records_to_db
+from core.base.arr_manager.client_pool import close_client_sessions
+from core.base.database.utils.engine import db_writer, flush_records_to_db
 from core.tasks import scheduler
 from core.tasks.schedules import schedule_all_tasks
 from core.plex_extras import get_plex
@@ -53,6 +54,9 @@ async def lifespan(app: FastAPI):
     # Before shutdown
     logging.debug("Shutting down the scheduler and flushing logs to DB")
     scheduler.shutdown()
+    await close_client_sessions()
+    # Wait for the queued database writes to be committed
+    db_writer.stop()
     flush_records_to_db()
     flush_logs_to_db()
     logging.debug("Trailarr shutdown complete")
@@ -0,0 +1,192 @@
+import json
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+import pytest
+from sqlmodel import Session
+
+from api.v1 import media as media_module
+from core.base.database.manager import customfilter
+from core.base.database.manager.base import MediaDatabaseManager
+from core.base.database.models.connection import (
+    ArrType,
+    Connection,
+    MonitorType,
+)
+from core.base.database.models.customfilter import (
+    CustomFilterCreate,
+    CustomFilterRead,
+    FilterType,
+)
+from core.base.database.models.filter import (
+    FilterCondition,
+    FilterCreate,
+    FilterRead,
+)
+from core.base.database.models.media import MediaCreate
+from core.base.database.models.trailerprofile import TrailerProfileRead
+from core.base.database.utils.engine import engine
+
+
+@pytest.fixture
+def connection_id():
+    with Session(engine) as session:
+        db_connection = Connection(
+            name="Stream",
+            arr_type=ArrType.RADARR,
+            url="http://example.com",
+            api_key="API_KEY",
+            monitor=MonitorType.MONITOR_NEW,
+        )
+        session.add(db_connection)
+        session.commit()
+        session.refresh(db_connection)
+        connection_id = db_connection.id
+    MediaDatabaseManager().create_or_update_bulk(
+        [
+            MediaCreate(
+                connection_id=connection_id,  # type: ignore
+                arr_id=i,
+                title=f"Stream Movie {i}",
+                txdb_id=str(700000 + i),
+            )
+            for i in range(12)
+        ]
+    )
+    yield connection_id
+    with Session(engine) as session:
+        session.delete(session.get(Connection, connection_id))
+        session.commit()
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(media_module.media_router)
+    return TestClient(app)
+
+
+class TestMediaAll:
+
+    def test_page_and_stream_same_as_all(self, client, connection_id):
+        params = {"sort_by": "title", "sort_asc": False}
+        expected = client.get("/media/all", params=params).json()
+        assert len(expected) >= 12
+
+        items = []
+        cursor = None
+        while True:
+            page_params = {**params, "limit": 5}
+            if cursor:
+                page_params["cursor"] = cursor
+            response = client.get("/media/all/page", params=page_params)
+            assert response.status_code == 200
+            items += response.json()["items"]
+            cursor = response.json()["next_cursor"]
+            if cursor is None:
+                break
+        assert items == expected
+
+        response = client.get("/media/all/stream", params=params)
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        lines = response.text.splitlines()
+        assert [json.loads(line) for line in lines] == expected
+
+    def test_page_invalid_cursor(self, client, connection_id):
+        response = client.get("/media/all/page", params={"cursor": "bad"})
+        assert response.status_code == 400
+
+    def test_filter_page(self, client, connection_id):
+        view_filter = customfilter.create_customfilter(
+            CustomFilterCreate(
+                filter_name="Stream 1x",
+                filter_type=FilterType.MOVIES,
+                filters=[
+                    FilterCreate(
+                        filter_by="title",
+                        filter_condition=FilterCondition.STARTS_WITH,
+                        filter_value="Stream Movie 1",
+                    )
+                ],
+            )
+        )
+        try:
+            response = client.get(
+                f"/media/filter/{view_filter.id}",
+                params={"sort_by": "title", "limit": 2},
+            )
+            assert response.status_code == 200
+            page = response.json()
+            assert [media["title"] for media in page["items"]] == [
+                "Stream Movie 1",
+                "Stream Movie 10",
+            ]
+            response = client.get(
+                f"/media/filter/{view_filter.id}",
+                params={"sort_by": "title", "cursor": page["next_cursor"]},
+            )
+            assert [media["title"] for media in response.json()["items"]] == [
+                "Stream Movie 11"
+            ]
+            # Custom filter for movies only
+            response = client.get(
+                f"/media/filter/{view_filter.id}",
+                params={"movies_only": False},
+            )
+            assert response.json()["items"] == []
+        finally:
+            customfilter.delete_customfilter(view_filter.id)
+        response = client.get(f"/media/filter/{view_filter.id}")
+        assert response.status_code == 404
+
+    def test_media_trailerprofile(self, client, connection_id, monkeypatch):
+        def _profile(
+            profile_id: int, priority: int, enabled: bool, value: str
+        ):
+            return TrailerProfileRead(
+                id=profile_id,
+                customfilter_id=profile_id,
+                priority=priority,
+                enabled=enabled,
+                customfilter=CustomFilterRead(
+                    id=profile_id,
+                    filter_name=f"Profile {profile_id}",
+                    filters=[
+                        FilterRead(
+                            id=profile_id,
+                            customfilter_id=profile_id,
+                            filter_by="title",
+                            filter_condition=FilterCondition.CONTAINS,
+                            filter_value=value,
+                        )
+                    ],
+                ),
+            )
+
+        profiles = [
+            _profile(1, 1, True, "Stream"),
+            _profile(2, 3, False, "Stream Movie 1"),
+            _profile(3, 2, True, "Stream Movie 1"),
+        ]
+
+        async def _get_trailerprofiles():
+            return profiles
+
+        monkeypatch.setattr(
+            media_module.trailerprofile,
+            "get_trailerprofiles_async",
+            _get_trailerprofiles,
+        )
+        media_list = MediaDatabaseManager().read_all_by_connection(
+            connection_id
+        )
+        media_ids = {media.title: media.id for media in media_list}
+        url = "/media/{}/trailerprofile"
+        response = client.get(url.format(media_ids["Stream Movie 1"]))
+        assert response.status_code == 200
+        assert response.json()["id"] == 3
+        response = client.get(url.format(media_ids["Stream Movie 2"]))
+        assert response.json()["id"] == 1
+        profiles.pop(0)
+        response = client.get(url.format(media_ids["Stream Movie 2"]))
+        assert response.status_code == 404
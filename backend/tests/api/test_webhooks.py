@@ -0,0 +1,106 @@
+from datetime import datetime
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+import pytest
+
+from api.v1 import webhooks as webhooks_module
+from core.base.database.models.connection import ArrType, ConnectionRead
+from exceptions import ItemNotFoundError
+
+
+def _connection(arr_type: ArrType) -> ConnectionRead:
+    return ConnectionRead(
+        id=1,
+        name="Arr",
+        arr_type=arr_type,
+        url="http://example.com",
+        api_key="API_KEY",
+        monitor="new",
+        path_mappings=[],
+        added_at=datetime.now(),
+    )
+
+
+@pytest.fixture
+def webhook_calls(monkeypatch):
+    calls: list[tuple] = []
+    connections = {
+        1: _connection(ArrType.RADARR),
+        2: _connection(ArrType.SONARR),
+    }
+
+    def _read(self, connection_id):
+        if connection_id not in connections:
+            raise ItemNotFoundError("Connection", connection_id)
+        return connections[connection_id]
+
+    async def _refresh_media(connection, arr_ids):
+        calls.append(("refresh", connection.arr_type, arr_ids))
+
+    async def _delete_media(connection, txdb_ids):
+        calls.append(("delete", connection.arr_type, txdb_ids))
+
+    monkeypatch.setattr(
+        webhooks_module.ConnectionDatabaseManager, "read", _read
+    )
+    monkeypatch.setattr(webhooks_module, "api_refresh_media", _refresh_media)
+    monkeypatch.setattr(webhooks_module, "api_delete_media", _delete_media)
+    return calls
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(webhooks_module.webhooks_router)
+    return TestClient(app)
+
+
+class TestWebhooks:
+
+    def test_refresh_events(self, client, webhook_calls):
+        movie = {"id": 5, "tmdbId": 123, "title": "Movie"}
+        for event in ("Download", "Rename", "MovieAdded"):
+            response = client.post(
+                "/webhooks/1", json={"eventType": event, "movie": movie}
+            )
+            assert response.status_code == 200
+        series = {"id": 7, "tvdbId": 456}
+        response = client.post(
+            "/webhooks/2",
+            json={"eventType": "SeriesAdd", "series": series, "episodes": []},
+        )
+        assert response.status_code == 200
+        assert webhook_calls == [
+            ("refresh", ArrType.RADARR, [5]),
+            ("refresh", ArrType.RADARR, [5]),
+            ("refresh", ArrType.RADARR, [5]),
+            ("refresh", ArrType.SONARR, [7]),
+        ]
+
+    def test_delete_events(self, client, webhook_calls):
+        response = client.post(
+            "/webhooks/1",
+            json={"eventType": "MovieDelete", "movie": {"id": 5, "tmdbId": 9}},
+        )
+        assert response.status_code == 200
+        response = client.post(
+            "/webhooks/2",
+            json={"eventType": "SeriesDelete", "series": {"id": 7}},
+        )
+        assert response.status_code == 400
+        assert webhook_calls == [("delete", ArrType.RADARR, ["9"])]
+
+    def test_other_events(self, client, webhook_calls):
+        for event in ("Test", "Grab", "Health"):
+            response = client.post("/webhooks/1", json={"eventType": event})
+            assert response.status_code == 200
+        # Payload for a different Arr type than the connection
+        response = client.post(
+            "/webhooks/2", json={"eventType": "Download", "movie": {"id": 5}}
+        )
+        assert response.status_code == 400
+        response = client.post(
+            "/webhooks/3", json={"eventType": "Download", "movie": {"id": 5}}
+        )
+        assert response.status_code == 404
+        assert webhook_calls == []
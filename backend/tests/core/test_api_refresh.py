@@ -0,0 +1,94 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+import pytest
+
+from config.settings import app_settings
+from core.base.database.models.connection import ArrType, ConnectionRead
+from core.tasks import api_refresh as api_refresh_module
+
+
+def _connection(id: int, name: str) -> ConnectionRead:
+    return ConnectionRead(
+        id=id,
+        name=name,
+        arr_type=ArrType.RADARR,
+        url="http://example.com",
+        api_key="API_KEY",
+        monitor="new",
+        path_mappings=[],
+        added_at=datetime.now(),
+    )
+
+
+class TestApiRefresh:
+
+    @pytest.mark.asyncio
+    async def test_refresh_concurrent(self, monkeypatch):
+        connections = [_connection(i, f"Radarr {i}") for i in range(1, 6)]
+        running = 0
+        max_running = 0
+        refreshed: list[str] = []
+
+        async def _refresh_by_id(connection, image_refresh=True, delta=False):
+            nonlocal running, max_running
+            assert image_refresh is False
+            assert delta is False
+            running += 1
+            max_running = max(max_running, running)
+            if connection.name == "Radarr 2":
+                running -= 1
+                raise ValueError("Connection failed")
+            if connection.name == "Radarr 3":
+                await asyncio.sleep(10)
+            await asyncio.sleep(0.05)
+            running -= 1
+            refreshed.append(connection.name)
+
+        async def _refresh_images(recent_only=False):
+            return
+
+        monkeypatch.setattr(
+            api_refresh_module.ConnectionDatabaseManager,
+            "read_all",
+            lambda self: connections,
+        )
+        monkeypatch.setattr(
+            api_refresh_module, "api_refresh_by_id", _refresh_by_id
+        )
+        monkeypatch.setattr(
+            api_refresh_module, "refresh_images", _refresh_images
+        )
+        # Short timeout for the hung connection, below the setting's min
+        refresh_connection = api_refresh_module._refresh_connection
+        monkeypatch.setattr(
+            api_refresh_module,
+            "_refresh_connection",
+            lambda connection, semaphore: refresh_connection(
+                connection, semaphore, timeout=1
+            ),
+        )
+        monkeypatch.setenv("ARR_REFRESH_CONCURRENCY", "2")
+        assert app_settings.arr_refresh_concurrency == 2
+
+        await asyncio.wait_for(api_refresh_module.api_refresh(), timeout=5)
+        # Failed and hung connections don't stop the others
+        assert sorted(refreshed) == ["Radarr 1", "Radarr 4", "Radarr 5"]
+        assert max_running == 2
+
+    def test_is_delta_refresh(self, monkeypatch):
+        connection = _connection(1, "Radarr 1")
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        monkeypatch.setenv("ARR_FULL_REFRESH_INTERVAL", "24")
+        monkeypatch.setenv("ARR_DELTA_REFRESH", "True")
+        # Never refreshed before
+        assert not api_refresh_module._is_delta_refresh(connection)
+        connection.last_synced_at = now - timedelta(hours=1)
+        connection.last_full_synced_at = now - timedelta(hours=2)
+        assert api_refresh_module._is_delta_refresh(connection)
+        # Full refresh is due
+        connection.last_full_synced_at = now - timedelta(hours=25)
+        assert not api_refresh_module._is_delta_refresh(connection)
+        # Delta refresh disabled
+        connection.last_full_synced_at = now - timedelta(hours=2)
+        monkeypatch.setenv("ARR_DELTA_REFRESH", "False")
+        assert not api_refresh_module._is_delta_refresh(connection)
@@ -0,0 +1,124 @@
+from datetime import datetime, timezone
+from types import SimpleNamespace
+import pytest
+from sqlmodel import Session
+
+from core.base.database.manager.base import MediaDatabaseManager
+from core.base.database.models.connection import (
+    ArrType,
+    Connection,
+    MonitorType,
+)
+from core.base.database.models.download import DownloadPriority
+from core.base.database.models.filter import FilterCondition, FilterRead
+from core.base.database.models.media import MediaCreate
+from core.base.database.utils.engine import engine
+from core.download.trailers import missing
+
+
+@pytest.fixture
+def connection_id(tmp_path):
+    with Session(engine) as session:
+        db_connection = Connection(
+            name="Missing",
+            arr_type=ArrType.RADARR,
+            url="http://example.com",
+            api_key="API_KEY",
+            monitor=MonitorType.MONITOR_NEW,
+        )
+        session.add(db_connection)
+        session.commit()
+        session.refresh(db_connection)
+        connection_id = db_connection.id
+    MediaDatabaseManager().create_or_update_bulk(
+        [
+            MediaCreate(
+                connection_id=connection_id,  # type: ignore
+                arr_id=i,
+                title=f"Missing {title}",
+                year=year,
+                txdb_id=str(600000 + i),
+                folder_path=str(tmp_path) if i != 3 else "/not/a/folder",
+                monitor=monitor,
+            )
+            for i, (title, year, monitor) in enumerate(
+                [
+                    ("Old", 1990, True),
+                    ("New", 2020, True),
+                    ("Unmonitored", 2020, False),
+                    ("No Folder", 2020, True),
+                    ("Other", 2020, True),
+                ]
+            )
+        ]
+    )
+    yield connection_id
+    with Session(engine) as session:
+        session.delete(session.get(Connection, connection_id))
+        session.commit()
+
+
+def _profile(
+    profile_id: int,
+    priority: int,
+    *filters: tuple[str, FilterCondition, str],
+):
+    return SimpleNamespace(
+        id=profile_id,
+        priority=priority,
+        customfilter=SimpleNamespace(
+            filters=[
+                FilterRead(
+                    id=1,
+                    customfilter_id=profile_id,
+                    filter_by=filter_by,
+                    filter_condition=condition,
+                    filter_value=value,
+                )
+                for filter_by, condition, value in filters
+            ]
+        ),
+    )
+
+
+def test_process_media_items(monkeypatch, connection_id):
+    monkeypatch.setattr(missing, "get_plex", lambda: None)
+    monkeypatch.setattr(missing.app_settings, "wait_for_media", False)
+    title = ("title", FilterCondition.STARTS_WITH, "Missing")
+    profiles = [
+        _profile(2, 1, title),
+        _profile(1, 2, title, ("year", FilterCondition.GREATER_THAN, "2000")),
+        _profile(3, 0, ("title", FilterCondition.CONTAINS, "Other")),
+    ]
+    skipped_titles: dict[str, list[str]] = {
+        "missing_folder_path": [],
+        "media_not_found": [],
+    }
+    profile_to_media_map: dict = {1: [], 2: [], 3: []}
+    checked_count, count = missing._process_media_items(
+        profiles, skipped_titles, profile_to_media_map  # type: ignore
+    )
+    titles = {
+        profile_id: [media.title for media in media_list]
+        for profile_id, media_list in profile_to_media_map.items()
+    }
+    assert titles == {
+        1: ["Missing New", "Missing Other"],
+        2: ["Missing Old"],
+        3: [],
+    }
+    assert checked_count == 4
+    assert count == 3
+    assert skipped_titles["missing_folder_path"] == ["Missing No Folder"]
+
+
+def test_recently_added_media_has_priority():
+    new_after = datetime(2026, 1, 10)
+    media = SimpleNamespace(
+        added_at=datetime(2026, 1, 11, tzinfo=timezone.utc)
+    )
+    priority = missing._get_priority(media, new_after)  # type: ignore
+    assert priority == DownloadPriority.NEW
+    media.added_at = datetime(2026, 1, 9)
+    priority = missing._get_priority(media, new_after)  # type: ignore
+    assert priority == DownloadPriority.BACKLOG
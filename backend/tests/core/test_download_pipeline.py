@@ -0,0 +1,171 @@
+import asyncio
+import time
+
+import pytest
+
+from core.base.utils.cpu_quota import get_cpu_quota
+from core.download.pipeline import DownloadPipeline
+from exceptions import ConversionFailedError, DownloadFailedError
+
+STAGE_TIME = 0.05
+
+
+class _Stages:
+    """Fake stages, tracking the order of stage events."""
+
+    def __init__(self) -> None:
+        self.events: list[tuple[str, int]] = []
+
+    def download(self, index: int, error: bool = False):
+        async def _download() -> str:
+            self.events.append(("download", index))
+            await asyncio.sleep(STAGE_TIME)
+            if error:
+                raise DownloadFailedError("Download failed")
+            return f"/tmp/{index}.webm"
+
+        return _download
+
+    def convert(self, index: int, error: bool = False):
+        async def _convert(download_file: str) -> str:
+            assert download_file == f"/tmp/{index}.webm"
+            self.events.append(("convert", index))
+            await asyncio.sleep(STAGE_TIME)
+            if error:
+                raise ConversionFailedError("Conversion failed")
+            return f"/tmp/{index}.mkv"
+
+        return _convert
+
+
+class TestDownloadPipeline:
+
+    @pytest.mark.asyncio
+    async def test_stages_overlap(self):
+        stages = _Stages()
+        start = time.monotonic()
+        async with DownloadPipeline(2, 1) as pipeline:
+            results = await asyncio.gather(
+                *(
+                    pipeline.run(stages.download(i), stages.convert(i))
+                    for i in range(4)
+                )
+            )
+        elapsed = time.monotonic() - start
+        assert results == [f"/tmp/{i}.mkv" for i in range(4)]
+        # Sequential would take 8 stage times, conversions are the
+        # bottleneck with the first download before them
+        assert elapsed < 7 * STAGE_TIME
+        first_convert = stages.events.index(("convert", 0))
+        assert ("download", 1) in stages.events[: first_convert + 1]
+
+    @pytest.mark.asyncio
+    async def test_errors_are_returned_to_callers(self):
+        stages = _Stages()
+        async with DownloadPipeline(2, 2) as pipeline:
+            results = await asyncio.gather(
+                pipeline.run(stages.download(0, True), stages.convert(0)),
+                pipeline.run(stages.download(1), stages.convert(1, True)),
+                pipeline.run(stages.download(2), stages.convert(2)),
+                return_exceptions=True,
+            )
+        assert isinstance(results[0], DownloadFailedError)
+        assert isinstance(results[1], ConversionFailedError)
+        assert results[2] == "/tmp/2.mkv"
+        assert ("convert", 0) not in stages.events
+
+    @pytest.mark.asyncio
+    async def test_downloads_wait_for_conversions(self):
+        stages = _Stages()
+
+        async def _slow_convert(download_file: str) -> str:
+            await asyncio.sleep(STAGE_TIME * 4)
+            return download_file
+
+        async with DownloadPipeline(1, 1, queue_size=1) as pipeline:
+            tasks = [
+                asyncio.create_task(
+                    pipeline.run(stages.download(i), _slow_convert)
+                )
+                for i in range(6)
+            ]
+            await asyncio.sleep(STAGE_TIME * 4.5)
+            # First video is converting, second is waiting in the queue,
+            # third is downloaded and held until there is room in the queue
+            downloaded = [e for e in stages.events if e[0] == "download"]
+            assert len(downloaded) == 3
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_stops_stage(self):
+        stage = asyncio.Event()
+        stopped = asyncio.Event()
+
+        async def _download() -> str:
+            stage.set()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                stopped.set()
+                raise
+            return "/tmp/0.webm"
+
+        stages = _Stages()
+        async with DownloadPipeline(1, 1) as pipeline:
+            task = asyncio.create_task(
+                pipeline.run(_download, stages.convert(0))
+            )
+            await stage.wait()
+            task.cancel()
+            await asyncio.wait_for(stopped.wait(), 1)
+            # Pipeline keeps working for other callers
+            result = await pipeline.run(stages.download(1), stages.convert(1))
+        assert result == "/tmp/1.mkv"
+
+    @pytest.mark.asyncio
+    async def test_close_cancels_callers(self):
+        async def _download() -> str:
+            await asyncio.sleep(10)
+            return "/tmp/0.webm"
+
+        stages = _Stages()
+        pipeline = DownloadPipeline(1, 1)
+        pipeline.start()
+        task = asyncio.create_task(pipeline.run(_download, stages.convert(0)))
+        await asyncio.sleep(0.01)
+        await pipeline.close()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    @pytest.mark.asyncio
+    async def test_not_started(self):
+        stages = _Stages()
+        with pytest.raises(RuntimeError):
+            await DownloadPipeline(1, 1).run(
+                stages.download(0), stages.convert(0)
+            )
+
+
+class TestCpuQuota:
+
+    def test_cgroup_v2_quota(self, tmp_path):
+        (tmp_path / "cpu.max").write_text("150000 100000\n")
+        assert get_cpu_quota(str(tmp_path)) == min(2, get_cpu_quota("/none"))
+
+    def test_cgroup_v2_unlimited(self, tmp_path):
+        (tmp_path / "cpu.max").write_text("max 100000\n")
+        assert get_cpu_quota(str(tmp_path)) == get_cpu_quota("/none")
+
+    def test_cgroup_v1_quota(self, tmp_path):
+        (tmp_path / "cpu").mkdir()
+        (tmp_path / "cpu" / "cpu.cfs_quota_us").write_text("50000\n")
+        (tmp_path / "cpu" / "cpu.cfs_period_us").write_text("100000\n")
+        assert get_cpu_quota(str(tmp_path)) == 1
+
+    def test_cgroup_v1_unlimited(self, tmp_path):
+        (tmp_path / "cpu").mkdir()
+        (tmp_path / "cpu" / "cpu.cfs_quota_us").write_text("-1\n")
+        (tmp_path / "cpu" / "cpu.cfs_period_us").write_text("100000\n")
+        assert get_cpu_quota(str(tmp_path)) == get_cpu_quota("/none")
@@ -0,0 +1,302 @@
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+from sqlmodel import Session
+
+from core.base.database.manager import trailerprofile
+from core.base.database.manager.base import MediaDatabaseManager
+from core.base.database.manager.download import (
+    RETRY_DELAY,
+    DownloadQueueManager,
+)
+from core.base.database.models.connection import (
+    ArrType,
+    Connection,
+    MonitorType,
+)
+from core.base.database.models.customfilter import CustomFilterCreate
+from core.base.database.models.download import DownloadPriority
+from core.base.database.models.media import MediaCreate
+from core.base.database.models.trailerprofile import TrailerProfileCreate
+from core.base.database.utils.engine import engine
+from core.base.utils.rate_limit import TokenBucket
+from core.download.trailers import batch
+from core.tasks import download_trailers
+from exceptions import DownloadFailedError
+
+
+@pytest.fixture
+def queue_data():
+    """Media and a trailer profile to queue downloads for."""
+    with Session(engine) as session:
+        db_connection = Connection(
+            name="Pool",
+            arr_type=ArrType.RADARR,
+            url="http://example.com",
+            api_key="API_KEY",
+            monitor=MonitorType.MONITOR_NEW,
+        )
+        session.add(db_connection)
+        session.commit()
+        session.refresh(db_connection)
+        connection_id = db_connection.id
+    db_manager = MediaDatabaseManager()
+    db_manager.create_or_update_bulk(
+        [
+            MediaCreate(
+                connection_id=connection_id,  # type: ignore
+                arr_id=i,
+                title=f"Pool {i}",
+                txdb_id=str(980000 + i),
+            )
+            for i in range(10)
+        ]
+    )
+    media_ids = sorted(
+        media.id for media in db_manager.read_all_by_connection(connection_id)
+    )
+    profile_id = trailerprofile.create_trailerprofile(
+        TrailerProfileCreate(
+            customfilter=CustomFilterCreate(filter_name="Pool")
+        )
+    ).id
+    yield SimpleNamespace(media_ids=media_ids, profile_id=profile_id)
+    with Session(engine) as session:
+        session.delete(session.get(Connection, connection_id))
+        session.commit()
+    trailerprofile.delete_trailerprofile(profile_id)
+
+
+def _enqueue(queue_data, media_ids: list[int]) -> None:
+    DownloadQueueManager().enqueue(
+        media_ids, queue_data.profile_id, DownloadPriority.BACKLOG
+    )
+
+
+@pytest.fixture
+def downloads(monkeypatch):
+    """Fake downloads run through the pipeline, tracking the number of \
+        downloads running at once and the times of the stages. Set \
+        `results` to the result (or error) of the download of a media."""
+    state = SimpleNamespace(
+        running=0,
+        max_running=0,
+        calls=[],
+        yt_ids=[],
+        results={},
+        convert_time=0.0,
+        stages=[],
+        scheduled=[],
+    )
+
+    async def _download() -> str:
+        start = time.monotonic()
+        state.running += 1
+        state.max_running = max(state.max_running, state.running)
+        await asyncio.sleep(0.02)
+        state.running -= 1
+        state.stages.append(("download", start, time.monotonic()))
+        return "/tmp/trailer.webm"
+
+    async def _convert(download_file: str) -> str:
+        start = time.monotonic()
+        await asyncio.sleep(state.convert_time)
+        state.stages.append(("convert", start, time.monotonic()))
+        return "/tmp/trailer.mkv"
+
+    async def _download_trailer(media, profile, retry_count=2, pipeline=None):
+        state.calls.append((media.id, profile.id, retry_count))
+        state.yt_ids.append(media.youtube_trailer_id)
+        await pipeline.run(_download, _convert)
+        result = state.results.get(media.id, True)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    monkeypatch.setattr(batch, "download_trailer", _download_trailer)
+    monkeypatch.setattr(
+        download_trailers,
+        "schedule_download_queue",
+        lambda delay=1: state.scheduled.append(delay),
+    )
+    monkeypatch.setattr(
+        batch, "_get_download_bucket", lambda: TokenBucket(1000, 100)
+    )
+    return state
+
+
+class TestTokenBucket:
+
+    def test_burst_then_paced(self):
+        bucket = TokenBucket(rate=10, capacity=3)
+        delays = [bucket.reserve() for _ in range(5)]
+        assert delays[:3] == [0.0, 0.0, 0.0]
+        # Waiting callers are spaced by 1/rate, in order
+        assert delays[3] == pytest.approx(0.1, abs=0.01)
+        assert delays[4] == pytest.approx(0.2, abs=0.01)
+
+    def test_refills_up_to_capacity(self):
+        bucket = TokenBucket(rate=100, capacity=2)
+        bucket.reserve()
+        bucket.reserve()
+        time.sleep(0.1)
+        assert [bucket.reserve() for _ in range(2)] == [0.0, 0.0]
+        assert bucket.reserve() > 0
+
+    @pytest.mark.asyncio
+    async def test_acquire_paces_callers(self):
+        bucket = TokenBucket(rate=50, capacity=1)
+        start = time.monotonic()
+        await asyncio.gather(*(bucket.acquire() for _ in range(6)))
+        assert time.monotonic() - start >= 0.09
+
+    @pytest.mark.asyncio
+    async def test_cancelled_acquire_returns_token(self):
+        bucket = TokenBucket(rate=1, capacity=1)
+        await bucket.acquire()
+        task = asyncio.create_task(bucket.acquire())
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        # Next caller waits for one token, not two
+        assert bucket.reserve() <= 1
+
+
+class TestDownloadQueueProcessing:
+
+    @pytest.mark.asyncio
+    async def test_concurrent_workers(self, downloads, queue_data):
+        _enqueue(queue_data, queue_data.media_ids)
+        stats = await batch.process_download_queue(workers=3)
+        assert stats.total == 10
+        assert stats.downloaded == 10
+        assert stats.failed == 0
+        assert downloads.max_running == 3
+        assert sorted(call[0] for call in downloads.calls) == sorted(
+            queue_data.media_ids
+        )
+        assert stats.per_hour > 0
+        assert DownloadQueueManager().count() == 0
+
+    @pytest.mark.asyncio
+    async def test_download_overlaps_conversion(
+        self, downloads, queue_data, monkeypatch
+    ):
+        monkeypatch.setattr(batch, "get_convert_workers", lambda: 1)
+        downloads.convert_time = 0.05
+        _enqueue(queue_data, queue_data.media_ids[:4])
+        stats = await batch.process_download_queue(workers=1)
+        assert stats.downloaded == 4
+        assert downloads.max_running == 1
+        downloaded = [s for s in downloads.stages if s[0] == "download"]
+        converted = [s for s in downloads.stages if s[0] == "convert"]
+        # A trailer is downloaded while the previous one is converted
+        assert any(
+            d_start < c_end and c_start < d_end
+            for _, d_start, d_end in downloaded
+            for _, c_start, c_end in converted
+        )
+
+    @pytest.mark.asyncio
+    async def test_database_calls_off_event_loop(
+        self, downloads, queue_data, monkeypatch
+    ):
+        loop_thread = threading.get_ident()
+        call_threads: dict[str, set[int]] = {}
+
+        def _track(name: str):
+            method = getattr(DownloadQueueManager, name)
+
+            def _tracked(self, *args, **kwargs):
+                call_threads.setdefault(name, set()).add(threading.get_ident())
+                return method(self, *args, **kwargs)
+
+            monkeypatch.setattr(DownloadQueueManager, name, _tracked)
+
+        for name in ("claim", "complete", "count"):
+            _track(name)
+        _enqueue(queue_data, queue_data.media_ids[:3])
+        stats = await batch.process_download_queue(workers=2)
+        assert stats.downloaded == 3
+        assert set(call_threads) == {"claim", "complete", "count"}
+        assert all(loop_thread not in ids for ids in call_threads.values())
+
+    @pytest.mark.asyncio
+    async def test_failures_are_counted(self, downloads, queue_data):
+        media_ids = queue_data.media_ids[:4]
+        downloads.results = {
+            media_ids[1]: DownloadFailedError("Download failed"),
+            media_ids[2]: False,
+            media_ids[3]: RuntimeError("Unexpected"),
+        }
+        _enqueue(queue_data, media_ids)
+        stats = await batch.process_download_queue()
+        assert (stats.downloaded, stats.failed) == (1, 3)
+        # Only the unexpected error is retried later
+        (job,) = DownloadQueueManager().read_all()
+        assert job.media_id == media_ids[3]
+        assert job.last_error == "Unexpected"
+        assert DownloadQueueManager().count(ready_only=True) == 0
+        # Processed again when the failed job can be retried
+        (delay,) = downloads.scheduled
+        assert RETRY_DELAY - 5 <= delay <= RETRY_DELAY
+
+    @pytest.mark.asyncio
+    async def test_paced_by_bucket(self, downloads, queue_data, monkeypatch):
+        monkeypatch.setattr(
+            batch, "_get_download_bucket", lambda: TokenBucket(25, 1)
+        )
+        _enqueue(queue_data, queue_data.media_ids[:5])
+        stats = await batch.process_download_queue(workers=5)
+        # First download starts right away, then one every 40ms
+        assert stats.elapsed >= 0.16
+        assert stats.downloaded == 5
+
+    @pytest.mark.asyncio
+    async def test_empty(self, downloads, queue_data):
+        stats = await batch.process_download_queue()
+        assert stats.total == 0
+        assert downloads.calls == []
+        assert downloads.scheduled == []
+
+    @pytest.mark.asyncio
+    async def test_job_request_is_used(self, downloads, queue_data):
+        media_id = queue_data.media_ids[0]
+        DownloadQueueManager().enqueue(
+            [media_id],
+            queue_data.profile_id,
+            DownloadPriority.MANUAL,
+            yt_id="abc123",
+            retry_count=0,
+        )
+        await batch.process_download_queue()
+        assert downloads.calls == [(media_id, queue_data.profile_id, 0)]
+        assert downloads.yt_ids == ["abc123"]
+
+    @pytest.mark.asyncio
+    async def test_skips_downloaded_media(self, downloads, queue_data):
+        backlog_id, manual_id = queue_data.media_ids[:2]
+        MediaDatabaseManager().update_trailer_exists_bulk(
+            [(backlog_id, True), (manual_id, True)]
+        )
+        _enqueue(queue_data, [backlog_id])
+        DownloadQueueManager().enqueue(
+            [manual_id], queue_data.profile_id, DownloadPriority.MANUAL
+        )
+        stats = await batch.process_download_queue()
+        # Manual requests replace the existing trailer
+        assert [call[0] for call in downloads.calls] == [manual_id]
+        assert stats.total == 1
+        assert DownloadQueueManager().count() == 0
+
+    @pytest.mark.asyncio
+    async def test_single_processor(self, downloads, queue_data):
+        _enqueue(queue_data, queue_data.media_ids[:2])
+        with batch._queue_lock:
+            stats = await batch.process_download_queue()
+        assert stats.total == 0
+        assert DownloadQueueManager().count(ready_only=True) == 2
@@ -0,0 +1,179 @@
+import asyncio
+import sys
+
+import pytest
+
+from api.v1 import websockets
+from core.base.utils.process_runner import run_process
+from core.download.progress import (
+    DownloadProgress,
+    FFmpegProgressParser,
+    ProgressPublisher,
+    parse_ytdlp_progress,
+)
+
+
+class _Connection:
+    """Fake websocket connection, keeping the sent messages."""
+
+    def __init__(self, error: bool = False) -> None:
+        self.error = error
+        self.messages: list[dict] = []
+
+    async def send_json(self, data: dict) -> None:
+        if self.error:
+            raise RuntimeError("Connection closed")
+        self.messages.append(data)
+
+
+@pytest.fixture
+def connection(monkeypatch):
+    connection = _Connection()
+    monkeypatch.setattr(
+        websockets.ws_manager, "active_connections", [connection]
+    )
+    return connection
+
+
+def _ffmpeg_block(out_time_us: str, speed: str, end: bool = False):
+    return [
+        "frame=120",
+        f"out_time_us={out_time_us}",
+        f"speed={speed}",
+        f"progress={'end' if end else 'continue'}",
+    ]
+
+
+class TestYtdlpProgress:
+
+    def test_progress_line(self):
+        line = (
+            "[download]  45.3% of ~  12.34MiB at    1.23MiB/s ETA 01:05"
+            " (frag 3/20)"
+        )
+        assert parse_ytdlp_progress(1, line) == DownloadProgress(
+            media_id=1,
+            stage="download",
+            percent=45.3,
+            speed="1.23MiB/s",
+            eta=65,
+        )
+
+    def test_unknown_values(self):
+        line = "[download]   0.0% of   12.34MiB at  Unknown B/s ETA Unknown"
+        progress = parse_ytdlp_progress(1, line)
+        assert progress is not None
+        assert progress.percent == 0
+        assert progress.speed is None
+        assert progress.eta is None
+
+    def test_finished_line(self):
+        line = "[download] 100% of   12.34MiB in 00:00:05 at 2.41MiB/s"
+        progress = parse_ytdlp_progress(1, line)
+        assert progress is not None
+        assert progress.percent == 100
+        assert progress.speed == "2.41MiB/s"
+        assert progress.eta == 0
+
+    def test_other_lines(self):
+        assert parse_ytdlp_progress(1, "[download] Destination: a.mkv") is None
+        assert parse_ytdlp_progress(1, "[youtube] abc: Downloading") is None
+
+
+class TestFFmpegProgress:
+
+    def test_progress_blocks(self):
+        parser = FFmpegProgressParser(1)
+        parser.parse_line(
+            "stderr", "  Duration: 00:01:40.00, start: 0.000000, bitrate: 1k"
+        )
+        events = [
+            parser.parse_line("stdout", line)
+            for line in _ffmpeg_block("25000000", "2.5x")
+        ]
+        assert events[:-1] == [None, None, None]
+        assert events[-1] == DownloadProgress(
+            media_id=1, stage="convert", percent=25.0, speed="2.5x", eta=30
+        )
+        *_, end = [
+            parser.parse_line("stdout", line)
+            for line in _ffmpeg_block("100000000", "2.5x", end=True)
+        ]
+        assert end is not None
+        assert (end.percent, end.eta) == (100.0, 0)
+
+    def test_values_not_available(self):
+        parser = FFmpegProgressParser(1)
+        *_, progress = [
+            parser.parse_line("stdout", line)
+            for line in _ffmpeg_block("N/A", "N/A")
+        ]
+        assert progress == DownloadProgress(media_id=1, stage="convert")
+
+    def test_without_duration(self):
+        parser = FFmpegProgressParser(1)
+        *_, progress = [
+            parser.parse_line("stdout", line)
+            for line in _ffmpeg_block("5000000", "1.5x")
+        ]
+        assert progress is not None
+        assert progress.percent is None
+        assert progress.speed == "1.5x"
+
+
+class TestProgressPublisher:
+
+    @pytest.mark.asyncio
+    async def test_events_are_throttled(self, connection):
+        publisher = ProgressPublisher(1, interval=0.2)
+        for percent in range(10):
+            publisher.update(
+                DownloadProgress(1, "download", percent=float(percent))
+            )
+        await asyncio.sleep(0.01)
+        assert len(connection.messages) == 1
+        await asyncio.sleep(0.2)
+        publisher.update(DownloadProgress(1, "download", percent=50.0))
+        # Last of the throttled events is sent when the stage ends
+        publisher.update(DownloadProgress(1, "download", percent=60.0))
+        publisher.flush()
+        await asyncio.sleep(0.01)
+        percents = [m["progress"]["percent"] for m in connection.messages]
+        assert percents == [0.0, 50.0, 60.0]
+        assert connection.messages[0]["type"] == "Progress"
+        assert connection.messages[0]["progress"]["media_id"] == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_connections_are_skipped(self, monkeypatch):
+        connections = [_Connection(error=True), _Connection()]
+        monkeypatch.setattr(
+            websockets.ws_manager, "active_connections", connections
+        )
+        publisher = ProgressPublisher(1)
+        publisher.update(DownloadProgress(1, "convert", percent=10.0))
+        await asyncio.sleep(0.01)
+        assert len(connections[1].messages) == 1
+
+    @pytest.mark.asyncio
+    async def test_progress_is_published_while_running(self, connection):
+        publisher = ProgressPublisher(1, interval=0)
+        code = (
+            "import sys, time\n"
+            "for i in (10, 50):\n"
+            "    print(f'[download]  {i}.0% of 1.00MiB at 1.00MiB/s'"
+            " f' ETA 00:0{i // 10}', flush=True)\n"
+            "    time.sleep(0.3)\n"
+        )
+        task = asyncio.create_task(
+            run_process(
+                [sys.executable, "-c", code],
+                on_line=publisher.ytdlp_handler(),
+            )
+        )
+        await asyncio.sleep(0.2)
+        assert not task.done()
+        assert [m["progress"]["percent"] for m in connection.messages] == [
+            10.0
+        ]
+        await task
+        assert connection.messages[-1]["progress"]["eta"] == 5
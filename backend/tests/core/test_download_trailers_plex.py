@@ -27,6 +27,9 @@ def _setup_common(monkeypatch, plex_result=False):
     monkeypatch.setattr(dl.FilesHandler, "check_folder_exists", lambda _: True)
     calls = []
     monkeypatch.setattr(dl.scheduler, "add_job", lambda *a, **k: calls.append((a, k)))
+    monkeypatch.setattr(
+        dl.DownloadQueueManager, "enqueue", lambda self, *a, **k: calls.append((a, k))
+    )
     monkeypatch.setattr(dl, "get_plex", lambda: DummyPlex(plex_result))
     return media, profile, calls
 
@@ -72,7 +75,7 @@ def test_direct_download_respects_plex_pass(monkeypatch):
         trailer.trailer_file, "move_trailer_to_folder", lambda *a, **k: None
     )
     monkeypatch.setattr(trailer.trailer_file, "verify_download", lambda *a, **k: True)
-    monkeypatch.setattr(trailer, "download_video", lambda *a, **k: "f.mp4")
+    monkeypatch.setattr(trailer.video_v2, "download_source", fail)
     monkeypatch.setattr(trailer.video_analysis, "remove_silence_at_end", lambda x: x)
 
     result = asyncio.run(trailer.download_trailer(media, profile))
@@ -0,0 +1,44 @@
+import asyncio
+import os
+
+import pytest
+
+from core.download import video_v2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_downloads_keep_other_files(tmp_path, monkeypatch):
+    async def _download_with_ytdlp(url, file_path, profile, progress=None):
+        await asyncio.sleep(0.02)
+        output_file = file_path.replace("%(ext)s", "mkv")
+        with open(output_file, "w") as file:
+            file.write(url)
+        return output_file
+
+    monkeypatch.setattr(video_v2, "_download_with_ytdlp", _download_with_ytdlp)
+    # Files of another media being converted, and leftovers of media 7
+    others = ["5-trailer.mkv", "temp_5-trailer.mkv", "trimmed_5-trailer.mkv"]
+    leftovers = [
+        "7-trailer.mkv",
+        "temp_7-trailer.webm.part",
+        "trimmed_7-trailer.mkv",
+    ]
+    for file in others + leftovers + ["17-trailer.mkv"]:
+        (tmp_path / file).write_text("")
+    downloaded = await asyncio.gather(
+        *(
+            video_v2.download_source(
+                f"url-{media_id}",
+                str(tmp_path / f"{media_id}-trailer.%(ext)s"),
+                None,  # type: ignore
+            )
+            for media_id in (7, 8)
+        )
+    )
+    assert downloaded == [
+        str(tmp_path / "temp_7-trailer.mkv"),
+        str(tmp_path / "temp_8-trailer.mkv"),
+    ]
+    assert sorted(os.listdir(tmp_path)) == sorted(
+        others + ["17-trailer.mkv", "temp_7-trailer.mkv", "temp_8-trailer.mkv"]
+    )
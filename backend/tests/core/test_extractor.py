@@ -0,0 +1,101 @@
+from dataclasses import dataclass, fields
+import pytest
+
+from core.base.database.models.helpers import MediaCreateDC
+from core.base.utils.extractor import compile_extractor
+from core.radarr.data_parser import (
+    RadarrDataParser,
+    extract_movie,
+    parse_movie,
+)
+from core.sonarr.data_parser import extract_series, parse_series
+
+MOVIE = {
+    "id": 1,
+    "title": "Movie 1",
+    "cleanTitle": "movie1",
+    "year": 2001,
+    "originalLanguage": {"id": 1, "name": "English"},
+    "overview": "Overview",
+    "runtime": 120,
+    "youTubeTrailerId": "abc123",
+    "studio": "Studio",
+    "tmdbId": 12345,
+    "imdbId": "tt1234567",
+    "titleSlug": "movie-1",
+    "path": "/movies/Movie 1 (2001)",
+    "monitored": True,
+    "statistics": {"movieFileCount": 1, "sizeOnDisk": 1000},
+    "movieFile": {"relativePath": "Movie 1 (2001).mkv"},
+    "images": [
+        {"coverType": "banner", "remoteUrl": "https://example.com/b.jpg"},
+        {"coverType": "poster", "remoteUrl": " https://example.com/p.jpg "},
+        {"coverType": "fanart", "remoteUrl": "https://example.com/f.jpg"},
+    ],
+}
+
+SERIES = {
+    "id": 2,
+    "title": "Series 1",
+    "year": 2010,
+    "network": "Network",
+    "tvdbId": 54321,
+    "path": "/tv/Series 1",
+    "statistics": {"seasonCount": 3, "episodeFileCount": 0},
+    "images": [{"coverType": "poster", "remoteUrl": "https://e.com/p.jpg"}],
+}
+
+# Sync bookkeeping fields, not in MediaCreate
+_SYNC_FIELDS = ("arr_fingerprint", "sync_epoch")
+_FIELDS = [
+    field.name
+    for field in fields(MediaCreateDC)
+    if field.name not in _SYNC_FIELDS
+]
+
+
+def _assert_same(parsed, extracted) -> None:
+    for name in _FIELDS:
+        assert getattr(parsed, name) == getattr(extracted, name), name
+
+
+class TestExtractor:
+
+    def test_extract_movie(self):
+        extracted = extract_movie(7, MOVIE)
+        _assert_same(parse_movie(7, MOVIE), extracted)
+        assert extracted.connection_id == 7
+        assert extracted.txdb_id == "12345"
+        assert extracted.media_exists is True
+        assert extracted.poster_url == "https://example.com/p.jpg"
+        assert extracted.fanart_url == "https://example.com/f.jpg"
+
+    def test_extract_movie_defaults(self):
+        movie = {"id": 1, "title": "Movie", "year": 2001, "tmdbId": 1}
+        movie["images"] = []
+        extracted = extract_movie(1, movie)
+        _assert_same(parse_movie(1, movie), extracted)
+        assert extracted.language == "English"
+        assert extracted.media_exists is False
+        assert extracted.poster_url is None
+
+    def test_extract_series(self):
+        extracted = extract_series(3, SERIES)
+        _assert_same(parse_series(3, SERIES), extracted)
+        assert extracted.is_movie is False
+        assert extracted.season_count == 3
+        assert extracted.studio == "Network"
+
+    def test_missing_required_field(self):
+        movie = {key: value for key, value in MOVIE.items() if key != "title"}
+        with pytest.raises(KeyError):
+            extract_movie(1, movie)
+
+    def test_record_missing_fields(self):
+        @dataclass(slots=True)
+        class _Record:
+            connection_id: int
+            title: str
+
+        with pytest.raises(ValueError):
+            compile_extractor(RadarrDataParser, _Record)
@@ -0,0 +1,56 @@
+import pytest
+
+from core.files_handler import FilesHandler
+
+
+def _create_tree(root) -> dict[str, bool]:
+    """Create media folders, returns folder path to trailer exists flag."""
+    folders = {
+        "inline": ["Movie (2020).mkv", "Movie (2020)-trailer.mkv"],
+        "subfolder": ["Movie (2020).mkv", "Trailers/Movie-trailer.mp4"],
+        "empty_subfolder": ["Movie (2020).mkv", "trailers/readme.txt"],
+        "other_subfolder": ["Movie (2020).mkv", "Extras/Movie-trailer.mp4"],
+        "no_trailer": ["Movie (2020).mkv", "Movie (2020).srt"],
+        "episode": ["Show - S01E01 - trailer.mkv"],
+    }
+    expected = {
+        "inline": True,
+        "subfolder": True,
+        "empty_subfolder": False,
+        "other_subfolder": False,
+        "no_trailer": False,
+        "episode": False,
+    }
+    paths: dict[str, bool] = {}
+    for folder, files in folders.items():
+        for file in files:
+            file_path = root / folder / file
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            file_path.write_text("")
+        paths[str(root / folder)] = expected[folder]
+    paths[str(root / "missing")] = False
+    return paths
+
+
+class TestFilesHandler:
+
+    @pytest.mark.asyncio
+    async def test_check_trailers_exist(self, tmp_path):
+        paths = _create_tree(tmp_path)
+        results = await FilesHandler.check_trailers_exist(
+            list(paths) + list(paths), check_inline_file=True, max_workers=4
+        )
+        assert results == paths
+        # Same results as checking the folders one by one
+        for path, trailer_exists in paths.items():
+            assert trailer_exists == await FilesHandler.check_trailer_exists(
+                path, check_inline_file=True
+            )
+
+    @pytest.mark.asyncio
+    async def test_check_trailers_exist_folder_only(self, tmp_path):
+        paths = _create_tree(tmp_path)
+        results = await FilesHandler.check_trailers_exist(list(paths))
+        assert results[str(tmp_path / "inline")] is False
+        assert results[str(tmp_path / "subfolder")] is True
+        assert await FilesHandler.check_trailers_exist([]) == {}
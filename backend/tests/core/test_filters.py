@@ -0,0 +1,301 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from hypothesis import HealthCheck, given, settings
+from hypothesis import strategies as st
+import pytest
+from sqlmodel import Session, col, delete, select
+
+from core.base.database.models.connection import (
+    ArrType,
+    Connection,
+    MonitorType,
+)
+from core.base.database.models.filter import (
+    ALL_COLS,
+    BOOL_COLS,
+    DATE_COLS,
+    INT_COLS,
+    FilterCondition,
+    FilterRead,
+)
+from core.base.database.models.media import Media, MediaRead, MonitorStatus
+from core.base.database.utils.engine import engine
+from core.base.utils.filters import (
+    compile_filters,
+    compile_predicate,
+    compile_profile_matcher,
+    matches_filters,
+)
+
+_NOW = datetime.now()
+
+# Small alphabet, so that generated filters often match the media, with
+# characters that are special in LIKE and whitespace removed by strip()
+_SMALL_TEXT = st.text(alphabet="aAbé %_\t\xa0", max_size=5)
+# Any text that can be stored in SQLite
+_ANY_TEXT = st.text(
+    alphabet=st.characters(
+        blacklist_categories=("Cs",), blacklist_characters="\x00"
+    ),
+    max_size=8,
+)
+_TEXT = st.one_of(_SMALL_TEXT, _ANY_TEXT)
+_DATETIMES = st.one_of(
+    st.datetimes(min_value=_NOW - timedelta(days=15), max_value=_NOW),
+    st.datetimes(
+        min_value=datetime(1990, 1, 1), max_value=datetime(2100, 1, 1)
+    ),
+)
+
+
+def _optional(strategy):
+    return st.one_of(st.none(), strategy)
+
+
+_MEDIA = st.fixed_dictionaries(
+    {
+        "arr_id": st.integers(0, 5),
+        "is_movie": st.booleans(),
+        "title": _TEXT,
+        "clean_title": _TEXT,
+        "year": st.integers(1990, 2030),
+        "language": _TEXT,
+        "studio": _TEXT,
+        "media_exists": st.booleans(),
+        "media_filename": _TEXT,
+        "runtime": st.integers(0, 200),
+        "youtube_trailer_id": _optional(_TEXT),
+        "folder_path": _optional(_TEXT),
+        "imdb_id": _optional(_TEXT),
+        "txdb_id": _TEXT,
+        "title_slug": _TEXT,
+        "trailer_exists": st.booleans(),
+        "monitor": st.booleans(),
+        "arr_monitored": st.booleans(),
+        "status": st.sampled_from(MonitorStatus),
+        "added_at": _DATETIMES,
+        "updated_at": _DATETIMES,
+        "downloaded_at": _optional(_DATETIMES),
+    }
+)
+
+
+@st.composite
+def _filters(draw) -> FilterRead:
+    filter_by = draw(st.sampled_from(ALL_COLS + ["overview", "unknown"]))
+    condition = draw(st.sampled_from(FilterCondition))
+    if filter_by in BOOL_COLS:
+        value = draw(st.sampled_from(["true", "False", "TRUE", "no"]))
+    elif filter_by in INT_COLS:
+        value = str(
+            draw(
+                st.one_of(
+                    st.integers(-5, 2040),
+                    st.floats(allow_nan=False, allow_infinity=False),
+                )
+            )
+        )
+    elif filter_by in DATE_COLS and condition in (
+        FilterCondition.IN_THE_LAST,
+        FilterCondition.NOT_IN_THE_LAST,
+    ):
+        value = str(draw(st.integers(0, 20) | st.integers(0, 10**7)))
+    elif filter_by in DATE_COLS:
+        value = draw(
+            st.one_of(
+                _DATETIMES.map(lambda dt: dt.strftime("%Y-%m-%d")),
+                _SMALL_TEXT,
+            )
+        )
+    elif filter_by == "status":
+        value = draw(
+            st.one_of(
+                st.sampled_from([status.value for status in MonitorStatus]),
+                st.sampled_from(["down", "ing", "MISSING"]),
+            )
+        )
+    else:
+        value = draw(_TEXT)
+    return FilterRead(
+        id=1,
+        customfilter_id=1,
+        filter_by=filter_by,
+        filter_condition=condition,
+        filter_value=value,
+    )
+
+
+@pytest.fixture(scope="module")
+def connection_id():
+    with Session(engine) as session:
+        db_connection = Connection(
+            name="Filters",
+            arr_type=ArrType.RADARR,
+            url="http://example.com",
+            api_key="API_KEY",
+            monitor=MonitorType.MONITOR_NEW,
+        )
+        session.add(db_connection)
+        session.commit()
+        session.refresh(db_connection)
+        connection_id = db_connection.id
+    yield connection_id
+    with Session(engine) as session:
+        session.delete(session.get(Connection, connection_id))
+        session.commit()
+
+
+def _filter(filter_by: str, condition: FilterCondition, value: str):
+    return FilterRead(
+        id=1,
+        customfilter_id=1,
+        filter_by=filter_by,
+        filter_condition=condition,
+        filter_value=value,
+    )
+
+
+class TestCompileFilters:
+
+    @settings(
+        max_examples=300,
+        deadline=None,
+        suppress_health_check=[HealthCheck.function_scoped_fixture],
+    )
+    @given(
+        # Media is unique by txdb id in a connection
+        media_list=st.lists(
+            _MEDIA,
+            min_size=1,
+            max_size=6,
+            unique_by=lambda media: media["txdb_id"],
+        ),
+        filters=st.lists(_filters(), max_size=3),
+    )
+    def test_same_as_matches_filters(self, connection_id, media_list, filters):
+        with Session(engine) as session:
+            session.add_all(
+                Media(connection_id=connection_id, **media)
+                for media in media_list
+            )
+            session.commit()
+            try:
+                statement = (
+                    select(Media)
+                    .where(Media.connection_id == connection_id)
+                    .order_by(Media.id)
+                )
+                expected = [
+                    db_media.id
+                    for db_media in session.exec(statement)
+                    if matches_filters(
+                        MediaRead.model_validate(db_media), filters
+                    )
+                ]
+                statement = statement.where(compile_filters(filters))
+                media_ids = [
+                    db_media.id for db_media in session.exec(statement)
+                ]
+                assert media_ids == expected
+            finally:
+                session.exec(
+                    delete(Media).where(
+                        col(Media.connection_id) == connection_id
+                    )
+                )
+                session.commit()
+
+    @settings(max_examples=1000, deadline=None)
+    @given(
+        media=_MEDIA,
+        media_id=st.integers(1, 10),
+        filters=st.lists(_filters(), max_size=3),
+    )
+    def test_predicate_same_as_matches_filters(self, media, media_id, filters):
+        media_read = MediaRead(
+            id=media_id, connection_id=media_id % 3, **media
+        )
+        predicate = compile_predicate(filters)
+        assert predicate(media_read) == matches_filters(media_read, filters)
+
+    def test_profile_matcher(self):
+        media = MediaRead(
+            id=1,
+            connection_id=1,
+            arr_id=1,
+            title="Movie",
+            year=2001,
+            txdb_id="1",
+            added_at=_NOW,
+            updated_at=_NOW,
+            downloaded_at=None,
+        )
+        greater_than = FilterCondition.GREATER_THAN
+
+        def _profile(profile_id: int, priority: int, year: str):
+            return SimpleNamespace(
+                id=profile_id,
+                priority=priority,
+                customfilter=SimpleNamespace(
+                    filters=[_filter("year", greater_than, year)]
+                ),
+            )
+
+        profiles = [
+            _profile(1, 0, "1990"),
+            _profile(2, 5, "2010"),
+            _profile(3, 2, "2000"),
+        ]
+        match_profile = compile_profile_matcher(profiles)  # type: ignore
+        assert match_profile(media).id == 3  # type: ignore
+        media.year = 1995
+        assert match_profile(media).id == 1  # type: ignore
+        media.year = 1980
+        assert match_profile(media) is None
+
+    def test_in_the_last(self):
+        media = MediaRead(
+            id=1,
+            connection_id=1,
+            arr_id=1,
+            title="Movie",
+            txdb_id="1",
+            added_at=_NOW - timedelta(days=3),
+            updated_at=_NOW + timedelta(days=3),
+            downloaded_at=None,
+        )
+        in_the_last = FilterCondition.IN_THE_LAST
+        not_in_the_last = FilterCondition.NOT_IN_THE_LAST
+        assert matches_filters(media, [_filter("added_at", in_the_last, "5")])
+        assert not matches_filters(
+            media, [_filter("added_at", in_the_last, "2")]
+        )
+        assert matches_filters(
+            media, [_filter("added_at", not_in_the_last, "2")]
+        )
+        assert matches_filters(
+            media, [_filter("updated_at", in_the_last, "0")]
+        )
+        assert not matches_filters(
+            media, [_filter("downloaded_at", in_the_last, "5")]
+        )
+
+    def test_status(self):
+        media = MediaRead(
+            id=1,
+            connection_id=1,
+            arr_id=1,
+            title="Movie",
+            txdb_id="1",
+            status=MonitorStatus.DOWNLOADED,
+            added_at=_NOW,
+            updated_at=_NOW,
+            downloaded_at=None,
+        )
+        equals = FilterCondition.EQUALS
+        assert matches_filters(
+            media, [_filter("status", equals, "downloaded")]
+        )
+        assert not matches_filters(
+            media, [_filter("status", equals, "DOWNLOADED")]
+        )
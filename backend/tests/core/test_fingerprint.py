@@ -0,0 +1,89 @@
+import copy
+
+from core.base.database.models.media import Media, MediaCreate, MediaRead
+from core.base.utils.fingerprint import get_alias_paths
+from core.radarr.data_parser import RadarrDataParser, fingerprint_movie
+from core.sonarr.data_parser import fingerprint_series
+
+MOVIE = {
+    "id": 1,
+    "title": "Movie 1",
+    "cleanTitle": "movie1",
+    "year": 2001,
+    "originalLanguage": {"id": 1, "name": "English"},
+    "tmdbId": 12345,
+    "imdbId": "tt1234567",
+    "path": "/movies/Movie 1 (2001)",
+    "monitored": True,
+    "statistics": {"movieFileCount": 1, "sizeOnDisk": 1000},
+    "images": [
+        {
+            "coverType": "poster",
+            "url": "/poster.jpg?lastWrite=1",
+            "remoteUrl": "https://example.com/poster.jpg",
+        }
+    ],
+}
+
+
+class TestFingerprint:
+
+    def test_alias_paths(self):
+        paths = get_alias_paths(RadarrDataParser)
+        assert ("id",) in paths
+        assert ("tmdbId",) in paths
+        assert ("originalLanguage", "name") in paths
+        assert ("statistics", "movieFileCount") in paths
+        assert ("title",) in paths
+
+    def test_same_data_same_fingerprint(self):
+        txdb_id, fingerprint = fingerprint_movie(MOVIE)
+        assert txdb_id == "12345"
+        assert fingerprint_movie(copy.deepcopy(MOVIE)) == (
+            txdb_id,
+            fingerprint,
+        )
+
+    def test_relevant_field_changes_fingerprint(self):
+        _, fingerprint = fingerprint_movie(MOVIE)
+        for path, value in [
+            (("title",), "Movie One"),
+            (("monitored",), False),
+            (("statistics", "movieFileCount"), 0),
+            (("originalLanguage", "name"), "French"),
+        ]:
+            movie = copy.deepcopy(MOVIE)
+            target = movie
+            for key in path[:-1]:
+                target = target[key]
+            target[path[-1]] = value
+            assert fingerprint_movie(movie)[1] != fingerprint
+
+    def test_image_change_changes_fingerprint(self):
+        movie = copy.deepcopy(MOVIE)
+        movie["images"][0]["remoteUrl"] = "https://example.com/new.jpg"
+        assert fingerprint_movie(movie)[1] != fingerprint_movie(MOVIE)[1]
+
+    def test_irrelevant_field_keeps_fingerprint(self):
+        movie = copy.deepcopy(MOVIE)
+        movie["statistics"]["sizeOnDisk"] = 2000
+        movie["images"][0]["url"] = "/poster.jpg?lastWrite=2"
+        movie["ratings"] = {"imdb": {"value": 7.5}}
+        assert fingerprint_movie(movie)[1] == fingerprint_movie(MOVIE)[1]
+
+    def test_salt_changes_fingerprint(self):
+        assert (
+            fingerprint_movie(MOVIE, "a")[1]
+            != fingerprint_movie(MOVIE, "b")[1]
+        )
+
+    def test_series_uses_tvdb_id(self):
+        series = copy.deepcopy(MOVIE)
+        series["tvdbId"] = 54321
+        assert fingerprint_series(series)[0] == "54321"
+
+    def test_fingerprint_not_in_api_models(self):
+        assert "arr_fingerprint" in Media.model_fields
+        assert "arr_fingerprint" not in MediaCreate.model_fields
+        assert "arr_fingerprint" not in MediaRead.model_fields
+        assert "sync_epoch" not in MediaRead.model_fields
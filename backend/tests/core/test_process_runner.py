@@ -0,0 +1,133 @@
+import asyncio
+import sys
+import time
+
+import pytest
+
+from core.base.utils.process_runner import run_process
+
+
+def _python(code: str) -> list[str]:
+    return [sys.executable, "-c", code]
+
+
+def _is_running(pid: int) -> bool:
+    """Check if a process is running, orphans killed in a container \
+        without an init process are left as zombies."""
+    try:
+        with open(f"/proc/{pid}/stat") as file:
+            return file.read().split(")")[-1].split()[0] != "Z"
+    except FileNotFoundError:
+        return False
+
+
+class TestRunProcess:
+
+    @pytest.mark.asyncio
+    async def test_output_and_returncode(self):
+        result = await run_process(
+            _python(
+                "import sys; print('out'); print('err', file=sys.stderr);"
+                " sys.exit(3)"
+            )
+        )
+        assert result.returncode == 3
+        assert result.stdout == "out"
+        assert result.stderr == "err"
+
+    @pytest.mark.asyncio
+    async def test_lines_are_handled_as_written(self):
+        lines: list[tuple[str, str, float]] = []
+        start = time.monotonic()
+        await run_process(
+            _python(
+                "import sys, time\n"
+                "for i in range(3):\n"
+                "    sys.stdout.write(f'progress {i}\\r')\n"
+                "    sys.stdout.flush()\n"
+                "    time.sleep(0.1)\n"
+                "print('done')"
+            ),
+            on_line=lambda stream, line: lines.append(
+                (stream, line, time.monotonic() - start)
+            ),
+        )
+        assert [line[1] for line in lines] == [
+            "progress 0",
+            "progress 1",
+            "progress 2",
+            "done",
+        ]
+        assert all(line[0] == "stdout" for line in lines)
+        # First line handled before the process exits
+        assert lines[0][2] < lines[-1][2] - 0.15
+
+    @pytest.mark.asyncio
+    async def test_output_retention_is_bounded(self):
+        result = await run_process(
+            _python("for i in range(1000): print(i)"), max_lines=5
+        )
+        assert list(result.stdout_lines) == [str(i) for i in range(995, 1000)]
+
+    @pytest.mark.asyncio
+    async def test_long_lines_are_split(self):
+        result = await run_process(
+            _python("print('x' * 200000)"), max_lines=10
+        )
+        assert len(result.stdout_lines) == 4
+        assert sum(len(line) for line in result.stdout_lines) == 200000
+
+    @pytest.mark.asyncio
+    async def test_handler_errors_are_ignored(self):
+        def _on_line(stream: str, line: str) -> None:
+            raise ValueError("Bad line")
+
+        result = await run_process(
+            _python("print('a'); print('b')"), on_line=_on_line
+        )
+        assert result.stdout == "a\nb"
+
+    @pytest.mark.asyncio
+    async def test_timeout_kills_process(self):
+        pids: list[int] = []
+        start = time.monotonic()
+        with pytest.raises(asyncio.TimeoutError):
+            await run_process(
+                _python(
+                    "import os, time; print(os.getpid(), flush=True);"
+                    " time.sleep(30)"
+                ),
+                timeout=0.5,
+                on_line=lambda stream, line: pids.append(int(line)),
+            )
+        assert time.monotonic() - start < 5
+        assert not _is_running(pids[0])
+
+    @pytest.mark.asyncio
+    async def test_cancel_kills_child_processes(self):
+        pids: list[int] = []
+        code = (
+            "import subprocess, sys, time;"
+            " child = subprocess.Popen([sys.executable, '-c',"
+            " 'import time; time.sleep(30)']);"
+            " print(child.pid, flush=True); time.sleep(30)"
+        )
+        task = asyncio.create_task(
+            run_process(
+                _python(code),
+                on_line=lambda stream, line: pids.append(int(line)),
+            )
+        )
+        while not pids:
+            await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        # Child of the process was stopped with it
+        await asyncio.sleep(0.2)
+        assert not _is_running(pids[0])
+
+    @pytest.mark.asyncio
+    async def test_command_not_found(self):
+        with pytest.raises(FileNotFoundError):
+            await run_process(["/not/a/command"])
@@ -0,0 +1,191 @@
+from datetime import datetime, timedelta
+import pytest
+from sqlmodel import Session, select
+
+from core.base.database.manager.base import MediaDatabaseManager
+from core.base.database.manager.connection import ConnectionDatabaseManager
+from core.base.database.models.connection import (
+    ArrType,
+    Connection,
+    MonitorType,
+)
+from core.base.database.models.media import Media
+from core.radarr.connection_manager import RadarrConnectionManager
+from core.base.database.utils.engine import engine
+
+
+@pytest.fixture
+def connection_id():
+    with Session(engine) as session:
+        db_connection = Connection(
+            name="Webhook",
+            arr_type=ArrType.RADARR,
+            url="http://example.com",
+            api_key="API_KEY",
+            monitor=MonitorType.MONITOR_MISSING,
+        )
+        session.add(db_connection)
+        session.commit()
+        session.refresh(db_connection)
+        connection_id = db_connection.id
+    yield connection_id
+    with Session(engine) as session:
+        session.delete(session.get(Connection, connection_id))
+        session.commit()
+
+
+def _movie(i: int, title: str = "Movie") -> dict:
+    return {
+        "id": i,
+        "title": f"{title} {i}",
+        "year": 2000 + i,
+        "tmdbId": 1000 + i,
+        "path": f"/nonexistent/Movie {i}",
+        "monitored": True,
+        "images": [],
+    }
+
+
+class _ArrManager:
+    def __init__(self, movies: dict[int, dict]):
+        self.movies = movies
+        self.updated_ids: list[int] = []
+        self.since: datetime | None = None
+
+    async def get_media(self, arr_id: int) -> dict:
+        return self.movies[arr_id]
+
+    async def get_updated_media_ids(self, since: datetime) -> list[int]:
+        self.since = since
+        return self.updated_ids
+
+    async def iter_all_media(self):
+        for movie in self.movies.values():
+            yield movie
+
+
+def _manager(connection_id: int, movies: dict[int, dict]):
+    connection = ConnectionDatabaseManager().read(connection_id)
+    manager = RadarrConnectionManager(connection)
+    manager.arr_manager = _ArrManager(movies)  # type: ignore
+    return manager
+
+
+class TestRefreshMedia:
+
+    @pytest.mark.asyncio
+    async def test_refresh_media(self, connection_id):
+        db_manager = MediaDatabaseManager()
+        movies = {i: _movie(i) for i in range(1, 4)}
+        await _manager(connection_id, movies).refresh_media([1, 2])
+        media_list = db_manager.read_all_by_connection(connection_id)
+        assert sorted(media.title for media in media_list) == [
+            "Movie 1",
+            "Movie 2",
+        ]
+        assert all(media.monitor for media in media_list)
+
+        # Only the given media is updated, missing media is skipped
+        movies[2] = _movie(2, "New")
+        manager = _manager(connection_id, movies)
+        await manager.refresh_media([2, 9])
+        assert (manager.created_count, manager.updated_count) == (0, 1)
+        media_list = db_manager.read_all_by_connection(connection_id)
+        assert sorted(media.title for media in media_list) == [
+            "Movie 1",
+            "New 2",
+        ]
+        # Refreshed media is stamped with a newer sync epoch than a full
+        # refresh already in progress, so that it is not deleted by it
+        with Session(engine) as session:
+            statement = select(Media.title, Media.sync_epoch).where(
+                Media.connection_id == connection_id
+            )
+            epochs = dict(session.exec(statement).all())
+        assert epochs["New 2"] > epochs["Movie 1"]
+        assert db_manager.delete_stale(connection_id, epochs["New 2"]) == 1
+
+        await manager.delete_media(["1002"])
+        assert db_manager.read_all_by_connection(connection_id) == []
+
+    @pytest.mark.asyncio
+    async def test_refresh_delta(self, connection_id):
+        db_manager = MediaDatabaseManager()
+        connection_db_manager = ConnectionDatabaseManager()
+        movies = {i: _movie(i) for i in range(1, 4)}
+        # Never synced before, does a full refresh
+        await _manager(connection_id, movies).refresh_delta()
+        connection = connection_db_manager.read(connection_id)
+        assert connection.last_synced_at is not None
+        assert connection.last_full_synced_at == connection.last_synced_at
+        assert len(db_manager.read_all_by_connection(connection_id)) == 3
+
+        # Only media in Arr history is refreshed, removed media is kept
+        movies[2] = _movie(2, "New")
+        movies[3] = _movie(3, "Not in history")
+        del movies[1]
+        manager = _manager(connection_id, movies)
+        manager.arr_manager.updated_ids = [2]  # type: ignore
+        await manager.refresh_delta()
+        since = manager.arr_manager.since  # type: ignore
+        assert since == connection.last_synced_at - timedelta(minutes=5)
+        media_list = db_manager.read_all_by_connection(connection_id)
+        assert sorted(media.title for media in media_list) == [
+            "Movie 1",
+            "Movie 3",
+            "New 2",
+        ]
+        delta_connection = connection_db_manager.read(connection_id)
+        assert delta_connection.last_synced_at > connection.last_synced_at
+        assert (
+            delta_connection.last_full_synced_at
+            == connection.last_full_synced_at
+        )
+
+    @pytest.mark.asyncio
+    async def test_refresh_delta_keeps_watermark_on_failure(
+        self, connection_id
+    ):
+        db_manager = MediaDatabaseManager()
+        connection_db_manager = ConnectionDatabaseManager()
+        movies = {i: _movie(i) for i in range(1, 4)}
+        await _manager(connection_id, movies).refresh_delta()
+        connection = connection_db_manager.read(connection_id)
+
+        # Media 3 fails to fetch, media 2 is still updated
+        movies[2] = _movie(2, "New")
+        movies[3] = _movie(3, "New")
+        manager = _manager(connection_id, movies)
+        arr_manager = manager.arr_manager
+        get_media = arr_manager.get_media
+
+        async def _get_media(arr_id: int) -> dict:
+            if arr_id == 3:
+                raise ConnectionError("Connection reset")
+            return await get_media(arr_id)
+
+        arr_manager.get_media = _get_media  # type: ignore
+        arr_manager.updated_ids = [2, 3]  # type: ignore
+        await manager.refresh_delta()
+        media_list = db_manager.read_all_by_connection(connection_id)
+        assert sorted(media.title for media in media_list) == [
+            "Movie 1",
+            "Movie 3",
+            "New 2",
+        ]
+        # Watermark is kept, the next delta refresh retries media 3
+        failed_connection = connection_db_manager.read(connection_id)
+        assert failed_connection.last_synced_at == connection.last_synced_at
+        manager = _manager(connection_id, movies)
+        manager.arr_manager.updated_ids = [2, 3]  # type: ignore
+        await manager.refresh_delta()
+        since = manager.arr_manager.since  # type: ignore
+        assert since == connection.last_synced_at - timedelta(minutes=5)
+        media_list = db_manager.read_all_by_connection(connection_id)
+        assert sorted(media.title for media in media_list) == [
+            "Movie 1",
+            "New 2",
+            "New 3",
+        ]
+        synced_connection = connection_db_manager.read(connection_id)
+        assert synced_connection.last_synced_at > connection.last_synced_at
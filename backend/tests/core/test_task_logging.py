@@ -0,0 +1,39 @@
+import threading
+
+from core.tasks import task_logging
+
+
+def test_concurrent_reads_and_writes():
+    errors: list[Exception] = []
+
+    def _log_runs(index: int) -> None:
+        task_id = f"concurrent-{index}"
+        try:
+            for run in range(30):
+                task_logging.update_task(
+                    task_logging.TaskInfo(
+                        name=f"Task {index}", task_id=task_id, interval=run
+                    )
+                )
+                task_logging.get_all_tasks()
+                task_logging.update_queue(
+                    task_logging.QueueInfo(
+                        name=f"Task {index}", queue_id=task_id
+                    )
+                )
+                task_logging.get_all_queue()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=_log_runs, args=(i,)) for i in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    tasks = {
+        task.task_id: task.interval
+        for task in task_logging.get_all_tasks()
+        if task.task_id.startswith("concurrent-")
+    }
+    assert tasks == {f"concurrent-{i}": 29 for i in range(6)}
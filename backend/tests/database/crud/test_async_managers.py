@@ -0,0 +1,232 @@
+import asyncio
+import gc
+import time
+from typing import Iterator
+
+import pytest
+from sqlalchemy.exc import OperationalError
+from sqlmodel import Session, text
+
+from core.base.database.manager import trailerprofile
+from core.base.database.manager.base import (
+    AsyncMediaDatabaseManager,
+    MediaDatabaseManager,
+)
+from core.base.database.manager.connection import (
+    AsyncConnectionDatabaseManager,
+    ConnectionDatabaseManager,
+)
+from core.base.database.models.connection import (
+    ArrType,
+    Connection,
+    MonitorType,
+)
+from core.base.database.models.customfilter import CustomFilterCreate
+from core.base.database.models.media import MediaCreate
+from core.base.database.models.trailerprofile import TrailerProfileCreate
+from core.base.database.utils.engine import (
+    engine,
+    manage_session,
+    run_async_read,
+)
+from exceptions import ItemNotFoundError
+
+
+def _create_connection(media_count: int) -> Iterator[int]:
+    with Session(engine) as session:
+        db_connection = Connection(
+            name="Async",
+            arr_type=ArrType.RADARR,
+            url="http://example.com",
+            api_key="API_KEY",
+            monitor=MonitorType.MONITOR_NEW,
+        )
+        session.add(db_connection)
+        session.commit()
+        session.refresh(db_connection)
+        connection_id = db_connection.id
+    MediaDatabaseManager().create_or_update_bulk(
+        [
+            MediaCreate(
+                connection_id=connection_id,  # type: ignore
+                arr_id=i,
+                title=f"Async Movie {i}",
+                year=2010 + i,
+                txdb_id=str(900000 + i),
+                monitor=False,
+            )
+            for i in range(media_count)
+        ]
+    )
+    yield connection_id
+    with Session(engine) as session:
+        session.delete(session.get(Connection, connection_id))
+        session.commit()
+
+
+@pytest.fixture
+def connection_id():
+    yield from _create_connection(5)
+
+
+@pytest.fixture
+def large_connection_id():
+    yield from _create_connection(5000)
+
+
+@manage_session
+def _delete_all_media(*, _session: Session = None) -> None:  # type: ignore
+    _session.exec(text("DELETE FROM media"))  # type: ignore
+
+
+def _media_ids(connection_id: int) -> dict[str, int]:
+    media_list = MediaDatabaseManager().read_all_by_connection(connection_id)
+    return {media.title: media.id for media in media_list}
+
+
+class TestAsyncMediaDatabaseManager:
+
+    @pytest.mark.asyncio
+    async def test_reads_match_sync_manager(self, connection_id):
+        db_manager = MediaDatabaseManager()
+        async_manager = AsyncMediaDatabaseManager()
+        media_id = _media_ids(connection_id)["Async Movie 2"]
+        assert await async_manager.read(media_id) == db_manager.read(media_id)
+        assert await async_manager.read_all(
+            sort_by="year"
+        ) == db_manager.read_all(sort_by="year")
+        assert await async_manager.read_page(
+            2, sort_by="title"
+        ) == db_manager.read_page(2, sort_by="title")
+        assert await async_manager.read_recent(3) == db_manager.read_recent(3)
+        assert await async_manager.search("async movie") == db_manager.search(
+            "async movie"
+        )
+
+    @pytest.mark.asyncio
+    async def test_read_not_found(self, connection_id):
+        with pytest.raises(ItemNotFoundError):
+            await AsyncMediaDatabaseManager().read(987654321)
+
+    @pytest.mark.asyncio
+    async def test_writes_are_committed(self, connection_id):
+        async_manager = AsyncMediaDatabaseManager()
+        media_ids = _media_ids(connection_id)
+        media_id = media_ids["Async Movie 1"]
+        _, is_success = await async_manager.update_monitoring(media_id, True)
+        assert is_success
+        await async_manager.update_ytid(media_id, "abcdefghijk")
+        await async_manager.update_monitoring_bulk(
+            [media_ids["Async Movie 3"], media_ids["Async Movie 4"]], True
+        )
+        media = MediaDatabaseManager().read(media_id)
+        assert media.monitor is True
+        assert media.youtube_trailer_id == "abcdefghijk"
+        monitored = {
+            media.title
+            for media in await async_manager.read_all(filter_by="monitored")
+        }
+        assert {"Async Movie 1", "Async Movie 3", "Async Movie 4"} <= (
+            monitored
+        )
+
+    @pytest.mark.asyncio
+    async def test_read_does_not_block_event_loop(self, large_connection_id):
+        max_gap = 0.0
+        done = asyncio.Event()
+
+        async def _tick():
+            nonlocal max_gap
+            last = time.perf_counter()
+            while not done.is_set():
+                await asyncio.sleep(0.001)
+                now = time.perf_counter()
+                max_gap = max(max_gap, now - last)
+                last = now
+
+        async def _read() -> int:
+            try:
+                return len(await AsyncMediaDatabaseManager().read_all())
+            finally:
+                done.set()
+
+        # Full collections of the objects left by other tests pause all
+        # threads, only the objects of the read are collected during it
+        gc.collect()
+        gc.freeze()
+        try:
+            _, count = await asyncio.gather(_tick(), _read())
+        finally:
+            gc.unfreeze()
+        assert count >= 5000
+        # Rows are read and converted off the event loop
+        assert max_gap < 0.1
+
+    @pytest.mark.asyncio
+    async def test_read_session_is_read_only(self):
+        with pytest.raises(OperationalError):
+            await run_async_read(_delete_all_media)
+
+
+class TestAsyncConnectionDatabaseManager:
+
+    @pytest.mark.asyncio
+    async def test_read(self, connection_id):
+        async_manager = AsyncConnectionDatabaseManager()
+        connection = await async_manager.read(connection_id)
+        assert connection == ConnectionDatabaseManager().read(connection_id)
+        assert connection_id in [
+            connection.id for connection in await async_manager.read_all()
+        ]
+        with pytest.raises(ItemNotFoundError):
+            await async_manager.read(987654321)
+
+    @pytest.mark.asyncio
+    async def test_delete(self, connection_id):
+        assert await AsyncConnectionDatabaseManager().delete(connection_id)
+        with pytest.raises(ItemNotFoundError):
+            ConnectionDatabaseManager().read(connection_id)
+        # Media is deleted on cascade
+        assert _media_ids(connection_id) == {}
+        # Recreate it for the fixture teardown
+        with Session(engine) as session:
+            session.add(
+                Connection(
+                    id=connection_id,
+                    name="Async",
+                    arr_type=ArrType.RADARR,
+                    url="http://example.com",
+                    api_key="API_KEY",
+                    monitor=MonitorType.MONITOR_NEW,
+                )
+            )
+            session.commit()
+
+
+class TestAsyncTrailerProfile:
+
+    @pytest.mark.asyncio
+    async def test_create_read_update_delete(self):
+        profile = await trailerprofile.create_trailerprofile_async(
+            TrailerProfileCreate(
+                customfilter=CustomFilterCreate(filter_name="Async Profile")
+            )
+        )
+        profiles = await trailerprofile.get_trailerprofiles_async()
+        assert profiles == trailerprofile.get_trailerprofiles()
+        assert profile in profiles
+        assert (
+            await trailerprofile.get_trailerprofile_async(profile.id)
+            == profile
+        )
+        updated = await trailerprofile.update_trailerprofile_setting_async(
+            profile.id, "priority", profile.priority + 1
+        )
+        assert updated.priority == profile.priority + 1
+        assert (
+            trailerprofile.get_trailerprofile(profile.id).priority
+            == profile.priority + 1
+        )
+        assert await trailerprofile.delete_trailerprofile_async(profile.id)
+        with pytest.raises(ItemNotFoundError):
+            await trailerprofile.get_trailerprofile_async(profile.id)
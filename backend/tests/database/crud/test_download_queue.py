@@ -0,0 +1,311 @@
+from types import SimpleNamespace
+
+import pytest
+from sqlmodel import Session, select
+
+from core.base.database.manager import trailerprofile
+from core.base.database.manager.base import MediaDatabaseManager
+from core.base.database.manager.download import (
+    MAX_ATTEMPTS,
+    DownloadQueueManager,
+)
+from core.base.database.models.connection import (
+    ArrType,
+    Connection,
+    MonitorType,
+)
+from core.base.database.models.customfilter import CustomFilterCreate
+from core.base.database.models.download import (
+    DownloadJob,
+    DownloadPriority,
+    get_current_time,
+)
+from core.base.database.models.media import MediaCreate
+from core.base.database.models.trailerprofile import TrailerProfileCreate
+from core.base.database.utils.engine import engine
+
+
+@pytest.fixture
+def queue_data():
+    """Media and trailer profiles for the queue, queue is empty."""
+    with Session(engine) as session:
+        db_connection = Connection(
+            name="Queue",
+            arr_type=ArrType.RADARR,
+            url="http://example.com",
+            api_key="API_KEY",
+            monitor=MonitorType.MONITOR_NEW,
+        )
+        session.add(db_connection)
+        session.commit()
+        session.refresh(db_connection)
+        connection_id = db_connection.id
+    db_manager = MediaDatabaseManager()
+    db_manager.create_or_update_bulk(
+        [
+            MediaCreate(
+                connection_id=connection_id,  # type: ignore
+                arr_id=i,
+                title=f"Queue Movie {i}",
+                txdb_id=str(970000 + i),
+            )
+            for i in range(5)
+        ]
+    )
+    media_ids = sorted(
+        media.id for media in db_manager.read_all_by_connection(connection_id)
+    )
+    profile_ids = [
+        trailerprofile.create_trailerprofile(
+            TrailerProfileCreate(
+                customfilter=CustomFilterCreate(filter_name=f"Queue {i}")
+            )
+        ).id
+        for i in range(2)
+    ]
+    yield SimpleNamespace(media_ids=media_ids, profile_ids=profile_ids)
+    with Session(engine) as session:
+        for job in session.exec(select(DownloadJob)).all():
+            session.delete(job)
+        session.delete(session.get(Connection, connection_id))
+        session.commit()
+    for profile_id in profile_ids:
+        trailerprofile.delete_trailerprofile(profile_id)
+
+
+def _claim_all(queue: DownloadQueueManager) -> list[int]:
+    media_ids = []
+    while job := queue.claim():
+        media_ids.append(job.media_id)
+    return media_ids
+
+
+class TestDownloadQueue:
+
+    def test_enqueue_dedupes_media(self, queue_data):
+        queue = DownloadQueueManager()
+        profile_id = queue_data.profile_ids[0]
+        media_ids = queue_data.media_ids
+        assert queue.enqueue(media_ids[:3], profile_id, DownloadPriority.NEW)
+        queue.enqueue(media_ids[1:], profile_id, DownloadPriority.BACKLOG)
+        jobs = queue.read_all()
+        assert sorted(job.media_id for job in jobs) == media_ids
+        priorities = {job.media_id: job.priority for job in jobs}
+        # Queued again with a lower priority, keeps the higher one
+        assert priorities[media_ids[2]] == DownloadPriority.NEW
+        assert priorities[media_ids[4]] == DownloadPriority.BACKLOG
+
+    def test_enqueue_ignores_missing_media(self, queue_data):
+        queue = DownloadQueueManager()
+        queue.enqueue(
+            [queue_data.media_ids[0], 99999999],
+            queue_data.profile_ids[0],
+            DownloadPriority.BACKLOG,
+        )
+        assert [job.media_id for job in queue.read_all()] == [
+            queue_data.media_ids[0]
+        ]
+
+    def test_higher_priority_replaces_request(self, queue_data):
+        queue = DownloadQueueManager()
+        media_id = queue_data.media_ids[0]
+        backlog_profile, manual_profile = queue_data.profile_ids
+        queue.enqueue([media_id], backlog_profile, DownloadPriority.BACKLOG)
+        queue.enqueue(
+            [media_id],
+            manual_profile,
+            DownloadPriority.MANUAL,
+            yt_id="abc123",
+            retry_count=0,
+        )
+        # Lower priority request doesn't replace the manual one
+        queue.enqueue([media_id], backlog_profile, DownloadPriority.NEW)
+        (job,) = queue.read_all()
+        assert job.priority == DownloadPriority.MANUAL
+        assert job.profile_id == manual_profile
+        assert job.yt_id == "abc123"
+        assert job.retry_count == 0
+
+    def test_claim_order(self, queue_data):
+        queue = DownloadQueueManager()
+        profile_id = queue_data.profile_ids[0]
+        m = queue_data.media_ids
+        queue.enqueue([m[0], m[1]], profile_id, DownloadPriority.BACKLOG)
+        queue.enqueue([m[2]], profile_id, DownloadPriority.NEW)
+        queue.enqueue([m[3]], profile_id, DownloadPriority.MANUAL)
+        queue.enqueue([m[4]], profile_id, DownloadPriority.NEW)
+        assert _claim_all(queue) == [m[3], m[2], m[4], m[0], m[1]]
+
+    def test_claimed_job_is_hidden(self, queue_data):
+        queue = DownloadQueueManager()
+        queue.enqueue(
+            queue_data.media_ids[:1],
+            queue_data.profile_ids[0],
+            DownloadPriority.BACKLOG,
+        )
+        job = queue.claim()
+        assert job is not None
+        assert job.attempts == 1
+        assert queue.claim() is None
+        assert queue.count() == 1
+        assert queue.count(ready_only=True) == 0
+        queue.complete(job.id)
+        assert queue.count() == 0
+
+    def test_visibility_timeout(self, queue_data):
+        queue = DownloadQueueManager()
+        queue.enqueue(
+            queue_data.media_ids[:1],
+            queue_data.profile_ids[0],
+            DownloadPriority.BACKLOG,
+        )
+        job = queue.claim(visibility_timeout=0)
+        # Worker didn't complete the job in time, claimed again
+        job_again = queue.claim()
+        assert job_again is not None
+        assert job_again.id == job.id
+        assert job_again.attempts == 2
+        # Extended job stays hidden
+        queue.extend(job_again.id, visibility_timeout=60)
+        assert queue.claim() is None
+
+    def test_claim_drops_crashing_job(self, queue_data):
+        queue = DownloadQueueManager()
+        queue.enqueue(
+            queue_data.media_ids[:1],
+            queue_data.profile_ids[0],
+            DownloadPriority.BACKLOG,
+        )
+        # Worker crashed before completing the job, every time
+        for attempt in range(1, MAX_ATTEMPTS + 1):
+            job = queue.claim(visibility_timeout=0)
+            assert job is not None
+            assert job.attempts == attempt
+        assert queue.claim() is None
+        assert queue.count() == 0
+
+    def test_requeued_while_claimed(self, queue_data):
+        queue = DownloadQueueManager()
+        media_id = queue_data.media_ids[0]
+        profile_id, other_profile_id = queue_data.profile_ids
+        queue.enqueue([media_id], profile_id, DownloadPriority.BACKLOG)
+        job = queue.claim()
+        assert job is not None
+        # Same request again, the running download is enough
+        queue.enqueue([media_id], profile_id, DownloadPriority.BACKLOG)
+        queue.complete(job.id)
+        assert queue.count() == 0
+
+        queue.enqueue([media_id], profile_id, DownloadPriority.BACKLOG)
+        job = queue.claim()
+        assert job is not None
+        queue.enqueue(
+            [media_id], other_profile_id, DownloadPriority.MANUAL, "abc123"
+        )
+        queue.complete(job.id)
+        job = queue.claim()
+        assert job is not None
+        assert job.profile_id == other_profile_id
+        assert job.yt_id == "abc123"
+        assert job.attempts == 1
+        queue.complete(job.id)
+        assert queue.count() == 0
+
+    def test_requeued_job_failed(self, queue_data):
+        queue = DownloadQueueManager()
+        media_id = queue_data.media_ids[0]
+        profile_id = queue_data.profile_ids[0]
+        queue.enqueue([media_id], profile_id, DownloadPriority.BACKLOG)
+        job = queue.claim()
+        assert job is not None
+        queue.enqueue([media_id], profile_id, DownloadPriority.MANUAL, "abc")
+        # Failed download was of the old request, new one is not delayed
+        assert queue.fail(job.id, "Failed", retry_delay=60)
+        job = queue.claim()
+        assert job is not None
+        assert job.yt_id == "abc"
+        assert job.last_error is None
+
+    def test_fail_retries_then_drops(self, queue_data):
+        queue = DownloadQueueManager()
+        queue.enqueue(
+            queue_data.media_ids[:1],
+            queue_data.profile_ids[0],
+            DownloadPriority.BACKLOG,
+        )
+        for attempt in range(1, MAX_ATTEMPTS):
+            job = queue.claim()
+            assert job is not None
+            assert queue.fail(job.id, "Failed", retry_delay=0)
+            (job,) = queue.read_all()
+            assert job.last_error == "Failed"
+            assert job.attempts == attempt
+        job = queue.claim()
+        assert job is not None
+        assert not queue.fail(job.id, "Failed again")
+        assert queue.count() == 0
+
+    def test_fail_delays_retry(self, queue_data):
+        queue = DownloadQueueManager()
+        media_id = queue_data.media_ids[0]
+        profile_id = queue_data.profile_ids[0]
+        queue.enqueue([media_id], profile_id, DownloadPriority.BACKLOG)
+        job = queue.claim()
+        assert job is not None
+        queue.fail(job.id, "Failed", retry_delay=60)
+        assert queue.claim() is None
+        # Requested again, available right away
+        queue.enqueue([media_id], profile_id, DownloadPriority.MANUAL)
+        job = queue.claim()
+        assert job is not None
+        assert job.attempts == 1
+
+    def test_next_visible_at(self, queue_data):
+        queue = DownloadQueueManager()
+        assert queue.next_visible_at() is None
+        queue.enqueue(
+            queue_data.media_ids[:1],
+            queue_data.profile_ids[0],
+            DownloadPriority.BACKLOG,
+        )
+        assert queue.next_visible_at() <= get_current_time()
+        job = queue.claim()
+        assert job is not None
+        queue.fail(job.id, "Failed", retry_delay=60)
+        delay = queue.next_visible_at() - get_current_time()
+        assert 50 < delay.total_seconds() <= 60
+
+    def test_recover(self, queue_data):
+        queue = DownloadQueueManager()
+        queue.enqueue(
+            queue_data.media_ids[:2],
+            queue_data.profile_ids[0],
+            DownloadPriority.BACKLOG,
+        )
+        interrupted = queue.claim()
+        assert interrupted is not None
+        # Crashed on every attempt
+        with Session(engine) as session:
+            crashing = session.exec(
+                select(DownloadJob).where(DownloadJob.id != interrupted.id)
+            ).one()
+            crashing.attempts = MAX_ATTEMPTS - 1
+            session.add(crashing)
+            session.commit()
+        assert queue.claim() is not None
+        assert queue.recover() == 1
+        (job,) = queue.read_all()
+        assert job.id == interrupted.id
+        assert job.claimed_at is None
+        assert queue.claim() is not None
+
+    def test_removed_with_media_and_profile(self, queue_data):
+        queue = DownloadQueueManager()
+        profile_id, other_profile_id = queue_data.profile_ids
+        m = queue_data.media_ids
+        queue.enqueue(m[:2], profile_id, DownloadPriority.BACKLOG)
+        queue.enqueue(m[2:], other_profile_id, DownloadPriority.BACKLOG)
+        MediaDatabaseManager().delete(m[0])
+        trailerprofile.delete_trailerprofile(other_profile_id)
+        queue_data.profile_ids.remove(other_profile_id)
+        assert [job.media_id for job in queue.read_all()] == [m[1]]
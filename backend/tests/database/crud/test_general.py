@@ -0,0 +1,131 @@
+from sqlalchemy import event
+from sqlmodel import Session, select
+
+from core.base.database.manager.base import MediaDatabaseManager
+from core.base.database.manager.connection import ConnectionDatabaseManager
+from core.base.database.manager.general import (
+    GeneralDatabaseManager,
+    ServerStats,
+)
+from core.base.database.models.connection import (
+    ArrType,
+    Connection,
+    MonitorType,
+)
+from core.base.database.models.media import Media, MediaCreate
+from core.base.database.utils.engine import engine, read_engine
+
+
+def _create_connection() -> int:
+    with Session(engine) as session:
+        db_connection = Connection(
+            name="Stats",
+            arr_type=ArrType.SONARR,
+            url="http://example.com",
+            api_key="API_KEY",
+            monitor=MonitorType.MONITOR_NEW,
+        )
+        session.add(db_connection)
+        session.commit()
+        session.refresh(db_connection)
+        return db_connection.id  # type: ignore
+
+
+def _expected_stats() -> ServerStats:
+    with Session(engine) as session:
+        media_list = session.exec(select(Media)).all()
+    movies = [media for media in media_list if media.is_movie]
+    series = [media for media in media_list if not media.is_movie]
+    return ServerStats(
+        trailers_downloaded=sum(1 for m in media_list if m.downloaded_at),
+        trailers_detected=sum(1 for m in media_list if m.trailer_exists),
+        movies_count=len(movies),
+        movies_monitored=sum(1 for m in movies if m.monitor),
+        series_count=len(series),
+        series_monitored=sum(1 for m in series if m.monitor),
+    )
+
+
+class _QueryCounter:
+    def __init__(self) -> None:
+        self.count = 0
+
+    def __call__(self, *args, **kwargs) -> None:
+        self.count += 1
+
+
+class TestGeneralDatabaseManager:
+
+    def test_get_stats(self):
+        db_manager = GeneralDatabaseManager()
+        media_db_manager = MediaDatabaseManager()
+        stats = db_manager.get_stats()
+        assert stats == _expected_stats()
+
+        # Stats are not read again until media changes
+        counter = _QueryCounter()
+        event.listen(read_engine, "before_cursor_execute", counter)
+        try:
+            assert db_manager.get_stats() == stats
+            assert counter.count == 0
+        finally:
+            event.remove(read_engine, "before_cursor_execute", counter)
+
+        connection_id = _create_connection()
+        media_list = media_db_manager.create_or_update_bulk(
+            [
+                MediaCreate(
+                    connection_id=connection_id,
+                    arr_id=i,
+                    is_movie=False,
+                    title=f"Series {i}",
+                    txdb_id=str(i),
+                    trailer_exists=i == 0,
+                )
+                for i in range(3)
+            ]
+        )
+        stats = db_manager.get_stats()
+        assert stats == _expected_stats()
+        media_ids = [media_read.id for media_read, _, _ in media_list]
+        media_db_manager.update_monitoring_bulk(media_ids, True)
+        stats = db_manager.get_stats()
+        assert stats == _expected_stats()
+        assert stats.series_monitored >= 2
+
+        # Media is deleted on cascade with the connection
+        ConnectionDatabaseManager().delete(connection_id)
+        assert db_manager.get_stats() == _expected_stats()
+
+    def test_only_media_writes_invalidate_stats(self):
+        db_manager = GeneralDatabaseManager()
+        media_db_manager = MediaDatabaseManager()
+        connection_id = _create_connection()
+        media_list = media_db_manager.create_or_update_bulk(
+            [
+                MediaCreate(
+                    connection_id=connection_id,
+                    arr_id=1,
+                    title="Movie 1",
+                    txdb_id="1",
+                )
+            ]
+        )
+        media_id = media_list[0][0].id
+        db_manager.get_stats()
+
+        # Sync bookkeeping doesn't change the stats
+        media_db_manager.update_sync_epoch([media_id], 5)
+        counter = _QueryCounter()
+        event.listen(read_engine, "before_cursor_execute", counter)
+        try:
+            db_manager.get_stats()
+            assert counter.count == 0
+            media_db_manager.update_trailer_exists(media_id, True)
+            counter.count = 0
+            stats = db_manager.get_stats()
+            assert counter.count == 1
+        finally:
+            event.remove(read_engine, "before_cursor_execute", counter)
+        assert stats == _expected_stats()
+        ConnectionDatabaseManager().delete(connection_id)
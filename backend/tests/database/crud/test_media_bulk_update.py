@@ -0,0 +1,173 @@
+from datetime import datetime, timezone
+import random
+import pytest
+from sqlmodel import Session, select
+
+from core.base.database.manager.base import MediaDatabaseManager
+from core.base.database.models.connection import (
+    ArrType,
+    Connection,
+    MonitorType,
+)
+from core.base.database.models.helpers import MediaUpdateDC
+from core.base.database.models.media import (
+    Media,
+    MediaCreate,
+    MediaUpdate,
+    MonitorStatus,
+)
+from core.base.database.utils.engine import engine
+from exceptions import ItemNotFoundError
+
+MEDIA_COUNT = 60
+# Columns that differ between the media of the two connections
+_SKIP_COLUMNS = {"id", "connection_id", "added_at", "updated_at"}
+
+
+def _create_connection(name: str) -> int:
+    with Session(engine) as session:
+        db_connection = Connection(
+            name=name,
+            arr_type=ArrType.RADARR,
+            url="http://example.com",
+            api_key="API_KEY",
+            monitor=MonitorType.MONITOR_NEW,
+        )
+        session.add(db_connection)
+        session.commit()
+        session.refresh(db_connection)
+        return db_connection.id  # type: ignore
+
+
+@pytest.fixture
+def media_ids():
+    """Create the same media for two connections, and return their ids."""
+    db_manager = MediaDatabaseManager()
+    connection_ids = [_create_connection(name) for name in ("Loop", "Bulk")]
+    statuses = list(MonitorStatus)
+    ids: list[list[int]] = []
+    for connection_id in connection_ids:
+        media_list = db_manager.create_or_update_bulk(
+            [
+                MediaCreate(
+                    connection_id=connection_id,
+                    arr_id=i,
+                    title=f"Movie {i}",
+                    txdb_id=str(i),
+                    trailer_exists=i % 2 == 0,
+                    monitor=i % 3 == 0,
+                    status=statuses[i % len(statuses)],
+                )
+                for i in range(MEDIA_COUNT)
+            ]
+        )
+        ids.append([media_read.id for media_read, _, _ in media_list])
+    yield ids
+    with Session(engine) as session:
+        for connection_id in connection_ids:
+            session.delete(session.get(Connection, connection_id))
+        session.commit()
+
+
+def _read_rows(media_ids: list[int]) -> list[dict]:
+    with Session(engine) as session:
+        statement = select(Media).where(Media.id.in_(media_ids))  # type: ignore
+        return [
+            media.model_dump(exclude=_SKIP_COLUMNS)
+            for media in session.exec(statement.order_by(Media.arr_id))
+        ]
+
+
+class TestMediaBulkUpdate:
+    db_manager = MediaDatabaseManager()
+
+    def test_update_media_status_bulk(self, media_ids):
+        rng = random.Random(1)
+        updates: list[list[MediaUpdateDC]] = [[], []]
+        for i in range(MEDIA_COUNT):
+            update = {
+                "monitor": rng.random() < 0.5,
+                "status": rng.choice(list(MonitorStatus)),
+                "trailer_exists": rng.choice([None, True, False]),
+                "yt_id": rng.choice([None, "", f"yt{i}"]),
+                "downloaded_at": rng.choice(
+                    [None, datetime(2026, 1, 1, tzinfo=timezone.utc)]
+                ),
+            }
+            for ids, update_list in zip(media_ids, updates):
+                update_list.append(MediaUpdateDC(id=ids[i], **update))
+        for media_update in updates[0]:
+            self.db_manager.update_media_status(media_update)
+        self.db_manager.update_media_status_bulk(updates[1])
+        assert _read_rows(media_ids[0]) == _read_rows(media_ids[1])
+
+    def test_update_trailer_exists_bulk(self, media_ids):
+        loop_ids, bulk_ids = media_ids
+        for i, media_id in enumerate(loop_ids):
+            self.db_manager.update_trailer_exists(media_id, i % 5 < 2)
+        self.db_manager.update_trailer_exists_bulk(
+            [(media_id, i % 5 < 2) for i, media_id in enumerate(bulk_ids)]
+        )
+        assert _read_rows(loop_ids) == _read_rows(bulk_ids)
+
+    @pytest.mark.parametrize("monitor", [True, False])
+    def test_update_monitoring_bulk(self, media_ids, monitor):
+        loop_ids, bulk_ids = media_ids
+        for media_id in loop_ids:
+            self.db_manager.update_monitoring(media_id, monitor)
+        self.db_manager.update_monitoring_bulk(bulk_ids, monitor)
+        assert _read_rows(loop_ids) == _read_rows(bulk_ids)
+
+    def test_update_bulk(self, media_ids):
+        loop_ids, bulk_ids = media_ids
+        updates: list[MediaUpdate] = []
+        for i in range(MEDIA_COUNT):
+            media_update = MediaUpdate()
+            if i % 2 == 0:
+                media_update.poster_path = f"/posters/{i}.jpg"
+            if i % 3 == 0:
+                media_update.fanart_path = f"/fanart/{i}.jpg"
+            updates.append(media_update)
+        for media_id, media_update in zip(loop_ids, updates):
+            self.db_manager.update(media_id, media_update)
+        self.db_manager.update_bulk(list(zip(bulk_ids, updates)))
+        assert _read_rows(loop_ids) == _read_rows(bulk_ids)
+
+    def test_update_bulk_updated_at(self, media_ids):
+        media_id = media_ids[1][0]
+        updated_at = self.db_manager.read(media_id).updated_at
+        media_update = MediaUpdate(title="Movie 0")
+        self.db_manager.update_bulk([(media_id, media_update)])
+        # Unchanged values don't change the updated time
+        assert self.db_manager.read(media_id).updated_at == updated_at
+        media_update = MediaUpdate(title="New Title")
+        self.db_manager.update_bulk([(media_id, media_update)])
+        media_read = self.db_manager.read(media_id)
+        assert media_read.title == "New Title"
+        assert media_read.updated_at > updated_at
+
+    def test_missing_ids(self, media_ids):
+        media_id = media_ids[1][1]
+        missing_id = max(media_ids[1]) + 1000
+        with pytest.raises(ItemNotFoundError):
+            self.db_manager.update_trailer_exists_bulk(
+                [(media_id, True), (missing_id, True)]
+            )
+        with pytest.raises(ItemNotFoundError):
+            self.db_manager.update_monitoring_bulk([missing_id], True)
+        with pytest.raises(ItemNotFoundError):
+            self.db_manager.update_bulk(
+                [(media_id, MediaUpdate()), (missing_id, MediaUpdate())]
+            )
+        with pytest.raises(ItemNotFoundError):
+            self.db_manager.update_media_status_bulk(
+                [
+                    MediaUpdateDC(
+                        id=missing_id,
+                        monitor=True,
+                        status=MonitorStatus.MONITORED,
+                    )
+                ]
+            )
+        # Nothing is changed if any of the media doesn't exist
+        assert self.db_manager.read(media_id).trailer_exists is False
@@ -0,0 +1,112 @@
+import pytest
+from sqlmodel import Session
+
+from core.base.database.manager.base import MediaDatabaseManager
+from core.base.database.models.connection import (
+    ArrType,
+    Connection,
+    MonitorType,
+)
+from core.base.database.models.media import MediaCreate
+from core.base.database.utils.engine import engine
+
+
+@pytest.fixture
+def connection_id():
+    with Session(engine) as session:
+        db_connection = Connection(
+            name="Pages",
+            arr_type=ArrType.RADARR,
+            url="http://example.com",
+            api_key="API_KEY",
+            monitor=MonitorType.MONITOR_NEW,
+        )
+        session.add(db_connection)
+        session.commit()
+        session.refresh(db_connection)
+        connection_id = db_connection.id
+    # Few titles and years, so that pages split between equal values
+    MediaDatabaseManager().create_or_update_bulk(
+        [
+            MediaCreate(
+                connection_id=connection_id,  # type: ignore
+                arr_id=i,
+                title=f"Page Movie {i % 4}",
+                year=2000 + i % 3,
+                txdb_id=str(800000 + i),
+                monitor=i % 2 == 0,
+            )
+            for i in range(23)
+        ]
+    )
+    yield connection_id
+    with Session(engine) as session:
+        session.delete(session.get(Connection, connection_id))
+        session.commit()
+
+
+def _read_pages(limit: int, **kwargs) -> list[int]:
+    db_manager = MediaDatabaseManager()
+    media_ids: list[int] = []
+    cursor = None
+    while True:
+        media_list, cursor = db_manager.read_page(
+            limit, cursor=cursor, **kwargs
+        )
+        assert len(media_list) <= limit
+        media_ids += [media.id for media in media_list]
+        if cursor is None:
+            return media_ids
+
+
+def _expected_ids(sort_by: str, sort_asc: bool, **kwargs) -> list[int]:
+    media_list = MediaDatabaseManager().read_all(**kwargs)
+    media_list.sort(
+        key=lambda media: (getattr(media, sort_by), media.id),
+        reverse=not sort_asc,
+    )
+    return [media.id for media in media_list]
+
+
+class TestMediaPagination:
+
+    @pytest.mark.parametrize(
+        "sort_by", ["title", "year", "added_at", "updated_at", "id"]
+    )
+    @pytest.mark.parametrize("sort_asc", [True, False])
+    def test_read_page(self, connection_id, sort_by, sort_asc):
+        expected = _expected_ids(sort_by, sort_asc)
+        assert len(expected) >= 23
+        assert _read_pages(5, sort_by=sort_by, sort_asc=sort_asc) == expected
+
+    def test_read_page_filtered(self, connection_id):
+        expected = _expected_ids(
+            "year", True, movies_only=True, filter_by="monitored"
+        )
+        assert expected
+        assert (
+            _read_pages(
+                4, movies_only=True, filter_by="monitored", sort_by="year"
+            )
+            == expected
+        )
+
+    def test_read_page_invalid_cursor(self, connection_id):
+        db_manager = MediaDatabaseManager()
+        _, cursor = db_manager.read_page(2, sort_by="title")
+        assert cursor
+        with pytest.raises(ValueError):
+            db_manager.read_page(2, cursor=cursor, sort_by="year")
+        with pytest.raises(ValueError):
+            db_manager.read_page(2, cursor="not-a-cursor", sort_by="title")
+
+    def test_read_all_batches(self, connection_id):
+        db_manager = MediaDatabaseManager()
+        batches = list(
+            db_manager.read_all_batches(
+                sort_by="title", sort_asc=False, batch_size=7
+            )
+        )
+        assert all(len(batch) <= 7 for batch in batches)
+        media_ids = [media.id for batch in batches for media in batch]
+        assert media_ids == _expected_ids("title", False)
@@ -0,0 +1,110 @@
+from dataclasses import fields
+
+import pytest
+from sqlmodel import Session
+
+from core.base.database.manager.base import MediaDatabaseManager
+from core.base.database.models.connection import (
+    ArrType,
+    Connection,
+    MonitorType,
+)
+from core.base.database.models.helpers import MediaImagesDC, MediaTrailerDC
+from core.base.database.models.media import MediaCreate
+from core.base.database.utils.engine import engine
+
+
+@pytest.fixture
+def connection_id():
+    with Session(engine) as session:
+        db_connection = Connection(
+            name="Projection",
+            arr_type=ArrType.RADARR,
+            url="http://example.com",
+            api_key="API_KEY",
+            monitor=MonitorType.MONITOR_NEW,
+        )
+        session.add(db_connection)
+        session.commit()
+        session.refresh(db_connection)
+        connection_id = db_connection.id
+    db_manager = MediaDatabaseManager()
+    db_manager.create_or_update_bulk(
+        [
+            MediaCreate(
+                connection_id=connection_id,  # type: ignore
+                arr_id=i,
+                title=f"Projection Movie {i}",
+                txdb_id=str(950000 + i),
+                folder_path=f"/movies/projection {i}" if i % 3 else None,
+                poster_url=f"http://example.com/poster{i}.jpg",
+                fanart_url=f"http://example.com/fanart{i}.jpg",
+            )
+            for i in range(9)
+        ]
+    )
+    media_ids = [
+        media.id for media in db_manager.read_all_by_connection(connection_id)
+    ]
+    db_manager.update_trailer_exists_bulk(
+        [(media_id, True) for media_id in media_ids[::2]]
+    )
+    yield connection_id
+    with Session(engine) as session:
+        session.delete(session.get(Connection, connection_id))
+        session.commit()
+
+
+def _expected(record_type: type, **kwargs) -> list:
+    """Records built from the full `MediaRead` objects of `read_all`."""
+    names = [field.name for field in fields(record_type)]
+    return [
+        record_type(*[getattr(media, name) for name in names])
+        for media in sorted(
+            MediaDatabaseManager().read_all(**kwargs), key=lambda m: m.id
+        )
+    ]
+
+
+def _as_tuples(records: list) -> list[tuple]:
+    return [
+        tuple(getattr(record, field.name) for field in fields(record))
+        for record in records
+    ]
+
+
+class TestMediaProjection:
+
+    @pytest.mark.parametrize("record_type", [MediaTrailerDC, MediaImagesDC])
+    def test_read_all_projected(self, connection_id, record_type):
+        records = MediaDatabaseManager().read_all_projected(record_type)
+        assert all(type(record) is record_type for record in records)
+        assert _as_tuples(records) == _as_tuples(_expected(record_type))
+
+    @pytest.mark.parametrize("filter_by", ["downloaded", "missing"])
+    @pytest.mark.parametrize("movies_only", [None, True, False])
+    def test_read_all_projected_filtered(
+        self, connection_id, filter_by, movies_only
+    ):
+        records = MediaDatabaseManager().read_all_projected(
+            MediaTrailerDC, movies_only=movies_only, filter_by=filter_by
+        )
+        expected = _expected(
+            MediaTrailerDC, movies_only=movies_only, filter_by=filter_by
+        )
+        assert _as_tuples(records) == _as_tuples(expected)
+
+    def test_iter_all_projected(self, connection_id):
+        db_manager = MediaDatabaseManager()
+        records = db_manager.iter_all_projected(
+            MediaTrailerDC, filter_by="downloaded", batch_size=2
+        )
+        assert _as_tuples(list(records)) == _as_tuples(
+            db_manager.read_all_projected(
+                MediaTrailerDC, filter_by="downloaded"
+            )
+        )
+
+    def test_records_have_slots(self, connection_id):
+        record = MediaDatabaseManager().read_all_projected(MediaTrailerDC)[0]
+        assert not hasattr(record, "__dict__")
@@ -0,0 +1,252 @@
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator
+
+import pytest
+from sqlalchemy import event
+from sqlmodel import Session
+
+from core.base.database.manager.base import MediaDatabaseManager
+from core.base.database.models.connection import (
+    ArrType,
+    Connection,
+    MonitorType,
+)
+from core.base.database.models.helpers import MediaImagesDC, MediaTrailerDC
+from core.base.database.models.media import MediaCreate
+from core.base.database.utils.engine import engine, read_engine
+from core.radarr.data_parser import extract_movie
+
+_SORT_KEYS = ["title", "year", "added_at", "updated_at", None]
+
+
+@pytest.fixture(scope="module")
+def connection_id():
+    with Session(engine) as session:
+        db_connection = Connection(
+            name="Plans",
+            arr_type=ArrType.RADARR,
+            url="http://example.com",
+            api_key="API_KEY",
+            monitor=MonitorType.MONITOR_NEW,
+        )
+        session.add(db_connection)
+        session.commit()
+        session.refresh(db_connection)
+        connection_id = db_connection.id
+    MediaDatabaseManager().create_or_update_bulk(
+        [
+            MediaCreate(
+                connection_id=connection_id,  # type: ignore
+                arr_id=i,
+                title=f"Plan Movie {i}",
+                year=2000 + i % 5,
+                txdb_id=str(700000 + i),
+                imdb_id=f"tt{7000000 + i}",
+                monitor=i % 2 == 0,
+            )
+            for i in range(10)
+        ]
+    )
+    yield connection_id
+    with Session(engine) as session:
+        session.delete(session.get(Connection, connection_id))
+        session.commit()
+
+
+@contextmanager
+def _capture_selects() -> Iterator[list[tuple[str, Any]]]:
+    """Capture the SELECT statements executed, with their parameters."""
+    statements: list[tuple[str, Any]] = []
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    # Reads are on the read engine, reads of writes on the write engine
+    engines = {engine, read_engine}
+    for _engine in engines:
+        event.listen(_engine, "before_cursor_execute", _capture)
+    try:
+        yield statements
+    finally:
+        for _engine in engines:
+            event.remove(_engine, "before_cursor_execute", _capture)
+
+
+def _query_plans(read: Callable[[], Any]) -> list[list[str]]:
+    """Run the read and get the query plan of each SELECT it executed."""
+    with _capture_selects() as statements:
+        result = read()
+        if isinstance(result, Iterator):
+            list(result)
+    assert statements, "No queries executed"
+    with engine.connect() as conn:
+        return [
+            [
+                row[3]
+                for row in conn.exec_driver_sql(
+                    f"EXPLAIN QUERY PLAN {statement}", parameters
+                )
+            ]
+            for statement, parameters in statements
+        ]
+
+
+def _assert_no_full_scan(read: Callable[[], Any], ordered: bool = False):
+    """Assert that no query of the read scans a whole table. \n
+    If `ordered`, the rows should also be read in index order, so that \
+        a LIMIT stops the scan early instead of sorting all rows."""
+    for plan in _query_plans(read):
+        for detail in plan:
+            # 'SCAN <table>' without 'USING [COVERING] INDEX' is a full scan
+            if detail.startswith("SCAN ") and "VIRTUAL TABLE" not in detail:
+                assert " USING " in detail, plan
+            if ordered:
+                assert "USE TEMP B-TREE" not in detail, plan
+
+
+class TestMediaQueryPlans:
+    """Query plans of the `MediaDatabaseManager` read paths. \n
+    Reads of all media without a filter (`read_all()` and the first page \
+        sorted by id) scan the table by design, and are not checked."""
+
+    def test_read(self, connection_id):
+        db_manager = MediaDatabaseManager()
+        media_id = db_manager.read_all_by_connection(connection_id)[0].id
+        _assert_no_full_scan(lambda: db_manager.read(media_id))
+
+    @pytest.mark.parametrize(
+        "filter_by", ["downloaded", "monitored", "missing", "unmonitored"]
+    )
+    def test_read_all_filtered(self, connection_id, filter_by):
+        _assert_no_full_scan(
+            lambda: MediaDatabaseManager().read_all(filter_by=filter_by)
+        )
+
+    @pytest.mark.parametrize("movies_only", [True, False])
+    def test_read_all_movies_only(self, connection_id, movies_only):
+        _assert_no_full_scan(
+            lambda: MediaDatabaseManager().read_all(movies_only=movies_only)
+        )
+
+    @pytest.mark.parametrize("sort_by", ["title", "year", "added_at"])
+    def test_read_all_sorted(self, connection_id, sort_by):
+        _assert_no_full_scan(
+            lambda: MediaDatabaseManager().read_all(
+                sort_by=sort_by, sort_asc=False
+            ),
+            ordered=True,
+        )
+
+    @pytest.mark.parametrize("sort_asc", [True, False])
+    @pytest.mark.parametrize("sort_by", _SORT_KEYS)
+    def test_read_page(self, connection_id, sort_by, sort_asc):
+        db_manager = MediaDatabaseManager()
+        _, cursor = db_manager.read_page(3, sort_by=sort_by, sort_asc=sort_asc)
+        assert cursor is not None
+        _assert_no_full_scan(
+            lambda: db_manager.read_page(
+                3, cursor=cursor, sort_by=sort_by, sort_asc=sort_asc
+            ),
+            ordered=True,
+        )
+
+    @pytest.mark.parametrize("sort_by", ["title", "year", "added_at"])
+    def test_read_page_first(self, connection_id, sort_by):
+        _assert_no_full_scan(
+            lambda: MediaDatabaseManager().read_page(3, sort_by=sort_by),
+            ordered=True,
+        )
+
+    def test_read_page_filtered(self, connection_id):
+        _assert_no_full_scan(
+            lambda: MediaDatabaseManager().read_page(
+                3, movies_only=True, filter_by="monitored", sort_by="title"
+            )
+        )
+
+    def test_read_all_batches(self, connection_id):
+        _assert_no_full_scan(
+            lambda: MediaDatabaseManager().read_all_batches(
+                filter_by="missing", sort_by="added_at", batch_size=3
+            )
+        )
+
+    @pytest.mark.parametrize("filter_by", ["downloaded", "missing"])
+    def test_read_all_projected(self, connection_id, filter_by):
+        _assert_no_full_scan(
+            lambda: MediaDatabaseManager().read_all_projected(
+                MediaTrailerDC, filter_by=filter_by
+            )
+        )
+
+    def test_iter_all_projected(self, connection_id):
+        _assert_no_full_scan(
+            lambda: MediaDatabaseManager().iter_all_projected(
+                MediaImagesDC, movies_only=True
+            )
+        )
+
+    def test_read_all_by_connection(self, connection_id):
+        _assert_no_full_scan(
+            lambda: MediaDatabaseManager().read_all_by_connection(
+                connection_id
+            )
+        )
+
+    def test_read_fingerprints(self, connection_id):
+        _assert_no_full_scan(
+            lambda: MediaDatabaseManager().read_fingerprints(connection_id)
+        )
+
+    def test_read_next_sync_epoch(self, connection_id):
+        _assert_no_full_scan(
+            lambda: MediaDatabaseManager().read_next_sync_epoch(connection_id)
+        )
+
+    @pytest.mark.parametrize("movies_only", [None, True, False])
+    def test_read_recent(self, connection_id, movies_only):
+        _assert_no_full_scan(
+            lambda: MediaDatabaseManager().read_recent(
+                5, offset=2, movies_only=movies_only
+            ),
+            ordered=True,
+        )
+
+    def test_read_recently_downloaded(self, connection_id):
+        _assert_no_full_scan(
+            lambda: MediaDatabaseManager().read_recently_downloaded(5),
+            ordered=True,
+        )
+
+    def test_read_updated_after(self, connection_id):
+        _assert_no_full_scan(
+            lambda: MediaDatabaseManager().read_updated_after(60)
+        )
+
+    @pytest.mark.parametrize(
+        "query",
+        ["plan movie", "tt7000001", "tmdb-700001", "2001", "plan 2001"],
+    )
+    def test_search(self, connection_id, query):
+        _assert_no_full_scan(lambda: MediaDatabaseManager().search(query))
+
+    def test_create_or_update_bulk(self, connection_id):
+        media = MediaCreate(
+            connection_id=connection_id,
+            arr_id=1,
+            title="Plan Movie 1",
+            txdb_id="700001",
+        )
+        _assert_no_full_scan(
+            lambda: MediaDatabaseManager().create_or_update_bulk([media])
+        )
+
+    def test_sync_bulk(self, connection_id):
+        movie = {"id": 1, "title": "Plan Movie 1", "year": 2001}
+        movie.update({"tmdbId": 700001, "images": []})
+        _assert_no_full_scan(
+            lambda: MediaDatabaseManager().sync_bulk(
+                [extract_movie(connection_id, movie)]
+            )
+        )
@@ -0,0 +1,97 @@
+import pytest
+from sqlmodel import Session
+
+from core.base.database.manager.base import MediaDatabaseManager
+from core.base.database.models.connection import (
+    ArrType,
+    Connection,
+    MonitorType,
+)
+from core.base.database.models.media import MediaCreate, MediaUpdate
+from core.base.database.utils.engine import engine
+
+
+@pytest.fixture
+def media_ids():
+    with Session(engine) as session:
+        db_connection = Connection(
+            name="Search",
+            arr_type=ArrType.RADARR,
+            url="http://example.com",
+            api_key="API_KEY",
+            monitor=MonitorType.MONITOR_NEW,
+        )
+        session.add(db_connection)
+        session.commit()
+        session.refresh(db_connection)
+        connection_id = db_connection.id
+    media_list = MediaDatabaseManager().create_or_update_bulk(
+        [
+            MediaCreate(
+                connection_id=connection_id,  # type: ignore
+                arr_id=1,
+                title="The Zyxquor Knight",
+                clean_title="thezyxquorknight",
+                title_slug="the-zyxquor-knight",
+                year=2008,
+                txdb_id="900001",
+                imdb_id="tt9000001",
+            ),
+            MediaCreate(
+                connection_id=connection_id,  # type: ignore
+                arr_id=2,
+                title="Zyxquor Rises",
+                year=2012,
+                txdb_id="900002",
+                overview="The knight returns.",
+            ),
+            MediaCreate(
+                connection_id=connection_id,  # type: ignore
+                arr_id=3,
+                title="Améliequx",
+                year=2001,
+                txdb_id="900003",
+                studio="Zyxquor Studios",
+            ),
+        ]
+    )
+    yield [media_read.id for media_read, _, _ in media_list]
+    with Session(engine) as session:
+        session.delete(session.get(Connection, connection_id))
+        session.commit()
+
+
+def _titles(query: str) -> list[str]:
+    return [media.title for media in MediaDatabaseManager().search(query)]
+
+
+class TestMediaSearch:
+
+    def test_search_prefix_and_rank(self, media_ids):
+        # Title matches rank above studio matches
+        assert _titles("zyxq") == [
+            "The Zyxquor Knight",
+            "Zyxquor Rises",
+            "Améliequx",
+        ]
+        # All words must match, title above overview
+        assert _titles("zyxquor kni") == [
+            "The Zyxquor Knight",
+            "Zyxquor Rises",
+        ]
+        assert _titles("thezyxquor") == ["The Zyxquor Knight"]
+        assert _titles("ameliequ") == ["Améliequx"]
+        assert _titles("zyxquor-studio") == ["Améliequx"]
+
+    def test_search_shortcuts(self, media_ids):
+        assert _titles("zyxquor 2012") == ["Zyxquor Rises"]
+        assert _titles("tt9000001") == ["The Zyxquor Knight"]
+        assert _titles("900002") == ["Zyxquor Rises"]
+
+    def test_search_index_updated(self, media_ids):
+        db_manager = MediaDatabaseManager()
+        db_manager.update(media_ids[1], MediaUpdate(title="Qwvbnm Rises"))
+        assert _titles("qwvbn") == ["Qwvbnm Rises"]
+        assert _titles("zyxquor kni") == ["The Zyxquor Knight"]
+        db_manager.delete(media_ids[0])
+        assert _titles("zyxquor kni") == []
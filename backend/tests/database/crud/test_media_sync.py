@@ -0,0 +1,143 @@
+import pytest
+from sqlmodel import Session, select
+
+from core.base.database.manager.base import MediaDatabaseManager
+from core.base.database.models.connection import (
+    ArrType,
+    Connection,
+    MonitorType,
+)
+from core.base.database.models.media import Media, MonitorStatus
+from core.base.database.utils.engine import engine
+from core.radarr.data_parser import extract_movie, parse_movie
+
+# Columns that differ between two connections with the same media
+_SKIP_COLUMNS = {"id", "connection_id", "added_at", "updated_at"}
+
+
+def _create_connection(name: str) -> int:
+    with Session(engine) as session:
+        db_connection = Connection(
+            name=name,
+            arr_type=ArrType.RADARR,
+            url="http://example.com",
+            api_key="API_KEY",
+            monitor=MonitorType.MONITOR_NEW,
+        )
+        session.add(db_connection)
+        session.commit()
+        session.refresh(db_connection)
+        return db_connection.id  # type: ignore
+
+
+def _delete_connection(connection_id: int) -> None:
+    with Session(engine) as session:
+        session.delete(session.get(Connection, connection_id))
+        session.commit()
+
+
+def _movie(i: int, title: str = "Movie") -> dict:
+    return {
+        "id": i,
+        "title": f"{title} {i}",
+        "year": 2000 + i,
+        "tmdbId": 1000 + i,
+        "path": f"/movies/Movie {i}",
+        "monitored": i % 2 == 0,
+        "overview": None if i % 3 == 0 else f"Overview {i}",
+        "statistics": {"movieFileCount": i % 2},
+        "images": [{"coverType": "poster", "remoteUrl": f"/p{i}.jpg"}],
+    }
+
+
+def _read_rows(connection_id: int) -> list[dict]:
+    with Session(engine) as session:
+        statement = (
+            select(Media)
+            .where(Media.connection_id == connection_id)
+            .order_by(Media.txdb_id)
+        )
+        return [
+            media.model_dump(exclude=_SKIP_COLUMNS)
+            for media in session.exec(statement)
+        ]
+
+
+@pytest.fixture
+def connection_ids():
+    ids = (_create_connection("ORM"), _create_connection("Sync"))
+    yield ids
+    for connection_id in ids:
+        _delete_connection(connection_id)
+
+
+class TestMediaSync:
+
+    def test_create_or_update_bulk_same_as_sync_bulk(self, connection_ids):
+        db_manager = MediaDatabaseManager()
+        orm_id, sync_id = connection_ids
+        # Create, with a duplicate in the list
+        movies = [_movie(i) for i in range(1, 7)] + [_movie(2, "Dup")]
+        orm_result = db_manager.create_or_update_bulk(
+            [parse_movie(orm_id, movie) for movie in movies]
+        )
+        sync_result = db_manager.sync_bulk(
+            [extract_movie(sync_id, movie) for movie in movies]
+        )
+        assert [flags for _, *flags in orm_result] == [
+            [media.created, updated] for media, updated in sync_result
+        ]
+        assert _read_rows(orm_id) == _read_rows(sync_id)
+        media, updated = sync_result[0]
+        assert media.id is not None
+        assert media.created is True and updated is False
+        assert media.status == MonitorStatus.MISSING
+
+        # Update, some changed and some not
+        movies = [_movie(i, "New" if i < 3 else "Movie") for i in range(1, 8)]
+        orm_result = db_manager.create_or_update_bulk(
+            [parse_movie(orm_id, movie) for movie in movies]
+        )
+        sync_result = db_manager.sync_bulk(
+            [extract_movie(sync_id, movie) for movie in movies]
+        )
+        assert [flags for _, *flags in orm_result] == [
+            [media.created, updated] for media, updated in sync_result
+        ]
+        assert [updated for _, updated in sync_result] == [
+            True,
+            True,
+            False,
+            False,
+            False,
+            False,
+            False,
+        ]
+        assert _read_rows(orm_id) == _read_rows(sync_id)
+
+    def test_create_or_update_bulk_sets_local_fields(self, connection_ids):
+        db_manager = MediaDatabaseManager()
+        connection_id, _ = connection_ids
+        media_list = [parse_movie(connection_id, _movie(i)) for i in (1, 2)]
+        media_list[0].monitor = True
+        media_list[0].status = MonitorStatus.DOWNLOADED
+        media_list[0].trailer_exists = True
+        result = db_manager.create_or_update_bulk(media_list)
+        assert [flags for _, *flags in result] == [[True, False]] * 2
+        media, _, _ = result[0]
+        assert media.monitor is True
+        assert media.status == MonitorStatus.DOWNLOADED
+        assert media.trailer_exists is True
+        assert result[1][0].trailer_exists is False
+
+        # Only a local field changed, counts as an update
+        media_list = [parse_movie(connection_id, _movie(i)) for i in (1, 2)]
+        media_list[1].trailer_exists = True
+        result = db_manager.create_or_update_bulk(media_list)
+        assert [flags for _, *flags in result] == [
+            [False, False],
+            [False, True],
+        ]
+        # Local fields not given are kept
+        assert result[0][0].status == MonitorStatus.DOWNLOADED
+        assert result[1][0].trailer_exists is True
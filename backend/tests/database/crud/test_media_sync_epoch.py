@@ -0,0 +1,83 @@
+import pytest
+from sqlmodel import Session, select
+
+from core.base.database.manager.base import MediaDatabaseManager
+from core.base.database.models.connection import (
+    ArrType,
+    Connection,
+    MonitorType,
+)
+from core.base.database.models.helpers import MediaCreateDC
+from core.base.database.models.media import Media
+from core.base.database.utils.engine import engine
+from core.radarr.data_parser import extract_movie
+
+
+@pytest.fixture
+def connection_id():
+    with Session(engine) as session:
+        db_connection = Connection(
+            name="Sync Epoch",
+            arr_type=ArrType.RADARR,
+            url="http://example.com",
+            api_key="API_KEY",
+            monitor=MonitorType.MONITOR_NEW,
+        )
+        session.add(db_connection)
+        session.commit()
+        session.refresh(db_connection)
+        connection_id = db_connection.id
+    yield connection_id
+    with Session(engine) as session:
+        db_connection = session.get(Connection, connection_id)
+        session.delete(db_connection)
+        session.commit()
+
+
+def _media(connection_id: int, txdb_id: str, sync_epoch: int) -> MediaCreateDC:
+    movie = {
+        "id": int(txdb_id),
+        "title": f"Movie {txdb_id}",
+        "year": 2000,
+        "tmdbId": int(txdb_id),
+        "images": [],
+    }
+    media = extract_movie(connection_id, movie)
+    media.sync_epoch = sync_epoch
+    return media
+
+
+def _read_sync_epochs(connection_id: int) -> dict[int, int]:
+    with Session(engine) as session:
+        statement = select(Media.id, Media.sync_epoch).where(
+            Media.connection_id == connection_id
+        )
+        return dict(session.exec(statement).all())
+
+
+class TestMediaSyncEpoch:
+
+    def test_delete_stale(self, connection_id):
+        db_manager = MediaDatabaseManager()
+        assert db_manager.read_next_sync_epoch(connection_id) == 1
+        media_list = db_manager.sync_bulk(
+            [_media(connection_id, str(i), 1) for i in range(1, 4)]
+        )
+        ids = [media_read.id for media_read, _ in media_list]
+        assert db_manager.read_next_sync_epoch(connection_id) == 2
+
+        # Media 1 is updated, media 2 is unchanged and media 3 is removed
+        media_read, updated = db_manager.sync_bulk(
+            [_media(connection_id, "1", 2)]
+        )[0]
+        # Sync epoch change alone doesn't count as an update
+        assert (media_read.created, updated) == (False, False)
+        db_manager.update_sync_epoch([ids[1]], 2)
+        assert db_manager.delete_stale(connection_id, 2) == 1
+        assert _read_sync_epochs(connection_id) == {ids[0]: 2, ids[1]: 2}
+
+    def test_update_sync_epoch_many_ids(self, connection_id):
+        # More ids than SQLite's default limit of variables in a statement
+        db_manager = MediaDatabaseManager()
+        db_manager.update_sync_epoch(list(range(1, 40001)), 1)
+        assert db_manager.delete_stale(connection_id, 1) == 0
@@ -0,0 +1,137 @@
+import threading
+
+import pytest
+from sqlalchemy import event, text
+from sqlmodel import Session, create_engine
+
+from core.base.database.utils.writer import DatabaseWriter
+
+
+@pytest.fixture
+def write_engine(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path}/writer.db",
+        connect_args={"check_same_thread": False},
+    )
+    writer = DatabaseWriter(engine)
+    with engine.begin() as connection:
+        connection.exec_driver_sql("CREATE TABLE item (id INTEGER, name TEXT)")
+    yield engine, writer
+    writer.stop()
+    engine.dispose()
+
+
+def _insert(item_id: int):
+    def _write(session: Session) -> int:
+        session.exec(text(f"INSERT INTO item VALUES ({item_id}, 'x')"))
+        session.commit()
+        return item_id
+
+    return _write
+
+
+def _read_ids(engine) -> list[int]:
+    with engine.connect() as connection:
+        result = connection.exec_driver_sql("SELECT id FROM item ORDER BY id")
+        return [item_id for item_id, in result]
+
+
+class TestDatabaseWriter:
+
+    def test_run(self, write_engine):
+        engine, writer = write_engine
+        assert writer.run(_insert(1)) == 1
+        assert _read_ids(engine) == [1]
+        assert writer.connection is None
+
+    def test_group_commit(self, write_engine):
+        engine, writer = write_engine
+        commits: list[int] = []
+        event.listen(engine, "commit", lambda conn: commits.append(1))
+        started = threading.Event()
+        release = threading.Event()
+
+        def _blocking(session: Session) -> None:
+            started.set()
+            release.wait(5)
+
+        first = writer.submit(_blocking)
+        started.wait(5)
+        # Queued while the writer is busy, committed together
+        futures = [writer.submit(_insert(i)) for i in range(10)]
+        release.set()
+        assert [future.result(5) for future in futures] == list(range(10))
+        first.result(5)
+        assert _read_ids(engine) == list(range(10))
+        assert len(commits) == 2
+
+    def test_failed_write_rolled_back(self, write_engine):
+        engine, writer = write_engine
+        started = threading.Event()
+        release = threading.Event()
+
+        def _blocking(session: Session) -> None:
+            started.set()
+            release.wait(5)
+
+        def _failing(session: Session) -> None:
+            session.exec(text("INSERT INTO item VALUES (99, 'x')"))
+            raise ValueError("Invalid item")
+
+        writer.submit(_blocking)
+        started.wait(5)
+        ok_before = writer.submit(_insert(1))
+        failed = writer.submit(_failing)
+        ok_after = writer.submit(_insert(2))
+        release.set()
+        with pytest.raises(ValueError):
+            failed.result(5)
+        assert ok_before.result(5) == 1
+        assert ok_after.result(5) == 2
+        assert _read_ids(engine) == [1, 2]
+
+    def test_nested_write(self, write_engine):
+        engine, writer = write_engine
+
+        def _outer(session: Session) -> list[int]:
+            session.exec(text("INSERT INTO item VALUES (1, 'x')"))
+            session.commit()
+            # Runs in the same transaction, instead of waiting in the queue
+            writer.run(_insert(2))
+            return [
+                item_id
+                for item_id, in session.exec(text("SELECT id FROM item"))
+            ]
+
+        assert writer.run(_outer) == [1, 2]
+        assert _read_ids(engine) == [1, 2]
+
+    def test_concurrent_writes(self, write_engine):
+        engine, writer = write_engine
+        errors: list[Exception] = []
+
+        def _write_many(start: int) -> None:
+            try:
+                for i in range(start, start + 50):
+                    writer.run(_insert(i))
+            except Exception as e:
+                errors.append(e)
+
+        threads = [
+            threading.Thread(target=_write_many, args=(i * 50,))
+            for i in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert errors == []
+        assert _read_ids(engine) == list(range(400))
+
+    def test_stop_and_restart(self, write_engine):
+        engine, writer = write_engine
+        future = writer.submit(_insert(1))
+        writer.stop()
+        assert future.result(0) == 1
+        assert writer.run(_insert(2)) == 2
+        assert _read_ids(engine) == [1, 2]
@@ -0,0 +1,65 @@
+import asyncio
+import pytest
+
+from core.base.arr_manager import client_pool
+from core.base.arr_manager.request_manager import AsyncRequestManager
+import tests.conftest as conftest
+
+
+class TestClientPool:
+
+    @pytest.mark.asyncio
+    async def test_session_shared_per_host(self):
+        session1 = client_pool.get_client_session("http://example.com:7878/")
+        session2 = client_pool.get_client_session("HTTP://Example.com:7878")
+        session3 = client_pool.get_client_session("http://example.com:8989")
+        assert session1 is session2
+        assert session1 is not session3
+        await client_pool.close_client_sessions()
+        assert session1.closed
+        assert session3.closed
+
+    @pytest.mark.asyncio
+    async def test_closed_session_replaced(self):
+        session1 = client_pool.get_client_session("http://example.com")
+        await session1.close()
+        session2 = client_pool.get_client_session("http://example.com")
+        assert session1 is not session2
+        assert not session2.closed
+        await client_pool.close_client_sessions()
+
+    def test_session_per_event_loop(self):
+        async def _get_session():
+            session = client_pool.get_client_session("http://example.com")
+            await client_pool.close_client_sessions()
+            return session
+
+        session1 = asyncio.run(_get_session())
+        session2 = asyncio.run(_get_session())
+        assert session1 is not session2
+
+    @pytest.mark.asyncio
+    async def test_managers_reuse_session(self, debug_aiohttp_200):
+        # Mocked responses are consumed once, add another for second manager
+        debug_aiohttp_200.get(
+            conftest.TEST_AIOHTTP_FINAL_URL,
+            status=200,
+            payload=conftest.TEST_AIOHTTP_RESPONSE,
+        )
+        manager1 = AsyncRequestManager(
+            conftest.TEST_AIOHTTP_URL, conftest.TEST_AIOHTTP_APIKEY
+        )
+        manager2 = AsyncRequestManager(
+            conftest.TEST_AIOHTTP_URL, conftest.TEST_AIOHTTP_APIKEY
+        )
+        response1 = await manager1._request(
+            "GET", conftest.TEST_AIOHTTP_PATH, conftest.TEST_AIOHTTP_PARAMS
+        )
+        session = client_pool.get_client_session(conftest.TEST_AIOHTTP_URL)
+        response2 = await manager2._request(
+            "GET", conftest.TEST_AIOHTTP_PATH, conftest.TEST_AIOHTTP_PARAMS
+        )
+        assert response1 == response2 == conftest.TEST_AIOHTTP_RESPONSE
+        assert not session.closed
+        assert client_pool.get_client_session(manager2.host_url) is session
+        await client_pool.close_client_sessions()
@@ -0,0 +1,94 @@
+import json
+import pytest
+
+from core.base.arr_manager.json_stream import JSONArrayStreamParser
+from core.radarr.api_manager import RadarrManager
+from exceptions import InvalidResponseError
+from tests import conftest
+
+ITEMS = [
+    {"id": 1, "title": 'Movie [1], "quoted"', "year": 2001},
+    {"id": 2, "title": "Movie 2", "images": [{"url": "a"}, {"url": "b"}]},
+    {"id": 3, "title": "Möviè 3", "tags": [], "rating": 7.25},
+]
+
+
+class TestJSONArrayStreamParser:
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 7, 64, 4096])
+    def test_feed_in_chunks(self, chunk_size: int):
+        text = json.dumps(ITEMS, indent=2)
+        parser = JSONArrayStreamParser()
+        items = []
+        for i in range(0, len(text), chunk_size):
+            items.extend(parser.feed(text[i : i + chunk_size]))
+        parser.close()
+        assert items == ITEMS
+
+    def test_number_cut_at_chunk_end(self):
+        parser = JSONArrayStreamParser()
+        assert parser.feed("[12") == []
+        assert parser.feed("34, 5") == [1234]
+        assert parser.feed("]") == [5]
+        parser.close()
+
+    def test_empty_array(self):
+        parser = JSONArrayStreamParser()
+        assert parser.feed(" [ ] ") == []
+        parser.close()
+
+    def test_not_an_array(self):
+        parser = JSONArrayStreamParser()
+        with pytest.raises(InvalidResponseError):
+            parser.feed('{"message": "error"}')
+
+    @pytest.mark.parametrize(
+        "text", ["[1 2]", '[{"id": 1} {"id": 2}]', "[1,, 2]", "[, 1]", "[1,]"]
+    )
+    def test_missing_or_extra_commas(self, text: str):
+        parser = JSONArrayStreamParser()
+        with pytest.raises(InvalidResponseError):
+            parser.feed(text)
+
+    def test_missing_comma_across_chunks(self):
+        parser = JSONArrayStreamParser()
+        assert parser.feed("[1 ") == []
+        with pytest.raises(InvalidResponseError):
+            parser.feed("2]")
+
+    def test_incomplete_array(self):
+        parser = JSONArrayStreamParser()
+        assert parser.feed('[{"id": 1}, {"id"') == [{"id": 1}]
+        with pytest.raises(InvalidResponseError):
+            parser.close()
+
+
+class TestRadarrStream:
+    URL = conftest.TEST_AIOHTTP_URL
+    API_KEY = conftest.TEST_AIOHTTP_APIKEY
+    radarr_manager = RadarrManager(URL, API_KEY)
+
+    @pytest.mark.asyncio
+    async def test_iter_all_movies(self, debug_aiohttp):
+        debug_aiohttp.get(
+            f"{self.URL}/api/v3/movie", status=200, payload=ITEMS
+        )
+        items = [item async for item in self.radarr_manager.iter_all_media()]
+        assert items == ITEMS
+
+    @pytest.mark.asyncio
+    async def test_iter_all_movies_invalid(self, debug_aiohttp):
+        debug_aiohttp.get(
+            f"{self.URL}/api/v3/movie", status=200, payload={"id": 1}
+        )
+        with pytest.raises(InvalidResponseError):
+            async for _ in self.radarr_manager.iter_all_media():
+                pass
+
+    @pytest.mark.asyncio
+    async def test_iter_all_movies_unauthorized(self, debug_aiohttp):
+        debug_aiohttp.get(f"{self.URL}/api/v3/movie", status=401)
+        with pytest.raises(ConnectionError) as e:
+            async for _ in self.radarr_manager.iter_all_media():
+                pass
+        assert str(e.value).startswith("Unauthorized.")
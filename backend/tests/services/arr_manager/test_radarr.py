@@ -1,3 +1,4 @@
+from datetime import datetime, timedelta, timezone
 import pytest
 from exceptions import InvalidResponseError
 from core.radarr.api_manager import RadarrManager
@@ -41,3 +42,25 @@ class TestRadarrManager:
         _error = f"Invalid Host ({self.URL}) or API Key ({self.API_KEY}), not a Radarr instance."
         assert str(e.value) == _error
         assert e.type == InvalidResponseError
+
+    @pytest.mark.asyncio
+    async def test_get_updated_movie_ids(self, debug_aiohttp):
+        # Arrange
+        utc_plus_2 = timezone(timedelta(hours=2))
+        since = datetime(2026, 1, 2, 3, 4, 5, tzinfo=utc_plus_2)
+        debug_aiohttp.get(
+            f"{self.URL}/api/v3/history/since?date=2026-01-02T01:04:05Z",
+            status=200,
+            payload=[
+                {"movieId": 3, "eventType": "grabbed"},
+                {"movieId": 1, "eventType": "downloadFolderImported"},
+                {"movieId": 3, "eventType": "downloadFolderImported"},
+                {"eventType": "unknown"},
+            ],
+        )
+
+        # Act
+        result = await self.radarr_manager.get_updated_media_ids(since)
+
+        # Assert
+        assert result == [3, 1]
@@ -2,9 +2,18 @@ import {Injectable} from '@angular/core';
 import {Observable, Subject, Subscription} from 'rxjs';
 import {webSocket, WebSocketSubject} from 'rxjs/webSocket';
 
+export interface ProgressData {
+  media_id: number;
+  stage: string;
+  percent: number | null;
+  speed: string | null;
+  eta: number | null;
+}
+
 export interface MessageData {
   message: string;
   type: string;
+  progress?: ProgressData;
 }
 
 @Injectable({
@@ -14,6 +23,7 @@ export class WebsocketService {
   private socket$!: WebSocketSubject<any>;
   websocketSubscription?: Subscription;
   toastMessage = new Subject<MessageData>();
+  progressMessage = new Subject<ProgressData>();
 
   constructor() {
     this.connect();
@@ -37,6 +47,11 @@ export class WebsocketService {
       // Subscribe to the WebSocket and handle incoming messages
       this.websocketSubscription = this.socket$.subscribe({
         next: (data: MessageData) => {
+          // Download progress is not shown as a toast
+          if (data.type === 'Progress' && data.progress) {
+            this.progressMessage.next(data.progress);
+            return;
+          }
           this.toastMessage.next(data);
         },
         error: (error) => {